@@ -9,9 +9,12 @@ import json
 import logging
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple, Union
 
 import azure.functions as func
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.aio import ServiceBusClient
 
 # Add core directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "core"))
@@ -25,14 +28,27 @@ from lightning_core.abstractions.serverless import FunctionContext, TriggerType
 logging.basicConfig(level=os.getenv("LOGGING_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
 
+# Batched messages that fail are re-sent individually this many times
+# before being moved to the dead-letter queue
+MAX_MESSAGE_RETRIES = int(os.getenv("SERVICEBUS_MAX_MESSAGE_RETRIES", "5"))
+RETRY_COUNT_PROPERTY = "lightning_retry_count"
 
-async def main(msg: func.ServiceBusMessage) -> None:
+
+async def main(
+    msg: Union[func.ServiceBusMessage, List[func.ServiceBusMessage]]
+) -> None:
     """
     Azure Functions adapter for universal event processor.
     
     This function receives Service Bus messages and processes them through
     the Lightning Core universal event processor using the serverless abstraction.
+    When the trigger is bound with ``"cardinality": "many"`` it receives a list
+    of messages, which are processed as a single batch.
     """
+    if isinstance(msg, list):
+        await _process_batch(msg)
+        return
+
     invocation_start = datetime.utcnow()
     
     try:
@@ -95,6 +111,124 @@ async def main(msg: func.ServiceBusMessage) -> None:
         raise
 
 
+async def _process_batch(messages: List[func.ServiceBusMessage]) -> None:
+    """Process a batch of Service Bus messages in one invocation
+
+    The invocation only fails when no message was processed. Otherwise
+    failing it would make Service Bus redeliver the whole batch and run
+    drivers again for messages that succeeded, so each failed message is
+    re-sent on its own, or dead-lettered if it cannot be parsed or has
+    been retried ``MAX_MESSAGE_RETRIES`` times.
+    """
+    invocation_start = datetime.utcnow()
+
+    batch: List[Dict[str, Any]] = []
+    parsed: List[func.ServiceBusMessage] = []
+    malformed: List[Tuple[func.ServiceBusMessage, str]] = []
+    for message in messages:
+        try:
+            batch.append(json.loads(message.get_body().decode("utf-8")))
+            parsed.append(message)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to parse message {message.message_id}: {e}")
+            malformed.append((message, f"Malformed message body: {e}"))
+
+    failed: List[Tuple[func.ServiceBusMessage, str]] = []
+    if batch:
+        context = FunctionContext(
+            function_name="UniversalEventProcessor",
+            invocation_id=parsed[0].message_id or f"azure-{invocation_start.timestamp()}",
+            trigger_type=TriggerType.QUEUE,
+            trigger_data=batch,
+            environment=dict(os.environ),
+            metadata={
+                "azure_message_ids": [m.message_id for m in parsed],
+                "source": "azure_service_bus"
+            }
+        )
+
+        logger.info(f"Azure Function invoked with batch of {len(batch)} messages")
+
+        response = await universal_event_processor_handler(context)
+
+        processing_time = (datetime.utcnow() - invocation_start).total_seconds()
+        logger.info(f"Batch processing completed in {processing_time:.2f} seconds")
+
+        if response.is_error:
+            # Nothing was processed, so Service Bus can safely retry the batch
+            logger.error(f"Batch processing failed: {response.error_message or response.body}")
+            raise Exception(response.error_message or "Event batch processing failed")
+
+        results = response.body.get("results", [])
+        failed = [
+            (parsed[index], results[index].get("error") or "Event processing failed")
+            for index in response.body.get("failed", [])
+        ]
+
+    if failed or malformed:
+        await _settle_failed(failed, malformed)
+
+
+async def _settle_failed(
+    failed: List[Tuple[func.ServiceBusMessage, str]],
+    malformed: List[Tuple[func.ServiceBusMessage, str]],
+) -> None:
+    """Re-send failed batch messages individually, dead-lettering exhausted ones
+
+    Raises if a message cannot be re-sent, so Service Bus redelivers the
+    batch rather than the message being lost.
+    """
+    queue_name = os.environ["SERVICEBUS_QUEUE"]
+    retries: List[ServiceBusMessage] = []
+    dead_letters: List[ServiceBusMessage] = []
+
+    for message, error in failed:
+        properties = dict(message.user_properties or {})
+        attempt = int(properties.get(RETRY_COUNT_PROPERTY, 0)) + 1
+        if attempt > MAX_MESSAGE_RETRIES:
+            dead_letters.append(_copy_message(message, properties, error))
+            continue
+        properties[RETRY_COUNT_PROPERTY] = attempt
+        retry = _copy_message(message, properties, error)
+        retry.scheduled_enqueue_time_utc = datetime.utcnow() + timedelta(
+            seconds=min(2 ** attempt, 300)
+        )
+        retries.append(retry)
+    dead_letters.extend(_copy_message(m, dict(m.user_properties or {}), e) for m, e in malformed)
+
+    async with ServiceBusClient.from_connection_string(
+        os.environ["SERVICEBUS_CONNECTION"]
+    ) as client:
+        if retries:
+            async with client.get_queue_sender(queue_name) as sender:
+                await sender.send_messages(retries)
+            logger.warning(f"Re-sent {len(retries)} failed messages for retry")
+        if dead_letters:
+            dead_letter_queue = os.getenv(
+                "SERVICEBUS_DEADLETTER_QUEUE", f"{queue_name}-deadletter"
+            )
+            async with client.get_queue_sender(dead_letter_queue) as sender:
+                await sender.send_messages(dead_letters)
+            logger.error(f"Dead-lettered {len(dead_letters)} messages to {dead_letter_queue}")
+
+
+def _copy_message(
+    message: func.ServiceBusMessage, properties: Dict[str, Any], error: str
+) -> ServiceBusMessage:
+    """Copy a received message for re-sending, recording the last error
+
+    The copy gets a new message id so duplicate detection does not drop it.
+    """
+    properties["lightning_last_error"] = error[:1000]
+    return ServiceBusMessage(
+        message.get_body(),
+        application_properties=properties,
+        content_type=message.content_type,
+        correlation_id=message.correlation_id,
+        session_id=message.session_id,
+    )
+
+
 # Alternative HTTP trigger for testing/debugging
 async def http_trigger(req: func.HttpRequest) -> func.HttpResponse:
     """
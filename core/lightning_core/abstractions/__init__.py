@@ -5,6 +5,9 @@ This module provides abstract base classes for core services,
 enabling both local and cloud implementations.
 """
 
+from .blob_storage import BlobStore
+from .caching import CachePolicy, CachingStorageProvider
+from .compression import CompressingStorageProvider, CompressionPolicy
 from .configuration import ConfigProvider, ExecutionMode, RuntimeConfig
 from .container_runtime import Container, ContainerConfig, ContainerRuntime, ResourceRequirements
 from .event_bus import (
@@ -25,14 +28,37 @@ from .health import (
     CircuitState,
     HealthMonitor,
 )
+from .query import Query
 from .serverless import FunctionConfig, FunctionHandler, ServerlessRuntime
-from .storage import Document, DocumentStore, StorageProvider
+from .storage import (
+    BulkItemResult,
+    BulkResult,
+    Document,
+    DocumentConflictError,
+    DocumentStore,
+    Page,
+    StorageProvider,
+)
+from .write_behind import WriteBehindPolicy, WriteBehindStorageProvider, WriteDurability
 
 __all__ = [
     # Storage
     "StorageProvider",
     "DocumentStore",
     "Document",
+    "DocumentConflictError",
+    "BulkResult",
+    "BulkItemResult",
+    "Page",
+    "Query",
+    "CachePolicy",
+    "CachingStorageProvider",
+    "WriteBehindPolicy",
+    "WriteBehindStorageProvider",
+    "WriteDurability",
+    "CompressionPolicy",
+    "CompressingStorageProvider",
+    "BlobStore",
     # Event Bus
     "EventBus",
     "EventMessage",
@@ -0,0 +1,44 @@
+"""
+Blob storage abstraction for Lightning Core.
+
+Stores opaque byte payloads by key, such as document fields too large to
+keep inline. Keys are ``/``-separated paths.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class BlobStore(ABC):
+    """Abstract base class for blob storage implementations."""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes) -> None:
+        """Store a blob, replacing any blob with the same key."""
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a blob, or None if it does not exist."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Delete a blob; returns whether it existed."""
+        pass
+
+    @abstractmethod
+    async def list_keys(self, prefix: str = "") -> List[str]:
+        """List the keys starting with ``prefix``."""
+        pass
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete every blob whose key starts with ``prefix``."""
+        deleted = 0
+        for key in await self.list_keys(prefix):
+            deleted += await self.delete(key)
+        return deleted
+
+    async def close(self) -> None:
+        """Close blob storage connections."""
+        pass
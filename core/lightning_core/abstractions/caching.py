@@ -0,0 +1,375 @@
+"""
+Read-through document caching for storage providers.
+
+Wraps a StorageProvider so that point reads of hot documents (agent
+configs, instructions, plan definitions) are served from memory. Entries
+expire per container policy and are then revalidated by ETag instead of
+re-read. Writes through the same provider invalidate the affected
+documents. Other processes' caches are only invalidated with an
+invalidation bus that delivers every event to every process; otherwise
+their entries are served until the TTL expires.
+"""
+
+import copy
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from .event_bus import EventBus, EventMessage
+from .health import HealthCheckResult
+from .query import Query
+from .storage import BulkResult, Document, DocumentStore, Page, StorageProvider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=Document)
+
+INVALIDATION_EVENT_TYPE = "storage.cache.invalidate"
+
+
+@dataclass
+class CachePolicy:
+    """How the documents of one container are cached."""
+
+    ttl_seconds: float = 30.0
+    max_entries: int = 1000
+    negative_ttl_seconds: float = 5.0  # How long a missing document is remembered; 0 disables
+    revalidate: bool = True  # Check the ETag of expired entries instead of re-reading them
+
+
+@dataclass
+class CacheStats:
+    """Cache counters for one container.
+
+    Every read counts once: as a hit or negative hit when served from a
+    fresh entry, as stale when the entry had expired, or as a miss.
+    ``revalidated`` counts the stale reads an ETag check confirmed unchanged.
+    """
+
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    revalidated: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        lookups = self.hits + self.negative_hits + self.misses + self.stale
+        served = self.hits + self.negative_hits + self.revalidated
+        stats["hit_ratio"] = served / lookups if lookups else 0.0
+        return stats
+
+
+@dataclass
+class _Entry:
+    document: Optional[Document]  # None caches a missing document
+    partition_key: Optional[str]  # Partition key the entry was read with
+    expires_at: float
+
+
+class CachedDocumentStore(DocumentStore[T]):
+    """Read-through, LRU-bounded cache in front of a document store.
+
+    Only point reads are cached; queries always go to the store. Cached
+    documents are copied on the way in and out, so callers can modify what
+    they get back without affecting the cache.
+    """
+
+    def __init__(
+        self,
+        store: DocumentStore[T],
+        policy: CachePolicy,
+        on_invalidate: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+    ):
+        self.store = store
+        self.policy = policy
+        self.stats = CacheStats()
+        self._on_invalidate = on_invalidate
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Bumped on every invalidation so reads racing a write don't cache
+        # what they fetched before it
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, id: str, partition_key: Optional[str]) -> Optional[_Entry]:
+        entry = self._entries.get(id)
+        if entry is None or partition_key is None:
+            return entry
+        if entry.document is None:
+            return entry if entry.partition_key == partition_key else None
+        return entry if entry.document.partition_key == partition_key else None
+
+    def _put(self, id: str, partition_key: Optional[str], document: Optional[T]) -> None:
+        ttl = self.policy.ttl_seconds if document is not None else self.policy.negative_ttl_seconds
+        if ttl <= 0:
+            self._entries.pop(id, None)
+            return
+        self._entries[id] = _Entry(copy.deepcopy(document), partition_key, time.monotonic() + ttl)
+        self._entries.move_to_end(id)
+        while len(self._entries) > self.policy.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def read(self, id: str, partition_key: Optional[str] = None) -> Optional[T]:
+        """Read a document, from the cache when fresh."""
+        entry = self._lookup(id, partition_key)
+        version = self._version
+
+        if entry is None:
+            self.stats.misses += 1
+            document = await self.store.read(id, partition_key)
+        elif entry.expires_at > time.monotonic():
+            if entry.document is None:
+                self.stats.negative_hits += 1
+            else:
+                self.stats.hits += 1
+            self._entries.move_to_end(id)
+            return copy.deepcopy(entry.document)
+        else:
+            self.stats.stale += 1
+            cached = entry.document
+            if self.policy.revalidate and cached is not None and cached.etag:
+                modified, document = await self.store.read_if_modified(
+                    id, cached.partition_key, cached.etag
+                )
+                if not modified:
+                    self.stats.revalidated += 1
+                    document = cached
+            else:
+                document = await self.store.read(id, partition_key)
+
+        if version == self._version:
+            self._put(id, partition_key, document)
+        return copy.deepcopy(document)
+
+    async def invalidate(self, ids: List[str], publish: bool = True) -> None:
+        """Drop cached entries, and broadcast the invalidation if configured."""
+        self._version += 1
+        for id in ids:
+            if self._entries.pop(id, None) is not None:
+                self.stats.invalidations += 1
+        if publish and self._on_invalidate is not None:
+            await self._on_invalidate(ids)
+
+    def clear(self) -> None:
+        self._version += 1
+        self._entries.clear()
+
+    async def read_if_modified(
+        self, id: str, partition_key: Optional[str], etag: Optional[str]
+    ) -> Tuple[bool, Optional[T]]:
+        return await self.store.read_if_modified(id, partition_key, etag)
+
+    async def create(self, document: T) -> T:
+        """Create a new document."""
+        try:
+            return await self.store.create(document)
+        finally:
+            # Also drops a cached "not found" for the id
+            await self.invalidate([document.id])
+
+    async def update(self, document: T, if_match: Optional[str] = None) -> T:
+        """Update an existing document."""
+        try:
+            return await self.store.update(document, if_match)
+        finally:
+            await self.invalidate([document.id])
+
+    async def upsert(self, document: T, if_match: Optional[str] = None) -> T:
+        """Create a document or replace it if it already exists."""
+        try:
+            return await self.store.upsert(document, if_match)
+        finally:
+            await self.invalidate([document.id])
+
+    async def delete(
+        self, id: str, partition_key: Optional[str] = None, if_match: Optional[str] = None
+    ) -> bool:
+        """Delete a document by ID."""
+        try:
+            return await self.store.delete(id, partition_key, if_match)
+        finally:
+            await self.invalidate([id])
+
+    async def bulk_upsert(self, documents: List[T]) -> BulkResult[T]:
+        try:
+            return await self.store.bulk_upsert(documents)
+        finally:
+            await self.invalidate([document.id for document in documents])
+
+    async def bulk_delete(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> BulkResult[T]:
+        try:
+            return await self.store.bulk_delete(ids, partition_key)
+        finally:
+            await self.invalidate(ids)
+
+    async def read_many(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> List[Optional[T]]:
+        return await self.store.read_many(ids, partition_key)
+
+    async def query(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> List[T]:
+        """Query documents based on criteria."""
+        return await self.store.query(query, partition_key, max_items)
+
+    async def query_page(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        page_size: int = 100,
+        continuation_token: Optional[str] = None,
+    ) -> Page[T]:
+        return await self.store.query_page(query, partition_key, page_size, continuation_token)
+
+    async def list_all(
+        self, partition_key: Optional[str] = None, max_items: Optional[int] = None
+    ) -> List[T]:
+        """List all documents in the store."""
+        return await self.store.list_all(partition_key, max_items)
+
+
+class CachingStorageProvider(StorageProvider):
+    """Storage provider adding read-through caches to selected containers.
+
+    Containers listed in ``policies`` are cached with their policy; other
+    containers use ``default_policy``, or are not cached if it is None.
+    With an ``invalidation_bus``, every write publishes a
+    ``storage.cache.invalidate`` event, and invalidations published by
+    other processes are applied to this cache. The bus must broadcast:
+    on a queue with competing consumers only one process would see each
+    invalidation.
+    """
+
+    def __init__(
+        self,
+        provider: StorageProvider,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        default_policy: Optional[CachePolicy] = None,
+        invalidation_bus: Optional[EventBus] = None,
+    ):
+        self.provider = provider
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy
+        self.invalidation_bus = invalidation_bus
+        self.instance_id = str(uuid.uuid4())
+        self._stores: Dict[str, CachedDocumentStore] = {}
+        self._subscription_id: Optional[str] = None
+
+    def get_document_store(
+        self, container_name: str, document_type: Type[T]
+    ) -> DocumentStore[T]:
+        """Get a document store, cached if the container has a policy."""
+        policy = self.policies.get(container_name, self.default_policy)
+        if policy is None:
+            return self.provider.get_document_store(container_name, document_type)
+
+        if container_name not in self._stores:
+            self._stores[container_name] = CachedDocumentStore(
+                self.provider.get_document_store(container_name, document_type),
+                policy,
+                on_invalidate=lambda ids: self._publish_invalidation(container_name, ids),
+            )
+        return self._stores[container_name]
+
+    async def _publish_invalidation(self, container_name: str, ids: List[str]) -> None:
+        if self.invalidation_bus is None:
+            return
+        event = EventMessage(
+            event_type=INVALIDATION_EVENT_TYPE,
+            data={"container": container_name, "ids": ids},
+            metadata={"origin": self.instance_id},
+            # Repeated writes to a document must not be deduplicated away
+            idempotency_key=str(uuid.uuid4()),
+        )
+        try:
+            await self.invalidation_bus.publish(event)
+        except Exception as e:
+            # The write succeeded; other caches catch up when entries expire
+            logger.warning(f"Failed to publish cache invalidation for {container_name}: {e}")
+
+    async def _handle_invalidation(self, event: EventMessage) -> None:
+        if event.metadata.get("origin") == self.instance_id:
+            return
+        store = self._stores.get(event.data.get("container", ""))
+        if store is not None:
+            await store.invalidate(event.data.get("ids", []), publish=False)
+
+    async def initialize(self) -> None:
+        """Initialize the storage provider and subscribe to invalidations."""
+        await self.provider.initialize()
+        if self.invalidation_bus is not None and self._subscription_id is None:
+            self._subscription_id = await self.invalidation_bus.subscribe(
+                INVALIDATION_EVENT_TYPE, self._handle_invalidation
+            )
+
+    async def close(self) -> None:
+        """Close storage provider connections."""
+        if self._subscription_id is not None:
+            await self.invalidation_bus.unsubscribe(self._subscription_id)
+            self._subscription_id = None
+        await self.provider.close()
+
+    def declare_indexes(self, container_name: str, fields: List[str]) -> None:
+        self.provider.declare_indexes(container_name, fields)
+
+    async def create_container_if_not_exists(
+        self, container_name: str, partition_key_path: str = "/partition_key"
+    ) -> None:
+        """Create a container/collection if it doesn't exist."""
+        await self.provider.create_container_if_not_exists(container_name, partition_key_path)
+
+    async def delete_container(self, container_name: str) -> None:
+        """Delete a container/collection."""
+        await self.provider.delete_container(container_name)
+        store = self._stores.pop(container_name, None)
+        if store is not None:
+            store.clear()
+
+    async def container_exists(self, container_name: str) -> bool:
+        """Check if a container/collection exists."""
+        return await self.provider.container_exists(container_name)
+
+    async def health_check(self) -> HealthCheckResult:
+        return await self.provider.health_check()
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get cache counters and sizes per container."""
+        return {
+            name: {**store.stats.to_dict(), "entries": len(store)}
+            for name, store in self._stores.items()
+        }
+
+    def write_cache_metrics(self, writer: Any) -> None:
+        """Add per-container cache metrics to a ``PrometheusWriter``."""
+        stats = self.get_cache_stats()
+        for counter in ("hits", "negative_hits", "misses", "stale", "revalidated", "evictions", "invalidations"):
+            writer.counter(
+                f"lightning_storage_cache_{counter}_total",
+                f"Document cache {counter.replace('_', ' ')} per container",
+                [({"container": name}, container[counter]) for name, container in stats.items()],
+            )
+        writer.gauge(
+            "lightning_storage_cache_entries",
+            "Documents held in the cache per container",
+            [({"container": name}, container["entries"]) for name, container in stats.items()],
+        )
+
+    def write_metrics(self, writer: Any) -> None:
+        """Add cache metrics, and those of the wrapped provider, to a writer."""
+        self.write_cache_metrics(writer)
+        if hasattr(self.provider, "write_metrics"):
+            self.provider.write_metrics(writer)
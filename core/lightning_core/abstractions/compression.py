@@ -0,0 +1,574 @@
+"""
+Payload compression and large-field offload for document stores.
+
+For containers that opt in, top-level data fields whose JSON is larger
+than a threshold are stored compressed, and fields larger than a second
+threshold are moved to blob storage with only a reference kept in the
+document. Smaller fields are stored as they are, so queries on them keep
+working; compressed and offloaded fields cannot be filtered on.
+
+Point reads return documents with every field restored. Queries and
+listings leave offloaded fields in blob storage until they are used:
+such fields come back as ``OffloadedField`` placeholders, fetched with
+``await field.fetch()`` or all at once with ``store.fetch_offloaded()``.
+"""
+
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import logging
+import uuid
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, TypeVar, Union
+from urllib.parse import quote
+
+from .blob_storage import BlobStore
+from .health import HealthCheckResult
+from .query import Query
+from .storage import (
+    BulkItemResult,
+    BulkResult,
+    Document,
+    DocumentConflictError,
+    DocumentStore,
+    Page,
+    StorageProvider,
+)
+
+try:
+    import zstandard
+
+    ZSTD = True
+except ImportError:
+    ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=Document)
+
+COMPRESSED_MARKER = "$compressed"
+BLOB_MARKER = "$blob"
+
+
+def _compress(algorithm: str, raw: bytes, level: Optional[int]) -> bytes:
+    if algorithm == "zstd":
+        return zstandard.ZstdCompressor(level=level or 3).compress(raw)
+    return zlib.compress(raw, 6 if level is None else level)
+
+
+def _decompress(algorithm: Optional[str], data: bytes) -> bytes:
+    if algorithm == "zstd":
+        if not ZSTD:
+            raise RuntimeError("Reading zstd-compressed fields needs the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if algorithm == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+@dataclass
+class CompressionPolicy:
+    """How the documents of one container are compressed."""
+
+    threshold_bytes: int = 4096  # Fields at least this large, as JSON, are compressed
+    algorithm: str = "zlib"  # zlib, or zstd with the zstandard package
+    level: Optional[int] = None
+    offload_threshold_bytes: int = 0  # Fields at least this large go to blob storage; 0 disables
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in ("zlib", "zstd"):
+            raise ValueError(f"Unknown compression algorithm: {self.algorithm}")
+        if self.algorithm == "zstd" and not ZSTD:
+            raise ValueError("zstd compression needs the zstandard package")
+
+
+@dataclass
+class CompressionStats:
+    """Compression counters for one container.
+
+    ``*_raw`` counts the JSON size of compressed and offloaded fields and
+    ``*_stored`` their size as stored, inline or in blob storage.
+    """
+
+    fields_compressed: int = 0
+    fields_offloaded: int = 0
+    bytes_written_raw: int = 0
+    bytes_written_stored: int = 0
+    bytes_read_raw: int = 0
+    bytes_read_stored: int = 0
+    bytes_offloaded: int = 0
+    blob_fetches: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats["compression_ratio"] = (
+            self.bytes_written_raw / self.bytes_written_stored if self.bytes_written_stored else 0.0
+        )
+        stats["bytes_saved_written"] = self.bytes_written_raw - self.bytes_written_stored
+        stats["bytes_saved_read"] = self.bytes_read_raw - self.bytes_read_stored
+        return stats
+
+
+class OffloadedField:
+    """A document field kept in blob storage, fetched on first use.
+
+    Writing a document back with an unfetched placeholder keeps the
+    stored blob without downloading or uploading it again.
+    """
+
+    def __init__(
+        self, store: "CompressedDocumentStore", key: str, size: int, compression: Optional[str]
+    ):
+        self.key = key
+        self.size = size  # JSON size of the value
+        self.compression = compression
+        self._store = store
+        self._value: Any = None
+        self._fetched = False
+
+    async def fetch(self) -> Any:
+        """Get the field's value, downloading it on first call."""
+        if not self._fetched:
+            self._value = await self._store._fetch_blob(self.key, self.compression)
+            self._fetched = True
+        return self._value
+
+    def reference(self) -> Dict[str, Any]:
+        return {BLOB_MARKER: self.key, "size": self.size, "compression": self.compression}
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "OffloadedField":
+        return self
+
+    def __repr__(self) -> str:
+        return f"OffloadedField({self.key!r}, size={self.size})"
+
+
+class CompressedDocumentStore(DocumentStore[T]):
+    """Compresses and offloads large fields in front of a document store.
+
+    With offload enabled, each write reads the stored document and
+    replaces it with ``if_match`` on its ETag, retrying if another writer
+    got in first. Only blobs referenced by the version a write replaced,
+    and not by the new one, are deleted, so a concurrent writer's blobs
+    are never collected. Offloaded fields are keyed by document, field,
+    content hash and write, and an unchanged field reuses the stored blob.
+    """
+
+    max_write_attempts = 10
+
+    def __init__(
+        self,
+        store: DocumentStore[T],
+        policy: CompressionPolicy,
+        blob_store: Optional[BlobStore] = None,
+        blob_prefix: str = "",
+    ):
+        self.store = store
+        self.policy = policy
+        self.blob_store = blob_store if policy.offload_threshold_bytes > 0 else None
+        self.blob_prefix = blob_prefix
+        self.stats = CompressionStats()
+
+    def _document_prefix(self, id: str) -> str:
+        return f"{self.blob_prefix}/{quote(id, safe='')}/"
+
+    @staticmethod
+    def _references(document: Optional[Document]) -> Set[str]:
+        """Get the blob keys a stored document refers to."""
+        if document is None:
+            return set()
+        return {
+            value[BLOB_MARKER]
+            for value in document.data.values()
+            if isinstance(value, dict) and isinstance(value.get(BLOB_MARKER), str)
+        }
+
+    async def _encode_field(
+        self, id: str, name: str, value: Any, previous: Set[str], uploaded: List[str]
+    ) -> Tuple[Any, Optional[str]]:
+        """Encode one field; returns the stored value and its blob key, if any."""
+        if isinstance(value, OffloadedField):
+            if value.key in previous:
+                return value.reference(), value.key
+            # Not in the version being replaced, so it may be collected
+            value = await value.fetch()
+
+        raw = json.dumps(value, separators=(",", ":")).encode()
+        if len(raw) < self.policy.threshold_bytes:
+            return value, None
+        compressed = _compress(self.policy.algorithm, raw, self.policy.level)
+
+        if self.blob_store is not None and len(raw) >= self.policy.offload_threshold_bytes:
+            digest = hashlib.sha256(raw).hexdigest()[:32]
+            field_prefix = f"{self._document_prefix(id)}{quote(name, safe='')}/{digest}."
+            key = next((k for k in previous if k.startswith(field_prefix)), None)
+            if key is None:
+                key = f"{field_prefix}{uuid.uuid4().hex[:12]}"
+                await self.blob_store.put(key, compressed)
+                uploaded.append(key)
+            self.stats.fields_offloaded += 1
+            self.stats.bytes_offloaded += len(compressed)
+            self.stats.bytes_written_raw += len(raw)
+            self.stats.bytes_written_stored += len(compressed)
+            return {BLOB_MARKER: key, "size": len(raw), "compression": self.policy.algorithm}, key
+
+        encoded = base64.b64encode(compressed).decode()
+        if len(encoded) >= len(raw):
+            return value, None  # Incompressible
+        self.stats.fields_compressed += 1
+        self.stats.bytes_written_raw += len(raw)
+        self.stats.bytes_written_stored += len(encoded)
+        return {COMPRESSED_MARKER: self.policy.algorithm, "data": encoded, "size": len(raw)}, None
+
+    async def _encode(
+        self, document: T, previous: Optional[Set[str]] = None
+    ) -> Tuple[T, Set[str], List[str]]:
+        """Encode a copy of a document.
+
+        Returns the copy, the blob keys it references and the keys
+        uploaded for it. Blobs in ``previous`` are reused.
+        """
+        previous = previous or set()
+        uploaded: List[str] = []
+        names = list(document.data)
+        fields = await asyncio.gather(
+            *(
+                self._encode_field(document.id, name, document.data[name], previous, uploaded)
+                for name in names
+            )
+        )
+        encoded = copy.copy(document)
+        encoded.data = {name: value for name, (value, _) in zip(names, fields)}
+        return encoded, {key for _, key in fields if key}, uploaded
+
+    async def _delete_blobs(self, keys: Any) -> None:
+        if self.blob_store is None:
+            return
+        for key in keys:
+            try:
+                await self.blob_store.delete(key)
+            except Exception as e:
+                logger.warning(f"Failed to delete unreferenced blob {key}: {e}")
+
+    async def _write(self, document: T, if_match: Optional[str], mode: str) -> T:
+        """Create, update or upsert a document whose fields may be offloaded."""
+        if self.blob_store is None:
+            encoded, _, _ = await self._encode(document)
+            if mode == "create":
+                saved = await self.store.create(encoded)
+            elif mode == "update":
+                saved = await self.store.update(encoded, if_match)
+            else:
+                saved = await self.store.upsert(encoded, if_match)
+            return self._copy_back(document, saved)
+
+        for _ in range(self.max_write_attempts):
+            stored = None
+            if mode != "create":
+                stored = await self.store.read(document.id, document.partition_key)
+                if stored is None and mode == "update":
+                    raise ValueError(f"Document not found: {document.id}")
+                if stored is None and if_match is not None:
+                    raise DocumentConflictError(document.id)
+                if stored is not None and if_match is not None and stored.etag != if_match:
+                    raise DocumentConflictError(document.id)
+
+            previous = self._references(stored)
+            encoded, referenced, uploaded = await self._encode(document, previous)
+            try:
+                if stored is None:
+                    saved = await self.store.create(encoded)
+                else:
+                    saved = await self.store.update(encoded, if_match=stored.etag)
+            except ValueError:
+                # Another writer created, replaced or deleted the document
+                await self._delete_blobs(uploaded)
+                if mode == "create" or if_match is not None:
+                    raise
+                continue
+            except BaseException:
+                await self._delete_blobs(uploaded)
+                raise
+            await self._delete_blobs(previous - referenced)
+            return self._copy_back(document, saved)
+
+        raise DocumentConflictError(
+            document.id, f"Gave up writing {document.id} after repeated concurrent writes"
+        )
+
+    def _decode(self, document: Optional[T]) -> Optional[T]:
+        """Decompress fields in place; offloaded fields become placeholders."""
+        if document is None:
+            return None
+        for name, value in list(document.data.items()):
+            if not isinstance(value, dict):
+                continue
+            if isinstance(value.get(COMPRESSED_MARKER), str):
+                stored = value["data"]
+                raw = _decompress(value[COMPRESSED_MARKER], base64.b64decode(stored))
+                self.stats.bytes_read_raw += len(raw)
+                self.stats.bytes_read_stored += len(stored)
+                document.data[name] = json.loads(raw)
+            elif isinstance(value.get(BLOB_MARKER), str):
+                document.data[name] = OffloadedField(
+                    self, value[BLOB_MARKER], value.get("size", 0), value.get("compression")
+                )
+        return document
+
+    async def _fetch_blob(self, key: str, compression: Optional[str]) -> Any:
+        if self.blob_store is None:
+            raise RuntimeError(f"No blob store configured to fetch {key}")
+        data = await self.blob_store.get(key)
+        if data is None:
+            raise LookupError(f"Offloaded field {key} no longer exists; re-read the document")
+        raw = _decompress(compression, data)
+        self.stats.blob_fetches += 1
+        self.stats.bytes_read_raw += len(raw)
+        self.stats.bytes_read_stored += len(data)
+        return json.loads(raw)
+
+    async def fetch_offloaded(self, document: Optional[T]) -> Optional[T]:
+        """Replace a document's offloaded-field placeholders with their values."""
+        if document is None:
+            return None
+        names = [
+            name for name, value in document.data.items() if isinstance(value, OffloadedField)
+        ]
+        values = await asyncio.gather(*(document.data[name].fetch() for name in names))
+        document.data.update(zip(names, values))
+        return document
+
+    @staticmethod
+    def _copy_back(document: T, saved: T) -> T:
+        document.etag = saved.etag
+        document.version = saved.version
+        document.updated_at = saved.updated_at
+        return document
+
+    async def create(self, document: T) -> T:
+        """Create a new document."""
+        return await self._write(document, None, "create")
+
+    async def read(self, id: str, partition_key: Optional[str] = None) -> Optional[T]:
+        """Read a document with every field restored."""
+        return await self.fetch_offloaded(self._decode(await self.store.read(id, partition_key)))
+
+    async def read_if_modified(
+        self, id: str, partition_key: Optional[str], etag: Optional[str]
+    ) -> Tuple[bool, Optional[T]]:
+        modified, document = await self.store.read_if_modified(id, partition_key, etag)
+        return modified, await self.fetch_offloaded(self._decode(document))
+
+    async def update(self, document: T, if_match: Optional[str] = None) -> T:
+        """Update an existing document."""
+        return await self._write(document, if_match, "update")
+
+    async def upsert(self, document: T, if_match: Optional[str] = None) -> T:
+        """Create a document or replace it if it already exists."""
+        return await self._write(document, if_match, "upsert")
+
+    async def delete(
+        self, id: str, partition_key: Optional[str] = None, if_match: Optional[str] = None
+    ) -> bool:
+        """Delete a document and its offloaded fields."""
+        if self.blob_store is None:
+            return await self.store.delete(id, partition_key, if_match)
+
+        for _ in range(self.max_write_attempts):
+            stored = await self.store.read(id, partition_key)
+            if stored is None:
+                return False
+            if if_match is not None and stored.etag != if_match:
+                raise DocumentConflictError(id)
+            try:
+                deleted = await self.store.delete(id, partition_key, stored.etag)
+            except DocumentConflictError:
+                if if_match is not None:
+                    raise
+                continue
+            if deleted:
+                await self._delete_blobs(self._references(stored))
+            return deleted
+
+        raise DocumentConflictError(id, f"Gave up deleting {id} after repeated concurrent writes")
+
+    async def _bulk(self, ids: List[str], operations: List[Any]) -> BulkResult[T]:
+        results = await asyncio.gather(*operations, return_exceptions=True)
+        items: List[BulkItemResult[T]] = []
+        for id, result in zip(ids, results):
+            if isinstance(result, Exception):
+                items.append(BulkItemResult(id=id, success=False, error=str(result)))
+            elif result is False:
+                items.append(BulkItemResult(id=id, success=False, error="Document not found"))
+            else:
+                document = None if result is True else result
+                items.append(BulkItemResult(id=id, success=True, document=document))
+        return BulkResult(items=items)
+
+    async def bulk_upsert(self, documents: List[T]) -> BulkResult[T]:
+        if self.blob_store is not None:
+            # Each write has to replace the version whose blobs it collects
+            return await self._bulk(
+                [document.id for document in documents],
+                [self.upsert(document) for document in documents],
+            )
+
+        encoded = await asyncio.gather(*(self._encode(document) for document in documents))
+        result = await self.store.bulk_upsert([document for document, _, _ in encoded])
+        for document, item in zip(documents, result.items):
+            if item.success:
+                if item.document is not None:
+                    self._copy_back(document, item.document)
+                item.document = document
+        return result
+
+    async def bulk_delete(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> BulkResult[T]:
+        if self.blob_store is not None:
+            return await self._bulk(ids, [self.delete(id, partition_key) for id in ids])
+        return await self.store.bulk_delete(ids, partition_key)
+
+    async def read_many(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> List[Optional[T]]:
+        documents = await self.store.read_many(ids, partition_key)
+        return [self._decode(document) for document in documents]
+
+    async def query(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> List[T]:
+        """Query documents based on criteria."""
+        documents = await self.store.query(query, partition_key, max_items)
+        return [self._decode(document) for document in documents]
+
+    async def query_page(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        page_size: int = 100,
+        continuation_token: Optional[str] = None,
+    ) -> Page[T]:
+        page = await self.store.query_page(query, partition_key, page_size, continuation_token)
+        page.items = [self._decode(document) for document in page.items]
+        return page
+
+    async def list_all(
+        self, partition_key: Optional[str] = None, max_items: Optional[int] = None
+    ) -> List[T]:
+        """List all documents in the store."""
+        documents = await self.store.list_all(partition_key, max_items)
+        return [self._decode(document) for document in documents]
+
+
+class CompressingStorageProvider(StorageProvider):
+    """Storage provider compressing large fields of selected containers.
+
+    Only containers listed in ``policies`` are compressed. Policies with
+    an ``offload_threshold_bytes`` need a ``blob_store``; offloaded blobs
+    are keyed by container name.
+    """
+
+    def __init__(
+        self,
+        provider: StorageProvider,
+        policies: Dict[str, CompressionPolicy],
+        blob_store: Optional[BlobStore] = None,
+    ):
+        self.provider = provider
+        self.policies = dict(policies)
+        self.blob_store = blob_store
+        self._stores: Dict[str, CompressedDocumentStore] = {}
+
+    def get_document_store(
+        self, container_name: str, document_type: Type[T]
+    ) -> DocumentStore[T]:
+        """Get a document store, compressed if the container has a policy."""
+        policy = self.policies.get(container_name)
+        if policy is None:
+            return self.provider.get_document_store(container_name, document_type)
+
+        if container_name not in self._stores:
+            if policy.offload_threshold_bytes > 0 and self.blob_store is None:
+                logger.warning(
+                    f"No blob store configured; {container_name} fields are not offloaded"
+                )
+            self._stores[container_name] = CompressedDocumentStore(
+                self.provider.get_document_store(container_name, document_type),
+                policy,
+                self.blob_store,
+                blob_prefix=quote(container_name, safe=""),
+            )
+        return self._stores[container_name]
+
+    async def initialize(self) -> None:
+        """Initialize the storage provider."""
+        await self.provider.initialize()
+
+    async def close(self) -> None:
+        """Close storage provider and blob store connections."""
+        await self.provider.close()
+        if self.blob_store is not None:
+            await self.blob_store.close()
+
+    def declare_indexes(self, container_name: str, fields: List[str]) -> None:
+        self.provider.declare_indexes(container_name, fields)
+
+    async def create_container_if_not_exists(
+        self, container_name: str, partition_key_path: str = "/partition_key"
+    ) -> None:
+        """Create a container/collection if it doesn't exist."""
+        await self.provider.create_container_if_not_exists(container_name, partition_key_path)
+
+    async def delete_container(self, container_name: str) -> None:
+        """Delete a container/collection and its offloaded fields."""
+        await self.provider.delete_container(container_name)
+        self._stores.pop(container_name, None)
+        if self.blob_store is not None and container_name in self.policies:
+            await self.blob_store.delete_prefix(f"{quote(container_name, safe='')}/")
+
+    async def container_exists(self, container_name: str) -> bool:
+        """Check if a container/collection exists."""
+        return await self.provider.container_exists(container_name)
+
+    async def health_check(self) -> HealthCheckResult:
+        return await self.provider.health_check()
+
+    def get_compression_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get compression counters per container."""
+        return {name: store.stats.to_dict() for name, store in self._stores.items()}
+
+    def write_metrics(self, writer: Any) -> None:
+        """Add per-container compression metrics to a ``PrometheusWriter``."""
+        stats = self.get_compression_stats()
+        for counter in (
+            "fields_compressed",
+            "fields_offloaded",
+            "bytes_written_raw",
+            "bytes_written_stored",
+            "bytes_read_raw",
+            "bytes_read_stored",
+            "bytes_offloaded",
+            "blob_fetches",
+        ):
+            writer.counter(
+                f"lightning_storage_compression_{counter}_total",
+                f"Compression {counter.replace('_', ' ')} per container",
+                [({"container": name}, container[counter]) for name, container in stats.items()],
+            )
+        writer.gauge(
+            "lightning_storage_compression_ratio",
+            "Uncompressed to stored size of compressed fields per container",
+            [
+                ({"container": name}, container["compression_ratio"])
+                for name, container in stats.items()
+            ],
+        )
+        if hasattr(self.provider, "write_metrics"):
+            self.provider.write_metrics(writer)
@@ -10,7 +10,7 @@ import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, Optional, Type, TypeVar
+from typing import Any, Dict, List, Optional, Type, TypeVar
 
 
 class ExecutionMode(Enum):
@@ -34,6 +34,22 @@ class RuntimeConfig:
     storage_connection_string: Optional[str] = None
     storage_endpoint: Optional[str] = None
     storage_path: Optional[str] = "./data"  # For local storage
+    # Document cache TTL; 0 disables caching. Caches are per process, so
+    # writes by other processes show up once their entries expire
+    storage_cache_ttl_seconds: float = 0.0
+    storage_cache_containers: List[str] = field(default_factory=list)  # Empty caches all
+    storage_write_behind_containers: List[str] = field(default_factory=list)  # Empty disables
+    storage_write_behind_interval_seconds: float = 1.0
+    storage_write_behind_durability: str = "buffered"  # buffered, flushed
+    storage_compression_containers: List[str] = field(default_factory=list)  # Empty disables
+    storage_compression_threshold_bytes: int = 4096
+    storage_compression_algorithm: str = "zlib"  # zlib, zstd
+    storage_offload_threshold_bytes: int = 0  # Larger fields go to blob storage; 0 disables
+
+    # Blob storage configuration
+    blob_storage_provider: str = "local"  # local, azure_blob
+    blob_storage_connection_string: Optional[str] = None
+    blob_storage_path: Optional[str] = None  # For local blobs; defaults to <storage_path>/blobs
 
     # Event bus configuration
     event_bus_provider: str = "local"  # local, azure_service_bus, sqs, pubsub
@@ -61,6 +77,9 @@ class RuntimeConfig:
     auth_enabled: bool = True
     encryption_enabled: bool = True
     api_keys: Dict[str, str] = field(default_factory=dict)
+    rate_limit_connection_string: Optional[str] = None  # Redis URL for shared limits
+    usage_save_interval_seconds: float = 0.0  # Persist usage counters this often; 0 disables
+    audit_log_container: Optional[str] = None  # Persist the audit log to this container
 
     # Logging configuration
     log_level: str = "INFO"
@@ -87,6 +106,37 @@ class RuntimeConfig:
         config.storage_connection_string = os.getenv("LIGHTNING_STORAGE_CONNECTION")
         config.storage_endpoint = os.getenv("LIGHTNING_STORAGE_ENDPOINT")
         config.storage_path = os.getenv("LIGHTNING_STORAGE_PATH", "./data")
+        if cache_ttl := os.getenv("LIGHTNING_STORAGE_CACHE_TTL"):
+            config.storage_cache_ttl_seconds = float(cache_ttl)
+        if cache_containers := os.getenv("LIGHTNING_STORAGE_CACHE_CONTAINERS"):
+            config.storage_cache_containers = [
+                name.strip() for name in cache_containers.split(",") if name.strip()
+            ]
+        if write_behind := os.getenv("LIGHTNING_STORAGE_WRITE_BEHIND_CONTAINERS"):
+            config.storage_write_behind_containers = [
+                name.strip() for name in write_behind.split(",") if name.strip()
+            ]
+        if write_behind_interval := os.getenv("LIGHTNING_STORAGE_WRITE_BEHIND_INTERVAL"):
+            config.storage_write_behind_interval_seconds = float(write_behind_interval)
+        config.storage_write_behind_durability = os.getenv(
+            "LIGHTNING_STORAGE_WRITE_BEHIND_DURABILITY", config.storage_write_behind_durability
+        )
+        if compressed := os.getenv("LIGHTNING_STORAGE_COMPRESSION_CONTAINERS"):
+            config.storage_compression_containers = [
+                name.strip() for name in compressed.split(",") if name.strip()
+            ]
+        if compression_threshold := os.getenv("LIGHTNING_STORAGE_COMPRESSION_THRESHOLD"):
+            config.storage_compression_threshold_bytes = int(compression_threshold)
+        config.storage_compression_algorithm = os.getenv(
+            "LIGHTNING_STORAGE_COMPRESSION_ALGORITHM", config.storage_compression_algorithm
+        )
+        if offload_threshold := os.getenv("LIGHTNING_STORAGE_OFFLOAD_THRESHOLD"):
+            config.storage_offload_threshold_bytes = int(offload_threshold)
+
+        # Blob storage
+        config.blob_storage_provider = os.getenv("LIGHTNING_BLOB_STORAGE_PROVIDER", "local")
+        config.blob_storage_connection_string = os.getenv("LIGHTNING_BLOB_STORAGE_CONNECTION")
+        config.blob_storage_path = os.getenv("LIGHTNING_BLOB_STORAGE_PATH")
 
         # Event bus
         config.event_bus_provider = os.getenv("LIGHTNING_EVENT_BUS_PROVIDER", "local")
@@ -120,6 +170,11 @@ class RuntimeConfig:
             os.getenv("LIGHTNING_ENCRYPTION_ENABLED", "true").lower() == "true"
         )
 
+        config.rate_limit_connection_string = os.getenv("LIGHTNING_RATE_LIMIT_CONNECTION")
+        if usage_interval := os.getenv("LIGHTNING_USAGE_SAVE_INTERVAL"):
+            config.usage_save_interval_seconds = float(usage_interval)
+        config.audit_log_container = os.getenv("LIGHTNING_AUDIT_LOG_CONTAINER")
+
         # API keys
         for key, value in os.environ.items():
             if key.startswith("LIGHTNING_API_KEY_"):
@@ -151,6 +206,18 @@ class RuntimeConfig:
             "storage_connection_string": self.storage_connection_string,
             "storage_endpoint": self.storage_endpoint,
             "storage_path": self.storage_path,
+            "storage_cache_ttl_seconds": self.storage_cache_ttl_seconds,
+            "storage_cache_containers": self.storage_cache_containers,
+            "storage_write_behind_containers": self.storage_write_behind_containers,
+            "storage_write_behind_interval_seconds": self.storage_write_behind_interval_seconds,
+            "storage_write_behind_durability": self.storage_write_behind_durability,
+            "storage_compression_containers": self.storage_compression_containers,
+            "storage_compression_threshold_bytes": self.storage_compression_threshold_bytes,
+            "storage_compression_algorithm": self.storage_compression_algorithm,
+            "storage_offload_threshold_bytes": self.storage_offload_threshold_bytes,
+            "blob_storage_provider": self.blob_storage_provider,
+            "blob_storage_connection_string": self.blob_storage_connection_string,
+            "blob_storage_path": self.blob_storage_path,
             "event_bus_provider": self.event_bus_provider,
             "event_bus_connection_string": self.event_bus_connection_string,
             "event_bus_endpoint": self.event_bus_endpoint,
@@ -163,6 +230,9 @@ class RuntimeConfig:
             "resource_group": self.resource_group,
             "auth_enabled": self.auth_enabled,
             "encryption_enabled": self.encryption_enabled,
+            "rate_limit_connection_string": self.rate_limit_connection_string,
+            "usage_save_interval_seconds": self.usage_save_interval_seconds,
+            "audit_log_container": self.audit_log_container,
             "log_level": self.log_level,
             "log_provider": self.log_provider,
             "log_connection_string": self.log_connection_string,
@@ -3,8 +3,10 @@ Factory for creating abstraction implementations based on configuration.
 """
 
 import importlib
+import os
 from typing import Any, Dict, Optional, Type
 
+from .blob_storage import BlobStore
 from .configuration import ExecutionMode, RuntimeConfig
 from .container_runtime import ContainerRuntime
 from .event_bus import EventBus
@@ -23,6 +25,11 @@ class ProviderFactory:
         "firestore": "lightning_core.providers.gcp.storage.FirestoreStorageProvider",
     }
 
+    _blob_stores: Dict[str, str] = {
+        "local": "lightning_core.providers.local.blob_storage.LocalBlobStore",
+        "azure_blob": "lightning_core.providers.azure.blob_storage.AzureBlobStore",
+    }
+
     _event_bus_providers: Dict[str, str] = {
         "local": "lightning_core.providers.local.event_bus.LocalEventBus",
         "redis": "lightning_core.providers.redis.event_bus.RedisEventBus",
@@ -73,6 +80,25 @@ class ProviderFactory:
 
         return provider_class(**provider_config)
 
+    @classmethod
+    def create_blob_store(cls, config: RuntimeConfig, **kwargs: Any) -> BlobStore:
+        """Create a blob store based on configuration."""
+        provider_path = cls._blob_stores.get(config.blob_storage_provider)
+        if not provider_path:
+            raise ValueError(f"Unknown blob storage provider: {config.blob_storage_provider}")
+
+        provider_class = cls._load_class(provider_path)
+
+        # Prepare provider-specific configuration
+        provider_config = {
+            "connection_string": config.blob_storage_connection_string,
+            "path": config.blob_storage_path
+            or os.path.join(config.storage_path or "./data", "blobs"),
+            **kwargs,
+        }
+
+        return provider_class(**provider_config)
+
     @classmethod
     def create_event_bus(cls, config: RuntimeConfig, **kwargs: Any) -> EventBus:
         """Create an event bus based on configuration."""
@@ -158,6 +184,11 @@ class ProviderFactory:
         """Register a custom serverless provider."""
         cls._serverless_providers[name] = module_path
 
+    @classmethod
+    def register_blob_store(cls, name: str, module_path: str) -> None:
+        """Register a custom blob store."""
+        cls._blob_stores[name] = module_path
+
 
 # Global factory instance
 _global_factory: Optional[ProviderFactory] = None
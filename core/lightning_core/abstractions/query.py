@@ -0,0 +1,136 @@
+"""
+Portable query expressions for document stores.
+
+Filters are dictionaries mapping document data paths to either a value,
+meaning equality, or to a dictionary of operators::
+
+    {"enabled": True, "next_trigger": {"$lte": now}}
+    {"status": {"$in": ["pending", "running"]}, "name": {"$prefix": "daily-"}}
+    {"archived_at": {"$exists": False}}
+
+Paths are relative to ``Document.data``, with dots for nested fields.
+A ``Query`` adds ordering, projection and a limit to a filter. Each store
+compiles these into its own query language, so filtering, sorting and
+projection run in the database rather than in Python.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+# Operator -> whether its operand is a list
+OPERATORS: Dict[str, bool] = {
+    "$eq": False,
+    "$ne": False,
+    "$lt": False,
+    "$lte": False,
+    "$gt": False,
+    "$gte": False,
+    "$in": True,
+    "$prefix": False,
+    "$exists": False,
+}
+
+
+def validate_field(path: str) -> str:
+    """Check a data path is safe to embed in a query and return it."""
+    if not isinstance(path, str) or not FIELD_PATTERN.match(path):
+        raise ValueError(f"Invalid document field name: {path!r}")
+    return path
+
+
+@dataclass
+class Condition:
+    """One comparison of a data path against a value."""
+
+    field: str
+    op: str  # One of OPERATORS
+    value: Any = None
+
+
+@dataclass
+class Query:
+    """A filter with ordering, projection and a limit.
+
+    ``order_by`` lists data paths, each prefixed with ``-`` for descending
+    order. Cosmos DB leaves out documents missing an ordered field and
+    needs a composite index to order by more than one. ``fields``
+    restricts the data returned to those paths; other document attributes
+    are always returned. ``limit`` caps the number of documents.
+    """
+
+    filter: Dict[str, Any] = field(default_factory=dict)
+    order_by: List[str] = field(default_factory=list)
+    fields: Optional[List[str]] = None
+    limit: Optional[int] = None
+
+    @classmethod
+    def of(cls, query: Union["Query", Dict[str, Any], None]) -> "Query":
+        """Wrap a plain filter dictionary in a Query."""
+        if isinstance(query, Query):
+            return query
+        return cls(filter=dict(query or {}))
+
+    def conditions(self) -> List[Condition]:
+        return parse_filter(self.filter)
+
+    def ordering(self) -> List[Tuple[str, bool]]:
+        """``(path, descending)`` pairs for ``order_by``."""
+        return [
+            (validate_field(key[1:]), True) if key.startswith("-") else (validate_field(key), False)
+            for key in self.order_by
+        ]
+
+    def projection(self) -> Optional[List[str]]:
+        if self.fields is None:
+            return None
+        return [validate_field(path) for path in self.fields]
+
+    def effective_limit(self, max_items: Optional[int]) -> Optional[int]:
+        """The smaller of the query's limit and a caller's ``max_items``."""
+        limits = [limit for limit in (self.limit, max_items) if limit]
+        return min(limits) if limits else None
+
+
+def _is_operator_dict(value: Any) -> bool:
+    return isinstance(value, dict) and bool(value) and all(
+        isinstance(key, str) and key.startswith("$") for key in value
+    )
+
+
+def parse_filter(filter: Dict[str, Any]) -> List[Condition]:
+    """Parse a filter dictionary into conditions, all of which must hold.
+
+    Raises ValueError for invalid paths, unknown operators and operands of
+    the wrong shape.
+    """
+    conditions = []
+    for path, value in filter.items():
+        validate_field(path)
+        if not _is_operator_dict(value):
+            # Plain values, including dictionaries and lists, match exactly
+            conditions.append(Condition(path, "$eq", value))
+            continue
+        for op, operand in value.items():
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown query operator {op!r} for {path!r}")
+            if OPERATORS[op] and not isinstance(operand, (list, tuple, set)):
+                raise ValueError(f"Operator {op} for {path!r} needs a list")
+            if op == "$prefix" and not isinstance(operand, str):
+                raise ValueError(f"Operator $prefix for {path!r} needs a string")
+            if op == "$in":
+                operand = list(operand)
+            elif op == "$exists":
+                operand = bool(operand)
+            conditions.append(Condition(path, op, operand))
+    return conditions
+
+
+def set_path(data: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted path in a dictionary, creating parents as needed."""
+    parts = path.split(".")
+    for part in parts[:-1]:
+        data = data.setdefault(part, {})
+    data[parts[-1]] = value
@@ -5,14 +5,32 @@ Provides abstract base classes for storage operations,
 supporting both cloud (e.g., Cosmos DB) and local implementations.
 """
 
+import asyncio
+import base64
+import inspect
+import json
+import random
 import time
 import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .health import HealthCheckable, HealthCheckResult, HealthStatus
+from .query import Query
 
 
 @dataclass
@@ -25,6 +43,7 @@ class Document:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
     etag: Optional[str] = None
+    version: int = 0  # Incremented by the store on every write; 0 if never stored
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert document to dictionary."""
@@ -35,6 +54,7 @@ class Document:
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "etag": self.etag,
+            "version": self.version,
         }
 
     @classmethod
@@ -51,12 +71,91 @@ class Document:
             doc.updated_at = datetime.fromisoformat(data["updated_at"])
 
         doc.etag = data.get("etag")
+        doc.version = data.get("version", 0)
         return doc
 
 
+class DocumentConflictError(ValueError):
+    """A write lost a race with another writer.
+
+    Raised when a conditional write's ``if_match`` ETag no longer matches
+    the stored document, and when creating a document whose id exists.
+    """
+
+    def __init__(self, id: str, message: Optional[str] = None):
+        super().__init__(message or f"Document was modified by another process: {id}")
+        self.id = id
+
+
 T = TypeVar("T", bound=Document)
 
 
+@dataclass
+class BulkItemResult(Generic[T]):
+    """Outcome of one item in a bulk operation."""
+
+    id: str
+    success: bool
+    document: Optional[T] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkResult(Generic[T]):
+    """Per-item outcomes of a bulk operation, in request order."""
+
+    items: List[BulkItemResult[T]] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[BulkItemResult[T]]:
+        return [item for item in self.items if item.success]
+
+    @property
+    def failed(self) -> List[BulkItemResult[T]]:
+        return [item for item in self.items if not item.success]
+
+    @property
+    def all_succeeded(self) -> bool:
+        return all(item.success for item in self.items)
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of query results.
+
+    ``continuation_token`` is opaque; pass it back to get the next page. It
+    is None on the last page.
+    """
+
+    items: List[T] = field(default_factory=list)
+    continuation_token: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.continuation_token is not None
+
+
+def encode_continuation_token(state: Dict[str, Any]) -> str:
+    """Encode store-specific paging state as an opaque, URL-safe token."""
+    payload = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_continuation_token(token: str) -> Dict[str, Any]:
+    """Decode a token from ``encode_continuation_token``.
+
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        state = json.loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid continuation token: {e}")
+    if not isinstance(state, dict):
+        raise ValueError("Invalid continuation token")
+    return state
+
+
 class DocumentStore(ABC, Generic[T]):
     """Abstract base class for document storage operations."""
 
@@ -71,23 +170,37 @@ class DocumentStore(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    async def update(self, document: T) -> T:
-        """Update an existing document."""
+    async def update(self, document: T, if_match: Optional[str] = None) -> T:
+        """Update an existing document.
+
+        With ``if_match``, the update only applies if the stored document's
+        ETag still equals it, and raises DocumentConflictError otherwise.
+        """
         pass
 
     @abstractmethod
-    async def delete(self, id: str, partition_key: Optional[str] = None) -> bool:
-        """Delete a document by ID."""
+    async def delete(
+        self, id: str, partition_key: Optional[str] = None, if_match: Optional[str] = None
+    ) -> bool:
+        """Delete a document by ID.
+
+        With ``if_match``, raises DocumentConflictError if the stored
+        document's ETag differs.
+        """
         pass
 
     @abstractmethod
     async def query(
         self,
-        query: Dict[str, Any],
+        query: Union[Dict[str, Any], Query],
         partition_key: Optional[str] = None,
         max_items: Optional[int] = None,
     ) -> List[T]:
-        """Query documents based on criteria."""
+        """Query documents based on criteria.
+
+        ``query`` is a filter dictionary or a ``Query`` with ordering,
+        projection and a limit; see ``lightning_core.abstractions.query``.
+        """
         pass
 
     @abstractmethod
@@ -97,6 +210,148 @@ class DocumentStore(ABC, Generic[T]):
         """List all documents in the store."""
         pass
 
+    async def read_if_modified(
+        self, id: str, partition_key: Optional[str], etag: Optional[str]
+    ) -> Tuple[bool, Optional[T]]:
+        """Read a document unless its ETag still equals ``etag``.
+
+        Returns ``(False, None)`` if the document is unchanged, otherwise
+        ``(True, document)``, with None for a deleted document. Stores
+        should override this to avoid transferring unchanged documents.
+        """
+        document = await self.read(id, partition_key)
+        if document is not None and etag is not None and document.etag == etag:
+            return False, None
+        return True, document
+
+    async def query_page(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        page_size: int = 100,
+        continuation_token: Optional[str] = None,
+    ) -> Page[T]:
+        """Get one page of documents matching the criteria.
+
+        An empty query pages through every document. Stores should override
+        this to fetch only the requested page; the default runs the full
+        query and slices it.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        offset = 0
+        if continuation_token:
+            offset = int(decode_continuation_token(continuation_token).get("offset", 0))
+        documents = await self.query(query, partition_key, max_items=offset + page_size + 1)
+        items = documents[offset : offset + page_size]
+        token = None
+        if len(documents) > offset + page_size:
+            token = encode_continuation_token({"offset": offset + page_size})
+        return Page(items, token)
+
+    async def iter_query(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[T]:
+        """Iterate over matching documents, fetching one page at a time."""
+        token = None
+        while True:
+            page = await self.query_page(query, partition_key, page_size, token)
+            for document in page.items:
+                yield document
+            if not page.has_more:
+                return
+            token = page.continuation_token
+
+    def iter_all(
+        self, partition_key: Optional[str] = None, page_size: int = 100
+    ) -> AsyncIterator[T]:
+        """Iterate over all documents, fetching one page at a time."""
+        return self.iter_query({}, partition_key, page_size)
+
+    async def upsert(self, document: T, if_match: Optional[str] = None) -> T:
+        """Create a document or replace it if it already exists.
+
+        With ``if_match`` the document must exist, so this is a conditional
+        update.
+        """
+        if if_match is not None:
+            return await self.update(document, if_match=if_match)
+        if await self.read(document.id, document.partition_key) is None:
+            return await self.create(document)
+        return await self.update(document)
+
+    async def read_modify_write(
+        self,
+        id: str,
+        partition_key: Optional[str],
+        modify: Callable[[Optional[T]], Union[T, Awaitable[T]]],
+        max_attempts: int = 5,
+        backoff_seconds: float = 0.01,
+    ) -> T:
+        """Read a document, change it and write it back without losing updates.
+
+        ``modify`` gets the stored document, or None if there is none, and
+        returns the document to write; it may be a coroutine function. The
+        write is conditional on the ETag that was read, and on a conflict
+        the whole cycle is retried, so ``modify`` can run more than once.
+        Raises DocumentConflictError after ``max_attempts`` conflicts.
+        """
+        for attempt in range(max_attempts):
+            current = await self.read(id, partition_key)
+            etag = current.etag if current is not None else None
+            document = modify(current)
+            if inspect.isawaitable(document):
+                document = await document
+            try:
+                if current is None:
+                    return await self.create(document)
+                return await self.update(document, if_match=etag)
+            except DocumentConflictError:
+                if attempt + 1 >= max_attempts:
+                    raise
+                # Jittered exponential backoff so competing writers spread out
+                await asyncio.sleep(backoff_seconds * (2 ** attempt) * random.random())
+        raise DocumentConflictError(id)
+
+    async def bulk_upsert(self, documents: List[T]) -> BulkResult[T]:
+        """Upsert many documents, reporting failures per item.
+
+        Stores should override this to use a single round trip or
+        transaction; the default upserts one document at a time.
+        """
+        result: BulkResult[T] = BulkResult()
+        for document in documents:
+            try:
+                saved = await self.upsert(document)
+                result.items.append(BulkItemResult(document.id, True, document=saved))
+            except Exception as e:
+                result.items.append(BulkItemResult(document.id, False, error=str(e)))
+        return result
+
+    async def bulk_delete(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> BulkResult[T]:
+        """Delete many documents, reporting failures per item."""
+        result: BulkResult[T] = BulkResult()
+        for id in ids:
+            try:
+                deleted = await self.delete(id, partition_key)
+                result.items.append(
+                    BulkItemResult(id, deleted, error=None if deleted else "Document not found")
+                )
+            except Exception as e:
+                result.items.append(BulkItemResult(id, False, error=str(e)))
+        return result
+
+    async def read_many(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> List[Optional[T]]:
+        """Read many documents; missing documents are returned as None."""
+        return [await self.read(id, partition_key) for id in ids]
+
 
 class StorageProvider(ABC, HealthCheckable):
     """Abstract base class for storage provider implementations."""
@@ -113,6 +368,14 @@ class StorageProvider(ABC, HealthCheckable):
         """Initialize the storage provider."""
         pass
 
+    def declare_indexes(self, container_name: str, fields: List[str]) -> None:
+        """Declare document data fields that queries filter on.
+
+        Providers that need explicit secondary indexes create them; those
+        that index every path (such as Cosmos DB) can ignore this.
+        """
+        pass
+
     @abstractmethod
     async def close(self) -> None:
         """Close storage provider connections."""
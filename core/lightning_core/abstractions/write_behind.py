@@ -0,0 +1,446 @@
+"""
+Write-behind buffering for frequently rewritten documents.
+
+Some documents (chat threads, agent status, task progress) are rewritten
+on every event. For containers that opt in, upserts and deletes are held
+in memory and written in bulk once per flush interval, so a document
+rewritten many times within the interval is stored once. Reads through
+the same store see buffered writes. Pending writes are flushed when the
+provider closes. Buffered writes that fail to store are retried on later
+flushes and dead-lettered after repeated failures.
+"""
+
+import asyncio
+import copy
+import logging
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from .health import HealthCheckResult
+from .query import Query
+from .storage import BulkResult, Document, DocumentStore, Page, StorageProvider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=Document)
+
+
+class WriteDurability(str, Enum):
+    """When a buffered write returns to the caller."""
+
+    BUFFERED = "buffered"  # Once buffered; writes since the last flush are lost on a crash
+    FLUSHED = "flushed"  # Once the flush containing it is stored; batches without losing writes
+
+
+@dataclass
+class WriteBehindPolicy:
+    """How writes to one container are buffered."""
+
+    flush_interval_seconds: float = 1.0
+    max_pending: int = 1000  # Flush early once this many documents are pending
+    durability: WriteDurability = WriteDurability.BUFFERED
+    max_attempts: int = 5  # Flushes a buffered write may fail before it is dead-lettered
+    max_dead_letters: int = 1000  # Dead-lettered writes kept for inspection
+
+
+@dataclass
+class WriteBehindStats:
+    """Write-behind counters for one container.
+
+    ``writes`` counts buffered upserts and deletes, ``stored`` the writes
+    that reached the store after coalescing, and ``coalesced`` the writes
+    replaced by a later write to the same document before a flush.
+    ``failed`` counts failed store attempts, ``retried`` the failed writes
+    put back for the next flush and ``dead_lettered`` those given up on.
+    """
+
+    writes: int = 0
+    coalesced: int = 0
+    stored: int = 0
+    flushes: int = 0
+    failed: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats["writes_saved_ratio"] = self.coalesced / self.writes if self.writes else 0.0
+        return stats
+
+
+@dataclass
+class _PendingWrite:
+    document: Optional[Document]  # None for a delete
+    partition_key: Optional[str]
+    waiters: List["asyncio.Future[None]"] = field(default_factory=list)
+    attempts: int = 0  # Failed flushes so far
+
+
+class WriteBehindDocumentStore(DocumentStore[T]):
+    """Buffers upserts and deletes in front of a document store.
+
+    Only ``upsert`` and ``delete`` without ``if_match`` are buffered.
+    Other writes, and queries, flush pending writes first so they see a
+    consistent store. Buffered upserts return the document without a new
+    ETag or version, since it has not been stored yet.
+
+    A failed write nobody is waiting on goes back into the buffer, unless
+    a newer write to the document replaced it, and is retried on the next
+    flush. After ``max_attempts`` failures it is moved to
+    ``dead_letters``. Writes with ``FLUSHED`` durability fail their
+    callers instead.
+    """
+
+    def __init__(self, store: DocumentStore[T], policy: WriteBehindPolicy):
+        self.store = store
+        self.policy = policy
+        self.stats = WriteBehindStats()
+        self._pending: "OrderedDict[str, _PendingWrite]" = OrderedDict()
+        # Writes being stored by the current flush, still visible to reads
+        self._flushing: Dict[str, _PendingWrite] = {}
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=policy.max_dead_letters)
+        # Created on first use so they bind to the running event loop
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _buffered(self, id: str, partition_key: Optional[str]) -> Optional[_PendingWrite]:
+        write = self._pending.get(id) or self._flushing.get(id)
+        if write is None or partition_key is None:
+            return write
+        if write.document is not None:
+            return write if write.document.partition_key == partition_key else None
+        return write if write.partition_key in (None, partition_key) else None
+
+    async def _buffer(self, id: str, write: _PendingWrite) -> None:
+        previous = self._pending.pop(id, None)
+        if previous is not None:
+            self.stats.coalesced += 1
+            write.waiters = previous.waiters
+        self._pending[id] = write
+        self.stats.writes += 1
+
+        if self._flusher is None or self._flusher.done():
+            self._wake = asyncio.Event()
+            self._flusher = asyncio.ensure_future(self._flush_loop(self._wake))
+        if len(self._pending) >= self.policy.max_pending:
+            self._wake.set()  # type: ignore[union-attr]
+
+        if self.policy.durability == WriteDurability.FLUSHED:
+            waiter = asyncio.get_running_loop().create_future()
+            write.waiters.append(waiter)
+            await waiter
+
+    async def _flush_loop(self, wake: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), self.policy.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            try:
+                # Shielded so stopping the loop never abandons a flush midway
+                await asyncio.shield(self.flush())
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+
+    async def flush(self) -> int:
+        """Store all pending writes; returns the number of documents written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            self._flushing = dict(self._pending)
+            self._pending = OrderedDict()
+            try:
+                errors = await self._store_writes(self._flushing)
+            finally:
+                writes, self._flushing = self._flushing, {}
+
+            self.stats.flushes += 1
+            self.stats.stored += len(writes) - len(errors)
+            self.stats.failed += len(errors)
+            for id, error in errors.items():
+                if not writes[id].waiters:
+                    self._retry(id, writes[id], error)
+
+        for id, write in writes.items():
+            error = errors.get(id)
+            for waiter in write.waiters:
+                if waiter.done():
+                    continue
+                if error is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(RuntimeError(f"Buffered write to {id} failed: {error}"))
+        return len(writes) - len(errors)
+
+    def _retry(self, id: str, write: _PendingWrite, error: str) -> None:
+        """Put a failed write back in the buffer, or dead-letter it."""
+        if id in self._pending:
+            return  # Replaced by a newer write, which will be stored instead
+        write.attempts += 1
+        if write.attempts < self.policy.max_attempts:
+            self._pending[id] = write
+            self.stats.retried += 1
+            logger.warning(
+                f"Buffered write to {id} failed (attempt {write.attempts}), retrying: {error}"
+            )
+            return
+        self._dead_letter(id, write, error)
+
+    def _dead_letter(self, id: str, write: _PendingWrite, error: str) -> None:
+        self.stats.dead_lettered += 1
+        self.dead_letters.append(
+            {
+                "id": id,
+                "partition_key": write.partition_key,
+                "document": write.document,
+                "attempts": write.attempts,
+                "error": error,
+            }
+        )
+        logger.error(
+            f"Dead-lettered buffered write to {id} after {write.attempts} attempts: {error}"
+        )
+
+    async def _store_writes(self, writes: Dict[str, _PendingWrite]) -> Dict[str, str]:
+        """Write documents in bulk; returns errors by document id."""
+        upserts = [write.document for write in writes.values() if write.document is not None]
+        deletes = [(id, write.partition_key) for id, write in writes.items() if write.document is None]
+
+        errors: Dict[str, str] = {}
+        try:
+            if upserts:
+                result = await self.store.bulk_upsert(upserts)
+                errors.update({item.id: item.error or "Write failed" for item in result.failed})
+        except Exception as e:
+            errors.update({document.id: str(e) for document in upserts})
+        # Deleted one at a time: a missing document would fail a whole
+        # transactional batch, and deleting one that is gone is not a failure
+        outcomes = await asyncio.gather(
+            *(self.store.delete(id, partition_key) for id, partition_key in deletes),
+            return_exceptions=True,
+        )
+        for (id, _), outcome in zip(deletes, outcomes):
+            if isinstance(outcome, Exception):
+                errors[id] = str(outcome)
+        return errors
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush pending writes."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        if self._pending:
+            logger.error(f"{len(self._pending)} buffered writes failed to store before close")
+            pending, self._pending = self._pending, OrderedDict()
+            for id, write in pending.items():
+                self._dead_letter(id, write, "Not stored before close")
+
+    async def upsert(self, document: T, if_match: Optional[str] = None) -> T:
+        """Buffer an upsert; conditional upserts are written immediately."""
+        if if_match is not None:
+            await self.flush()
+            return await self.store.upsert(document, if_match)
+        await self._buffer(
+            document.id, _PendingWrite(copy.deepcopy(document), document.partition_key)
+        )
+        return document
+
+    async def delete(
+        self, id: str, partition_key: Optional[str] = None, if_match: Optional[str] = None
+    ) -> bool:
+        """Buffer a delete; conditional deletes are written immediately.
+
+        A buffered delete returns whether the document existed when it was
+        buffered.
+        """
+        if if_match is not None:
+            await self.flush()
+            return await self.store.delete(id, partition_key, if_match)
+        existed = await self.read(id, partition_key) is not None
+        await self._buffer(id, _PendingWrite(None, partition_key))
+        return existed
+
+    async def read(self, id: str, partition_key: Optional[str] = None) -> Optional[T]:
+        """Read a document, including buffered writes."""
+        write = self._buffered(id, partition_key)
+        if write is not None:
+            return copy.deepcopy(write.document)  # type: ignore[return-value]
+        return await self.store.read(id, partition_key)
+
+    async def read_if_modified(
+        self, id: str, partition_key: Optional[str], etag: Optional[str]
+    ) -> Tuple[bool, Optional[T]]:
+        if self._buffered(id, partition_key) is not None:
+            return True, await self.read(id, partition_key)
+        return await self.store.read_if_modified(id, partition_key, etag)
+
+    async def read_many(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> List[Optional[T]]:
+        unbuffered = [id for id in ids if self._buffered(id, partition_key) is None]
+        stored = dict(zip(unbuffered, await self.store.read_many(unbuffered, partition_key)))
+        return [
+            stored[id] if id in stored else await self.read(id, partition_key) for id in ids
+        ]
+
+    async def create(self, document: T) -> T:
+        """Create a new document."""
+        await self.flush()
+        return await self.store.create(document)
+
+    async def update(self, document: T, if_match: Optional[str] = None) -> T:
+        """Update an existing document."""
+        await self.flush()
+        return await self.store.update(document, if_match)
+
+    async def bulk_upsert(self, documents: List[T]) -> BulkResult[T]:
+        await self.flush()
+        return await self.store.bulk_upsert(documents)
+
+    async def bulk_delete(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> BulkResult[T]:
+        await self.flush()
+        return await self.store.bulk_delete(ids, partition_key)
+
+    async def query(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> List[T]:
+        """Query documents based on criteria."""
+        await self.flush()
+        return await self.store.query(query, partition_key, max_items)
+
+    async def query_page(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        page_size: int = 100,
+        continuation_token: Optional[str] = None,
+    ) -> Page[T]:
+        await self.flush()
+        return await self.store.query_page(query, partition_key, page_size, continuation_token)
+
+    async def list_all(
+        self, partition_key: Optional[str] = None, max_items: Optional[int] = None
+    ) -> List[T]:
+        """List all documents in the store."""
+        await self.flush()
+        return await self.store.list_all(partition_key, max_items)
+
+
+class WriteBehindStorageProvider(StorageProvider):
+    """Storage provider buffering writes to selected containers.
+
+    Only containers listed in ``policies`` are buffered. Closing the
+    provider flushes every buffer before closing the wrapped provider.
+    """
+
+    def __init__(self, provider: StorageProvider, policies: Dict[str, WriteBehindPolicy]):
+        self.provider = provider
+        self.policies = dict(policies)
+        self._stores: Dict[str, WriteBehindDocumentStore] = {}
+
+    def get_document_store(
+        self, container_name: str, document_type: Type[T]
+    ) -> DocumentStore[T]:
+        """Get a document store, buffered if the container has a policy."""
+        policy = self.policies.get(container_name)
+        if policy is None:
+            return self.provider.get_document_store(container_name, document_type)
+
+        if container_name not in self._stores:
+            self._stores[container_name] = WriteBehindDocumentStore(
+                self.provider.get_document_store(container_name, document_type), policy
+            )
+        return self._stores[container_name]
+
+    async def flush(self) -> int:
+        """Flush every container's pending writes."""
+        return sum([await store.flush() for store in self._stores.values()])
+
+    async def initialize(self) -> None:
+        """Initialize the storage provider."""
+        await self.provider.initialize()
+
+    async def close(self) -> None:
+        """Flush pending writes and close storage provider connections."""
+        for name, store in self._stores.items():
+            try:
+                await store.close()
+            except Exception as e:
+                logger.error(f"Failed to flush buffered writes for {name}: {e}")
+        await self.provider.close()
+
+    def declare_indexes(self, container_name: str, fields: List[str]) -> None:
+        self.provider.declare_indexes(container_name, fields)
+
+    async def create_container_if_not_exists(
+        self, container_name: str, partition_key_path: str = "/partition_key"
+    ) -> None:
+        """Create a container/collection if it doesn't exist."""
+        await self.provider.create_container_if_not_exists(container_name, partition_key_path)
+
+    async def delete_container(self, container_name: str) -> None:
+        """Delete a container/collection, dropping its pending writes."""
+        store = self._stores.pop(container_name, None)
+        if store is not None and store._flusher is not None:
+            store._flusher.cancel()
+        await self.provider.delete_container(container_name)
+
+    async def container_exists(self, container_name: str) -> bool:
+        """Check if a container/collection exists."""
+        return await self.provider.container_exists(container_name)
+
+    async def health_check(self) -> HealthCheckResult:
+        return await self.provider.health_check()
+
+    def get_write_behind_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get write-behind counters and pending writes per container."""
+        return {
+            name: {**store.stats.to_dict(), "pending": len(store)}
+            for name, store in self._stores.items()
+        }
+
+    def write_metrics(self, writer: Any) -> None:
+        """Add per-container write-behind metrics to a ``PrometheusWriter``."""
+        stats = self.get_write_behind_stats()
+        for counter in (
+            "writes", "coalesced", "stored", "flushes", "failed", "retried", "dead_lettered"
+        ):
+            writer.counter(
+                f"lightning_storage_write_behind_{counter}_total",
+                f"Write-behind {counter} per container",
+                [({"container": name}, container[counter]) for name, container in stats.items()],
+            )
+        writer.gauge(
+            "lightning_storage_write_behind_pending",
+            "Buffered writes not yet stored per container",
+            [({"container": name}, container["pending"]) for name, container in stats.items()],
+        )
+        writer.gauge(
+            "lightning_storage_write_behind_saved_ratio",
+            "Share of writes coalesced away per container",
+            [
+                ({"container": name}, container["writes_saved_ratio"])
+                for name, container in stats.items()
+            ],
+        )
+        if hasattr(self.provider, "write_metrics"):
+            self.provider.write_metrics(writer)
@@ -12,7 +12,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import json
@@ -26,6 +26,10 @@ from lightning_core.abstractions import (
     ExecutionMode,
     RuntimeConfig,
 )
+from lightning_core.abstractions.storage import (
+    decode_continuation_token,
+    encode_continuation_token,
+)
 from lightning_core.runtime import get_runtime, initialize_runtime
 from lightning_core.vextir_os.driver_initialization import (
     configure_drivers_for_environment,
@@ -330,6 +334,22 @@ async def health_check():
     )
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Event processing metrics in Prometheus text format."""
+    from lightning_core.vextir_os.metrics import PrometheusWriter
+    from lightning_core.vextir_os.universal_processor import get_universal_processor
+
+    content = get_universal_processor().get_prometheus_metrics()
+    storage = getattr(runtime, "_storage", None) if runtime else None
+    if storage is not None and hasattr(storage, "write_metrics"):
+        writer = PrometheusWriter()
+        storage.write_metrics(writer)
+        content += writer.render()
+
+    return Response(content=content, media_type=PrometheusWriter.CONTENT_TYPE)
+
+
 # Event endpoints
 @app.post("/api/events", response_model=EventResponse)
 async def submit_event(event_req: EventRequest):
@@ -769,28 +789,29 @@ async def get_notifications(request: Request):
 # Driver endpoints
 @app.get("/api/drivers")
 async def get_drivers():
-    """Get registered drivers."""
+    """Get registered drivers with status, breaker state and startup time."""
     try:
         from lightning_core.vextir_os.registries import get_driver_registry
 
         registry = get_driver_registry()
         drivers = []
 
-        for driver_id in registry._drivers:
-            driver = await registry.get_driver(driver_id)
-            manifest = registry._manifests.get(driver_id)
-            if manifest:
-                drivers.append(
-                    {
-                        "id": driver_id,
-                        "name": manifest.name,
-                        "description": manifest.description,
-                        "version": manifest.version,
-                        "type": manifest.driver_type,
-                    }
-                )
+        for status in registry.list_drivers():
+            manifest = registry.manifests[status["id"]]
+            drivers.append(
+                {
+                    **status,
+                    "description": manifest.description,
+                    "version": manifest.version,
+                    "dependencies": manifest.dependencies,
+                }
+            )
 
-        return {"drivers": drivers, "total": len(drivers)}
+        return {
+            "drivers": drivers,
+            "total": len(drivers),
+            "startup_ms": registry.get_startup_report(),
+        }
 
     except Exception as e:
         logger.error(f"Failed to get drivers: {e}")
@@ -1080,8 +1101,17 @@ for instr in test_instructions:
     instructions_storage[instr["id"]] = instr
 
 @app.get("/api/instructions", response_model=List[InstructionResponse])
-async def list_instructions(request: Request):
-    """Get list of user instructions."""
+async def list_instructions(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    """Get list of user instructions.
+
+    With ``limit`` or ``cursor`` the list is paged in id order and the
+    cursor for the next page is returned in the ``X-Next-Cursor`` header.
+    """
     try:
         # Get user ID from header or use default
         user_id = request.headers.get("X-User-ID", "local-user")
@@ -1091,9 +1121,27 @@ async def list_instructions(request: Request):
             instr for instr in instructions_storage.values()
             if instr.get("user_id") == user_id
         ]
+        if limit is None and cursor is None:
+            return user_instructions
+
+        page_size = max(1, min(limit or 100, 1000))
+        try:
+            after = decode_continuation_token(cursor).get("after", "") if cursor else ""
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        remaining = sorted(
+            (instr for instr in user_instructions if instr["id"] > after),
+            key=lambda instr: instr["id"],
+        )
+        page = remaining[:page_size]
+        if len(remaining) > page_size:
+            response.headers["X-Next-Cursor"] = encode_continuation_token(
+                {"after": page[-1]["id"]}
+            )
+        return page
         
-        return user_instructions
-        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to list instructions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
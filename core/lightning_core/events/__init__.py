@@ -2,6 +2,7 @@
 Unified Event System for Lightning Core
 """
 
+from .factory import EventFactory, get_event_factory
 from .models import (
     BaseEvent,
     ExternalEvent,
@@ -15,6 +16,8 @@ from .types import EventCategory, EventType, ExternalEventType, ScheduleType
 __all__ = [
     "EventRegistry",
     "EventDefinition",
+    "EventFactory",
+    "get_event_factory",
     "EventType",
     "EventCategory",
     "ScheduleType",
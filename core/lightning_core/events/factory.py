@@ -0,0 +1,118 @@
+"""
+Typed event factory mapping event types to event classes
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .models import (
+    BaseEvent,
+    CalendarEvent,
+    EmailEvent,
+    EventSpec,
+    LLMChatEvent,
+    get_event_spec,
+    make_event_spec,
+)
+
+
+class EventFactory:
+    """Builds typed events from dictionaries by event type
+
+    Classes are registered for an exact event type, or for a dotted prefix
+    (``register("llm", cls, prefix=True)`` covers ``llm.chat.stream``). The
+    class chosen for each event type is cached, as are each class's field
+    set and converters, so conversion is a dict lookup plus construction.
+    Converters given to ``register`` only apply to events built by this
+    factory; ``BaseEvent.from_dict`` keeps the default converters.
+    """
+
+    def __init__(self, default_class: type = BaseEvent, max_cached_types: int = 1024):
+        self.default_class = default_class
+        self.max_cached_types = max_cached_types
+        self._exact: Dict[str, type] = {}
+        self._prefixes: Dict[str, type] = {}
+        self._resolved: Dict[str, type] = {}
+        # Specs for classes registered with custom converters
+        self._specs: Dict[type, EventSpec] = {}
+
+    def register(
+        self,
+        event_type: str,
+        event_class: type,
+        prefix: bool = False,
+        converters: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    ):
+        """Register the event class used for an event type or type prefix"""
+        if not issubclass(event_class, BaseEvent):
+            raise TypeError(f"{event_class.__name__} is not a BaseEvent subclass")
+
+        if prefix:
+            self._prefixes[event_type.rstrip(".")] = event_class
+        else:
+            self._exact[event_type] = event_class
+
+        if converters is not None:
+            self._specs[event_class] = make_event_spec(event_class, converters)
+        else:
+            self._specs.pop(event_class, None)
+            get_event_spec(event_class)
+        self._resolved.clear()
+
+    def unregister(self, event_type: str, prefix: bool = False):
+        """Remove a registration"""
+        registrations = self._prefixes if prefix else self._exact
+        registrations.pop(event_type.rstrip(".") if prefix else event_type, None)
+        self._resolved.clear()
+
+    def resolve(self, event_type: str) -> type:
+        """Get the event class for an event type"""
+        event_class = self._resolved.get(event_type)
+        if event_class is not None:
+            return event_class
+
+        event_class = self._exact.get(event_type)
+        if event_class is None:
+            # Longest registered dotted prefix wins
+            candidate = event_type
+            while "." in candidate and event_class is None:
+                candidate = candidate.rsplit(".", 1)[0]
+                event_class = self._prefixes.get(candidate)
+            if event_class is None:
+                event_class = self._prefixes.get(event_type, self.default_class)
+
+        if len(self._resolved) >= self.max_cached_types:
+            self._resolved.clear()
+        self._resolved[event_type] = event_class
+        return event_class
+
+    def from_dict(self, data: Dict[str, Any]) -> BaseEvent:
+        """Create a typed event from a dictionary"""
+        event_class = self.resolve(data.get("type", "unknown"))
+        spec = self._specs.get(event_class) or get_event_spec(event_class)
+        return spec.build(data)
+
+    def get_registrations(self) -> Dict[str, Tuple[str, bool]]:
+        """Get registered event types with their class names and prefix flag"""
+        registrations = {t: (c.__name__, False) for t, c in self._exact.items()}
+        registrations.update({t: (c.__name__, True) for t, c in self._prefixes.items()})
+        return registrations
+
+
+def _create_default_factory() -> EventFactory:
+    factory = EventFactory()
+    factory.register("llm.chat", LLMChatEvent)
+    factory.register("email", EmailEvent)
+    factory.register("calendar", CalendarEvent)
+    return factory
+
+
+# Global event factory
+_global_event_factory: Optional[EventFactory] = None
+
+
+def get_event_factory() -> EventFactory:
+    """Get global event factory instance"""
+    global _global_event_factory
+    if _global_event_factory is None:
+        _global_event_factory = _create_default_factory()
+    return _global_event_factory
@@ -3,9 +3,9 @@ Unified event models for both planner and vextir_os
 """
 
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, FrozenSet, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field, constr
 
@@ -23,6 +23,69 @@ class PlannerEventModel(BaseModel):
     description: Optional[str] = None
 
 
+def _parse_timestamp(value: Any) -> Any:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value
+
+
+def _parse_category(value: Any) -> Any:
+    if isinstance(value, str):
+        return EventCategory(value)
+    return value
+
+
+# Converters applied by from_dict to fields present in the input
+DEFAULT_FIELD_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    'timestamp': _parse_timestamp,
+    'category': _parse_category,
+}
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    """Precomputed construction details for an event class"""
+
+    event_class: type
+    field_names: FrozenSet[str]
+    converters: Dict[str, Callable[[Any], Any]]
+
+    def build(self, data: Dict[str, Any]) -> "BaseEvent":
+        """Construct an event from a dictionary, ignoring unknown keys"""
+        field_names = self.field_names
+        kwargs = {k: v for k, v in data.items() if k in field_names}
+        for name, convert in self.converters.items():
+            if name in kwargs:
+                kwargs[name] = convert(kwargs[name])
+        return self.event_class(**kwargs)
+
+
+_event_specs: Dict[type, EventSpec] = {}
+
+
+def make_event_spec(
+    event_class: type,
+    converters: Optional[Dict[str, Callable[[Any], Any]]] = None,
+) -> EventSpec:
+    """Compute a spec for an event class, merging ``converters`` over the
+    default converters for the class's fields"""
+    field_names = frozenset(f.name for f in fields(event_class))
+    merged = {**DEFAULT_FIELD_CONVERTERS, **(converters or {})}
+    return EventSpec(
+        event_class=event_class,
+        field_names=field_names,
+        converters={k: v for k, v in merged.items() if k in field_names},
+    )
+
+
+def get_event_spec(event_class: type) -> EventSpec:
+    """Get the shared default spec for an event class, computing it on first use"""
+    spec = _event_specs.get(event_class)
+    if spec is None:
+        spec = _event_specs[event_class] = make_event_spec(event_class)
+    return spec
+
+
 # Dataclass models for runtime events (vextir_os style)
 @dataclass
 class BaseEvent:
@@ -46,22 +109,8 @@ class BaseEvent:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "BaseEvent":
         """Create event from dictionary."""
-        # Get valid field names for this class
-        import inspect
-        valid_fields = {f.name for f in cls.__dataclass_fields__.values()}
-        
-        # Filter data to only include valid fields
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
-        
-        # Handle timestamp conversion
-        if 'timestamp' in filtered_data and isinstance(filtered_data['timestamp'], str):
-            filtered_data['timestamp'] = datetime.fromisoformat(filtered_data['timestamp'].replace('Z', '+00:00'))
-        
-        # Handle category conversion
-        if 'category' in filtered_data and isinstance(filtered_data['category'], str):
-            filtered_data['category'] = EventCategory(filtered_data['category'])
-            
-        return cls(**filtered_data)
+        # Field names and converters are computed once per class
+        return get_event_spec(cls).build(data)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary."""
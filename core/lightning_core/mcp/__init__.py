@@ -6,7 +6,7 @@ for agents in the Lightning ecosystem.
 
 from .client import MCPClient, MCPConnectionType, MCPTool
 from .registry import MCPRegistry, MCPServerConfig
-from .proxy import MCPSecurityProxy, ValidationResult
+from .proxy import MCPSecurityProxy, RateLimitDecision, RateLimiter, ValidationResult
 from .sandbox import MCPSandbox, SandboxConfig, SANDBOX_PRESETS
 from .adapter import MCPToolAdapter, MCPToolRegistry
 from .drivers import MCPDriver
@@ -19,6 +19,8 @@ __all__ = [
     "MCPServerConfig",
     "MCPSecurityProxy",
     "ValidationResult",
+    "RateLimiter",
+    "RateLimitDecision",
     "MCPSandbox",
     "SandboxConfig",
     "SANDBOX_PRESETS",
@@ -1,13 +1,14 @@
 """Security proxy for MCP tool calls."""
 
-import asyncio
 import json
+import time
 from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Deque, Tuple
 import logging
 
+from ..vextir_os.metrics import LatencyHistogram
 from ..vextir_os.security import SecurityManager, SecurityContext
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,7 @@ class ValidationResult:
     reason: Optional[str] = None
     restrictions: Optional[Dict[str, Any]] = None
     sanitized_parameters: Optional[Dict[str, Any]] = None
+    retry_after: Optional[float] = None  # Seconds to wait when rate limited
 
 
 @dataclass
@@ -34,41 +36,173 @@ class MCPCallRecord:
     reason: Optional[str] = None
     execution_time_ms: Optional[int] = None
     result_size_bytes: Optional[int] = None
+    error: bool = False  # Validation failed with an error rather than a denial
+
+
+@dataclass
+class CallAggregate:
+    """Running counts and latency histogram for one agent, server or tool."""
+    total: int = 0
+    blocked: int = 0
+    errors: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def record(self, record: MCPCallRecord, seconds: Optional[float]) -> None:
+        self.total += 1
+        if not record.allowed:
+            self.blocked += 1
+        if record.error:
+            self.errors += 1
+        if seconds is not None:
+            self.latency.record(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "blocked": self.blocked,
+            "errors": self.errors,
+            "error_rate": self.errors / self.total if self.total else 0,
+            "avg_execution_time_ms": self.latency.mean * 1000,
+            "latency": self.latency.summary(),
+        }
+
+
+class CallStatistics:
+    """Incrementally maintained call statistics with bounded cardinality.
+
+    Each grouping keeps at most ``max_keys`` entries; further agents,
+    servers or tools are counted under a shared ``_other`` entry.
+    """
+
+    OVERFLOW_KEY = "_other"
+
+    def __init__(self, max_keys: int = 500):
+        self.max_keys = max_keys
+        self.overall = CallAggregate()
+        self.groups: Dict[str, Dict[str, CallAggregate]] = {
+            "agents": {}, "servers": {}, "tools": {},
+        }
+        self.first_call: Optional[datetime] = None
+        self.last_call: Optional[datetime] = None
+
+    def _aggregate(self, group: str, key: str) -> CallAggregate:
+        aggregates = self.groups[group]
+        aggregate = aggregates.get(key)
+        if aggregate is None:
+            if len(aggregates) >= self.max_keys:
+                key = self.OVERFLOW_KEY
+                aggregate = aggregates.get(key)
+            if aggregate is None:
+                aggregate = aggregates[key] = CallAggregate()
+        return aggregate
+
+    def record(self, record: MCPCallRecord, seconds: Optional[float] = None) -> None:
+        self.overall.record(record, seconds)
+        self._aggregate("agents", record.agent_id).record(record, seconds)
+        self._aggregate("servers", record.server_id).record(record, seconds)
+        self._aggregate("tools", record.tool_name).record(record, seconds)
+        if self.first_call is None:
+            self.first_call = record.timestamp
+        self.last_call = record.timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        overall = self.overall
+        stats = {
+            "total_calls": overall.total,
+            "blocked_calls": overall.blocked,
+            "block_rate": overall.blocked / overall.total if overall.total else 0,
+            "error_rate": overall.errors / overall.total if overall.total else 0,
+            "latency": overall.latency.summary(),
+        }
+        for group, aggregates in self.groups.items():
+            stats[group] = {key: aggregate.to_dict() for key, aggregate in aggregates.items()}
+        if self.first_call is not None:
+            stats["time_range"] = {
+                "start": self.first_call.isoformat(),
+                "end": self.last_call.isoformat(),
+            }
+        return stats
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+    allowed: bool
+    retry_after: float = 0.0  # Seconds until a call would be allowed
+    remaining: int = 0  # Calls still allowed right now
 
 
 class RateLimiter:
-    """Rate limiter for MCP tool calls."""
-    
-    def __init__(self):
-        self.call_history: Dict[str, Deque[datetime]] = {}
-        self._lock = asyncio.Lock()
-    
+    """GCRA (token bucket) rate limiter for MCP tool calls.
+
+    Each (key, window) keeps a single theoretical arrival time, so state is
+    O(1) per key regardless of call rate. ``max_calls`` per
+    ``window_seconds`` sets the sustained rate and ``burst`` (default
+    ``max_calls``) how many calls may arrive back to back. Checks never
+    await, so they are atomic on the event loop without a lock. A key whose
+    bucket has fully refilled holds no information and is swept after
+    ``idle_expiry_seconds``.
+    """
+
+    def __init__(self, idle_expiry_seconds: float = 300.0):
+        self._tat: Dict[Tuple[str, float], float] = {}
+        self.idle_expiry_seconds = idle_expiry_seconds
+        self._next_sweep: Optional[float] = None
+
+    def acquire(self,
+                key: str,
+                max_calls: int,
+                window_seconds: float,
+                burst: Optional[int] = None,
+                cost: int = 1,
+                now: Optional[float] = None) -> RateLimitDecision:
+        """Take ``cost`` calls from a key's bucket if they are available."""
+        now = time.monotonic() if now is None else now
+        if self._next_sweep is None:
+            self._next_sweep = now + self.idle_expiry_seconds
+        elif now >= self._next_sweep:
+            self._expire_idle(now)
+
+        interval = window_seconds / max_calls
+        capacity = interval * (burst or max_calls)
+        state_key = (key, window_seconds)
+        tat = max(self._tat.get(state_key, now), now)
+        new_tat = tat + interval * cost
+        allow_at = new_tat - capacity
+
+        if allow_at > now:
+            return RateLimitDecision(allowed=False, retry_after=allow_at - now)
+
+        self._tat[state_key] = new_tat
+        return RateLimitDecision(allowed=True, remaining=int((now - allow_at) / interval))
+
+    async def check(self,
+                    key: str,
+                    max_calls: int,
+                    window_seconds: float,
+                    burst: Optional[int] = None) -> RateLimitDecision:
+        """Take one call from a key's bucket.
+
+        Backends that share limits across processes override this.
+        """
+        return self.acquire(key, max_calls, window_seconds, burst)
+
     async def check_rate_limit(self,
-                              key: str,
-                              max_calls: int,
-                              window_seconds: int) -> bool:
+                               key: str,
+                               max_calls: int,
+                               window_seconds: int) -> bool:
         """Check if a call is within rate limits."""
-        async with self._lock:
-            now = datetime.utcnow()
-            cutoff = now - timedelta(seconds=window_seconds)
-            
-            # Get or create history for this key
-            if key not in self.call_history:
-                self.call_history[key] = deque()
-            
-            history = self.call_history[key]
-            
-            # Remove old entries
-            while history and history[0] < cutoff:
-                history.popleft()
-            
-            # Check limit
-            if len(history) >= max_calls:
-                return False
-            
-            # Add current call
-            history.append(now)
-            return True
+        return (await self.check(key, max_calls, window_seconds)).allowed
+
+    def _expire_idle(self, now: float) -> None:
+        """Drop keys whose buckets have been full for the expiry period."""
+        cutoff = now - self.idle_expiry_seconds
+        for state_key in [k for k, tat in self._tat.items() if tat <= cutoff]:
+            del self._tat[state_key]
+        self._next_sweep = now + self.idle_expiry_seconds
+
+    def __len__(self) -> int:
+        return len(self._tat)
 
 
 class ParameterSanitizer:
@@ -134,11 +268,15 @@ class ParameterSanitizer:
 class MCPSecurityProxy:
     """Security proxy that intercepts and validates all MCP tool calls."""
     
-    def __init__(self, security_manager: SecurityManager):
+    def __init__(self,
+                 security_manager: SecurityManager,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 history_size: int = 10000):
         self.security_manager = security_manager
-        self.rate_limiter = RateLimiter()
-        self.call_history: Deque[MCPCallRecord] = deque(maxlen=10000)
-        self._lock = asyncio.Lock()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        # Ring buffer of recent calls; statistics cover every call since start
+        self.call_history: Deque[MCPCallRecord] = deque(maxlen=history_size)
+        self.statistics = CallStatistics()
         
         # Default rate limits
         self.default_rate_limits = {
@@ -203,7 +341,7 @@ class MCPSecurityProxy:
             logger.error(f"Error validating MCP tool call: {e}")
             await self._record_call(
                 agent_id, server_id, tool_name, parameters,
-                allowed=False, reason=str(e), start_time=start_time
+                allowed=False, reason=str(e), start_time=start_time, error=True
             )
             return ValidationResult(allowed=False, reason=f"Validation error: {e}")
     
@@ -212,32 +350,25 @@ class MCPSecurityProxy:
                                server_id: str,
                                tool_name: str) -> ValidationResult:
         """Check rate limits for the tool call."""
-        # Check per-agent limits
-        agent_key = f"agent:{agent_id}"
-        if not await self.rate_limiter.check_rate_limit(
-            agent_key, self.default_rate_limits["per_minute"], 60
-        ):
-            return ValidationResult(allowed=False, reason="Agent rate limit exceeded (per minute)")
-        
-        if not await self.rate_limiter.check_rate_limit(
-            agent_key, self.default_rate_limits["per_hour"], 3600
-        ):
-            return ValidationResult(allowed=False, reason="Agent rate limit exceeded (per hour)")
-        
-        # Check per-server limits
-        server_key = f"server:{server_id}"
-        if not await self.rate_limiter.check_rate_limit(
-            server_key, self.default_rate_limits["per_minute"] * 2, 60
-        ):
-            return ValidationResult(allowed=False, reason="Server rate limit exceeded")
-        
-        # Check per-tool limits (more restrictive for certain tools)
+        limits = self.default_rate_limits
+        checks = [
+            (f"agent:{agent_id}", limits["per_minute"], 60,
+             "Agent rate limit exceeded (per minute)"),
+            (f"agent:{agent_id}", limits["per_hour"], 3600,
+             "Agent rate limit exceeded (per hour)"),
+            (f"server:{server_id}", limits["per_minute"] * 2, 60,
+             "Server rate limit exceeded"),
+        ]
+        # Per-tool limits (more restrictive for certain tools)
         if tool_name in ["execute_command", "write_file", "delete_file"]:
-            tool_key = f"tool:{tool_name}"
-            if not await self.rate_limiter.check_rate_limit(tool_key, 10, 60):
+            checks.append((f"tool:{tool_name}", 10, 60,
+                           f"Rate limit exceeded for sensitive tool: {tool_name}"))
+
+        for key, max_calls, window_seconds, reason in checks:
+            decision = await self.rate_limiter.check(key, max_calls, window_seconds)
+            if not decision.allowed:
                 return ValidationResult(
-                    allowed=False,
-                    reason=f"Rate limit exceeded for sensitive tool: {tool_name}"
+                    allowed=False, reason=reason, retry_after=decision.retry_after
                 )
         
         return ValidationResult(allowed=True)
@@ -323,12 +454,14 @@ class MCPSecurityProxy:
                          parameters: Dict[str, Any],
                          allowed: bool,
                          reason: Optional[str] = None,
-                         start_time: Optional[datetime] = None) -> None:
+                         start_time: Optional[datetime] = None,
+                         error: bool = False) -> None:
         """Record a tool call for auditing."""
         if start_time:
-            execution_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            seconds = (datetime.utcnow() - start_time).total_seconds()
+            execution_time_ms = int(seconds * 1000)
         else:
-            execution_time_ms = None
+            seconds = execution_time_ms = None
         
         record = MCPCallRecord(
             timestamp=datetime.utcnow(),
@@ -339,10 +472,11 @@ class MCPSecurityProxy:
             allowed=allowed,
             reason=reason,
             execution_time_ms=execution_time_ms,
+            error=error,
         )
         
-        async with self._lock:
-            self.call_history.append(record)
+        self.call_history.append(record)
+        self.statistics.record(record, seconds)
         
         # Log significant events
         if not allowed:
@@ -360,89 +494,21 @@ class MCPSecurityProxy:
                              agent_id: Optional[str] = None,
                              server_id: Optional[str] = None,
                              limit: int = 100) -> List[MCPCallRecord]:
-        """Get call history with optional filtering."""
-        async with self._lock:
-            history = list(self.call_history)
-        
-        # Filter by agent
-        if agent_id:
-            history = [r for r in history if r.agent_id == agent_id]
+        """Get recent call history with optional filtering."""
+        history = []
+        for record in reversed(self.call_history):
+            if len(history) >= limit:
+                break
+            if agent_id and record.agent_id != agent_id:
+                continue
+            if server_id and record.server_id != server_id:
+                continue
+            history.append(record)
         
-        # Filter by server
-        if server_id:
-            history = [r for r in history if r.server_id == server_id]
-        
-        # Return most recent
-        return history[-limit:]
+        # Oldest first
+        history.reverse()
+        return history
     
     async def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics about MCP tool usage."""
-        async with self._lock:
-            history = list(self.call_history)
-        
-        if not history:
-            return {
-                "total_calls": 0,
-                "blocked_calls": 0,
-                "agents": {},
-                "servers": {},
-                "tools": {},
-            }
-        
-        # Calculate statistics
-        total_calls = len(history)
-        blocked_calls = sum(1 for r in history if not r.allowed)
-        
-        # Per-agent stats
-        agent_stats = {}
-        for record in history:
-            if record.agent_id not in agent_stats:
-                agent_stats[record.agent_id] = {
-                    "total": 0,
-                    "blocked": 0,
-                    "avg_execution_time_ms": 0,
-                }
-            
-            stats = agent_stats[record.agent_id]
-            stats["total"] += 1
-            if not record.allowed:
-                stats["blocked"] += 1
-            if record.execution_time_ms:
-                # Running average
-                stats["avg_execution_time_ms"] = (
-                    (stats["avg_execution_time_ms"] * (stats["total"] - 1) + 
-                     record.execution_time_ms) / stats["total"]
-                )
-        
-        # Per-server stats
-        server_stats = {}
-        for record in history:
-            if record.server_id not in server_stats:
-                server_stats[record.server_id] = {"total": 0, "blocked": 0}
-            
-            server_stats[record.server_id]["total"] += 1
-            if not record.allowed:
-                server_stats[record.server_id]["blocked"] += 1
-        
-        # Per-tool stats
-        tool_stats = {}
-        for record in history:
-            if record.tool_name not in tool_stats:
-                tool_stats[record.tool_name] = {"total": 0, "blocked": 0}
-            
-            tool_stats[record.tool_name]["total"] += 1
-            if not record.allowed:
-                tool_stats[record.tool_name]["blocked"] += 1
-        
-        return {
-            "total_calls": total_calls,
-            "blocked_calls": blocked_calls,
-            "block_rate": blocked_calls / total_calls if total_calls > 0 else 0,
-            "agents": agent_stats,
-            "servers": server_stats,
-            "tools": tool_stats,
-            "time_range": {
-                "start": history[0].timestamp.isoformat(),
-                "end": history[-1].timestamp.isoformat(),
-            }
-        }
\ No newline at end of file
+        """Get statistics about MCP tool usage since the proxy started."""
+        return self.statistics.to_dict()
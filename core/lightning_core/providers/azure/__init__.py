@@ -2,7 +2,6 @@
 Azure provider implementations for Lightning Core.
 """
 
-from .container_runtime import ACIContainerRuntime
 from .event_bus import ServiceBusEventBus
 from .serverless import AzureFunctionsRuntime
 from .storage import CosmosStorageProvider
@@ -10,6 +9,5 @@ from .storage import CosmosStorageProvider
 __all__ = [
     "CosmosStorageProvider",
     "ServiceBusEventBus",
-    "ACIContainerRuntime",
     "AzureFunctionsRuntime",
 ]
@@ -0,0 +1,72 @@
+"""
+Azure Blob Storage implementation of BlobStore.
+"""
+
+from typing import Any, List, Optional
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob.aio import BlobServiceClient
+
+from lightning_core.abstractions.blob_storage import BlobStore
+
+
+class AzureBlobStore(BlobStore):
+    """Blob store backed by one Azure Blob Storage container."""
+
+    def __init__(
+        self,
+        connection_string: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        key: Optional[str] = None,
+        container: str = "lightning-blobs",
+        **kwargs: Any,
+    ):
+        if connection_string:
+            self._service = BlobServiceClient.from_connection_string(connection_string)
+        elif endpoint:
+            self._service = BlobServiceClient(endpoint, credential=key)
+        else:
+            raise ValueError("Azure Blob Storage requires a connection string or endpoint")
+        self._container = self._service.get_container_client(container)
+        self._container_ready = False
+
+    async def _ensure_container(self) -> None:
+        if self._container_ready:
+            return
+        try:
+            await self._container.create_container()
+        except ResourceExistsError:
+            pass
+        self._container_ready = True
+
+    async def put(self, key: str, data: bytes) -> None:
+        """Store a blob, replacing any blob with the same key."""
+        await self._ensure_container()
+        await self._container.upload_blob(key, data, overwrite=True)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a blob, or None if it does not exist."""
+        try:
+            downloader = await self._container.download_blob(key)
+            return await downloader.readall()
+        except ResourceNotFoundError:
+            return None
+
+    async def delete(self, key: str) -> bool:
+        """Delete a blob; returns whether it existed."""
+        try:
+            await self._container.delete_blob(key)
+            return True
+        except ResourceNotFoundError:
+            return False
+
+    async def list_keys(self, prefix: str = "") -> List[str]:
+        """List the keys starting with ``prefix``."""
+        try:
+            return [blob.name async for blob in self._container.list_blobs(name_starts_with=prefix)]
+        except ResourceNotFoundError:
+            return []
+
+    async def close(self) -> None:
+        """Close blob storage connections."""
+        await self._service.close()
@@ -0,0 +1,451 @@
+"""
+In-process fake of the asynchronous Cosmos DB client.
+
+Implements the subset of ``azure.cosmos.aio`` used by
+``CosmosStorageProvider``: databases, containers, point operations,
+transactional batches and the parameterized queries the document store
+generates, with continuation-token paging. Errors are raised as the real
+``azure.cosmos.exceptions`` types.
+
+Containers can inject latency and throttling, and they count concurrent
+requests, so concurrency limits and retry-after handling can be tested
+without an account or the emulator.
+"""
+
+import asyncio
+import base64
+import json
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from azure.core import MatchConditions
+from azure.cosmos import exceptions
+
+_PATH = r"c(?:\.\w+)+"
+_CONDITIONS = [
+    (re.compile(rf"^({_PATH}) (=|!=|<=|>=|<|>) (@\w+)$"), "compare"),
+    (re.compile(rf"^ARRAY_CONTAINS\((@\w+), ({_PATH})\)$"), "in"),
+    (re.compile(rf"^STARTSWITH\(({_PATH}), (@\w+)\)$"), "prefix"),
+    (re.compile(rf"^(NOT )?IS_DEFINED\(({_PATH})\)$"), "defined"),
+]
+_QUERY = re.compile(
+    r"^SELECT (?P<select>.+?) FROM c(?: WHERE (?P<where>.+?))?(?: ORDER BY (?P<order>.+?))?"
+    r"(?: OFFSET (?P<offset>\d+) LIMIT (?P<limit>\d+))?$"
+)
+_SELECT = re.compile(rf"^({_PATH})(?: AS (\w+))?$")
+_ORDER = re.compile(rf"^({_PATH}) (ASC|DESC)$")
+_COMPARE = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+_UNDEFINED = object()
+
+
+def _throttled(retry_after_ms: int) -> exceptions.CosmosHttpResponseError:
+    error = exceptions.CosmosHttpResponseError(status_code=429, message="Request rate is large")
+    error.headers = {"x-ms-retry-after-ms": str(retry_after_ms)}
+    return error
+
+
+def _resolve(item: Dict[str, Any], path: str) -> Any:
+    value: Any = item
+    for part in path.split(".")[1:]:  # Drop the leading "c"
+        if not isinstance(value, dict) or part not in value:
+            return _UNDEFINED
+        value = value[part]
+    return value
+
+
+def _type_rank(value: Any) -> int:
+    # Cosmos DB only compares values of the same type
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    return 4
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    # Comparing undefined or mismatched types is undefined, which never matches
+    if left is _UNDEFINED or _type_rank(left) != _type_rank(right):
+        return False
+    if _type_rank(left) == 4 and op not in ("=", "!="):
+        return False
+    return _COMPARE[op](left, right)
+
+
+def _compile_condition(condition: str, values: Dict[str, Any]):
+    for pattern, kind in _CONDITIONS:
+        parsed = pattern.match(condition.strip())
+        if not parsed:
+            continue
+        if kind == "compare":
+            path, op, param = parsed.groups()
+            return lambda item: _compare(op, _resolve(item, path), values[param])
+        if kind == "in":
+            param, path = parsed.groups()
+            return lambda item: _resolve(item, path) in values[param]
+        if kind == "prefix":
+            path, param = parsed.groups()
+            return lambda item: isinstance(_resolve(item, path), str) and _resolve(
+                item, path
+            ).startswith(values[param])
+        negated, path = parsed.groups()
+        return lambda item: (_resolve(item, path) is _UNDEFINED) == bool(negated)
+    raise NotImplementedError(f"Condition not supported by the fake: {condition}")
+
+
+def _compile_select(select: str):
+    if select == "*":
+        return dict
+    columns = []
+    for column in select.split(", "):
+        parsed = _SELECT.match(column)
+        if not parsed:
+            raise NotImplementedError(f"Projection not supported by the fake: {column}")
+        path, alias = parsed.groups()
+        columns.append((path, alias or path.rsplit(".", 1)[-1]))
+
+    def project(item: Dict[str, Any]) -> Dict[str, Any]:
+        values = ((name, _resolve(item, path)) for path, name in columns)
+        return {name: value for name, value in values if value is not _UNDEFINED}
+
+    return project
+
+
+def _compile_order(order: Optional[str]):
+    keys = []
+    for term in order.split(", ") if order else []:
+        parsed = _ORDER.match(term)
+        if not parsed:
+            raise NotImplementedError(f"ORDER BY not supported by the fake: {term}")
+        keys.append((parsed.group(1), parsed.group(2) == "DESC"))
+
+    def sort(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Like Cosmos DB, documents missing an ordered field are left out
+        items = [i for i in items if all(_resolve(i, path) is not _UNDEFINED for path, _ in keys)]
+        for path, descending in reversed(keys):
+            items.sort(
+                key=lambda i: (_type_rank(_resolve(i, path)), _resolve(i, path)),
+                reverse=descending,
+            )
+        return items
+
+    return sort
+
+
+def _compile_query(query: str, parameters: List[Dict[str, Any]]):
+    """Compile the SQL subset emitted by CosmosDocumentStore.
+
+    Returns a filter, a sort, a projection, and the offset and limit.
+    """
+    match = _QUERY.match(" ".join(query.split()))
+    if not match:
+        raise NotImplementedError(f"Query not supported by the fake: {query}")
+    values = {p["name"]: p["value"] for p in parameters}
+
+    where = match.group("where")
+    checks = [_compile_condition(condition, values) for condition in where.split(" AND ")] if where else []
+
+    offset = int(match.group("offset") or 0)
+    limit = int(match.group("limit")) if match.group("limit") else None
+    return (
+        (lambda item: all(check(item) for check in checks)),
+        _compile_order(match.group("order")),
+        _compile_select(match.group("select")),
+        offset,
+        limit,
+    )
+
+
+class FakeItemPaged:
+    """Async iterable of query results supporting ``by_page``."""
+
+    def __init__(self, items: List[Dict[str, Any]], page_size: int, container: "FakeContainer"):
+        self._items = items
+        self._page_size = page_size
+        self._container = container
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        async for page in self.by_page():
+            async for item in page:
+                yield item
+
+    def by_page(self, continuation_token: Optional[str] = None) -> "FakePageIterator":
+        return FakePageIterator(self, continuation_token)
+
+
+class FakePageIterator:
+    """Pages of a query; ``continuation_token`` resumes after the last page read."""
+
+    def __init__(self, paged: FakeItemPaged, continuation_token: Optional[str]):
+        self._paged = paged
+        self._start = int(base64.b64decode(continuation_token)) if continuation_token else 0
+        self._done = False
+        self.continuation_token: Optional[str] = None
+
+    def __aiter__(self) -> "FakePageIterator":
+        return self
+
+    async def __anext__(self) -> "_AsyncList":
+        if self._done:
+            raise StopAsyncIteration
+        paged = self._paged
+        async with paged._container._request():
+            chunk = paged._items[self._start : self._start + paged._page_size]
+        self._start += paged._page_size
+        if self._start < len(paged._items):
+            self.continuation_token = base64.b64encode(str(self._start).encode()).decode()
+        else:
+            self.continuation_token = None
+            self._done = True
+        return _AsyncList(chunk)
+
+
+class _AsyncList:
+    def __init__(self, items: List[Dict[str, Any]]):
+        self._items = items
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        for item in self._items:
+            yield item
+
+
+class FakeContainer:
+    """In-memory container with injectable latency and throttling."""
+
+    def __init__(self, id: str, partition_key_path: str = "/partition_key", latency: float = 0.0):
+        self.id = id
+        self.partition_key_field = partition_key_path.lstrip("/")
+        self.latency = latency
+        self.items: Dict[Tuple[Any, str], Dict[str, Any]] = {}
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._throttle_remaining = 0
+        self._throttle_retry_after_ms = 0
+        self.throttled: List[float] = []  # Monotonic times of throttled requests
+
+    def throttle(self, count: int, retry_after_ms: int = 100) -> None:
+        """Reject the next ``count`` requests with 429 and a retry-after."""
+        self._throttle_remaining = count
+        self._throttle_retry_after_ms = retry_after_ms
+
+    @asynccontextmanager
+    async def _request(self):
+        self.requests += 1
+        if self._throttle_remaining > 0:
+            self._throttle_remaining -= 1
+            self.throttled.append(time.monotonic())
+            raise _throttled(self._throttle_retry_after_ms)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def _key(self, body: Dict[str, Any]) -> Tuple[Any, str]:
+        return (body.get(self.partition_key_field), body["id"])
+
+    def _store(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        item = json.loads(json.dumps(body))
+        item["_etag"] = f'"{uuid.uuid4()}"'
+        item["_ts"] = int(time.time())
+        self.items[self._key(item)] = item
+        return dict(item)
+
+    def _get(self, id: str, partition_key: Any) -> Dict[str, Any]:
+        item = self.items.get((partition_key, id))
+        if item is None:
+            raise exceptions.CosmosResourceNotFoundError(status_code=404, message=f"{id} not found")
+        return item
+
+    async def read(self, **kwargs: Any) -> Dict[str, Any]:
+        async with self._request():
+            return {"id": self.id, "partitionKey": {"paths": [f"/{self.partition_key_field}"]}}
+
+    async def create_item(self, body: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        async with self._request():
+            if self._key(body) in self.items:
+                raise exceptions.CosmosResourceExistsError(status_code=409, message="Conflict")
+            return self._store(body)
+
+    async def read_item(
+        self,
+        item: str,
+        partition_key: Any,
+        etag: Optional[str] = None,
+        match_condition: Optional[MatchConditions] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        async with self._request():
+            existing = self._get(item, partition_key)
+            if match_condition == MatchConditions.IfModified and existing["_etag"] == etag:
+                return {}  # 304 Not Modified
+            return dict(existing)
+
+    async def replace_item(
+        self,
+        item: str,
+        body: Dict[str, Any],
+        etag: Optional[str] = None,
+        match_condition: Optional[MatchConditions] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        async with self._request():
+            existing = self._get(item, body.get(self.partition_key_field))
+            if match_condition == MatchConditions.IfNotModified and existing["_etag"] != etag:
+                raise exceptions.CosmosAccessConditionFailedError(
+                    status_code=412, message="Precondition failed"
+                )
+            return self._store(body)
+
+    async def upsert_item(self, body: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        async with self._request():
+            return self._store(body)
+
+    async def delete_item(
+        self,
+        item: str,
+        partition_key: Any,
+        etag: Optional[str] = None,
+        match_condition: Optional[MatchConditions] = None,
+        **kwargs: Any,
+    ) -> None:
+        async with self._request():
+            existing = self._get(item, partition_key)
+            if match_condition == MatchConditions.IfNotModified and existing["_etag"] != etag:
+                raise exceptions.CosmosAccessConditionFailedError(
+                    status_code=412, message="Precondition failed"
+                )
+            del self.items[(partition_key, item)]
+
+    async def execute_item_batch(
+        self, batch_operations: List[Tuple[str, Tuple[Any, ...]]], partition_key: Any, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        async with self._request():
+            staged = dict(self.items)
+            responses = []
+            for index, (operation, args) in enumerate(batch_operations):
+                if operation == "upsert":
+                    body = args[0]
+                    if body.get(self.partition_key_field) != partition_key:
+                        self._fail_batch(index, 400, "Partition key mismatch", len(batch_operations))
+                    responses.append({"statusCode": 200, "resourceBody": body})
+                elif operation == "delete":
+                    if (partition_key, args[0]) not in staged:
+                        self._fail_batch(index, 404, "Not found", len(batch_operations))
+                    del staged[(partition_key, args[0])]
+                    responses.append({"statusCode": 204})
+                else:
+                    raise NotImplementedError(f"Batch operation not supported by the fake: {operation}")
+            self.items = staged
+            return [
+                {**response, "resourceBody": self._store(response["resourceBody"])}
+                if "resourceBody" in response
+                else response
+                for response in responses
+            ]
+
+    def _fail_batch(self, index: int, status: int, message: str, count: int) -> None:
+        responses = [{"statusCode": 424} for _ in range(count)]
+        responses[index] = {"statusCode": status}
+        raise exceptions.CosmosBatchOperationError(
+            error_index=index,
+            headers={},
+            status_code=status,
+            message=message,
+            operation_responses=responses,
+        )
+
+    def query_items(
+        self,
+        query: str,
+        parameters: Optional[List[Dict[str, Any]]] = None,
+        partition_key: Any = None,
+        max_item_count: Optional[int] = None,
+        **kwargs: Any,
+    ) -> FakeItemPaged:
+        matches, sort, project, offset, limit = _compile_query(query, parameters or [])
+        items = sort(
+            [
+                item
+                for (item_partition, _), item in sorted(self.items.items(), key=lambda kv: kv[0][1])
+                if (partition_key is None or item_partition == partition_key) and matches(item)
+            ]
+        )
+        items = [project(item) for item in items[offset : offset + limit if limit is not None else None]]
+        return FakeItemPaged(items, max_item_count or 100, self)
+
+
+class FakeDatabase:
+    """In-memory database holding fake containers."""
+
+    def __init__(self, id: str, latency: float = 0.0):
+        self.id = id
+        self.latency = latency
+        self.containers: Dict[str, FakeContainer] = {}
+
+    async def create_container_if_not_exists(
+        self, id: str, partition_key: Any = None, **kwargs: Any
+    ) -> FakeContainer:
+        if id not in self.containers:
+            path = getattr(partition_key, "path", None) or "/partition_key"
+            self.containers[id] = FakeContainer(id, path, latency=self.latency)
+        return self.containers[id]
+
+    def get_container_client(self, container: str) -> FakeContainer:
+        if container not in self.containers:
+            return _MissingContainer(container)  # type: ignore[return-value]
+        return self.containers[container]
+
+    async def delete_container(self, container: str, **kwargs: Any) -> None:
+        if container not in self.containers:
+            raise exceptions.CosmosResourceNotFoundError(status_code=404, message=f"{container} not found")
+        del self.containers[container]
+
+
+class _MissingContainer:
+    def __init__(self, id: str):
+        self.id = id
+
+    async def read(self, **kwargs: Any) -> Dict[str, Any]:
+        raise exceptions.CosmosResourceNotFoundError(status_code=404, message=f"{self.id} not found")
+
+
+class FakeCosmosClient:
+    """In-process stand-in for ``azure.cosmos.aio.CosmosClient``.
+
+    ``latency`` is added to every request on containers created afterwards.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.databases: Dict[str, FakeDatabase] = {}
+        self.closed = False
+
+    async def create_database_if_not_exists(self, id: str, **kwargs: Any) -> FakeDatabase:
+        if id not in self.databases:
+            self.databases[id] = FakeDatabase(id, latency=self.latency)
+        return self.databases[id]
+
+    def get_database_client(self, database: str) -> FakeDatabase:
+        return self.databases[database]
+
+    async def close(self) -> None:
+        self.closed = True
@@ -1,26 +1,166 @@
 """
 Azure Cosmos DB storage provider implementation.
+
+Built on the asynchronous ``azure.cosmos.aio`` SDK, so storage calls never
+block the event loop.
 """
 
+import asyncio
 import os
+import random
+import time
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Type, TypeVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
-from azure.cosmos import ContainerProxy, CosmosClient, exceptions
+from azure.core import MatchConditions
+from azure.cosmos import exceptions
+from azure.cosmos.aio import ContainerProxy, CosmosClient
 from azure.cosmos.partition_key import PartitionKey
 
-from lightning_core.abstractions.storage import Document, DocumentStore, StorageProvider
+from lightning_core.abstractions.query import Query, set_path
+from lightning_core.abstractions.storage import (
+    BulkItemResult,
+    BulkResult,
+    Document,
+    DocumentConflictError,
+    DocumentStore,
+    Page,
+    StorageProvider,
+    decode_continuation_token,
+    encode_continuation_token,
+)
 
 T = TypeVar("T", bound=Document)
 
+_COMPARISONS = {"$eq": "=", "$ne": "!=", "$lt": "<", "$lte": "<=", "$gt": ">", "$gte": ">="}
+# Document attributes always returned by projected queries
+_PROJECTED_ATTRIBUTES = ("id", "partition_key", "created_at", "updated_at", "version", "_etag")
+R = TypeVar("R")
+
+RETRY_AFTER_HEADER = "x-ms-retry-after-ms"
+
+
+def _retry_after_seconds(error: exceptions.CosmosHttpResponseError, attempt: int) -> float:
+    """Delay requested by a throttled (429) response, or exponential backoff."""
+    header = (getattr(error, "headers", None) or {}).get(RETRY_AFTER_HEADER)
+    try:
+        return float(header) / 1000
+    except (TypeError, ValueError):
+        return 0.1 * 2**attempt * (1 + random.random())
+
+
+class CosmosRequestGate:
+    """Bounds concurrent Cosmos requests and backs off on throttling.
+
+    At most ``max_concurrency`` requests run at once. When a request is
+    throttled, every request to the same container waits until the
+    server's ``x-ms-retry-after-ms`` has passed instead of retrying
+    immediately, and the throttled request is retried up to
+    ``max_throttle_retries`` times.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_throttle_retries: int = 5,
+        max_retry_after: float = 30.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_throttle_retries = max_throttle_retries
+        self.max_retry_after = max_retry_after
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._resume_at: Dict[str, float] = {}
+        self.requests = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def run(self, container_id: str, operation: Callable[[], Awaitable[R]]) -> R:
+        """Run ``operation()`` within the concurrency and throttling limits."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        attempt = 0
+        while True:
+            delay = self._resume_at.get(container_id, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            async with self._semaphore:
+                if self._resume_at.get(container_id, 0.0) > time.monotonic():
+                    continue  # Throttled while waiting for a slot
+                self.requests += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    return await operation()
+                except exceptions.CosmosHttpResponseError as e:
+                    if e.status_code != 429 or attempt >= self.max_throttle_retries:
+                        raise
+                    self.throttled += 1
+                    retry_after = min(_retry_after_seconds(e, attempt), self.max_retry_after)
+                    self._resume_at[container_id] = max(
+                        self._resume_at.get(container_id, 0.0), time.monotonic() + retry_after
+                    )
+                finally:
+                    self.in_flight -= 1
+            attempt += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
 
 class CosmosDocumentStore(DocumentStore[T]):
     """Cosmos DB document store implementation."""
 
-    def __init__(self, container: ContainerProxy, document_type: Type[T]):
+    # Cosmos transactional batches hold at most 100 operations
+    MAX_BATCH_OPERATIONS = 100
+
+    def __init__(
+        self,
+        container: ContainerProxy,
+        document_type: Type[T],
+        bulk_concurrency: int = 16,
+        gate: Optional[CosmosRequestGate] = None,
+    ):
         self.container = container
         self.document_type = document_type
+        self.bulk_concurrency = bulk_concurrency
+        self.gate = gate or CosmosRequestGate()
+
+    def _run(self, operation: Callable[[], Awaitable[R]]) -> Awaitable[R]:
+        return self.gate.run(self.container.id, operation)
+
+    def _to_document(self, item: Dict[str, Any], projection: Optional[List[str]] = None) -> T:
+        doc = self.document_type.from_dict(item)
+        doc.etag = item.get("_etag")
+        if projection is not None:
+            # Projected fields come back as f0, f1, ...; undefined ones are omitted
+            doc.data = {}
+            for i, path in enumerate(projection):
+                if f"f{i}" in item:
+                    set_path(doc.data, path, item[f"f{i}"])
+        return doc
+
+    async def _query_items(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        async def collect() -> List[Dict[str, Any]]:
+            return [item async for item in self.container.query_items(**kwargs)]
+
+        return await self._run(collect)
+
+    async def _find(self, id: str) -> Optional[Dict[str, Any]]:
+        """Look a document up by id alone with a cross-partition query."""
+        items = await self._query_items(
+            query="SELECT * FROM c WHERE c.id = @id",
+            parameters=[{"name": "@id", "value": id}],
+        )
+        return items[0] if items else None
 
     async def create(self, document: T) -> T:
         """Create a new document."""
@@ -31,17 +171,17 @@ class CosmosDocumentStore(DocumentStore[T]):
             # Cosmos DB requires 'id' field
             if "id" not in item:
                 item["id"] = document.id
+            item["version"] = 1
 
-            response = self.container.create_item(
-                body=item, enable_automatic_id_generation=False
-            )
+            response = await self._run(lambda: self.container.create_item(body=item))
 
             # Update etag from response
             document.etag = response.get("_etag")
+            document.version = 1
             return document
 
         except exceptions.CosmosResourceExistsError:
-            raise ValueError(f"Document already exists: {document.id}")
+            raise DocumentConflictError(document.id, f"Document already exists: {document.id}")
         except exceptions.CosmosHttpResponseError as e:
             raise RuntimeError(f"Failed to create document: {e}")
 
@@ -49,109 +189,213 @@ class CosmosDocumentStore(DocumentStore[T]):
         """Read a document by ID."""
         try:
             if partition_key:
-                response = self.container.read_item(
-                    item=id, partition_key=partition_key
+                response = await self._run(
+                    lambda: self.container.read_item(item=id, partition_key=partition_key)
                 )
             else:
-                # Try to read without partition key (will fail if partitioned)
-                response = self.container.read_item(item=id)
+                # Point reads need the partition key; fall back to a query
+                response = await self._find(id)
+                if response is None:
+                    return None
 
-            doc = self.document_type.from_dict(response)
-            doc.etag = response.get("_etag")
-            return doc
+            return self._to_document(response)
 
         except exceptions.CosmosResourceNotFoundError:
             return None
         except exceptions.CosmosHttpResponseError as e:
             raise RuntimeError(f"Failed to read document: {e}")
 
-    async def update(self, document: T) -> T:
-        """Update an existing document."""
-        document.updated_at = datetime.utcnow()
+    async def read_if_modified(
+        self, id: str, partition_key: Optional[str], etag: Optional[str]
+    ) -> Tuple[bool, Optional[T]]:
+        """Read a document unless its ETag still equals ``etag``.
+
+        Uses an If-None-Match read, so an unchanged document costs a 304
+        with no body.
+        """
+        if not partition_key or not etag:
+            return await super().read_if_modified(id, partition_key, etag)
+        try:
+            response = await self._run(
+                lambda: self.container.read_item(
+                    item=id,
+                    partition_key=partition_key,
+                    etag=etag,
+                    match_condition=MatchConditions.IfModified,
+                )
+            )
+        except exceptions.CosmosResourceNotFoundError:
+            return True, None
+        except exceptions.CosmosHttpResponseError as e:
+            if e.status_code == 304:
+                return False, None
+            raise RuntimeError(f"Failed to read document: {e}")
+        # A 304 does not raise; it comes back without a body
+        if not response or "id" not in response:
+            return False, None
+        return True, self._to_document(response)
+
+    async def update(self, document: T, if_match: Optional[str] = None) -> T:
+        """Update an existing document, optionally only if its ETag matches.
+
+        Cosmos DB cannot increment a field in place, so the new version is
+        computed from the document passed in. It is only guaranteed to
+        increase by one per write when updates are conditional.
+        """
+        updated_at = datetime.utcnow()
 
         try:
             item = document.to_dict()
             if "id" not in item:
                 item["id"] = document.id
+            item["updated_at"] = updated_at.isoformat()
+            item["version"] = document.version + 1
 
-            # Use etag for optimistic concurrency if available
-            access_condition = (
-                {"type": "IfMatch", "condition": document.etag}
-                if document.etag
-                else None
-            )
+            conditions: Dict[str, Any] = {}
+            if if_match is not None:
+                conditions = {"etag": if_match, "match_condition": MatchConditions.IfNotModified}
 
-            response = self.container.replace_item(
-                item=document.id, body=item, access_condition=access_condition
+            response = await self._run(
+                lambda: self.container.replace_item(item=document.id, body=item, **conditions)
             )
 
+            document.updated_at = updated_at
             document.etag = response.get("_etag")
+            document.version = item["version"]
             return document
 
         except exceptions.CosmosResourceNotFoundError:
             raise ValueError(f"Document not found: {document.id}")
         except exceptions.CosmosAccessConditionFailedError:
-            raise ValueError("Document was modified by another process")
+            raise DocumentConflictError(document.id)
         except exceptions.CosmosHttpResponseError as e:
             raise RuntimeError(f"Failed to update document: {e}")
 
-    async def delete(self, id: str, partition_key: Optional[str] = None) -> bool:
-        """Delete a document by ID."""
+    async def delete(
+        self, id: str, partition_key: Optional[str] = None, if_match: Optional[str] = None
+    ) -> bool:
+        """Delete a document by ID, optionally only if its ETag matches."""
         try:
-            if partition_key:
-                self.container.delete_item(item=id, partition_key=partition_key)
-            else:
-                self.container.delete_item(item=id)
+            if not partition_key:
+                item = await self._find(id)
+                if item is None:
+                    return False
+                partition_key = item.get("partition_key")
+
+            conditions: Dict[str, Any] = {}
+            if if_match is not None:
+                conditions = {"etag": if_match, "match_condition": MatchConditions.IfNotModified}
+
+            await self._run(
+                lambda: self.container.delete_item(
+                    item=id, partition_key=partition_key, **conditions
+                )
+            )
             return True
 
         except exceptions.CosmosResourceNotFoundError:
             return False
+        except exceptions.CosmosAccessConditionFailedError:
+            raise DocumentConflictError(id)
         except exceptions.CosmosHttpResponseError as e:
             raise RuntimeError(f"Failed to delete document: {e}")
 
-    async def query(
-        self,
-        query: Dict[str, Any],
-        partition_key: Optional[str] = None,
-        max_items: Optional[int] = None,
-    ) -> List[T]:
-        """Query documents based on criteria."""
-        # Build Cosmos DB SQL query from dict
+    def _build_query(self, query: Query) -> Tuple[str, List[Dict[str, Any]]]:
+        """Compile a query to Cosmos DB SQL, without its limit."""
         where_clauses = []
         parameters = []
 
-        for i, (key, value) in enumerate(query.items()):
-            param_name = f"@param{i}"
-            if "." in key:
-                # Support nested fields
-                where_clauses.append(f"c.{key} = {param_name}")
+        for i, condition in enumerate(query.conditions()):
+            path, param_name = f"c.data.{condition.field}", f"@param{i}"
+            if condition.op == "$exists":
+                where_clauses.append(f"{'' if condition.value else 'NOT '}IS_DEFINED({path})")
+                continue
+            if condition.op == "$in":
+                where_clauses.append(f"ARRAY_CONTAINS({param_name}, {path})")
+            elif condition.op == "$prefix":
+                where_clauses.append(f"STARTSWITH({path}, {param_name})")
             else:
-                where_clauses.append(f"c.data.{key} = {param_name}")
-            parameters.append({"name": param_name, "value": value})
-
-        query_text = "SELECT * FROM c"
+                where_clauses.append(f"{path} {_COMPARISONS[condition.op]} {param_name}")
+            parameters.append({"name": param_name, "value": condition.value})
+
+        projection = query.projection()
+        select = "*"
+        if projection is not None:
+            select = ", ".join(
+                [f"c.{name}" for name in _PROJECTED_ATTRIBUTES]
+                + [f"c.data.{path} AS f{i}" for i, path in enumerate(projection)]
+            )
+        query_text = f"SELECT {select} FROM c"
         if where_clauses:
             query_text += " WHERE " + " AND ".join(where_clauses)
+        ordering = query.ordering()
+        if ordering:
+            # More than one field needs a composite index on the container
+            query_text += " ORDER BY " + ", ".join(
+                f"c.data.{path} {'DESC' if descending else 'ASC'}" for path, descending in ordering
+            )
+        return query_text, parameters
 
-        # Add OFFSET and LIMIT if specified
-        if max_items:
-            query_text += f" OFFSET 0 LIMIT {max_items}"
+    async def query(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> List[T]:
+        """Query documents; filtering, ordering and projection run in Cosmos DB."""
+        query = Query.of(query)
+        query_text, parameters = self._build_query(query)
+
+        limit = query.effective_limit(max_items)
+        if limit:
+            query_text += f" OFFSET 0 LIMIT {int(limit)}"
 
         # Execute query
-        kwargs = {"query": query_text, "parameters": parameters}
+        kwargs: Dict[str, Any] = {"query": query_text, "parameters": parameters}
         if partition_key:
             kwargs["partition_key"] = partition_key
 
-        items = list(self.container.query_items(**kwargs))
+        projection = query.projection()
+        return [
+            self._to_document(item, projection) for item in await self._query_items(**kwargs)
+        ]
 
-        # Convert to documents
-        documents = []
-        for item in items:
-            doc = self.document_type.from_dict(item)
-            doc.etag = item.get("_etag")
-            documents.append(doc)
+    async def query_page(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        page_size: int = 100,
+        continuation_token: Optional[str] = None,
+    ) -> Page[T]:
+        """Get one page of matching documents using Cosmos continuation tokens."""
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        query = Query.of(query)
+        query_text, parameters = self._build_query(query)
+        if query.limit:
+            query_text += f" OFFSET 0 LIMIT {int(query.limit)}"
+        kwargs: Dict[str, Any] = {
+            "query": query_text,
+            "parameters": parameters,
+            "max_item_count": page_size,
+        }
+        if partition_key:
+            kwargs["partition_key"] = partition_key
 
-        return documents
+        cosmos_token = None
+        if continuation_token:
+            cosmos_token = decode_continuation_token(continuation_token).get("cosmos")
+
+        async def fetch() -> Tuple[List[Dict[str, Any]], Optional[str]]:
+            pages = self.container.query_items(**kwargs).by_page(cosmos_token)
+            async for page in pages:
+                return [item async for item in page], pages.continuation_token
+            return [], None
+
+        items, next_token = await self._run(fetch)
+        token = encode_continuation_token({"cosmos": next_token}) if next_token else None
+        projection = query.projection()
+        return Page([self._to_document(item, projection) for item in items], token)
 
     async def list_all(
         self, partition_key: Optional[str] = None, max_items: Optional[int] = None
@@ -161,24 +405,176 @@ class CosmosDocumentStore(DocumentStore[T]):
         if max_items:
             query += f" OFFSET 0 LIMIT {max_items}"
 
-        kwargs = {"query": query}
+        kwargs: Dict[str, Any] = {"query": query}
         if partition_key:
             kwargs["partition_key"] = partition_key
 
-        items = list(self.container.query_items(**kwargs))
+        return [self._to_document(item) for item in await self._query_items(**kwargs)]
 
-        # Convert to documents
-        documents = []
+    async def upsert(self, document: T, if_match: Optional[str] = None) -> T:
+        """Create a document or replace it if it already exists."""
+        if if_match is not None:
+            return await self.update(document, if_match=if_match)
+        document.updated_at = datetime.utcnow()
+
+        try:
+            item = document.to_dict()
+            item["version"] = document.version + 1
+            response = await self._run(lambda: self.container.upsert_item(body=item))
+            document.etag = response.get("_etag")
+            document.version = item["version"]
+            return document
+        except exceptions.CosmosHttpResponseError as e:
+            raise RuntimeError(f"Failed to upsert document: {e}")
+
+    async def bulk_upsert(self, documents: List[T]) -> BulkResult[T]:
+        """Upsert documents in transactional batches per partition key.
+
+        Each batch of up to 100 documents sharing a partition key commits
+        atomically; if a batch fails, every item in it is reported failed.
+        Batches run concurrently, up to ``bulk_concurrency`` at a time.
+        """
+        for document in documents:
+            document.updated_at = datetime.utcnow()
+
+        outcomes: Dict[str, BulkItemResult[T]] = {}
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def run_batch(partition_key: str, chunk: List[T]) -> None:
+            operations = [
+                ("upsert", ({**document.to_dict(), "version": document.version + 1},))
+                for document in chunk
+            ]
+            async with semaphore:
+                try:
+                    responses = await self._run(
+                        lambda: self.container.execute_item_batch(
+                            batch_operations=operations, partition_key=partition_key
+                        )
+                    )
+                except (exceptions.CosmosHttpResponseError, exceptions.CosmosBatchOperationError) as e:
+                    for document in chunk:
+                        outcomes[document.id] = BulkItemResult(
+                            document.id, False, error=f"Batch failed: {e}"
+                        )
+                    return
+            for document, response in zip(chunk, responses):
+                body = response.get("resourceBody") or {}
+                document.etag = body.get("_etag")
+                document.version = body.get("version", document.version)
+                outcomes[document.id] = BulkItemResult(document.id, True, document=document)
+
+        await asyncio.gather(
+            *(run_batch(key, chunk) for key, chunk in self._batches(documents, lambda d: d.partition_key))
+        )
+        return BulkResult([outcomes[document.id] for document in documents])
+
+    async def bulk_delete(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> BulkResult[T]:
+        """Delete documents in one transactional batch per 100 ids.
+
+        Without a partition key the documents are deleted individually with
+        bounded concurrency.
+        """
+        if partition_key is None:
+            return await self._concurrently(ids, lambda id: self.delete(id))
+
+        outcomes: Dict[str, BulkItemResult[T]] = {}
+        for _, chunk in self._batches(ids, lambda id: partition_key):
+            operations = [("delete", (id,)) for id in chunk]
+            try:
+                await self._run(
+                    lambda: self.container.execute_item_batch(
+                        batch_operations=operations, partition_key=partition_key
+                    )
+                )
+                for id in chunk:
+                    outcomes[id] = BulkItemResult(id, True)
+            except exceptions.CosmosBatchOperationError:
+                # One missing document fails the batch; fall back per item
+                chunk_result = await self._concurrently(
+                    chunk, lambda id: self.delete(id, partition_key)
+                )
+                for item in chunk_result.items:
+                    outcomes[item.id] = item
+            except exceptions.CosmosHttpResponseError as e:
+                for id in chunk:
+                    outcomes[id] = BulkItemResult(id, False, error=f"Batch failed: {e}")
+
+        return BulkResult([outcomes[id] for id in ids])
+
+    async def read_many(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> List[Optional[T]]:
+        """Read many documents with one query per 100 ids."""
+        found: Dict[str, T] = {}
+        for start in range(0, len(ids), self.MAX_BATCH_OPERATIONS):
+            kwargs: Dict[str, Any] = {
+                "query": "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.id)",
+                "parameters": [
+                    {"name": "@ids", "value": ids[start : start + self.MAX_BATCH_OPERATIONS]}
+                ],
+            }
+            if partition_key:
+                kwargs["partition_key"] = partition_key
+            for item in await self._query_items(**kwargs):
+                doc = self._to_document(item)
+                found[doc.id] = doc
+
+        return [found.get(id) for id in ids]
+
+    def _batches(self, items: List[Any], key_func) -> List[Any]:
+        """Group items by partition key into chunks of at most 100."""
+        groups: Dict[str, List[Any]] = {}
         for item in items:
-            doc = self.document_type.from_dict(item)
-            doc.etag = item.get("_etag")
-            documents.append(doc)
+            groups.setdefault(key_func(item), []).append(item)
+        return [
+            (key, group[start : start + self.MAX_BATCH_OPERATIONS])
+            for key, group in groups.items()
+            for start in range(0, len(group), self.MAX_BATCH_OPERATIONS)
+        ]
+
+    async def _concurrently(self, ids: List[str], delete) -> BulkResult[T]:
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def run(id: str) -> BulkItemResult[T]:
+            async with semaphore:
+                try:
+                    deleted = await delete(id)
+                    return BulkItemResult(
+                        id, deleted, error=None if deleted else "Document not found"
+                    )
+                except Exception as e:
+                    return BulkItemResult(id, False, error=str(e))
+
+        return BulkResult(list(await asyncio.gather(*(run(id) for id in ids))))
+
+
+class _SharedClient:
+    """A Cosmos client and its HTTP session, shared by providers of one account."""
+
+    def __init__(self, client: CosmosClient, session: Any):
+        self.client = client
+        self.session = session
+        self.references = 0
 
-        return documents
+
+# Keyed by connection string or endpoint, so providers for the same
+# account reuse one client and one connection pool
+_shared_clients: Dict[str, _SharedClient] = {}
 
 
 class CosmosStorageProvider(StorageProvider):
-    """Azure Cosmos DB storage provider."""
+    """Azure Cosmos DB storage provider.
+
+    Providers configured for the same account share one asynchronous
+    client, whose HTTP connection pool holds up to ``max_connections``
+    connections. Requests are limited to ``max_concurrency`` at a time and
+    back off together when Cosmos throttles them (see
+    ``CosmosRequestGate``). Pass ``client`` to use an existing client, such
+    as ``FakeCosmosClient`` in tests.
+    """
 
     def __init__(
         self,
@@ -186,26 +582,56 @@ class CosmosStorageProvider(StorageProvider):
         endpoint: Optional[str] = None,
         key: Optional[str] = None,
         database_name: str = "lightning",
+        client: Optional[Any] = None,
+        max_connections: int = 100,
+        max_concurrency: int = 32,
+        max_throttle_retries: int = 5,
         **kwargs: Any,
     ):
-        # Initialize Cosmos client
-        if connection_string:
-            self.client = CosmosClient.from_connection_string(connection_string)
-        elif endpoint and key:
-            self.client = CosmosClient(endpoint, key)
-        else:
+        self.connection_string = connection_string
+        self.endpoint = endpoint
+        self.key = key
+        if client is None and not connection_string and not (endpoint and key):
             # Try to get from environment
-            conn_str = os.getenv("COSMOS_CONNECTION_STRING")
-            if conn_str:
-                self.client = CosmosClient.from_connection_string(conn_str)
-            else:
+            self.connection_string = os.getenv("COSMOS_CONNECTION_STRING")
+            if not self.connection_string:
                 raise ValueError("Cosmos DB connection string or endpoint/key required")
 
+        self.client = client
+        self._owns_client = client is None
+        self._client_key = self.connection_string or self.endpoint or ""
+        self.max_connections = max_connections
+        self.gate = CosmosRequestGate(
+            max_concurrency=max_concurrency, max_throttle_retries=max_throttle_retries
+        )
+
         self.database_name = database_name
         self.database = None
         self._containers: Dict[str, ContainerProxy] = {}
         self._stores: Dict[str, CosmosDocumentStore] = {}
 
+    def _acquire_client(self) -> CosmosClient:
+        shared = _shared_clients.get(self._client_key)
+        if shared is None:
+            import aiohttp
+            from azure.core.pipeline.transport import AioHttpTransport
+
+            # Created inside the running loop, so the session binds to it
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections)
+            )
+            transport = AioHttpTransport(session=session, session_owner=False)
+            # Surface throttling quickly so CosmosRequestGate can back off
+            # every request to the container, not just the throttled one
+            options: Dict[str, Any] = {"transport": transport, "retry_throttle_total": 1}
+            if self.connection_string:
+                client = CosmosClient.from_connection_string(self.connection_string, **options)
+            else:
+                client = CosmosClient(self.endpoint, credential=self.key, **options)
+            shared = _shared_clients[self._client_key] = _SharedClient(client, session)
+        shared.references += 1
+        return shared.client
+
     def get_document_store(
         self, container_name: str, document_type: Type[T]
     ) -> DocumentStore[T]:
@@ -217,25 +643,46 @@ class CosmosStorageProvider(StorageProvider):
                 )
 
             self._stores[container_name] = CosmosDocumentStore(
-                self._containers[container_name], document_type
+                self._containers[container_name], document_type, gate=self.gate
             )
 
         return self._stores[container_name]
 
     async def initialize(self) -> None:
         """Initialize the storage provider."""
+        if self.client is None:
+            self.client = self._acquire_client()
         try:
             # Create database if it doesn't exist
-            self.database = self.client.create_database_if_not_exists(
+            self.database = await self.client.create_database_if_not_exists(
                 id=self.database_name
             )
         except exceptions.CosmosHttpResponseError as e:
             raise RuntimeError(f"Failed to initialize Cosmos DB: {e}")
 
     async def close(self) -> None:
-        """Close storage provider connections."""
-        # Cosmos client doesn't need explicit closing
-        pass
+        """Close storage provider connections.
+
+        The shared client is closed once the last provider using it closes.
+        """
+        if not self._owns_client or self.client is None:
+            return
+        self.client = None
+        self.database = None
+        self._containers.clear()
+        self._stores.clear()
+        shared = _shared_clients.get(self._client_key)
+        if shared is None:
+            return
+        shared.references -= 1
+        if shared.references <= 0:
+            del _shared_clients[self._client_key]
+            await shared.client.close()
+            await shared.session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, throttling and concurrency counters."""
+        return self.gate.get_stats()
 
     async def create_container_if_not_exists(
         self, container_name: str, partition_key_path: str = "/partition_key"
@@ -245,7 +692,7 @@ class CosmosStorageProvider(StorageProvider):
             await self.initialize()
 
         try:
-            container = self.database.create_container_if_not_exists(
+            container = await self.database.create_container_if_not_exists(
                 id=container_name,
                 partition_key=PartitionKey(path=partition_key_path),
                 offer_throughput=400,  # RU/s
@@ -260,7 +707,7 @@ class CosmosStorageProvider(StorageProvider):
             await self.initialize()
 
         try:
-            self.database.delete_container(container_name)
+            await self.database.delete_container(container_name)
 
             # Remove from caches
             if container_name in self._containers:
@@ -281,7 +728,7 @@ class CosmosStorageProvider(StorageProvider):
         try:
             container = self.database.get_container_client(container_name)
             # Try to read container properties to verify it exists
-            container.read()
+            await container.read()
             self._containers[container_name] = container
             return True
         except exceptions.CosmosResourceNotFoundError:
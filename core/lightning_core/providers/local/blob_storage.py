@@ -0,0 +1,80 @@
+"""
+Local file-based blob storage implementation.
+
+Each blob is a file under the base path; ``/`` in keys maps to
+directories.
+"""
+
+import asyncio
+import os
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional
+
+from lightning_core.abstractions.blob_storage import BlobStore
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store keeping each blob in a file."""
+
+    def __init__(self, path: str = "./data/blobs", **kwargs: Any):
+        self.base_path = Path(path)
+
+    def _path(self, key: str) -> Path:
+        parts = key.split("/")
+        if any(part in ("", ".", "..") for part in parts):
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return self.base_path.joinpath(*parts)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so readers never see a partial blob
+        temp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        temp.write_bytes(data)
+        os.replace(temp, path)
+
+    def _read(self, path: Path) -> Optional[bytes]:
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _remove(self, path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _list(self, prefix: str) -> List[str]:
+        directory = prefix.rsplit("/", 1)[0] if "/" in prefix else ""
+        root = self.base_path.joinpath(*directory.split("/")) if directory else self.base_path
+        keys = []
+        for dirpath, _, filenames in os.walk(root):
+            relative = Path(dirpath).relative_to(self.base_path).as_posix()
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue  # In-progress writes
+                key = filename if relative == "." else f"{relative}/{filename}"
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def put(self, key: str, data: bytes) -> None:
+        """Store a blob, replacing any blob with the same key."""
+        await self._run(self._write, self._path(key), data)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a blob, or None if it does not exist."""
+        return await self._run(self._read, self._path(key))
+
+    async def delete(self, key: str) -> bool:
+        """Delete a blob; returns whether it existed."""
+        return await self._run(self._remove, self._path(key))
+
+    async def list_keys(self, prefix: str = "") -> List[str]:
+        """List the keys starting with ``prefix``."""
+        return await self._run(self._list, prefix)
@@ -0,0 +1,125 @@
+"""
+Long-lived SQLite connections for the local storage provider.
+
+Opening a connection per call dominates the cost of small reads, so each
+database file gets one writer connection and a small pool of reader
+connections that live as long as the provider.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+R = TypeVar("R")
+
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "synchronous": "NORMAL",  # Safe with WAL; fsync only at checkpoints
+    "cache_size": -16000,  # 16 MB page cache per connection
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+class SQLiteConnectionPool:
+    """One writer and a pool of readers for a single SQLite database file.
+
+    Writes run on a dedicated thread, so they are queued and executed one
+    at a time, each in its own ``BEGIN IMMEDIATE`` transaction. Reads run on
+    up to ``readers`` threads, each holding its own read-only connection.
+    The database is switched to WAL mode so readers never block on the
+    writer. Connections are kept open, so SQLite's per-connection
+    prepared-statement cache (``cached_statements``) is reused across calls.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = 4,
+        pragmas: Optional[Dict[str, Any]] = None,
+        cached_statements: int = 256,
+    ):
+        self.db_path = db_path
+        self.readers = readers
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+        self._writer_executor: Optional[ThreadPoolExecutor] = None
+        self._reader_executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._generation = 0  # Bumped on close so threads drop old connections
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,  # Transactions are managed explicitly
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        if not read_only:
+            conn.execute("PRAGMA journal_mode=WAL")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _thread_connection(self, read_only: bool) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.connection = self._connect(read_only)
+            local.generation = self._generation
+        return local.connection
+
+    def _executors(self):
+        if self._writer_executor is None:
+            self._writer_executor = ThreadPoolExecutor(1, thread_name_prefix="sqlite-writer")
+            self._reader_executor = ThreadPoolExecutor(
+                self.readers, thread_name_prefix="sqlite-reader"
+            )
+        return self._writer_executor, self._reader_executor
+
+    def _run_write(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        conn = self._thread_connection(read_only=False)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def _run_read(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        return fn(self._thread_connection(read_only=True))
+
+    async def write(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        """Run ``fn(connection)`` in a write transaction on the writer thread."""
+        writer, _ = self._executors()
+        return await asyncio.get_running_loop().run_in_executor(writer, self._run_write, fn)
+
+    async def read(self, fn: Callable[[sqlite3.Connection], R]) -> R:
+        """Run ``fn(connection)`` on a pooled read-only connection."""
+        _, readers = self._executors()
+        return await asyncio.get_running_loop().run_in_executor(readers, self._run_read, fn)
+
+    def close_sync(self) -> None:
+        """Stop the threads and close every connection."""
+        writer, readers = self._writer_executor, self._reader_executor
+        self._writer_executor = self._reader_executor = None
+        for executor in (writer, readers):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+
+    async def close(self) -> None:
+        """Close the pool; it reopens on next use."""
+        await asyncio.get_running_loop().run_in_executor(None, self.close_sync)
@@ -6,36 +6,124 @@ Uses SQLite for structured data and file system for documents.
 
 import asyncio
 import json
+import logging
 import os
+import re
 import sqlite3
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, TypeVar
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from lightning_core.abstractions.query import Condition, Query, set_path, validate_field
+from lightning_core.abstractions.storage import (
+    BulkItemResult,
+    BulkResult,
+    Document,
+    DocumentConflictError,
+    DocumentStore,
+    Page,
+    StorageProvider,
+    decode_continuation_token,
+    encode_continuation_token,
+)
+
+from .sqlite_pool import SQLiteConnectionPool
 
-import aiosqlite
+T = TypeVar("T", bound=Document)
 
-from lightning_core.abstractions.storage import Document, DocumentStore, StorageProvider
 
-T = TypeVar("T", bound=Document)
+def _json_path(field: str) -> str:
+    """SQL expression extracting a data field, matching declared indexes."""
+    return f"json_extract(data, '$.{validate_field(field)}')"
+
+
+def _sql_value(value: Any) -> Any:
+    # json_extract returns objects and arrays as minified JSON text
+    return json.dumps(value, separators=(",", ":")) if isinstance(value, (dict, list)) else value
+
+
+def _condition_sql(condition: Condition) -> Tuple[str, List[Any]]:
+    path, op, value = _json_path(condition.field), condition.op, condition.value
+    if op == "$exists":
+        type_sql = f"json_type(data, '$.{condition.field}')"
+        return f"{type_sql} IS {'NOT ' if value else ''}NULL", []
+    if op == "$in":
+        if not value:
+            return "0", []
+        return f"{path} IN ({', '.join('?' * len(value))})", [_sql_value(v) for v in value]
+    if op == "$prefix":
+        # A range rather than LIKE, so an index on the field can be used
+        return f"({path} >= ? AND {path} < ?)", [value, value + "\U0010ffff"]
+    comparison = {"$eq": "=", "$ne": "!=", "$lt": "<", "$lte": "<=", "$gt": ">", "$gte": ">="}[op]
+    return f"{path} {comparison} ?", [_sql_value(value)]
 
 
 class LocalDocumentStore(DocumentStore[T]):
     """SQLite-based document store implementation."""
 
-    def __init__(self, db_path: str, table_name: str, document_type: Type[T]):
+    COLUMNS = "id, partition_key, data, created_at, updated_at, etag, version"
+
+    def __init__(
+        self,
+        db_path: str,
+        table_name: str,
+        document_type: Type[T],
+        pool: Optional[SQLiteConnectionPool] = None,
+        indexed_fields: Optional[List[str]] = None,
+        warn_on_scan: bool = False,
+    ):
         self.db_path = db_path
         self.table_name = table_name
         self.document_type = document_type
+        self.pool = pool or SQLiteConnectionPool(db_path)
+        self.indexed_fields: List[str] = []
+        self.warn_on_scan = warn_on_scan
+        self._checked_queries: set = set()
         self._initialized = False
+        for field in indexed_fields or []:
+            self.add_index(field)
+
+        # Constant statement text so pooled connections reuse prepared statements
+        table = table_name
+        self._sql = {
+            "insert": f"INSERT INTO {table} ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, 1)",
+            "read": f"SELECT {self.COLUMNS} FROM {table} WHERE id = ?",
+            "read_partition": f"SELECT {self.COLUMNS} FROM {table} WHERE id = ? AND partition_key = ?",
+            "etag": f"SELECT etag FROM {table} WHERE id = ?",
+            "etag_partition": f"SELECT etag FROM {table} WHERE id = ? AND partition_key = ?",
+            "version": f"SELECT version FROM {table} WHERE id = ?",
+            # The version is incremented inside the write transaction, so
+            # concurrent writers never hand out the same version twice
+            "update": (
+                f"UPDATE {table} SET data = ?, updated_at = ?, etag = ?, version = version + 1 "
+                "WHERE id = ? AND partition_key = ?"
+            ),
+            "update_if_match": (
+                f"UPDATE {table} SET data = ?, updated_at = ?, etag = ?, version = version + 1 "
+                "WHERE id = ? AND partition_key = ? AND etag = ?"
+            ),
+            "delete": f"DELETE FROM {table} WHERE id = ?",
+            "delete_partition": f"DELETE FROM {table} WHERE id = ? AND partition_key = ?",
+            "list": f"SELECT {self.COLUMNS} FROM {table} LIMIT ?",
+            "list_partition": f"SELECT {self.COLUMNS} FROM {table} WHERE partition_key = ? LIMIT ?",
+            # Conflicting ids in another partition are left untouched
+            "upsert": (
+                f"INSERT INTO {table} ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT(id) DO UPDATE SET data = excluded.data, "
+                "updated_at = excluded.updated_at, etag = excluded.etag, "
+                "version = version + 1 "
+                "WHERE partition_key = excluded.partition_key"
+            ),
+        }
 
     async def _ensure_initialized(self) -> None:
         """Ensure the table exists."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+        def create_schema(conn: sqlite3.Connection) -> None:
+            conn.execute(
                 f"""
                 CREATE TABLE IF NOT EXISTS {self.table_name} (
                     id TEXT PRIMARY KEY,
@@ -44,149 +132,332 @@ class LocalDocumentStore(DocumentStore[T]):
                     created_at TEXT,
                     updated_at TEXT,
                     etag TEXT,
+                    version INTEGER NOT NULL DEFAULT 0,
                     UNIQUE(id, partition_key)
                 )
             """
             )
-            await db.execute(
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")]
+            if "version" not in columns:
+                # Tables created before documents were versioned
+                conn.execute(
+                    f"ALTER TABLE {self.table_name} "
+                    "ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+            conn.execute(
                 f"""
                 CREATE INDEX IF NOT EXISTS idx_{self.table_name}_partition 
                 ON {self.table_name}(partition_key)
             """
             )
-            await db.commit()
 
+            for field in self.indexed_fields:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self._index_name(field)} "
+                    f"ON {self.table_name}({_json_path(field)})"
+                )
+
+        await self.pool.write(create_schema)
         self._initialized = True
 
+    def _index_name(self, field: str) -> str:
+        return f"idx_{self.table_name}_data_{field.replace('.', '__')}"
+
+    def add_index(self, field: str) -> None:
+        """Declare a data field to index; the index is created on next use."""
+        _json_path(field)  # Validate the field name
+        if field not in self.indexed_fields:
+            self.indexed_fields.append(field)
+            self._initialized = False
+
     async def create(self, document: T) -> T:
         """Create a new document."""
         await self._ensure_initialized()
 
         document.updated_at = datetime.utcnow()
         document.etag = str(uuid.uuid4())
-
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                f"""
-                INSERT INTO {self.table_name} 
-                (id, partition_key, data, created_at, updated_at, etag)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    document.id,
-                    document.partition_key,
-                    json.dumps(document.data),
-                    document.created_at.isoformat(),
-                    document.updated_at.isoformat(),
-                    document.etag,
-                ),
-            )
-            await db.commit()
-
+        params = (
+            document.id,
+            document.partition_key,
+            json.dumps(document.data),
+            document.created_at.isoformat(),
+            document.updated_at.isoformat(),
+            document.etag,
+        )
+
+        try:
+            await self.pool.write(lambda conn: conn.execute(self._sql["insert"], params))
+        except sqlite3.IntegrityError:
+            raise DocumentConflictError(document.id, f"Document already exists: {document.id}")
+        document.version = 1
         return document
 
     async def read(self, id: str, partition_key: Optional[str] = None) -> Optional[T]:
         """Read a document by ID."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            if partition_key is not None:
-                cursor = await db.execute(
-                    f"SELECT * FROM {self.table_name} WHERE id = ? AND partition_key = ?",
-                    (id, partition_key),
-                )
-            else:
-                cursor = await db.execute(
-                    f"SELECT * FROM {self.table_name} WHERE id = ?", (id,)
-                )
+        if partition_key is not None:
+            sql, params = self._sql["read_partition"], (id, partition_key)
+        else:
+            sql, params = self._sql["read"], (id,)
 
-            row = await cursor.fetchone()
-            if row:
-                return self._row_to_document(row)
+        row = await self.pool.read(lambda conn: conn.execute(sql, params).fetchone())
+        if row:
+            return self._row_to_document(row)
 
         return None
 
-    async def update(self, document: T) -> T:
-        """Update an existing document."""
+    async def read_if_modified(
+        self, id: str, partition_key: Optional[str], etag: Optional[str]
+    ) -> Tuple[bool, Optional[T]]:
+        """Read a document unless its ETag still equals ``etag``."""
         await self._ensure_initialized()
 
-        document.updated_at = datetime.utcnow()
-        document.etag = str(uuid.uuid4())
-
-        async with aiosqlite.connect(self.db_path) as db:
-            result = await db.execute(
-                f"""
-                UPDATE {self.table_name}
-                SET data = ?, updated_at = ?, etag = ?
-                WHERE id = ? AND partition_key = ?
-            """,
-                (
-                    json.dumps(document.data),
-                    document.updated_at.isoformat(),
-                    document.etag,
-                    document.id,
-                    document.partition_key,
-                ),
-            )
-            await db.commit()
-
-            if result.rowcount == 0:
-                raise ValueError(f"Document not found: {document.id}")
+        if partition_key is not None:
+            key, params = "_partition", (id, partition_key)
+        else:
+            key, params = "", (id,)
+        etag_sql, read_sql = self._sql["etag" + key], self._sql["read" + key]
+
+        def read_changed(conn: sqlite3.Connection):
+            # Compare the etag column first so unchanged data is not parsed
+            current = conn.execute(etag_sql, params).fetchone()
+            if current is None:
+                return True, None
+            if etag is not None and current[0] == etag:
+                return False, None
+            return True, conn.execute(read_sql, params).fetchone()
+
+        modified, row = await self.pool.read(read_changed)
+        return modified, self._row_to_document(row) if row else None
+
+    async def update(self, document: T, if_match: Optional[str] = None) -> T:
+        """Update an existing document, optionally only if its ETag matches."""
+        await self._ensure_initialized()
 
+        etag = str(uuid.uuid4())
+        updated_at = datetime.utcnow()
+        params: tuple = (
+            json.dumps(document.data),
+            updated_at.isoformat(),
+            etag,
+            document.id,
+            document.partition_key,
+        )
+        sql = self._sql["update"]
+        if if_match is not None:
+            sql, params = self._sql["update_if_match"], params + (if_match,)
+
+        def update(conn: sqlite3.Connection) -> Tuple[Optional[int], bool]:
+            if conn.execute(sql, params).rowcount:
+                return conn.execute(self._sql["version"], (document.id,)).fetchone()[0], True
+            exists = conn.execute(
+                self._sql["etag_partition"], (document.id, document.partition_key)
+            ).fetchone()
+            return None, exists is not None
+
+        version, exists = await self.pool.write(update)
+        if version is None:
+            if exists:
+                raise DocumentConflictError(document.id)
+            raise ValueError(f"Document not found: {document.id}")
+
+        document.updated_at = updated_at
+        document.etag = etag
+        document.version = version
         return document
 
-    async def delete(self, id: str, partition_key: Optional[str] = None) -> bool:
-        """Delete a document by ID."""
+    async def delete(
+        self, id: str, partition_key: Optional[str] = None, if_match: Optional[str] = None
+    ) -> bool:
+        """Delete a document by ID, optionally only if its ETag matches."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            if partition_key is not None:
-                result = await db.execute(
-                    f"DELETE FROM {self.table_name} WHERE id = ? AND partition_key = ?",
-                    (id, partition_key),
-                )
-            else:
-                result = await db.execute(
-                    f"DELETE FROM {self.table_name} WHERE id = ?", (id,)
-                )
-            await db.commit()
-
-            return result.rowcount > 0
+        if partition_key is not None:
+            key, params = "_partition", (id, partition_key)
+        else:
+            key, params = "", (id,)
+        etag_sql, delete_sql = self._sql["etag" + key], self._sql["delete" + key]
+
+        def delete(conn: sqlite3.Connection) -> bool:
+            if if_match is not None:
+                current = conn.execute(etag_sql, params).fetchone()
+                if current is None:
+                    return False
+                if current[0] != if_match:
+                    raise DocumentConflictError(id)
+            return conn.execute(delete_sql, params).rowcount > 0
+
+        return await self.pool.write(delete)
 
     async def query(
         self,
-        query: Dict[str, Any],
+        query: Union[Dict[str, Any], Query],
         partition_key: Optional[str] = None,
         max_items: Optional[int] = None,
     ) -> List[T]:
-        """Query documents based on criteria."""
+        """Query documents; filtering, ordering and projection run in SQLite."""
         await self._ensure_initialized()
+        query = Query.of(query)
+        sql, params = self._build_query(query, partition_key, max_items)
+        if self.warn_on_scan:
+            await self._check_plan(query, partition_key, sql, params)
 
-        # Build WHERE clause from query dict
+        rows = await self.pool.read(lambda conn: conn.execute(sql, params).fetchall())
+        return [self._row_to_document(row, query.projection()) for row in rows]
+
+    def _build_query(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str],
+        max_items: Optional[int],
+    ) -> Tuple[str, List[Any]]:
+        query = Query.of(query)
+        where_sql, params = self._build_where(query, partition_key)
+        order_sql = ", ".join(
+            f"{_json_path(path)} {'DESC' if descending else 'ASC'}"
+            for path, descending in query.ordering()
+        )
+        limit = query.effective_limit(max_items)
+        columns = self._select_columns(query.projection())
+        sql = f"SELECT {columns} FROM {self.table_name} WHERE {where_sql}"
+        if order_sql:
+            sql += f" ORDER BY {order_sql}, id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return sql, params
+
+    def _select_columns(self, projection: Optional[List[str]]) -> str:
+        if projection is None:
+            return self.COLUMNS
+        # The projected values, then their JSON types to tell missing
+        # fields (NULL) from explicit nulls ('null')
+        values = ", ".join(_json_path(path) for path in projection)
+        types = ", ".join(f"json_type(data, '$.{path}')" for path in projection)
+        return (
+            f"id, partition_key, json_array({values}), created_at, updated_at, etag, version, "
+            f"json_array({types})"
+        )
+
+    def _build_where(
+        self, query: Union[Dict[str, Any], Query], partition_key: Optional[str]
+    ) -> Tuple[str, List[Any]]:
         where_clauses = []
-        params = []
+        params: List[Any] = []
 
         if partition_key is not None:
             where_clauses.append("partition_key = ?")
             params.append(partition_key)
 
-        # Simple query implementation - matches JSON fields
-        for key, value in query.items():
-            where_clauses.append(f"json_extract(data, '$.{key}') = ?")
-            params.append(
-                json.dumps(value) if isinstance(value, (dict, list)) else value
-            )
+        for condition in Query.of(query).conditions():
+            clause, values = _condition_sql(condition)
+            where_clauses.append(clause)
+            params.extend(values)
 
         where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-        limit_sql = f"LIMIT {max_items}" if max_items else ""
+        return where_sql, params
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                f"SELECT * FROM {self.table_name} WHERE {where_sql} {limit_sql}", params
-            )
-            rows = await cursor.fetchall()
+    async def query_page(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        page_size: int = 100,
+        continuation_token: Optional[str] = None,
+    ) -> Page[T]:
+        """Get one page of matching documents using keyset pagination.
+
+        Pages are ordered by id and the token records the last id returned,
+        so each page is a range scan of the primary key rather than an
+        OFFSET that re-reads every earlier row. Queries with their own
+        ``order_by`` or ``limit`` are paged by offset instead.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        query = Query.of(query)
+        if query.order_by or query.limit:
+            return await super().query_page(query, partition_key, page_size, continuation_token)
 
-            return [self._row_to_document(row) for row in rows]
+        await self._ensure_initialized()
+        projection = query.projection()
+        where_sql, params = self._build_where(query, partition_key)
+        if continuation_token:
+            after = decode_continuation_token(continuation_token).get("after")
+            if after is None:
+                raise ValueError("Invalid continuation token")
+            where_sql += " AND id > ?"
+            params.append(after)
+        sql = (
+            f"SELECT {self._select_columns(projection)} FROM {self.table_name} "
+            f"WHERE {where_sql} ORDER BY id LIMIT ?"
+        )
+        # Fetch one extra row to know whether another page follows
+        params.append(page_size + 1)
+
+        rows = await self.pool.read(lambda conn: conn.execute(sql, params).fetchall())
+        items = [self._row_to_document(row, projection) for row in rows[:page_size]]
+        token = None
+        if len(rows) > page_size:
+            token = encode_continuation_token({"after": items[-1].id})
+        return Page(items, token)
+
+    async def explain_query(
+        self,
+        query: Union[Dict[str, Any], Query],
+        partition_key: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Show how SQLite would run a query and whether it uses an index."""
+        await self._ensure_initialized()
+        sql, params = self._build_query(query, partition_key, max_items)
+        return await self._explain(sql, params)
+
+    async def _explain(self, sql: str, params: List[Any]) -> Dict[str, Any]:
+        def explain(conn: sqlite3.Connection) -> List[tuple]:
+            # EXPLAIN neither reloads a changed schema nor re-plans a cached
+            # statement: read the schema first, then key the statement text
+            # on the schema cookie so new indexes are seen
+            conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            (schema_version,) = conn.execute("PRAGMA schema_version").fetchone()
+            explain_sql = f"EXPLAIN QUERY PLAN {sql} /* schema {schema_version} */"
+            return conn.execute(explain_sql, params).fetchall()
+
+        rows = await self.pool.read(explain)
+        plan = [row[-1] for row in rows]
+        indexes = [
+            match.group(1)
+            for detail in plan
+            for match in [re.search(r"USING (?:COVERING )?INDEX (\S+)", detail)]
+            if match
+        ]
+        return {
+            "sql": sql,
+            "plan": plan,
+            "indexes": indexes,
+            "full_scan": any(detail.startswith("SCAN") for detail in plan),
+        }
+
+    async def _check_plan(
+        self,
+        query: Query,
+        partition_key: Optional[str],
+        sql: str,
+        params: List[Any],
+    ) -> None:
+        """Warn once per query shape that falls back to a full table scan."""
+        shape = (
+            partition_key is not None,
+            tuple(sorted((c.field, c.op) for c in query.conditions())),
+            tuple(query.order_by),
+        )
+        if shape in self._checked_queries:
+            return
+        self._checked_queries.add(shape)
+        explained = await self._explain(sql, params)
+        if explained["full_scan"]:
+            logging.warning(
+                f"Query on {self.db_path} scans the whole table: fields={list(query.filter)}; "
+                f"declare an index with add_index(). Plan: {explained['plan']}"
+            )
 
     async def list_all(
         self, partition_key: Optional[str] = None, max_items: Optional[int] = None
@@ -194,29 +465,132 @@ class LocalDocumentStore(DocumentStore[T]):
         """List all documents in the store."""
         await self._ensure_initialized()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            if partition_key is not None:
-                cursor = await db.execute(
-                    f"SELECT * FROM {self.table_name} WHERE partition_key = ? LIMIT ?",
-                    (partition_key, max_items or -1),
-                )
-            else:
-                cursor = await db.execute(
-                    f"SELECT * FROM {self.table_name} LIMIT ?", (max_items or -1,)
+        if partition_key is not None:
+            sql, params = self._sql["list_partition"], (partition_key, max_items or -1)
+        else:
+            sql, params = self._sql["list"], (max_items or -1,)
+
+        rows = await self.pool.read(lambda conn: conn.execute(sql, params).fetchall())
+        return [self._row_to_document(row) for row in rows]
+
+    def _upsert_params(self, document: T) -> tuple:
+        document.updated_at = datetime.utcnow()
+        document.etag = str(uuid.uuid4())
+        return (
+            document.id,
+            document.partition_key,
+            json.dumps(document.data),
+            document.created_at.isoformat(),
+            document.updated_at.isoformat(),
+            document.etag,
+        )
+
+    async def upsert(self, document: T, if_match: Optional[str] = None) -> T:
+        """Create a document or replace it if it already exists."""
+        if if_match is not None:
+            return await self.update(document, if_match=if_match)
+        result = await self.bulk_upsert([document])
+        if not result.all_succeeded:
+            raise ValueError(result.items[0].error)
+        return document
+
+    async def bulk_upsert(self, documents: List[T]) -> BulkResult[T]:
+        """Upsert many documents in a single transaction."""
+        await self._ensure_initialized()
+        params = [self._upsert_params(document) for document in documents]
+
+        def upsert_all(conn: sqlite3.Connection) -> List[Tuple[Optional[str], int]]:
+            outcomes = []
+            for item in params:
+                try:
+                    if conn.execute(self._sql["upsert"], item).rowcount:
+                        version = conn.execute(self._sql["version"], (item[0],)).fetchone()[0]
+                        outcomes.append((None, version))
+                    else:
+                        outcomes.append(("Document exists in another partition", 0))
+                except sqlite3.Error as e:
+                    # A failed statement only rolls back itself, not the batch
+                    outcomes.append((str(e), 0))
+            return outcomes
+
+        outcomes = await self.pool.write(upsert_all)
+        errors = []
+        for document, (error, version) in zip(documents, outcomes):
+            if error is None:
+                document.version = version
+            errors.append(error)
+        return BulkResult(
+            [
+                BulkItemResult(document.id, error is None, document=document, error=error)
+                for document, error in zip(documents, errors)
+            ]
+        )
+
+    async def bulk_delete(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> BulkResult[T]:
+        """Delete many documents in a single transaction."""
+        await self._ensure_initialized()
+        if partition_key is not None:
+            sql, params = self._sql["delete_partition"], [(id, partition_key) for id in ids]
+        else:
+            sql, params = self._sql["delete"], [(id,) for id in ids]
+
+        def delete_all(conn: sqlite3.Connection) -> List[int]:
+            return [conn.execute(sql, item).rowcount for item in params]
+
+        counts = await self.pool.write(delete_all)
+        return BulkResult(
+            [
+                BulkItemResult(id, count > 0, error=None if count else "Document not found")
+                for id, count in zip(ids, counts)
+            ]
+        )
+
+    async def read_many(
+        self, ids: List[str], partition_key: Optional[str] = None
+    ) -> List[Optional[T]]:
+        """Read many documents with one query per chunk of ids."""
+        await self._ensure_initialized()
+        chunk_size = 500  # Stay under SQLite's bound parameter limit
+
+        def read_all(conn: sqlite3.Connection) -> List[tuple]:
+            rows = []
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start : start + chunk_size]
+                sql = (
+                    f"SELECT {self.COLUMNS} FROM {self.table_name} "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))})"
                 )
+                params: List[Any] = list(chunk)
+                if partition_key is not None:
+                    sql += " AND partition_key = ?"
+                    params.append(partition_key)
+                rows.extend(conn.execute(sql, params).fetchall())
+            return rows
 
-            rows = await cursor.fetchall()
-            return [self._row_to_document(row) for row in rows]
+        found = {row[0]: self._row_to_document(row) for row in await self.pool.read(read_all)}
+        return [found.get(id) for id in ids]
 
-    def _row_to_document(self, row: tuple) -> T:
+    def _row_to_document(self, row: tuple, projection: Optional[List[str]] = None) -> T:
         """Convert a database row to a document."""
         doc = self.document_type()
         doc.id = row[0]
         doc.partition_key = row[1]
-        doc.data = json.loads(row[2])
+        if projection is None:
+            doc.data = json.loads(row[2])
+        else:
+            doc.data = {}
+            for path, value, json_type in zip(projection, json.loads(row[2]), json.loads(row[7])):
+                if json_type in ("true", "false"):
+                    # json_extract turns booleans into 1 and 0
+                    set_path(doc.data, path, json_type == "true")
+                elif json_type is not None:
+                    set_path(doc.data, path, value)
         doc.created_at = datetime.fromisoformat(row[3])
         doc.updated_at = datetime.fromisoformat(row[4])
         doc.etag = row[5]
+        doc.version = row[6]
         return doc
 
 
@@ -227,6 +601,22 @@ class LocalStorageProvider(StorageProvider):
         self.base_path = Path(path)
         self.base_path.mkdir(parents=True, exist_ok=True)
         self._stores: Dict[str, LocalDocumentStore] = {}
+        self._pools: Dict[str, SQLiteConnectionPool] = {}
+        self.reader_connections = kwargs.get("reader_connections", 4)
+        # Container name -> data fields to index
+        self._indexes: Dict[str, List[str]] = {
+            name: list(fields) for name, fields in kwargs.get("indexes", {}).items()
+        }
+        self.warn_on_scan = kwargs.get("warn_on_scan", False)
+
+    def _get_pool(self, container_name: str) -> SQLiteConnectionPool:
+        """Get the shared connection pool for a container's database file"""
+        if container_name not in self._pools:
+            db_path = self.base_path / f"{container_name}.db"
+            self._pools[container_name] = SQLiteConnectionPool(
+                str(db_path), readers=self.reader_connections
+            )
+        return self._pools[container_name]
 
     def get_document_store(
         self, container_name: str, document_type: Type[T]
@@ -235,10 +625,23 @@ class LocalStorageProvider(StorageProvider):
         if container_name not in self._stores:
             db_path = self.base_path / f"{container_name}.db"
             self._stores[container_name] = LocalDocumentStore(
-                str(db_path), "documents", document_type
+                str(db_path),
+                "documents",
+                document_type,
+                pool=self._get_pool(container_name),
+                indexed_fields=self._indexes.get(container_name),
+                warn_on_scan=self.warn_on_scan,
             )
         return self._stores[container_name]
 
+    def declare_indexes(self, container_name: str, fields: List[str]) -> None:
+        """Index data fields of a container as SQLite expression indexes."""
+        declared = self._indexes.setdefault(container_name, [])
+        declared.extend(field for field in fields if field not in declared)
+        if container_name in self._stores:
+            for field in fields:
+                self._stores[container_name].add_index(field)
+
     async def initialize(self) -> None:
         """Initialize the storage provider."""
         # Ensure base directory exists
@@ -246,8 +649,8 @@ class LocalStorageProvider(StorageProvider):
 
     async def close(self) -> None:
         """Close storage provider connections."""
-        # SQLite connections are closed automatically
-        pass
+        for pool in self._pools.values():
+            await pool.close()
 
     async def create_container_if_not_exists(
         self, container_name: str, partition_key_path: str = "/partition_key"
@@ -259,9 +662,14 @@ class LocalStorageProvider(StorageProvider):
 
     async def delete_container(self, container_name: str) -> None:
         """Delete a container/collection."""
+        pool = self._pools.pop(container_name, None)
+        if pool is not None:
+            await pool.close()
+
         db_path = self.base_path / f"{container_name}.db"
-        if db_path.exists():
-            db_path.unlink()
+        for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+            if path.exists():
+                path.unlink()
 
         if container_name in self._stores:
             del self._stores[container_name]
@@ -1,5 +1,6 @@
 """Redis provider implementations for Lightning Core."""
 
 from .event_bus import RedisEventBus
+from .rate_limiter import RedisRateLimiter
 
-__all__ = ["RedisEventBus"]
+__all__ = ["RedisEventBus", "RedisRateLimiter"]
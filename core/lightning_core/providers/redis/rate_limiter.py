@@ -0,0 +1,165 @@
+"""
+Redis-backed distributed rate limiter.
+
+Runs the same GCRA algorithm as the in-process MCP rate limiter, but keeps
+the per-key state in Redis and updates it with an atomic Lua script, so
+every replica shares one limit.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from lightning_core.mcp.proxy import RateLimitDecision, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: bucket key
+# ARGV: emission interval (s), capacity (s), tokens requested
+# Returns {granted, retry_after}. Uses the Redis clock so replicas agree.
+GCRA_RESERVE_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+  tat = now
+end
+local available = math.floor((now + capacity - tat) / interval + 0.000001)
+if available < 1 then
+  return {0, string.format('%.6f', tat + interval - capacity - now)}
+end
+local granted = math.min(available, requested)
+local new_tat = tat + granted * interval
+redis.call('SET', KEYS[1], string.format('%.6f', new_tat),
+           'PX', math.ceil((new_tat - now) * 1000))
+return {granted, '0'}
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """Rate limiter sharing GCRA buckets across replicas through Redis.
+
+    To avoid a round trip per call, each check reserves a small batch of
+    tokens (``reservation_fraction`` of the burst, at most
+    ``max_reservation``) and serves following calls for the same key from
+    the local reservation until it is used up or ``reservation_ttl``
+    passes. Tokens left in an expired reservation are forfeited, which can
+    only make the limit stricter.
+
+    If Redis cannot be reached, checks fall back to the inherited
+    in-process limiter for ``retry_interval`` seconds before Redis is
+    tried again.
+    """
+
+    def __init__(self,
+                 client: Any,
+                 key_prefix: str = "ratelimit:",
+                 reservation_fraction: float = 0.1,
+                 max_reservation: int = 50,
+                 reservation_ttl: float = 1.0,
+                 retry_interval: float = 5.0,
+                 max_tracked_reservations: int = 10000,
+                 idle_expiry_seconds: float = 300.0):
+        super().__init__(idle_expiry_seconds=idle_expiry_seconds)
+        self.client = client
+        self.key_prefix = key_prefix
+        self.reservation_fraction = reservation_fraction
+        self.max_reservation = max_reservation
+        self.reservation_ttl = reservation_ttl
+        self.retry_interval = retry_interval
+        self.max_tracked_reservations = max_tracked_reservations
+        self._script = None
+        # (key, window) -> (reserved tokens, expires at)
+        self._reservations: Dict[Tuple[str, float], Tuple[int, float]] = {}
+        self._unavailable_until = 0.0
+
+        self.remote_calls = 0
+        self.local_hits = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisRateLimiter":
+        """Create a limiter connected to the Redis server at ``url``."""
+        import redis.asyncio as redis
+
+        return cls(redis.from_url(url), **kwargs)
+
+    async def check(self,
+                    key: str,
+                    max_calls: int,
+                    window_seconds: float,
+                    burst: Optional[int] = None) -> RateLimitDecision:
+        """Take one call from the shared bucket for a key."""
+        now = time.monotonic()
+        state_key = (key, window_seconds)
+
+        tokens, expires_at = self._reservations.get(state_key, (0, 0.0))
+        if tokens > 0 and expires_at > now:
+            self._reservations[state_key] = (tokens - 1, expires_at)
+            self.local_hits += 1
+            return RateLimitDecision(allowed=True, remaining=tokens - 1)
+
+        if now < self._unavailable_until:
+            self.fallbacks += 1
+            return self.acquire(key, max_calls, window_seconds, burst)
+
+        interval = window_seconds / max_calls
+        burst = burst or max_calls
+        requested = max(1, min(self.max_reservation, int(burst * self.reservation_fraction)))
+        try:
+            granted, retry_after = await self._reserve(
+                f"{self.key_prefix}{key}:{window_seconds}", interval, interval * burst, requested
+            )
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, limiting locally: {e}")
+            self._unavailable_until = now + self.retry_interval
+            self.fallbacks += 1
+            return self.acquire(key, max_calls, window_seconds, burst)
+
+        self.remote_calls += 1
+        if granted < 1:
+            self._reservations.pop(state_key, None)
+            return RateLimitDecision(allowed=False, retry_after=retry_after)
+
+        if granted > 1:
+            if len(self._reservations) >= self.max_tracked_reservations:
+                self._expire_reservations(now)
+            ttl = min(self.reservation_ttl, interval * granted)
+            self._reservations[state_key] = (granted - 1, now + ttl)
+        else:
+            self._reservations.pop(state_key, None)
+        return RateLimitDecision(allowed=True, remaining=granted - 1)
+
+    async def _reserve(self,
+                       redis_key: str,
+                       interval: float,
+                       capacity: float,
+                       requested: int) -> Tuple[int, float]:
+        if self._script is None:
+            self._script = self.client.register_script(GCRA_RESERVE_SCRIPT)
+        granted, retry_after = await self._script(
+            keys=[redis_key], args=[interval, capacity, requested]
+        )
+        return int(granted), float(retry_after)
+
+    def _expire_reservations(self, now: float) -> None:
+        for state_key in [k for k, (_, expires_at) in self._reservations.items()
+                          if expires_at <= now]:
+            del self._reservations[state_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get round trip, local hit and fallback counts."""
+        checks = self.remote_calls + self.local_hits + self.fallbacks
+        return {
+            "remote_calls": self.remote_calls,
+            "local_hits": self.local_hits,
+            "fallbacks": self.fallbacks,
+            "local_hit_ratio": self.local_hits / checks if checks else 0.0,
+            "reservations": len(self._reservations),
+        }
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -23,6 +23,13 @@ from .abstractions import (
     StorageProvider,
     CircuitBreakerConfig,
 )
+from .abstractions.caching import CachePolicy, CachingStorageProvider
+from .abstractions.compression import CompressingStorageProvider, CompressionPolicy
+from .abstractions.write_behind import (
+    WriteBehindPolicy,
+    WriteBehindStorageProvider,
+    WriteDurability,
+)
 from .abstractions.resilient_factory import ResilientProviderFactory
 from .mcp import (
     MCPRegistry,
@@ -31,7 +38,12 @@ from .mcp import (
     MCPDriver,
 )
 from .mcp.config import MCPConfigLoader
-from .vextir_os.security import SecurityManager
+from .vextir_os.audit import StorageAuditSink
+from .vextir_os.security import (
+    SecurityManager,
+    close_security_manager,
+    get_security_manager,
+)
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T", bound=Document)
@@ -78,6 +90,7 @@ class LightningRuntime:
         self._mcp_security_proxy: Optional[MCPSecurityProxy] = None
         self._mcp_driver: Optional[MCPDriver] = None
         self._security_manager: Optional[SecurityManager] = None
+        self._usage_task: Optional[asyncio.Task] = None
 
         # Tool registry
         self._tool_registry = None
@@ -125,7 +138,45 @@ class LightningRuntime:
     def storage(self) -> StorageProvider:
         """Get the storage provider instance."""
         if not self._storage:
-            self._storage = self._factory.create_storage_provider(self.config)
+            storage = self._factory.create_storage_provider(self.config)
+            if self.config.storage_compression_containers:
+                # Innermost, so buffers and caches hold uncompressed documents
+                policy = CompressionPolicy(
+                    threshold_bytes=self.config.storage_compression_threshold_bytes,
+                    algorithm=self.config.storage_compression_algorithm,
+                    offload_threshold_bytes=self.config.storage_offload_threshold_bytes,
+                )
+                storage = CompressingStorageProvider(
+                    storage,
+                    {name: policy for name in self.config.storage_compression_containers},
+                    blob_store=(
+                        self._factory.create_blob_store(self.config)
+                        if self.config.storage_offload_threshold_bytes > 0
+                        else None
+                    ),
+                )
+            if self.config.storage_write_behind_containers:
+                # Below the cache, so cached reads never miss buffered writes
+                policy = WriteBehindPolicy(
+                    flush_interval_seconds=self.config.storage_write_behind_interval_seconds,
+                    durability=WriteDurability(self.config.storage_write_behind_durability),
+                )
+                storage = WriteBehindStorageProvider(
+                    storage,
+                    {name: policy for name in self.config.storage_write_behind_containers},
+                )
+            if self.config.storage_cache_ttl_seconds > 0:
+                policy = CachePolicy(ttl_seconds=self.config.storage_cache_ttl_seconds)
+                containers = self.config.storage_cache_containers
+                storage = CachingStorageProvider(
+                    storage,
+                    policies={name: policy for name in containers},
+                    default_policy=None if containers else policy,
+                    # No invalidation bus: the cloud event bus delivers each
+                    # event to one competing consumer, not to every replica,
+                    # so other processes' entries only expire by TTL
+                )
+            self._storage = storage
         return self._storage
 
     @property
@@ -174,7 +225,15 @@ class LightningRuntime:
             if not self._security_manager:
                 from .vextir_os.security import SecurityManager
                 self._security_manager = SecurityManager()
-            self._mcp_security_proxy = MCPSecurityProxy(self._security_manager)
+            rate_limiter = None
+            if self.config.rate_limit_connection_string:
+                from .providers.redis import RedisRateLimiter
+                rate_limiter = RedisRateLimiter.from_url(
+                    self.config.rate_limit_connection_string
+                )
+            self._mcp_security_proxy = MCPSecurityProxy(
+                self._security_manager, rate_limiter=rate_limiter
+            )
         return self._mcp_security_proxy
 
     @property
@@ -220,9 +279,38 @@ class LightningRuntime:
         except Exception as e:
             logger.error(f"Failed to start event bus: {e}")
 
+        # Persist the audit log in runtime storage
+        if self.config.audit_log_container:
+            get_security_manager().set_audit_sink(
+                StorageAuditSink(
+                    self.storage.get_document_store(self.config.audit_log_container, Document)
+                )
+            )
+
+        # Restore usage counters so limits survive restarts
+        if self.config.usage_save_interval_seconds > 0:
+            try:
+                manager = get_security_manager()
+                loaded = await manager.load_usage(self._usage_store())
+                logger.info(f"Loaded usage counters for {loaded} users")
+            except Exception as e:
+                logger.error(f"Failed to load usage counters: {e}")
+            self._usage_task = asyncio.ensure_future(self._save_usage_periodically())
+
         self._initialized = True
         logger.info("Lightning Runtime services initialized")
 
+    def _usage_store(self):
+        return self.storage.get_document_store("usage_counters", Document)
+
+    async def _save_usage_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.usage_save_interval_seconds)
+            try:
+                await get_security_manager().save_usage(self._usage_store())
+            except Exception as e:
+                logger.error(f"Failed to save usage counters: {e}")
+
     async def initialize_mcp(self, load_config: bool = True) -> None:
         """Initialize MCP services."""
         if self._mcp_initialized:
@@ -279,10 +367,35 @@ class LightningRuntime:
                 await self._mcp_sandbox.cleanup_all()
             self._mcp_initialized = False
 
+        # Release the shared rate limiter's connections
+        if self._mcp_security_proxy:
+            close = getattr(self._mcp_security_proxy.rate_limiter, "close", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception as e:
+                    logger.error(f"Failed to close rate limiter: {e}")
+
         # Stop event bus
         if self._event_bus:
             await self._event_bus.stop()
 
+        # Save usage counters and flush buffered audit records while
+        # storage is still open
+        if self._usage_task:
+            self._usage_task.cancel()
+            self._usage_task = None
+            try:
+                await get_security_manager().save_usage(self._usage_store())
+            except Exception as e:
+                logger.error(f"Failed to save usage counters: {e}")
+        try:
+            await close_security_manager()
+            if self._security_manager:
+                await self._security_manager.audit.close()
+        except Exception as e:
+            logger.error(f"Failed to flush audit log: {e}")
+
         # Close storage
         if self._storage:
             await self._storage.close()
@@ -43,10 +43,12 @@ from .events import (
     WorkerTaskEvent,
 )
 from .universal_processor import (
+    EventAuthorizationError,
     EventProcessingError,
     UniversalEventProcessor,
     get_universal_processor,
     process_event_message,
+    process_event_messages,
 )
 
 __all__ = [
@@ -86,6 +88,8 @@ __all__ = [
     # Processing
     "UniversalEventProcessor",
     "EventProcessingError",
+    "EventAuthorizationError",
     "get_universal_processor",
     "process_event_message",
+    "process_event_messages",
 ]
@@ -0,0 +1,359 @@
+"""
+Vextir OS Audit Log - Buffered, batched persistence of authorization records
+"""
+
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from ..abstractions.storage import Document, DocumentStore
+
+PARTITION_FORMAT = "%Y-%m-%dT%H"  # Hourly partitions, a prefix of isoformat()
+MAX_QUERY_PARTITIONS = 31 * 24  # Queries read at most a month of partitions
+
+
+def partition_for(timestamp: str) -> str:
+    """Get the hourly partition for an ISO timestamp"""
+    return timestamp[:13]
+
+
+def _partitions_between(start: datetime, end: datetime) -> List[str]:
+    """Hourly partitions from ``end`` back to ``start``, newest first
+
+    At most ``MAX_QUERY_PARTITIONS`` are returned; older ones are skipped.
+    """
+    partitions = []
+    current = end.replace(minute=0, second=0, microsecond=0)
+    first = start.replace(minute=0, second=0, microsecond=0)
+    while current >= first:
+        if len(partitions) >= MAX_QUERY_PARTITIONS:
+            logging.warning(
+                f"Audit query from {start.isoformat()} spans more than "
+                f"{MAX_QUERY_PARTITIONS} hourly partitions; reading the newest only"
+            )
+            break
+        partitions.append(current.strftime(PARTITION_FORMAT))
+        current -= timedelta(hours=1)
+    return partitions
+
+
+def _matches(
+    record: Dict[str, Any], start: str, end: str, user_id: Optional[str]
+) -> bool:
+    if user_id is not None and record.get("user_id") != user_id:
+        return False
+    return start <= record.get("timestamp", "") <= end
+
+
+class AuditSink(ABC):
+    """Destination for batches of audit records"""
+
+    @abstractmethod
+    async def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Persist a batch of records, raising on failure"""
+        pass
+
+    @abstractmethod
+    async def query(
+        self,
+        start: datetime,
+        end: datetime,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Get records between ``start`` and ``end``, newest first"""
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class StorageAuditSink(AuditSink):
+    """Audit sink backed by a ``DocumentStore``
+
+    Each flushed batch is written as one document per hourly partition, so
+    a flush costs one write per hour it spans and a query only reads the
+    partitions inside its time range.
+    """
+
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    async def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        by_partition: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_partition.setdefault(partition_for(record["timestamp"]), []).append(record)
+        for partition, partition_records in by_partition.items():
+            await self.store.create(
+                Document(partition_key=partition, data={"records": partition_records})
+            )
+
+    async def query(
+        self,
+        start: datetime,
+        end: datetime,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        results: List[Dict[str, Any]] = []
+        for partition in _partitions_between(start, end):
+            records = [
+                record
+                for document in await self.store.list_all(partition_key=partition)
+                for record in document.data.get("records", [])
+                if _matches(record, start_iso, end_iso, user_id)
+            ]
+            records.sort(key=lambda r: r["timestamp"], reverse=True)
+            results.extend(records)
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+
+class FileAuditSink(AuditSink):
+    """Audit sink writing JSON lines to rotating append-only files
+
+    Files are named ``audit-<partition>.<segment>.jsonl``; a new segment is
+    started once the current one reaches ``max_bytes``, and the oldest
+    files are removed beyond ``max_files``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 10 * 1024 * 1024, max_files: int = 168):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._segments: Dict[str, int] = {}
+
+    def _files_for(self, partition: str) -> List[Path]:
+        files = self.directory.glob(f"audit-{partition}.*.jsonl")
+        return sorted(files, key=lambda p: int(p.name.rsplit(".", 2)[1]))
+
+    def _segment_path(self, partition: str, size: int) -> Path:
+        segment = self._segments.get(partition)
+        if segment is None:
+            existing = self._files_for(partition)
+            segment = int(existing[-1].name.rsplit(".", 2)[1]) if existing else 0
+        path = self.directory / f"audit-{partition}.{segment}.jsonl"
+        if path.exists() and path.stat().st_size + size > self.max_bytes:
+            segment += 1
+            path = self.directory / f"audit-{partition}.{segment}.jsonl"
+        self._segments[partition] = segment
+        return path
+
+    def _write(self, records: List[Dict[str, Any]]):
+        by_partition: Dict[str, List[str]] = {}
+        for record in records:
+            by_partition.setdefault(partition_for(record["timestamp"]), []).append(
+                json.dumps(record, default=str)
+            )
+        for partition, lines in by_partition.items():
+            payload = "\n".join(lines) + "\n"
+            with open(self._segment_path(partition, len(payload)), "a", encoding="utf-8") as f:
+                f.write(payload)
+        self._enforce_retention()
+
+    def _enforce_retention(self):
+        files = sorted(self.directory.glob("audit-*.jsonl"), key=os.path.getmtime)
+        for path in files[: max(0, len(files) - self.max_files)]:
+            path.unlink()
+
+    def _read(self, start: datetime, end: datetime, user_id: Optional[str], limit: int):
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        results: List[Dict[str, Any]] = []
+        for partition in _partitions_between(start, end):
+            records = []
+            for path in self._files_for(partition):
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        record = json.loads(line)
+                        if _matches(record, start_iso, end_iso, user_id):
+                            records.append(record)
+            records.sort(key=lambda r: r["timestamp"], reverse=True)
+            results.extend(records)
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    async def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._write, records)
+
+    async def query(
+        self,
+        start: datetime,
+        end: datetime,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._read, start, end, user_id, limit
+        )
+
+
+class AuditLog:
+    """Bounded in-memory audit log with asynchronous batched persistence
+
+    ``record`` never blocks: entries go into a ring of recent records and,
+    when a sink is configured, into a bounded buffer that a background task
+    flushes in batches of ``batch_size`` or every ``flush_interval``
+    seconds. When the buffer is full new records are dropped and counted
+    rather than growing memory without limit.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[AuditSink] = None,
+        max_recent: int = 10000,
+        max_buffer: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
+        self.sink = sink
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=max_recent)
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.recorded = 0
+        self.persisted = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    def set_sink(self, sink: Optional[AuditSink]):
+        self.sink = sink
+
+    def record(self, entry: Dict[str, Any]):
+        """Record an audit entry"""
+        self.recorded += 1
+        self.recent.append(entry)
+        if self.sink is None:
+            return
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self._buffer.append(entry)
+        self._ensure_flusher()
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and not self._flusher.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Flushed on the next explicit flush()
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if not self._buffer:
+                # Idle: stop until the next record restarts the flusher
+                self._flusher = None
+                return
+
+    async def flush(self) -> int:
+        """Write buffered records to the sink; returns records written"""
+        if self.sink is None:
+            return 0
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                count = min(self.batch_size, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(count)]
+                try:
+                    await self.sink.write_batch(batch)
+                except Exception as e:
+                    self.failed_batches += 1
+                    logging.error(f"Failed to persist {len(batch)} audit records: {e}")
+                    # Put the batch back for the next flush, as space allows
+                    space = self.max_buffer - len(self._buffer)
+                    self._buffer.extendleft(reversed(batch[:space]))
+                    self.dropped += max(0, len(batch) - space)
+                    break
+                written += len(batch)
+                self.persisted += len(batch)
+        return written
+
+    async def close(self):
+        """Flush remaining records and stop the background flusher"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        if self.sink is not None:
+            await self.sink.close()
+
+    def get_recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get the most recent entries, oldest first"""
+        if limit >= len(self.recent):
+            return list(self.recent)
+        entries = []
+        for entry in reversed(self.recent):
+            if len(entries) >= limit:
+                break
+            entries.append(entry)
+        entries.reverse()
+        return entries
+
+    async def query(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Get entries in a time range, newest first
+
+        Reads the sink's time partitions when persistence is configured,
+        otherwise the in-memory ring of recent entries.
+        """
+        end = end or datetime.utcnow()
+        start = start or end - timedelta(hours=24)
+        if self.sink is not None:
+            await self.flush()
+            return await self.sink.query(start, end, user_id=user_id, limit=limit)
+
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        results = []
+        for entry in reversed(self.recent):
+            if entry.get("timestamp", "") < start_iso:
+                break
+            if _matches(entry, start_iso, end_iso, user_id):
+                results.append(entry)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "persisted": self.persisted,
+            "buffered": len(self._buffer),
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+            "sink": type(self.sink).__name__ if self.sink else None,
+        }
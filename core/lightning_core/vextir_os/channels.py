@@ -8,7 +8,7 @@ communication interfaces for agents within the existing event bus.
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Set
@@ -227,10 +227,186 @@ class ErrorChannel(Channel):
         return await self.publish(data)
 
 
+class TelemetryLevel(Enum):
+    """How much per-event channel telemetry an agent publishes"""
+    FULL = "full"             # Every status change and activity, immediately
+    COALESCED = "coalesced"   # Status changes coalesced, activities sampled and batched
+    ERRORS = "errors"         # Only errors and error status
+    OFF = "off"               # Nothing from per-event telemetry
+
+
+@dataclass
+class TelemetryConfig:
+    """Per-agent configuration for channel telemetry"""
+    level: TelemetryLevel = TelemetryLevel.COALESCED
+    status_window_seconds: float = 0.25    # Coalesce status transitions within this window
+    activity_sample_rate: float = 1.0      # Fraction of activity records kept
+    activity_batch_size: int = 50          # Publish a batch once this many records are buffered
+    activity_flush_seconds: float = 1.0    # Publish buffered records at least this often
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TelemetryConfig":
+        """Build config from a driver config section, ignoring unknown keys"""
+        known = {f.name for f in fields(cls)}
+        data = dict(data or {})
+        unknown = sorted(set(data) - known)
+        if unknown:
+            logging.warning(f"Ignoring unknown telemetry config keys: {', '.join(unknown)}")
+        data = {key: value for key, value in data.items() if key in known}
+        if "level" in data:
+            data["level"] = TelemetryLevel(data["level"])
+        return cls(**data)
+
+
+class ChannelTelemetry:
+    """Coalesces and samples the status and activity telemetry of an agent
+
+    Status transitions are held for ``status_window_seconds`` and only the
+    latest status is published, and only if it differs from the last one
+    published, so busy/idle flaps within the window cost no bus traffic.
+    Activity records are sampled and published in batches as a single
+    ``activity_type="batch"`` message. Error status is published at once.
+    """
+
+    def __init__(self, status: StatusChannel, activity: ActivityChannel,
+                 config: Optional[TelemetryConfig] = None):
+        self.status_channel = status
+        self.activity_channel = activity
+        self.config = config or TelemetryConfig()
+
+        self.current_status: Optional[str] = None
+        self._published_status: Optional[str] = None
+        self._pending_status: Optional[Dict[str, Any]] = None
+        self._activities: List[Dict[str, Any]] = []
+        self._sample_credit = 0.0
+        self._status_task: Optional[asyncio.Task] = None
+        self._activity_task: Optional[asyncio.Task] = None
+
+        self.status_reports = 0
+        self.status_published = 0
+        self.activity_reports = 0
+        self.activity_sampled_out = 0
+        self.activity_batches = 0
+
+    async def report_status(self, status: str, activity: str = "",
+                            details: Optional[Dict[str, Any]] = None):
+        """Record a status transition"""
+        self.status_reports += 1
+        self.current_status = status
+        level = self.config.level
+
+        if level == TelemetryLevel.OFF or (level == TelemetryLevel.ERRORS and status != "error"):
+            return
+        if level == TelemetryLevel.FULL or status == "error":
+            self._pending_status = None
+            await self._publish_status(status, activity, details)
+            return
+
+        self._pending_status = {"status": status, "activity": activity, "details": details}
+        if self._status_task is None or self._status_task.done():
+            self._status_task = asyncio.create_task(
+                self._flush_later(
+                    self.config.status_window_seconds, self._flush_status, "_status_task"
+                )
+            )
+
+    async def report_activity(self, activity_type: str, description: str,
+                              details: Optional[Dict[str, Any]] = None):
+        """Record an activity, subject to sampling and batching"""
+        self.activity_reports += 1
+        level = self.config.level
+
+        if level in (TelemetryLevel.OFF, TelemetryLevel.ERRORS):
+            return
+        if level == TelemetryLevel.FULL:
+            await self.activity_channel.report_activity(activity_type, description, details)
+            return
+
+        # Deterministic sampling: keep records as sampling credit accumulates
+        self._sample_credit += self.config.activity_sample_rate
+        if self._sample_credit < 1.0:
+            self.activity_sampled_out += 1
+            return
+        self._sample_credit -= 1.0
+
+        record = {
+            "activity_type": activity_type,
+            "description": description,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        if details:
+            record.update(details)
+        self._activities.append(record)
+
+        if len(self._activities) >= self.config.activity_batch_size:
+            await self._flush_activities()
+        elif self._activity_task is None or self._activity_task.done():
+            self._activity_task = asyncio.create_task(
+                self._flush_later(
+                    self.config.activity_flush_seconds, self._flush_activities, "_activity_task"
+                )
+            )
+
+    async def flush(self):
+        """Publish any pending status and buffered activities now"""
+        for task in (self._status_task, self._activity_task):
+            if task is not None and not task.done() and task is not asyncio.current_task():
+                task.cancel()
+        await self._flush_status()
+        await self._flush_activities()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counts of reported versus published telemetry"""
+        return {
+            "level": self.config.level.value,
+            "current_status": self.current_status,
+            "status_reports": self.status_reports,
+            "status_published": self.status_published,
+            "activity_reports": self.activity_reports,
+            "activity_sampled_out": self.activity_sampled_out,
+            "activity_batches": self.activity_batches,
+            "activity_buffered": len(self._activities),
+        }
+
+    async def _flush_later(self, delay: float, flush: Callable, task_attr: str):
+        await asyncio.sleep(delay)
+        # Release the timer before publishing, so reports arriving while the
+        # publish is in flight schedule a flush of their own
+        if getattr(self, task_attr) is asyncio.current_task():
+            setattr(self, task_attr, None)
+        try:
+            await flush()
+        except Exception as e:
+            logging.error(f"Error flushing telemetry for agent {self.status_channel.agent_id}: {e}")
+
+    async def _flush_status(self):
+        pending, self._pending_status = self._pending_status, None
+        if pending and pending["status"] != self._published_status:
+            await self._publish_status(pending["status"], pending["activity"], pending["details"])
+
+    async def _publish_status(self, status: str, activity: str,
+                              details: Optional[Dict[str, Any]]):
+        self._published_status = status
+        self.status_published += 1
+        await self.status_channel.report_status(status, activity, details)
+
+    async def _flush_activities(self):
+        if not self._activities:
+            return
+        activities, self._activities = self._activities, []
+        self.activity_batches += 1
+        await self.activity_channel.report_activity(
+            "batch",
+            f"{len(activities)} activities",
+            {"activities": activities, "count": len(activities)},
+        )
+
+
 class AgentChannelManager:
     """Manages all channels for an agent"""
     
-    def __init__(self, agent_id: str, event_bus: Optional[EventBus] = None):
+    def __init__(self, agent_id: str, event_bus: Optional[EventBus] = None,
+                 telemetry_config: Optional[TelemetryConfig] = None):
         self.agent_id = agent_id
         self.event_bus = event_bus or get_event_bus()
         
@@ -240,6 +416,9 @@ class AgentChannelManager:
         self.health = HealthChannel(agent_id, event_bus)
         self.activity = ActivityChannel(agent_id, event_bus)
         self.error = ErrorChannel(agent_id, event_bus)
+
+        # Coalesced per-event status and activity reporting
+        self.telemetry = ChannelTelemetry(self.status, self.activity, telemetry_config)
         
         # Custom channels for specific agent types
         self._custom_channels: Dict[str, Channel] = {}
@@ -7,7 +7,9 @@ supporting both local and cloud deployment scenarios.
 
 import logging
 import os
-from typing import Any, Dict, List, Tuple, Type
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from .drivers import Driver as BaseDriver, DriverManifest
 from .registries import get_driver_registry
@@ -15,40 +17,72 @@ from .registries import get_driver_registry
 logger = logging.getLogger(__name__)
 
 
-async def initialize_all_drivers():
+async def initialize_all_drivers(lazy: Optional[bool] = None) -> Dict[str, Any]:
     """
     Initialize all drivers for the Vextir OS system.
 
-    This function registers all available drivers with the driver registry.
-    It handles both core drivers and optional drivers based on configuration.
+    This function registers all available drivers with the driver registry
+    and starts them in parallel, respecting the dependencies declared in
+    their manifests. It handles both core drivers and optional drivers
+    based on configuration.
+
+    Args:
+        lazy: Start every driver on its first routed event instead of now.
+            Defaults to the LAZY_DRIVER_STARTUP environment variable, which
+            is useful for serverless cold starts.
+
+    Returns:
+        Startup report with per-driver startup time in milliseconds
     """
     registry = get_driver_registry()
+    if lazy is None:
+        lazy = os.getenv("LAZY_DRIVER_STARTUP", "false").lower() == "true"
 
     # Get all driver definitions
     drivers_to_register = get_driver_definitions()
 
-    # Register each driver
-    successful = 0
+    # Register each driver, deferring startup
     failed = 0
 
     for manifest, driver_class in drivers_to_register:
         try:
-            await registry.register_driver(manifest, driver_class)
+            if lazy:
+                manifest = replace(manifest, lazy=True)
+            await registry.register_driver(manifest, driver_class, start=False)
             logger.info(f"Registered driver: {manifest.id}")
-            successful += 1
         except Exception as e:
             logger.error(f"Failed to register driver {manifest.id}: {e}")
             failed += 1
 
+    # Start registered drivers in dependency order, in parallel
+    started = time.perf_counter()
+    results = await registry.start_all()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    failed += sum(1 for error in results.values() if error)
+    successful = len(results) - sum(1 for error in results.values() if error)
+    startup_times = registry.get_startup_report()
+
     logger.info(
-        f"Driver initialization complete: {successful} successful, {failed} failed"
+        f"Driver initialization complete in {elapsed_ms:.1f}ms: "
+        f"{successful} successful, {failed} failed"
     )
+    for driver_id, startup_ms in sorted(
+        startup_times.items(), key=lambda item: -(item[1] or 0)
+    ):
+        logger.debug(f"Driver {driver_id} startup: {startup_ms or 0:.1f}ms")
 
     if failed > 0:
         logger.warning(
             f"{failed} drivers failed to initialize - system may have reduced functionality"
         )
 
+    return {
+        "total_ms": elapsed_ms,
+        "drivers": startup_times,
+        "errors": {d: error for d, error in results.items() if error},
+    }
+
 
 def get_driver_definitions() -> List[Tuple[DriverManifest, Type[BaseDriver]]]:
     """
@@ -179,16 +213,16 @@ async def initialize_required_drivers():
         missing = set(required_ids) - registered_ids
         logger.warning(f"Missing required drivers: {missing}")
 
-    # Register required drivers
+    # Register required drivers, then start them in dependency order
     for manifest, driver_class in required_drivers:
-        try:
-            await registry.register_driver(manifest, driver_class)
-            logger.info(f"Registered required driver: {manifest.id}")
-        except Exception as e:
-            logger.error(f"Failed to register required driver {manifest.id}: {e}")
-            raise RuntimeError(
-                f"Required driver {manifest.id} failed to initialize"
-            ) from e
+        await registry.register_driver(manifest, driver_class, start=False)
+        logger.info(f"Registered required driver: {manifest.id}")
+
+    results = await registry.start_all()
+    for driver_id, error in results.items():
+        if error:
+            logger.error(f"Failed to register required driver {driver_id}: {error}")
+            raise RuntimeError(f"Required driver {driver_id} failed to initialize")
 
     logger.info(
         f"Required driver initialization complete: {len(required_drivers)} drivers"
@@ -4,6 +4,7 @@ Vextir OS Driver Framework - Standardized driver interface and registry
 
 import asyncio
 import logging
+import time
 import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -11,9 +12,27 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Type, Union
 
+from ..abstractions.health import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerOpenError,
+)
 from .event_bus import EventBus, get_event_bus
 from .events import Event
-from .channels import AgentChannelManager, ChannelMessage
+from .metrics import LatencyHistogram
+from .channels import AgentChannelManager, ChannelMessage, TelemetryConfig
+
+# Default breaker for drivers: trip quickly and probe again after a few seconds
+# so a transient provider failure only sheds load briefly.
+DEFAULT_DRIVER_CIRCUIT_CONFIG = CircuitBreakerConfig(
+    failure_threshold=3,
+    success_threshold=1,
+    timeout_seconds=5,
+    half_open_requests=1,
+)
+
+# Driver statuses that are eligible for event routing
+ROUTABLE_STATUSES = ("running", "degraded")
 
 
 class DriverType(Enum):
@@ -46,9 +65,11 @@ class DriverManifest:
     driver_type: DriverType
     capabilities: List[str]
     resource_requirements: ResourceSpec
-    dependencies: List[str] = field(default_factory=list)
+    dependencies: List[str] = field(default_factory=list)  # driver IDs started first
     config_schema: Optional[Dict[str, Any]] = None
     enabled: bool = True
+    lazy: bool = False  # start on first routed event instead of at startup
+    startup_timeout_seconds: Optional[float] = None
 
 
 class Driver(ABC):
@@ -104,7 +125,12 @@ class AgentDriver(Driver):
         self._completions_api = None
         
         # Initialize standard agent channels
-        self.channels = AgentChannelManager(self.manifest.id, self.event_bus)
+        self.channels = AgentChannelManager(
+            self.manifest.id,
+            self.event_bus,
+            TelemetryConfig.from_dict(config.get("telemetry") if config else None),
+        )
+        self.telemetry = self.channels.telemetry
         self._setup_command_handler()
 
     async def get_model_client(self):
@@ -198,14 +224,19 @@ class AgentDriver(Driver):
     
     async def shutdown(self):
         """Shutdown agent driver with channel reporting"""
+        await self.telemetry.flush()
         await self.channels.status.report_status("shutting_down", "Agent driver stopping")
         await super().shutdown()
         await self.channels.status.report_status("stopped", "Agent driver stopped")
     
     async def handle_event(self, event: Event) -> List[Event]:
-        """Handle events with automatic activity reporting"""
+        """Handle events with automatic activity reporting
+
+        Status and activity go through the agent's telemetry aggregator,
+        which coalesces and samples them according to its telemetry config.
+        """
         # Report activity start
-        await self.channels.activity.report_activity(
+        await self.telemetry.report_activity(
             "event_processing",
             f"Processing event: {event.type}",
             {"event_id": event.id, "event_type": event.type}
@@ -213,13 +244,13 @@ class AgentDriver(Driver):
         
         try:
             # Set status to busy
-            await self.channels.status.report_status("busy", f"Processing {event.type}")
+            await self.telemetry.report_status("busy", f"Processing {event.type}")
             
             # Call subclass implementation
             result_events = await self._handle_event_impl(event)
             
             # Report successful completion
-            await self.channels.activity.report_activity(
+            await self.telemetry.report_activity(
                 "event_completed",
                 f"Successfully processed event: {event.type}",
                 {
@@ -230,7 +261,7 @@ class AgentDriver(Driver):
             )
             
             # Set status back to idle
-            await self.channels.status.report_status("idle", "Ready for next event")
+            await self.telemetry.report_status("idle", "Ready for next event")
             
             return result_events
             
@@ -247,7 +278,7 @@ class AgentDriver(Driver):
             )
             
             # Set status to error
-            await self.channels.status.report_status("error", f"Error processing {event.type}")
+            await self.telemetry.report_status("error", f"Error processing {event.type}")
             
             # Re-raise the exception
             raise
@@ -296,29 +327,60 @@ class DriverInstance:
 
     driver: Driver
     manifest: DriverManifest
-    status: str = "stopped"  # stopped, starting, running, error
+    status: str = "stopped"  # stopped, starting, running, degraded, error
     error_message: Optional[str] = None
     last_activity: Optional[datetime] = None
     event_count: int = 0
+    error_count: int = 0
+    rejected_count: int = 0
+    circuit_breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    max_concurrent: int = 10  # Bulkhead size: events beyond it are shed
+    timeout_seconds: Optional[float] = None
+    in_flight: int = 0
+    startup_time_ms: Optional[float] = None
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
 
 class DriverRegistry:
     """Registry for managing drivers in Vextir OS"""
 
-    def __init__(self, event_bus: EventBus):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        circuit_config: Optional[CircuitBreakerConfig] = None,
+    ):
         self.event_bus = event_bus
         self.manifests: Dict[str, DriverManifest] = {}
         self.driver_classes: Dict[str, Type[Driver]] = {}
         self.instances: Dict[str, DriverInstance] = {}
         self.capability_map: Dict[str, List[str]] = {}  # capability -> driver_ids
+        self.circuit_config = circuit_config or DEFAULT_DRIVER_CIRCUIT_CONFIG
+        self._circuit_configs: Dict[str, CircuitBreakerConfig] = {}
+        self.configs: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.default_startup_timeout: float = 30
+        self._start_locks: Dict[str, asyncio.Lock] = {}
+        # Set when a driver's start attempt finishes, successful or not
+        self._startups: Dict[str, asyncio.Event] = {}
+
+    def set_circuit_config(self, driver_id: str, config: CircuitBreakerConfig):
+        """Override the circuit breaker configuration for a single driver.
+
+        Takes effect the next time the driver is started.
+        """
+        self._circuit_configs[driver_id] = config
 
     async def register_driver(
         self,
         manifest: DriverManifest,
         driver_class: Type[Driver],
         config: Optional[Dict[str, Any]] = None,
+        start: bool = True,
     ):
-        """Register a driver with the system"""
+        """Register a driver with the system
+
+        With ``start=False`` the driver is only registered; use ``start_all``
+        to bring registered drivers up in dependency order.
+        """
         if manifest.id in self.manifests:
             raise ValueError(f"Driver {manifest.id} already registered")
 
@@ -329,6 +391,7 @@ class DriverRegistry:
         # Store manifest and class
         self.manifests[manifest.id] = manifest
         self.driver_classes[manifest.id] = driver_class
+        self.configs[manifest.id] = config
 
         # Update capability map
         for capability in manifest.capabilities:
@@ -336,8 +399,8 @@ class DriverRegistry:
                 self.capability_map[capability] = []
             self.capability_map[capability].append(manifest.id)
 
-        # Create instance if enabled
-        if manifest.enabled:
+        # Create instance if enabled (lazy drivers start on first event)
+        if start and manifest.enabled and not manifest.lazy:
             await self.start_driver(manifest.id, config)
 
         logging.info(f"Registered driver: {manifest.id} ({manifest.driver_type.value})")
@@ -354,28 +417,175 @@ class DriverRegistry:
 
         manifest = self.manifests[driver_id]
         driver_class = self.driver_classes[driver_id]
+        if config is None:
+            config = self.configs.get(driver_id)
+        timeout = manifest.startup_timeout_seconds or self.default_startup_timeout
+        started = time.perf_counter()
+        startup = self._startups[driver_id] = asyncio.Event()
 
         try:
-            # Create driver instance
+            # Create driver instance with its own breaker and bulkhead
             driver = driver_class(manifest, config)
+            resources = driver.get_resource_requirements() or manifest.resource_requirements
+            max_concurrent = max(1, resources.max_concurrent)
             instance = DriverInstance(
-                driver=driver, manifest=manifest, status="starting"
+                driver=driver,
+                manifest=manifest,
+                status="starting",
+                circuit_breaker=CircuitBreaker(
+                    self._circuit_configs.get(driver_id, self.circuit_config)
+                ),
+                max_concurrent=max_concurrent,
+                timeout_seconds=resources.timeout_seconds or None,
             )
             self.instances[driver_id] = instance
 
             # Initialize driver
-            await driver.initialize()
+            try:
+                await asyncio.wait_for(driver.initialize(), timeout)
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError(
+                    f"Driver {driver_id} did not initialize within {timeout}s"
+                ) from None
             instance.status = "running"
             instance.last_activity = datetime.utcnow()
+            instance.startup_time_ms = (time.perf_counter() - started) * 1000
 
-            logging.info(f"Started driver: {driver_id}")
+            logging.info(
+                f"Started driver: {driver_id} in {instance.startup_time_ms:.1f}ms"
+            )
 
         except Exception as e:
             if driver_id in self.instances:
                 self.instances[driver_id].status = "error"
                 self.instances[driver_id].error_message = str(e)
+                self.instances[driver_id].startup_time_ms = (
+                    time.perf_counter() - started
+                ) * 1000
             logging.error(f"Failed to start driver {driver_id}: {e}")
             raise
+        finally:
+            del self._startups[driver_id]
+            startup.set()
+
+    async def _wait_started(self, driver_id: str) -> bool:
+        """Wait out a driver's startup if in progress; True if it is routable"""
+        startup = self._startups.get(driver_id)
+        if startup is not None:
+            await startup.wait()
+        instance = self.instances.get(driver_id)
+        return instance is not None and instance.status in ROUTABLE_STATUSES
+
+    async def start_all(self) -> Dict[str, Optional[str]]:
+        """Start all registered, enabled, non-lazy drivers in parallel
+
+        Each driver starts as soon as the drivers it depends on are running,
+        so cold start costs the longest dependency chain rather than the sum
+        of all drivers. A driver whose dependency fails (or is part of a
+        cycle) is not started.
+
+        Returns:
+            Mapping of driver ID to error message (None on success)
+        """
+        pending = [
+            driver_id
+            for driver_id, manifest in self.manifests.items()
+            if manifest.enabled and not manifest.lazy and driver_id not in self.instances
+        ]
+        results: Dict[str, Optional[str]] = {}
+        cyclic = self._find_dependency_cycles(pending)
+        for driver_id in cyclic:
+            results[driver_id] = "Dependency cycle detected"
+            logging.error(f"Driver {driver_id} is part of a dependency cycle")
+
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def start_one(driver_id: str) -> bool:
+            for dependency in self.manifests[driver_id].dependencies:
+                if dependency in tasks:
+                    ok = await tasks[dependency]
+                elif dependency in cyclic:
+                    ok = False
+                else:
+                    ok = await self._ensure_started(dependency)
+                if not ok:
+                    results[driver_id] = f"Dependency {dependency} unavailable"
+                    logging.error(
+                        f"Not starting driver {driver_id}: "
+                        f"dependency {dependency} unavailable"
+                    )
+                    return False
+            # A lazy driver depending on this one may be starting it already
+            async with self._start_locks.setdefault(driver_id, asyncio.Lock()):
+                if driver_id not in self.instances:
+                    try:
+                        await self.start_driver(driver_id)
+                    except Exception as e:
+                        results[driver_id] = str(e)
+                        return False
+            if not await self._wait_started(driver_id):
+                instance = self.instances.get(driver_id)
+                results[driver_id] = (
+                    instance.error_message if instance else None
+                ) or "Driver unavailable"
+                return False
+            results[driver_id] = None
+            return True
+
+        for driver_id in pending:
+            if driver_id not in cyclic:
+                tasks[driver_id] = asyncio.ensure_future(start_one(driver_id))
+        if tasks:
+            await asyncio.gather(*tasks.values())
+        return results
+
+    def _find_dependency_cycles(self, driver_ids: List[str]) -> set:
+        """Return the drivers that can never start because of a cycle"""
+        remaining = {
+            driver_id: {
+                dep for dep in self.manifests[driver_id].dependencies
+                if dep in self.manifests
+            }
+            for driver_id in driver_ids
+        }
+        # Kahn's algorithm: peel off drivers whose dependencies are resolvable
+        resolved = {d for d in self.manifests if d not in remaining}
+        progress = True
+        while progress:
+            progress = False
+            for driver_id, deps in list(remaining.items()):
+                if deps <= resolved:
+                    resolved.add(driver_id)
+                    del remaining[driver_id]
+                    progress = True
+        return set(remaining)
+
+    async def _ensure_started(self, driver_id: str, _chain: tuple = ()) -> bool:
+        """Start a registered driver (and its dependencies) if not running yet"""
+        if driver_id in self.instances:
+            return await self._wait_started(driver_id)
+
+        manifest = self.manifests.get(driver_id)
+        if manifest is None or not manifest.enabled or driver_id in _chain:
+            return False
+
+        lock = self._start_locks.setdefault(driver_id, asyncio.Lock())
+        async with lock:
+            if driver_id not in self.instances:
+                for dependency in manifest.dependencies:
+                    if not await self._ensure_started(
+                        dependency, _chain + (driver_id,)
+                    ):
+                        logging.error(
+                            f"Not starting driver {driver_id}: "
+                            f"dependency {dependency} unavailable"
+                        )
+                        return False
+                try:
+                    await self.start_driver(driver_id)
+                except Exception:
+                    return False
+        return await self._wait_started(driver_id)
 
     async def stop_driver(self, driver_id: str):
         """Stop a driver instance"""
@@ -391,55 +601,167 @@ class DriverRegistry:
         del self.instances[driver_id]
         logging.info(f"Stopped driver: {driver_id}")
 
-    async def route_event(self, event: Event) -> List[Event]:
-        """Route event to capable drivers and collect results"""
-        result_events = []
-
-        # Find drivers that can handle this event type
-        capable_drivers = self.capability_map.get(event.type, [])
+    def resolve_driver_ids(self, event_type: str) -> List[str]:
+        """Find the IDs of drivers that can handle an event type"""
+        capable_drivers = list(self.capability_map.get(event_type, []))
 
         # Also check for wildcard capabilities
         for capability, driver_ids in self.capability_map.items():
-            if capability.endswith(".*") and event.type.startswith(capability[:-1]):
+            if capability.endswith(".*") and event_type.startswith(capability[:-1]):
                 capable_drivers.extend(driver_ids)
 
         # Remove duplicates
-        capable_drivers = list(set(capable_drivers))
+        return list(dict.fromkeys(capable_drivers))
+
+    def has_capable_drivers(
+        self, event_type: str, driver_ids: Optional[List[str]] = None
+    ) -> bool:
+        """Check if a running or lazily startable driver handles an event type"""
+        if driver_ids is None:
+            driver_ids = self.resolve_driver_ids(event_type)
+        for driver_id in driver_ids:
+            instance = self.instances.get(driver_id)
+            if instance is not None:
+                if instance.status in ROUTABLE_STATUSES:
+                    return True
+            elif self.manifests[driver_id].enabled and self.manifests[driver_id].lazy:
+                return True
+        return False
+
+    async def route_event(
+        self, event: Event, driver_ids: Optional[List[str]] = None
+    ) -> List[Event]:
+        """Route event to capable drivers and collect results
+
+        Drivers are dispatched concurrently, each through its own circuit
+        breaker and bulkhead, so a failing or hung driver only sheds its own
+        share of the load. Lazy drivers are started on their first event,
+        and events arriving while a driver is starting wait for it.
+        Callers routing many events of one type can pass ``driver_ids`` from
+        ``resolve_driver_ids`` to skip the capability lookup.
+        """
+        capable_drivers = (
+            driver_ids if driver_ids is not None else self.resolve_driver_ids(event.type)
+        )
 
-        # Route to each capable driver
         for driver_id in capable_drivers:
-            if driver_id not in self.instances:
-                continue
+            manifest = self.manifests[driver_id]
+            if driver_id in self._startups:
+                # Wait for a driver another event is still starting
+                await self._wait_started(driver_id)
+            elif driver_id not in self.instances and manifest.lazy and manifest.enabled:
+                await self._ensure_started(driver_id)
+
+        instances = [
+            self.instances[driver_id]
+            for driver_id in capable_drivers
+            if driver_id in self.instances
+            and self.instances[driver_id].status in ROUTABLE_STATUSES
+        ]
+        if not instances:
+            return []
+
+        results = await asyncio.gather(
+            *(self._dispatch(instance, event) for instance in instances)
+        )
 
-            instance = self.instances[driver_id]
-            if instance.status != "running":
-                continue
+        result_events = []
+        for events in results:
+            result_events.extend(events)
+        return result_events
 
-            try:
-                # Handle event
-                events = await instance.driver.handle_event(event)
-                result_events.extend(events)
+    async def _dispatch(self, instance: DriverInstance, event: Event) -> List[Event]:
+        """Deliver an event to one driver through its breaker and bulkhead"""
+        driver_id = instance.manifest.id
+
+        # Bulkhead: shed rather than queue once the driver is saturated.
+        # The slot is claimed with no await after the check, so concurrent
+        # events cannot all pass it, and nothing waits for a slot outside
+        # the handler's timeout
+        if instance.in_flight >= instance.max_concurrent:
+            instance.rejected_count += 1
+            logging.warning(
+                f"Driver {driver_id} at concurrency limit "
+                f"({instance.max_concurrent}), shedding event {event.type}"
+            )
+            return []
+        instance.in_flight += 1
 
-                # Update instance stats
-                instance.last_activity = datetime.utcnow()
-                instance.event_count += 1
+        try:
+            events = await instance.circuit_breaker.call(
+                self._invoke_driver, instance, event
+            )
+        except CircuitBreakerOpenError:
+            instance.rejected_count += 1
+            logging.debug(f"Circuit open for driver {driver_id}, shedding {event.type}")
+            return []
+        except Exception as e:
+            logging.error(
+                f"Error in driver {driver_id} handling event {event.type}: {e}"
+            )
+            instance.error_count += 1
+            instance.error_message = str(e) or type(e).__name__
+            return []
+        finally:
+            instance.in_flight -= 1
+            self._sync_status(instance)
+
+        # Update instance stats
+        instance.last_activity = datetime.utcnow()
+        instance.event_count += 1
+        return events or []
+
+    async def _invoke_driver(self, instance: DriverInstance, event: Event) -> List[Event]:
+        """Run the driver's handler with a timeout"""
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                instance.driver.handle_event(event), instance.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(
+                f"Driver {instance.manifest.id} timed out after "
+                f"{instance.timeout_seconds}s"
+            ) from None
+        finally:
+            instance.latency.record(time.perf_counter() - started)
+
+    def _sync_status(self, instance: DriverInstance):
+        """Reflect the breaker state in the driver status"""
+        if instance.status not in ROUTABLE_STATUSES:
+            return
 
-            except Exception as e:
-                logging.error(
-                    f"Error in driver {driver_id} handling event {event.type}: {e}"
-                )
-                instance.status = "error"
-                instance.error_message = str(e)
+        driver_id = instance.manifest.id
+        if instance.circuit_breaker.is_closed:
+            if instance.status == "degraded":
+                logging.info(f"Driver {driver_id} recovered, circuit closed")
+                instance.error_message = None
+            instance.status = "running"
+        elif instance.status != "degraded":
+            logging.warning(
+                f"Driver {driver_id} degraded, circuit "
+                f"{instance.circuit_breaker.state.value}"
+            )
+            instance.status = "degraded"
 
-        return result_events
+    def reset_circuit(self, driver_id: str) -> bool:
+        """Manually close a driver's circuit breaker"""
+        instance = self.instances.get(driver_id)
+        if not instance:
+            return False
+
+        instance.circuit_breaker = CircuitBreaker(instance.circuit_breaker.config)
+        self._sync_status(instance)
+        return True
 
     def get_drivers_by_capability(self, capability: str) -> List[Driver]:
         """Get driver instances that provide a capability"""
         driver_ids = self.capability_map.get(capability, [])
         drivers = []
         for driver_id in driver_ids:
-            if driver_id in self.instances and self.instances[driver_id].status == "running":
-                drivers.append(self.instances[driver_id].driver)
+            instance = self.instances.get(driver_id)
+            if instance and instance.status in ROUTABLE_STATUSES:
+                drivers.append(instance.driver)
         return drivers
     
     def get_driver_ids_by_capability(self, capability: str) -> List[str]:
@@ -448,8 +770,9 @@ class DriverRegistry:
     
     def get_driver(self, driver_id: str) -> Optional[Driver]:
         """Get a driver instance by ID"""
-        if driver_id in self.instances and self.instances[driver_id].status == "running":
-            return self.instances[driver_id].driver
+        instance = self.instances.get(driver_id)
+        if instance and instance.status in ROUTABLE_STATUSES:
+            return instance.driver
         return None
 
     def get_driver_status(self, driver_id: str) -> Optional[Dict[str, Any]]:
@@ -468,7 +791,25 @@ class DriverRegistry:
                 instance.last_activity.isoformat() if instance.last_activity else None
             ),
             "event_count": instance.event_count,
+            "error_count": instance.error_count,
+            "startup_time_ms": instance.startup_time_ms,
+            "latency": instance.latency.summary(),
+            "lazy": instance.manifest.lazy,
             "capabilities": instance.manifest.capabilities,
+            "circuit_breaker": instance.circuit_breaker.get_state(),
+            "bulkhead": {
+                "max_concurrent": instance.max_concurrent,
+                "in_flight": instance.in_flight,
+                "rejected": instance.rejected_count,
+                "timeout_seconds": instance.timeout_seconds,
+            },
+        }
+
+    def get_circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get circuit breaker state for every running driver"""
+        return {
+            driver_id: instance.circuit_breaker.get_state()
+            for driver_id, instance in self.instances.items()
         }
 
     def list_drivers(self) -> List[Dict[str, Any]]:
@@ -479,12 +820,20 @@ class DriverRegistry:
                 "id": driver_id,
                 "name": manifest.name,
                 "type": manifest.driver_type.value,
-                "status": "stopped",
+                "status": "pending" if manifest.lazy and manifest.enabled else "stopped",
+                "lazy": manifest.lazy,
                 "capabilities": manifest.capabilities,
             }
             drivers.append(status_info)
         return drivers
 
+    def get_startup_report(self) -> Dict[str, Optional[float]]:
+        """Get startup time in milliseconds per started driver"""
+        return {
+            driver_id: instance.startup_time_ms
+            for driver_id, instance in self.instances.items()
+        }
+
 
 # Global driver registry
 _global_registry: Optional[DriverRegistry] = None
@@ -513,6 +862,9 @@ def driver(driver_id: str, driver_type: DriverType = DriverType.AGENT, **kwargs)
             driver_type=driver_type,
             capabilities=kwargs.get("capabilities", []),
             resource_requirements=kwargs.get("resource_requirements", ResourceSpec()),
+            dependencies=kwargs.get("dependencies", []),
+            lazy=kwargs.get("lazy", False),
+            startup_timeout_seconds=kwargs.get("startup_timeout_seconds"),
         )
 
         # Store for later registration
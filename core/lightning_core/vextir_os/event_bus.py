@@ -104,6 +104,28 @@ class EventBus:
         logging.info(f"Event emitted: {event.type} (ID: {event.id})")
         return event.id
 
+    async def emit_batch(self, events: List[Event]) -> List[str]:
+        """Queue several events at once and return their IDs"""
+        if not events:
+            return []
+
+        for event in events:
+            if not event.id:
+                event.id = str(uuid.uuid4())
+
+        # Add to history under a single lock acquisition
+        async with self._lock:
+            self.event_history.extend(events)
+            overflow = len(self.event_history) - self.max_history
+            if overflow > 0:
+                del self.event_history[:overflow]
+
+        for event in events:
+            await self._notify_subscribers(event)
+
+        logging.info(f"Emitted batch of {len(events)} events")
+        return [event.id for event in events]
+
     def subscribe(self, filter: EventFilter, callback: Callable[[Event], None]) -> str:
         """Subscribe to event stream with callback"""
         subscription_id = str(uuid.uuid4())
@@ -135,6 +135,7 @@ class EventMonitor:
             event_types=event_types,
             before=before
         )
+        self.processor.metrics.record_drained(drained_count)
         
         # Get count after cleanup
         orphaned_after = await self.event_bus.get_orphaned_events()
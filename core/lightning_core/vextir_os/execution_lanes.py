@@ -0,0 +1,244 @@
+"""
+Vextir OS Execution Lanes - Per-key fair scheduling for event processing
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from .events import Event
+from .metrics import LatencyHistogram
+
+ROUND_ROBIN = "round_robin"
+WEIGHTED = "weighted"
+
+
+@dataclass
+class LaneConfig:
+    """Configuration for keyed execution lanes"""
+
+    mode: str = ROUND_ROBIN  # round_robin or weighted
+    max_concurrency: int = 32  # events in flight across all lanes
+    max_in_flight_per_key: int = 4
+    max_queued_per_key: int = 1000  # submit waits once a lane is this deep
+    default_weight: float = 1.0
+    weights: Dict[str, float] = field(default_factory=dict)  # per-key weights
+    max_tracked_lanes: int = 1000  # idle lanes kept for metrics
+
+    def __post_init__(self):
+        if self.mode not in (ROUND_ROBIN, WEIGHTED):
+            raise ValueError(f"Unknown lane scheduling mode: {self.mode}")
+        for weight in [self.default_weight, *self.weights.values()]:
+            if weight <= 0:
+                raise ValueError("Lane weights must be positive")
+
+
+@dataclass
+class ExecutionLane:
+    """Queue and counters for a single key"""
+
+    key: str
+    weight: float = 1.0
+    queue: Deque[Tuple[Event, asyncio.Future, float]] = field(default_factory=deque)
+    in_flight: int = 0
+    deficit: float = 0.0
+    in_ring: bool = False
+    processed: int = 0
+    failed: int = 0
+    max_queue_depth: int = 0
+    wait_times: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_times: LatencyHistogram = field(default_factory=LatencyHistogram)
+    space_available: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def __post_init__(self):
+        self.space_available.set()
+
+    @property
+    def idle(self) -> bool:
+        return not self.queue and not self.in_flight
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "weight": self.weight,
+            "queued": len(self.queue),
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "max_queue_depth": self.max_queue_depth,
+            "wait": self.wait_times.summary(),
+            "service": self.service_times.summary(),
+        }
+
+
+class KeyedLaneScheduler:
+    """Runs events through a handler with per-key queues and fair scheduling
+
+    Each key (by default the event's user) gets its own lane. Lanes are
+    served by deficit round robin: in ``round_robin`` mode every lane gets
+    one turn per round, in ``weighted`` mode a lane with weight 2 gets twice
+    the turns of a lane with weight 1. A lane at its in-flight cap is
+    skipped, so one key can never hold more than ``max_in_flight_per_key``
+    of the ``max_concurrency`` execution slots.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Event], Awaitable[List[Event]]],
+        config: Optional[LaneConfig] = None,
+        key_func: Optional[Callable[[Event], str]] = None,
+    ):
+        self.handler = handler
+        self.config = config or LaneConfig()
+        self.key_func = key_func or (lambda event: event.user_id or "anonymous")
+        self.lanes: "OrderedDict[str, ExecutionLane]" = OrderedDict()
+        self._ring: Deque[str] = deque()
+        self._active = 0
+        self._queued = 0
+        self._tasks: set = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def _get_lane(self, key: str) -> ExecutionLane:
+        lane = self.lanes.get(key)
+        if lane is None:
+            lane = self.lanes[key] = ExecutionLane(key=key, weight=self._weight_for(key))
+            self._evict_idle_lanes()
+        else:
+            self.lanes.move_to_end(key)
+        return lane
+
+    def _weight_for(self, key: str) -> float:
+        if self.config.mode == ROUND_ROBIN:
+            return 1.0
+        return self.config.weights.get(key, self.config.default_weight)
+
+    def set_weight(self, key: str, weight: float):
+        """Set the fair-share weight for a key"""
+        if weight <= 0:
+            raise ValueError("Lane weights must be positive")
+        self.config.weights[key] = weight
+        if key in self.lanes:
+            self.lanes[key].weight = self._weight_for(key)
+
+    def _evict_idle_lanes(self):
+        """Drop the least recently used idle lanes beyond the tracking limit"""
+        excess = len(self.lanes) - self.config.max_tracked_lanes
+        if excess <= 0:
+            return
+        for key in [k for k, lane in self.lanes.items() if lane.idle and not lane.in_ring][:excess]:
+            del self.lanes[key]
+
+    async def submit(self, event: Event) -> asyncio.Future:
+        """Queue an event and return a future for its output events
+
+        Waits while the event's lane is at ``max_queued_per_key``.
+        """
+        key = self.key_func(event)
+        lane = self._get_lane(key)
+        while len(lane.queue) >= self.config.max_queued_per_key:
+            lane.space_available.clear()
+            await lane.space_available.wait()
+
+        future = asyncio.get_running_loop().create_future()
+        lane.queue.append((event, future, time.perf_counter()))
+        lane.max_queue_depth = max(lane.max_queue_depth, len(lane.queue))
+        self._queued += 1
+        self._idle.clear()
+        if not lane.in_ring:
+            lane.in_ring = True
+            self._ring.append(key)
+
+        self._pump()
+        return future
+
+    async def run(self, event: Event) -> List[Event]:
+        """Process an event through its lane and wait for the result"""
+        return await (await self.submit(event))
+
+    def _next_lane(self) -> Optional[ExecutionLane]:
+        """Pick the next lane to serve using deficit round robin"""
+        ring = self._ring
+        blocked = 0
+        while ring:
+            lane = self.lanes[ring[0]]
+            if not lane.queue:
+                ring.popleft()
+                lane.in_ring = False
+                lane.deficit = 0.0
+                continue
+            if lane.in_flight >= self.config.max_in_flight_per_key:
+                ring.rotate(-1)
+                blocked += 1
+                if blocked >= len(ring):
+                    return None
+                continue
+            blocked = 0
+            if lane.deficit < 1:
+                lane.deficit += lane.weight
+                if lane.deficit < 1:
+                    ring.rotate(-1)
+                    continue
+            lane.deficit -= 1
+            if lane.deficit < 1:
+                ring.rotate(-1)
+            return lane
+        return None
+
+    def _pump(self):
+        """Start queued events while execution slots are free"""
+        while self._active < self.config.max_concurrency:
+            lane = self._next_lane()
+            if lane is None:
+                break
+            event, future, enqueued_at = lane.queue.popleft()
+            self._queued -= 1
+            lane.space_available.set()
+            lane.in_flight += 1
+            self._active += 1
+            lane.wait_times.record(time.perf_counter() - enqueued_at)
+            task = asyncio.create_task(self._execute(lane, event, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, lane: ExecutionLane, event: Event, future: asyncio.Future):
+        started = time.perf_counter()
+        try:
+            result = await self.handler(event)
+            lane.processed += 1
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            lane.failed += 1
+            logging.error(f"Error processing event {event.type} in lane {lane.key}: {e}")
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            lane.service_times.record(time.perf_counter() - started)
+            lane.in_flight -= 1
+            self._active -= 1
+            self._pump()
+            if not self._active and not self._queued:
+                self._idle.set()
+
+    async def drain(self):
+        """Wait until every queued and in-flight event has finished"""
+        await self._idle.wait()
+
+    def get_lane_metrics(self, key: str) -> Optional[Dict[str, Any]]:
+        lane = self.lanes.get(key)
+        return lane.get_metrics() if lane else None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get scheduler totals and per-lane metrics"""
+        return {
+            "mode": self.config.mode,
+            "active": self._active,
+            "queued": self._queued,
+            "max_concurrency": self.config.max_concurrency,
+            "max_in_flight_per_key": self.config.max_in_flight_per_key,
+            "lanes": {key: lane.get_metrics() for key, lane in self.lanes.items()},
+        }
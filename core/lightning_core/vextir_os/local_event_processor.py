@@ -11,7 +11,7 @@ import os
 import signal
 import sys
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from lightning_core.abstractions import EventMessage, ExecutionMode, RuntimeConfig
 from lightning_core.runtime import get_runtime, initialize_runtime
@@ -22,6 +22,13 @@ from lightning_core.vextir_os.driver_initialization import (
 from lightning_core.vextir_os.serverless_processor import (
     universal_event_processor_handler,
 )
+from lightning_core.vextir_os.events import Event
+from lightning_core.vextir_os.execution_lanes import LaneConfig
+from lightning_core.vextir_os.universal_processor import (
+    UniversalEventProcessor,
+    event_from_message,
+    get_universal_processor,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -32,14 +39,30 @@ logger = logging.getLogger(__name__)
 
 
 class LocalEventProcessorService:
-    """Service that processes events from the local event bus."""
+    """Service that processes events from the local event bus.
+
+    Events are handed straight to the universal processor by default
+    (``in_process`` mode). The ``serverless`` mode routes each event through
+    a deployed serverless function instead, for isolation between the bus
+    and event handling. The mode defaults to ``EVENT_PROCESSOR_EXECUTION_MODE``.
+    """
+
+    IN_PROCESS = "in_process"
+    SERVERLESS = "serverless"
 
-    def __init__(self):
+    def __init__(self, execution_mode: Optional[str] = None):
         self.runtime: Optional[Any] = None
         self.function_id: Optional[str] = None
         self.subscription_id: Optional[str] = None
+        self.processor: Optional[UniversalEventProcessor] = None
+        self.execution_mode = execution_mode or os.getenv(
+            "EVENT_PROCESSOR_EXECUTION_MODE", self.IN_PROCESS
+        )
+        if self.execution_mode not in (self.IN_PROCESS, self.SERVERLESS):
+            raise ValueError(f"Unknown execution mode: {self.execution_mode}")
         self.running = False
         self._shutdown_event = asyncio.Event()
+        self._publish_tasks: set = set()
 
     async def start(self):
         """Start the event processor service."""
@@ -58,6 +81,42 @@ class LocalEventProcessorService:
         await initialize_all_drivers()
         logger.info("Drivers initialized")
 
+        await self.setup_execution()
+
+        # Subscribe to all event types
+        self.subscription_id = await self.runtime.event_bus.subscribe(
+            "*", self.handle_event  # Subscribe to all events on default topic
+        )
+        logger.info(f"Subscribed to events with ID: {self.subscription_id}")
+
+        # Mark as running
+        self.running = True
+        logger.info("Local Event Processor Service started successfully")
+
+        # Process some startup events
+        await self._send_startup_event()
+
+    async def setup_execution(self):
+        """Prepare the processor or serverless function for the execution mode."""
+        if self.execution_mode == self.IN_PROCESS:
+            self.processor = get_universal_processor()
+            logger.info("Processing events in-process")
+
+            # Optional per-user fair scheduling (round_robin or weighted)
+            lane_mode = os.getenv("EVENT_PROCESSOR_LANES")
+            if lane_mode and lane_mode != "off":
+                self.processor.enable_lanes(
+                    LaneConfig(
+                        mode=lane_mode,
+                        max_concurrency=int(os.getenv("EVENT_PROCESSOR_MAX_CONCURRENCY", "32")),
+                        max_in_flight_per_key=int(
+                            os.getenv("EVENT_PROCESSOR_MAX_IN_FLIGHT_PER_USER", "4")
+                        ),
+                    )
+                )
+                logger.info(f"Per-user execution lanes enabled ({lane_mode})")
+            return
+
         # Deploy the event processor function
         logger.info("Deploying event processor function...")
         from lightning_core.abstractions.serverless import FunctionConfig, RuntimeType
@@ -79,71 +138,116 @@ class LocalEventProcessorService:
         )
         logger.info(f"Event processor function deployed: {self.function_id}")
 
-        # Subscribe to all events
-        async def process_event(event: EventMessage):
-            """Process incoming events."""
+    async def handle_event(self, event: EventMessage):
+        """Process an incoming event from the bus."""
+        try:
+            logger.debug(f"[TRACE] Received event from bus: {event.event_type} (ID: {event.id}) at {datetime.utcnow().isoformat()}")
+            logger.info(f"Processing event: {event.event_type} (ID: {event.id})")
+
+            if self.execution_mode == self.IN_PROCESS:
+                await self._process_in_process(event)
+            else:
+                await self._process_via_function(event)
+
+        except Exception as e:
+            logger.error(f"Error processing event {event.id}: {e}", exc_info=True)
+
+    @staticmethod
+    def _event_payload(event: EventMessage) -> Dict[str, Any]:
+        """Build the processor payload for a bus event."""
+        return {
+            "type": event.event_type,
+            "userID": event.metadata.get("userID", "system"),
+            "id": event.id,
+            "timestamp": event.timestamp,
+            "source": event.metadata.get("source", "unknown"),
+            "data": event.data,
+            "metadata": event.metadata,
+        }
+
+    async def _process_in_process(self, event: EventMessage):
+        """Hand the event directly to the universal processor."""
+        vextir_event = event_from_message(self._event_payload(event))
+
+        if self.processor.lanes is not None:
+            # Queue in the user's lane and return, so one user's backlog
+            # does not hold up the bus for everyone else
+            future = await self.processor.lanes.submit(vextir_event)
+            future.add_done_callback(self._on_lane_complete)
+            return
+
+        output_events = await self.processor.process_event(vextir_event)
+        await self._publish_outputs(output_events)
+
+    def _on_lane_complete(self, future: asyncio.Future):
+        """Publish the outputs of an event processed in an execution lane."""
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.error(f"Error processing event: {future.exception()}")
+            return
+        task = asyncio.create_task(self._publish_outputs(future.result()))
+        self._publish_tasks.add(task)
+        task.add_done_callback(self._publish_tasks.discard)
+
+    async def _publish_outputs(self, output_events: List[Event]):
+        """Publish processor output events to the runtime event bus."""
+        logger.info(
+            f"Event processed successfully, generated {len(output_events)} output events"
+        )
+
+        # Publish output events to the event bus
+        for output_event in output_events:
             try:
-                logger.info(f"[TRACE] Received event from bus: {event.event_type} (ID: {event.id}) at {datetime.utcnow().isoformat()}")
-                logger.info(f"Processing event: {event.event_type} (ID: {event.id})")
-
-                # Invoke the serverless function
-                response = await self.runtime.serverless.invoke_function(
-                    self.function_id,
-                    {
-                        "type": event.event_type,
-                        "userID": event.metadata.get("userID", "system"),
-                        "id": event.id,
-                        "timestamp": event.timestamp.isoformat(),
-                        "source": event.metadata.get("source", "unknown"),
-                        "data": event.data,
-                        "metadata": event.metadata,
-                    },
+                await self.runtime.publish_event(
+                    EventMessage(
+                        id=output_event.id,
+                        event_type=output_event.type,
+                        data=output_event.data,
+                        metadata=output_event.metadata,
+                        timestamp=output_event.timestamp or datetime.utcnow(),
+                    )
                 )
-
-                if response.is_error:
-                    logger.error(f"Event processing failed: {response.error_message}")
-                else:
-                    result = response.body
-                    if isinstance(result, dict):
-                        output_count = result.get("output_count", 0)
-                        logger.info(
-                            f"Event processed successfully, generated {output_count} output events"
-                        )
-                        
-                        # Publish output events to the event bus
-                        output_events = result.get("output_events", [])
-                        for output_event_data in output_events:
-                            try:
-                                # Convert back to EventMessage and publish
-                                output_event = EventMessage(
-                                    id=output_event_data.get("id"),
-                                    event_type=output_event_data.get("type", "unknown"),
-                                    data=output_event_data.get("data", {}),
-                                    metadata=output_event_data.get("metadata", {}),
-                                    timestamp=datetime.fromisoformat(output_event_data.get("timestamp", datetime.utcnow().isoformat()))
-                                )
-                                await self.runtime.publish_event(output_event)
-                                logger.info(f"Published output event: {output_event.event_type} (ID: {output_event.id})")
-                            except Exception as e:
-                                logger.error(f"Failed to publish output event: {e}")
-                    else:
-                        logger.info("Event processed successfully")
-
+                logger.debug(f"Published output event: {output_event.type} (ID: {output_event.id})")
             except Exception as e:
-                logger.error(f"Error processing event {event.id}: {e}", exc_info=True)
-
-        # Subscribe to all event types
-        self.subscription_id = await self.runtime.event_bus.subscribe(
-            "*", process_event  # Subscribe to all events on default topic
+                logger.error(f"Failed to publish output event: {e}")
+
+    async def _process_via_function(self, event: EventMessage):
+        """Invoke the deployed serverless function for the event."""
+        payload = self._event_payload(event)
+        payload["timestamp"] = event.timestamp.isoformat()
+        response = await self.runtime.serverless.invoke_function(
+            self.function_id, payload
         )
-        logger.info(f"Subscribed to events with ID: {self.subscription_id}")
-
-        # Mark as running
-        self.running = True
-        logger.info("Local Event Processor Service started successfully")
 
-        # Process some startup events
-        await self._send_startup_event()
+        if response.is_error:
+            logger.error(f"Event processing failed: {response.error_message}")
+        else:
+            result = response.body
+            if isinstance(result, dict):
+                output_count = result.get("output_count", 0)
+                logger.info(
+                    f"Event processed successfully, generated {output_count} output events"
+                )
+                
+                # Publish output events to the event bus
+                output_events = result.get("output_events", [])
+                for output_event_data in output_events:
+                    try:
+                        # Convert back to EventMessage and publish
+                        output_event = EventMessage(
+                            id=output_event_data.get("id"),
+                            event_type=output_event_data.get("type", "unknown"),
+                            data=output_event_data.get("data", {}),
+                            metadata=output_event_data.get("metadata", {}),
+                            timestamp=datetime.fromisoformat(output_event_data.get("timestamp", datetime.utcnow().isoformat()))
+                        )
+                        await self.runtime.publish_event(output_event)
+                        logger.info(f"Published output event: {output_event.event_type} (ID: {output_event.id})")
+                    except Exception as e:
+                        logger.error(f"Failed to publish output event: {e}")
+            else:
+                logger.info("Event processed successfully")
 
     async def _send_startup_event(self):
         """Send a startup event to verify the system is working."""
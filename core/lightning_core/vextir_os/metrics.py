@@ -0,0 +1,181 @@
+"""
+Vextir OS Metrics - Fixed-memory latency histograms and Prometheus exposition
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Quantiles reported in summaries and Prometheus output
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with fixed memory and O(1) recording
+
+    Buckets grow geometrically, so every recorded value lands in a bucket
+    whose bounds are within ``2 ** (1 / buckets_per_octave)`` of each other
+    (about 9% relative error with the default of 8 buckets per octave).
+    Values outside ``[min_seconds, max_seconds]`` are clamped into the first
+    or last bucket; the exact min, max, count and sum are tracked separately.
+    """
+
+    def __init__(
+        self,
+        min_seconds: float = 1e-5,
+        max_seconds: float = 600.0,
+        buckets_per_octave: int = 8,
+    ):
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self._scale = buckets_per_octave / math.log(2)
+        self._num_buckets = int(math.ceil(math.log(max_seconds / min_seconds) * self._scale)) + 2
+        self.counts: List[int] = [0] * self._num_buckets
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        """Record a single latency observation"""
+        if seconds <= self.min_seconds:
+            index = 0
+        else:
+            index = min(
+                int(math.log(seconds / self.min_seconds) * self._scale) + 1,
+                self._num_buckets - 1,
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def _bucket_upper_bound(self, index: int) -> float:
+        return self.min_seconds * math.exp(index / self._scale)
+
+    def percentile(self, quantile: float) -> float:
+        """Estimate the latency at a quantile between 0 and 1"""
+        if not self.count:
+            return 0.0
+
+        rank = max(1, int(math.ceil(quantile * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                # Never report beyond what was actually observed
+                return max(self.min, min(self._bucket_upper_bound(index), self.max))
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, float]:
+        """Summarize the histogram in milliseconds"""
+        result = {
+            "count": self.count,
+            "avg_ms": self.mean * 1000,
+            "min_ms": (self.min or 0.0) * 1000,
+            "max_ms": (self.max or 0.0) * 1000,
+        }
+        for quantile in quantiles:
+            result[f"p{quantile * 100:g}_ms"] = self.percentile(quantile) * 1000
+        return result
+
+
+class BoundedHistogramMap:
+    """Histograms keyed by label with a cap on the number of distinct keys
+
+    Keys beyond ``max_keys`` share a single overflow histogram so that
+    high-cardinality labels cannot grow memory without bound.
+    """
+
+    OVERFLOW_KEY = "_other"
+
+    def __init__(self, max_keys: int = 500):
+        self.max_keys = max_keys
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def get(self, key: str) -> LatencyHistogram:
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            if len(self.histograms) >= self.max_keys:
+                key = self.OVERFLOW_KEY
+                histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+        return histogram
+
+    def record(self, key: str, seconds: float):
+        self.get(key).record(seconds)
+
+    def items(self):
+        return self.histograms.items()
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+    return "{" + inner + "}"
+
+
+class PrometheusWriter:
+    """Minimal writer for the Prometheus text exposition format (0.0.4)"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._lines: List[str] = []
+
+    def _header(self, name: str, metric_type: str, help_text: str):
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {metric_type}")
+
+    def counter(
+        self,
+        name: str,
+        help_text: str,
+        samples: Iterable[Tuple[Dict[str, str], float]],
+    ):
+        self._header(name, "counter", help_text)
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        samples: Iterable[Tuple[Dict[str, str], float]],
+    ):
+        self._header(name, "gauge", help_text)
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    def summary(
+        self,
+        name: str,
+        help_text: str,
+        samples: Iterable[Tuple[Dict[str, str], LatencyHistogram]],
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+    ):
+        self._header(name, "summary", help_text)
+        for labels, histogram in samples:
+            for quantile in quantiles:
+                quantile_labels = {**labels, "quantile": f"{quantile:g}"}
+                self._lines.append(
+                    f"{name}{_format_labels(quantile_labels)} "
+                    f"{histogram.percentile(quantile)}"
+                )
+            self._lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+            self._lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
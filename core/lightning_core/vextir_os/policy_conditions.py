@@ -0,0 +1,258 @@
+"""
+Vextir OS Policy Conditions - Compile policy condition strings into predicates
+
+Conditions use a small, safe expression language:
+
+    always | never | true | false
+    <operand> [> < >= <= == != in | not in] <operand>
+    name.startswith('prefix') | name.endswith('suffix')
+    str(name) | len(name)
+    not <expr> | <expr> and <expr> | <expr> or <expr> | ( <expr> )
+
+Operands are numbers, quoted strings and context variable names. Nothing
+is passed to ``eval``; a condition that does not parse compiles to a
+predicate that never matches.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+Predicate = Callable[[Dict[str, Any]], Any]
+
+_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<number>\d+(?:\.\d+)?)
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<op>>=|<=|==|!=|>|<|\(|\)|\.|,)
+      | (?P<name>[A-Za-z_][A-Za-z_0-9]*)
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "in": lambda a, b: a in b,
+    "not in": lambda a, b: a not in b,
+}
+
+_FUNCTIONS: Dict[str, Callable[[Any], Any]] = {"str": str, "len": len}
+_METHODS = ("startswith", "endswith")
+_CONSTANTS = {"always": True, "never": False, "true": True, "false": False,
+              "True": True, "False": False}
+
+
+class ConditionSyntaxError(ValueError):
+    """Condition string is not valid in the policy expression language"""
+
+    pass
+
+
+@dataclass
+class CompiledCondition:
+    """A policy condition compiled to a predicate over the evaluation context"""
+
+    source: str
+    predicate: Predicate
+    variables: Set[str] = field(default_factory=set)
+    # Event types the condition can only match, from a top-level
+    # ``event_type == 'x'`` or ``event_type.startswith('x')`` conjunct
+    event_types: List[str] = field(default_factory=list)
+    event_type_prefixes: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def __call__(self, context: Dict[str, Any]) -> bool:
+        try:
+            return bool(self.predicate(context))
+        except Exception as e:
+            logging.debug(f"Condition '{self.source}' failed to evaluate: {e}")
+            return False
+
+    def explain(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate the condition and report the variable values it used"""
+        return {
+            "condition": self.source,
+            "matched": self(context),
+            "values": {name: context.get(name) for name in sorted(self.variables)},
+            "error": self.error,
+        }
+
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN_PATTERN.match(source, position)
+        if not match or match.end() == position:
+            raise ConditionSyntaxError(f"Unexpected character at {position}: {source[position:]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing predicate closures"""
+
+    def __init__(self, source: str):
+        self.tokens = _tokenize(source)
+        self.index = 0
+        self.variables: Set[str] = set()
+        # Top-level conjuncts constraining event_type: (kind, value)
+        self.type_constraints: List[Tuple[str, str]] = []
+        self._depth = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, value: Optional[str] = None) -> Tuple[str, str]:
+        kind, text = self.peek()
+        if kind is None or (value is not None and text != value):
+            raise ConditionSyntaxError(f"Expected {value or 'token'}, found {text!r}")
+        self.index += 1
+        return kind, text
+
+    def parse(self) -> Predicate:
+        predicate = self.parse_or()
+        if self.index != len(self.tokens):
+            raise ConditionSyntaxError(f"Unexpected token {self.peek()[1]!r}")
+        return predicate
+
+    def parse_or(self) -> Predicate:
+        parts = [self.parse_and()]
+        while self.peek() == ("name", "or"):
+            self.take()
+            parts.append(self.parse_and())
+        if len(parts) == 1:
+            return parts[0]
+        if not self._depth:
+            self.type_constraints = []  # A disjunction does not constrain the type
+        return lambda ctx: any(part(ctx) for part in parts)
+
+    def parse_and(self) -> Predicate:
+        parts = [self.parse_not()]
+        while self.peek() == ("name", "and"):
+            self.take()
+            parts.append(self.parse_not())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda ctx: all(part(ctx) for part in parts)
+
+    def parse_not(self) -> Predicate:
+        if self.peek() == ("name", "not"):
+            self.take()
+            self._depth += 1
+            inner = self.parse_not()
+            self._depth -= 1
+            return lambda ctx: not inner(ctx)
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Predicate:
+        if self.peek() == ("op", "("):
+            self.take()
+            self._depth += 1
+            inner = self.parse_or()
+            self._depth -= 1
+            self.take(")")
+            return inner
+
+        left, left_name, prefix = self.parse_operand()
+        kind, text = self.peek()
+        if text == "not" and self.peek(1) == ("name", "in"):
+            self.take()
+            self.take()
+            operator = "not in"
+        elif (kind == "op" and text in _COMPARISONS) or (kind == "name" and text == "in"):
+            self.take()
+            operator = text
+        else:
+            # Only a bare event_type.startswith(...) conjunct constrains the
+            # type; compared or negated, it may match other types
+            if prefix is not None and not self._depth:
+                self._record_type_constraint("prefix", prefix)
+            return left
+
+        right, _, _ = self.parse_operand()
+        compare = _COMPARISONS[operator]
+        if operator == "==" and left_name == "event_type" and not self._depth:
+            self._record_type_constraint("exact", right)
+        return lambda ctx: compare(left(ctx), right(ctx))
+
+    def _record_type_constraint(self, kind: str, value_getter: Predicate):
+        try:
+            value = value_getter({})
+        except Exception:
+            return
+        if isinstance(value, str):
+            self.type_constraints.append((kind, value))
+
+    def parse_operand(self) -> Tuple[Predicate, Optional[str], Optional[Predicate]]:
+        """Parse an operand; returns its getter, its variable name if it is a
+        bare variable, and the prefix argument of ``event_type.startswith``"""
+        kind, text = self.take()
+        if kind == "number":
+            value = float(text) if "." in text else int(text)
+            return (lambda ctx: value), None, None
+        if kind == "string":
+            value = text[1:-1]
+            return (lambda ctx: value), None, None
+        if kind != "name":
+            raise ConditionSyntaxError(f"Unexpected token {text!r}")
+
+        if text in _CONSTANTS:
+            value = _CONSTANTS[text]
+            return (lambda ctx: value), None, None
+
+        if text in _FUNCTIONS and self.peek() == ("op", "("):
+            function = _FUNCTIONS[text]
+            self.take("(")
+            argument, _, _ = self.parse_operand()
+            self.take(")")
+            return (lambda ctx: function(argument(ctx))), None, None
+
+        name = text
+        self.variables.add(name)
+        getter: Predicate = lambda ctx: ctx[name]
+
+        if self.peek() == ("op", "."):
+            self.take(".")
+            _, method = self.take()
+            if method not in _METHODS:
+                raise ConditionSyntaxError(f"Unsupported method {method!r}")
+            self.take("(")
+            argument, _, _ = self.parse_operand()
+            self.take(")")
+            if method == "startswith":
+                prefix = argument if name == "event_type" else None
+                return (lambda ctx: str(getter(ctx)).startswith(argument(ctx))), None, prefix
+            return (lambda ctx: str(getter(ctx)).endswith(argument(ctx))), None, None
+
+        return getter, name, None
+
+
+def compile_condition(source: str) -> CompiledCondition:
+    """Compile a condition string once so it can be evaluated cheaply"""
+    try:
+        if not source or not isinstance(source, str):
+            raise ConditionSyntaxError("Empty condition")
+        parser = _Parser(source.strip())
+        predicate = parser.parse()
+    except ConditionSyntaxError as e:
+        logging.warning(f"Unable to compile policy condition {source!r}: {e}")
+        return CompiledCondition(source=source, predicate=lambda ctx: False, error=str(e))
+
+    return CompiledCondition(
+        source=source,
+        predicate=predicate,
+        variables=parser.variables,
+        event_types=[v for k, v in parser.type_constraints if k == "exact"],
+        event_type_prefixes=[v for k, v in parser.type_constraints if k == "prefix"],
+    )
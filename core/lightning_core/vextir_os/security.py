@@ -5,13 +5,22 @@ Vextir OS Security Manager - Policy enforcement and authorization
 import asyncio
 import json
 import logging
+import os
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from ..abstractions.storage import DocumentStore
+from .audit import AuditLog, AuditSink, FileAuditSink
 from .events import Event
+from .policy_conditions import CompiledCondition, compile_condition
+from .usage import UsageCounters
+
+# Evaluation context variables that are part of the decision cache key
+DECISION_KEY_VARIABLES = frozenset({"event_type", "user_id"})
 
 
 @dataclass
@@ -45,6 +54,7 @@ class Policy:
     applies_to: List[str] = field(default_factory=list)  # user_ids or ["*"] for all
     enabled: bool = True
     priority: int = 100  # Lower number = higher priority
+    event_types: List[str] = field(default_factory=list)  # e.g. ["email.*"]; empty for all
 
 
 @dataclass
@@ -58,66 +68,248 @@ class PolicyEvaluation:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-class PolicyEngine:
-    """Engine for evaluating policies against events"""
+@dataclass
+class CompiledPolicy:
+    """Policy with its condition compiled and its index placement resolved"""
+
+    policy: Policy
+    condition: CompiledCondition
+    sequence: int
+    event_types: List[str] = field(default_factory=list)  # Exact types; empty for any
+    event_type_prefixes: List[str] = field(default_factory=list)
 
-    def __init__(self):
+    @property
+    def sort_key(self):
+        return (self.policy.priority, self.sequence)
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the outcome depends only on the user and event type"""
+        return self.condition.variables <= DECISION_KEY_VARIABLES
+
+
+@dataclass
+class DecisionCacheStats:
+    """Hit accounting for the authorization decision cache"""
+
+    hits: int = 0
+    misses: int = 0
+    evaluations_skipped: int = 0
+    evaluations_run: int = 0
+    evaluation_seconds: float = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        average = self.evaluation_seconds / self.evaluations_run if self.evaluations_run else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evaluations_skipped": self.evaluations_skipped,
+            "evaluations_run": self.evaluations_run,
+            "avg_evaluation_seconds": average,
+            "estimated_seconds_saved": self.evaluations_skipped * average,
+        }
+
+
+@dataclass
+class _TypeIndex:
+    """Policies for one user key, indexed by the event types they apply to"""
+
+    exact: Dict[str, List[CompiledPolicy]] = field(default_factory=dict)
+    prefixes: Dict[str, List[CompiledPolicy]] = field(default_factory=dict)
+    any_type: List[CompiledPolicy] = field(default_factory=list)
+
+
+class PolicyEngine:
+    """Engine for evaluating policies against events
+
+    Conditions are compiled once when a policy is added. Policies are
+    indexed by the users they apply to and by the event types they can
+    match, taken from ``Policy.event_types`` or inferred from a top-level
+    ``event_type == ...`` / ``event_type.startswith(...)`` conjunct, so an
+    evaluation only touches the rules relevant to the event. Changing a
+    policy's ``applies_to``, ``event_types``, ``condition`` or ``priority``
+    after adding it requires adding it again.
+    """
+
+    def __init__(self, max_cached_lookups: int = 10000, decision_cache: bool = True):
         self.policies: Dict[str, Policy] = {}
+        self.compiled: Dict[str, CompiledPolicy] = {}
+        self.version = 0  # Incremented whenever the policy set changes
+        self.max_cached_lookups = max_cached_lookups
+        self.decision_cache_enabled = decision_cache
+        self.decision_stats = DecisionCacheStats()
+        self._index: Dict[str, _TypeIndex] = {}
+        self._lookup_cache: Dict[Tuple[str, str], List[CompiledPolicy]] = {}
+        # (user, event type) -> per-candidate cached evaluation, or None
+        # where the policy reads per-event state and must run live
+        self._decision_cache: Dict[
+            Tuple[str, str], List[Tuple[CompiledPolicy, Optional[PolicyEvaluation]]]
+        ] = {}
+        self._sequence = 0
 
     def add_policy(self, policy: Policy):
         """Add a policy to the engine"""
+        if policy.id in self.policies:
+            self._unindex(policy.id)
+        self._sequence += 1
+        compiled = self._compile(policy, self._sequence)
         self.policies[policy.id] = policy
+        self.compiled[policy.id] = compiled
+        self._reindex()
         logging.info(f"Added policy: {policy.name}")
 
     def remove_policy(self, policy_id: str):
         """Remove a policy from the engine"""
         if policy_id in self.policies:
-            del self.policies[policy_id]
+            self._unindex(policy_id)
+            self._reindex()
             logging.info(f"Removed policy: {policy_id}")
 
-    async def evaluate_policies(
-        self, event: Event, context: Dict[str, Any]
-    ) -> List[PolicyEvaluation]:
-        """Evaluate all applicable policies against an event"""
-        evaluations = []
+    def _unindex(self, policy_id: str):
+        del self.policies[policy_id]
+        del self.compiled[policy_id]
 
-        # Get applicable policies
-        applicable_policies = []
-        for policy in self.policies.values():
-            if not policy.enabled:
-                continue
+    def _compile(self, policy: Policy, sequence: int) -> CompiledPolicy:
+        condition = compile_condition(policy.condition)
+        compiled = CompiledPolicy(policy=policy, condition=condition, sequence=sequence)
 
-            # Check if policy applies to this user
-            if policy.applies_to and "*" not in policy.applies_to:
-                if event.user_id not in policy.applies_to:
-                    continue
-
-            applicable_policies.append(policy)
+        if policy.event_types:
+            for pattern in policy.event_types:
+                if pattern == "*":
+                    compiled.event_types, compiled.event_type_prefixes = [], []
+                    break
+                if pattern.endswith("*"):
+                    compiled.event_type_prefixes.append(pattern[:-1])
+                else:
+                    compiled.event_types.append(pattern)
+        elif condition.event_types:
+            # A conjunction can only match its required type
+            compiled.event_types = condition.event_types[:1]
+        elif condition.event_type_prefixes:
+            compiled.event_type_prefixes = [max(condition.event_type_prefixes, key=len)]
+        return compiled
+
+    def _reindex(self):
+        """Rebuild the user/event-type index and drop cached lookups"""
+        index: Dict[str, _TypeIndex] = {}
+        for compiled in self.compiled.values():
+            applies_to = compiled.policy.applies_to
+            user_keys = ["*"] if not applies_to or "*" in applies_to else applies_to
+            for user_key in user_keys:
+                type_index = index.setdefault(user_key, _TypeIndex())
+                if not compiled.event_types and not compiled.event_type_prefixes:
+                    type_index.any_type.append(compiled)
+                for event_type in compiled.event_types:
+                    type_index.exact.setdefault(event_type, []).append(compiled)
+                for prefix in compiled.event_type_prefixes:
+                    type_index.prefixes.setdefault(prefix, []).append(compiled)
+        self._index = index
+        self._lookup_cache = {}
+        self._decision_cache = {}
+        self.version += 1
+
+    def get_applicable_policies(self, user_id: str, event_type: str) -> List[CompiledPolicy]:
+        """Get the compiled policies that can apply to a user and event type"""
+        key = (user_id, event_type)
+        cached = self._lookup_cache.get(key)
+        if cached is not None:
+            return cached
+
+        found: Dict[str, CompiledPolicy] = {}
+        for user_key in ("*", user_id):
+            type_index = self._index.get(user_key)
+            if type_index is None:
+                continue
+            for compiled in type_index.any_type:
+                found[compiled.policy.id] = compiled
+            for compiled in type_index.exact.get(event_type, ()):
+                found[compiled.policy.id] = compiled
+            for prefix, policies in type_index.prefixes.items():
+                if event_type.startswith(prefix):
+                    for compiled in policies:
+                        found[compiled.policy.id] = compiled
+
+        applicable = sorted(found.values(), key=lambda c: c.sort_key)
+        if len(self._lookup_cache) >= self.max_cached_lookups:
+            self._lookup_cache = {}
+        self._lookup_cache[key] = applicable
+        return applicable
 
-        # Sort by priority
-        applicable_policies.sort(key=lambda p: p.priority)
+    async def evaluate_policies(
+        self,
+        event: Event,
+        context: Dict[str, Any],
+        explain: bool = False,
+        plan: Optional[List[Tuple[CompiledPolicy, Optional[PolicyEvaluation]]]] = None,
+    ) -> List[PolicyEvaluation]:
+        """Evaluate applicable policies against an event
+
+        Outcomes of policies that only read ``event_type`` and ``user_id``
+        are cached per user, event type and policy set version; policies
+        reading usage counters or event contents always run. With
+        ``explain`` set the cache is bypassed and each evaluation's metadata
+        records the compiled condition and the context values it read.
+        A ``plan`` from ``get_decision_plan`` skips looking up the policies.
+        """
+        if plan is None:
+            plan = self.get_decision_plan(event.user_id, event.type, explain)
 
-        # Evaluate each policy
-        for policy in applicable_policies:
-            try:
-                evaluation = await self._evaluate_policy(policy, event, context)
-                evaluations.append(evaluation)
+        evaluations = []
+        eval_context = None
+        stats = self.decision_stats
 
-                # If policy denies, stop evaluation
-                if evaluation.action == PolicyAction.DENY:
-                    break
+        # Evaluate each applicable policy in priority order
+        for compiled, cached in plan:
+            if not compiled.policy.enabled:
+                continue
 
-            except Exception as e:
-                logging.error(f"Error evaluating policy {policy.id}: {e}")
+            if cached is not None:
+                evaluation = cached
+                stats.evaluations_skipped += 1
+            else:
+                if eval_context is None:
+                    eval_context = self._build_eval_context(event, context)
+                started = time.perf_counter()
+                evaluation = self._evaluate_compiled(compiled, eval_context, explain)
+                stats.evaluation_seconds += time.perf_counter() - started
+                stats.evaluations_run += 1
+            evaluations.append(evaluation)
+
+            # If policy denies, stop evaluation
+            if evaluation.action == PolicyAction.DENY:
+                break
 
         return evaluations
 
-    async def _evaluate_policy(
-        self, policy: Policy, event: Event, context: Dict[str, Any]
-    ) -> PolicyEvaluation:
-        """Evaluate a single policy"""
-        # Build evaluation context
-        eval_context = {
+    def get_decision_plan(
+        self, user_id: str, event_type: str, explain: bool = False
+    ) -> List[Tuple[CompiledPolicy, Optional[PolicyEvaluation]]]:
+        """Get candidates with pre-evaluated outcomes for cacheable policies"""
+        if explain or not self.decision_cache_enabled:
+            return [(c, None) for c in self.get_applicable_policies(user_id, event_type)]
+
+        key = (user_id, event_type)
+        plan = self._decision_cache.get(key)
+        if plan is not None:
+            self.decision_stats.hits += 1
+            return plan
+
+        self.decision_stats.misses += 1
+        key_context = {"event_type": event_type, "user_id": user_id}
+        plan = [
+            (compiled, self._evaluate_compiled(compiled, key_context, False) if compiled.cacheable else None)
+            for compiled in self.get_applicable_policies(user_id, event_type)
+        ]
+        if len(self._decision_cache) >= self.max_cached_lookups:
+            self._decision_cache = {}
+        self._decision_cache[key] = plan
+        return plan
+
+    @staticmethod
+    def _build_eval_context(event: Event, context: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "event": event,
             "event_type": event.type,
             "user_id": event.user_id,
@@ -127,81 +319,118 @@ class PolicyEngine:
             **context,
         }
 
-        try:
-            # Safely evaluate condition using a restricted expression evaluator
-            matched = await self._safe_evaluate_condition(policy.condition, eval_context)
-
-            if matched:
-                return PolicyEvaluation(
-                    policy=policy,
-                    matched=True,
-                    action=policy.action,
-                    message=f"Policy {policy.name} triggered",
-                    metadata={"condition": policy.condition},
-                )
-            else:
-                return PolicyEvaluation(
-                    policy=policy, matched=False, action=PolicyAction.ALLOW
-                )
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get decision cache hit ratio and estimated evaluation time saved"""
+        return {
+            "version": self.version,
+            "entries": len(self._decision_cache),
+            **self.decision_stats.get_stats(),
+        }
 
-        except Exception as e:
-            logging.error(f"Error in policy condition {policy.id}: {e}")
+    def _evaluate_compiled(
+        self, compiled: CompiledPolicy, eval_context: Dict[str, Any], explain: bool
+    ) -> PolicyEvaluation:
+        """Evaluate a single compiled policy"""
+        policy = compiled.policy
+        metadata: Dict[str, Any] = {}
+        if explain:
+            explanation = compiled.condition.explain(eval_context)
+            matched = explanation["matched"]
+            metadata["explain"] = {"policy_id": policy.id, "priority": policy.priority, **explanation}
+        else:
+            matched = compiled.condition(eval_context)
+
+        if matched:
+            metadata["condition"] = policy.condition
             return PolicyEvaluation(
                 policy=policy,
-                matched=False,
-                action=PolicyAction.ALLOW,
-                message=f"Policy evaluation error: {e}",
+                matched=True,
+                action=policy.action,
+                message=f"Policy {policy.name} triggered",
+                metadata=metadata,
             )
-    
-    async def _safe_evaluate_condition(self, condition: str, context: Dict[str, Any]) -> bool:
-        """Safely evaluate a policy condition"""
-        try:
-            # Simple evaluation for common conditions
-            if condition == "always":
-                return True
-            elif condition == "never":
-                return False
-            
-            # Check for specific patterns
-            if "monthly_cost >" in condition:
-                # For now, always return False (cost is not exceeded)
-                return False
-            
-            if "daily_events >" in condition:
-                # For now, always return False (rate limit not exceeded)
-                return False
-            
-            if "event_type.startswith" in condition:
-                # For now, always return False (no PII detected)
-                return False
-            
-            # Default to False (condition not met) for unknown conditions
-            logging.warning(f"Unknown condition type: {condition}")
-            return False
-            
-        except Exception as e:
-            logging.error(f"Error evaluating condition '{condition}': {e}")
-            return False  # Default to not match on error
+        return PolicyEvaluation(
+            policy=policy,
+            matched=False,
+            action=PolicyAction.ALLOW,
+            message=(
+                f"Policy condition error: {compiled.condition.error}"
+                if compiled.condition.error
+                else None
+            ),
+            metadata=metadata,
+        )
 
 
 class SecurityManager:
     """Main security manager for Vextir OS"""
 
-    def __init__(self):
+    def __init__(self, enforce_default_policies: bool = False):
         self.policy_engine = PolicyEngine()
-        self.audit_log: List[Dict[str, Any]] = []
+        # The built-in cost, rate and PII policies are shipped disabled so
+        # they do not change decisions until a deployment opts in
+        self.enforce_default_policies = enforce_default_policies
         self.max_audit_log = 10000
+        self.audit = AuditLog(max_recent=self.max_audit_log)
+        self.explain_decisions = False  # Record per-policy explanations in the audit log
+
+        # Rolling per-user usage, updated as each decision is recorded
+        self.usage = UsageCounters()
+        self.cost_per_event = 0.01  # Rough per-event cost estimate
 
         # Load default policies
         self._load_default_policies()
 
+    @property
+    def audit_log(self) -> List[Dict[str, Any]]:
+        """Recent audit entries, oldest first, as a list snapshot"""
+        return list(self.audit.recent)
+
     async def authorize(self, event: Event) -> bool:
         """Authorize an event based on security policies"""
         # Build context for policy evaluation
         context = await self._build_context(event)
+        return await self._authorize_with_context(event, context)
 
+    async def authorize_batch(self, events: List[Event]) -> List[bool]:
+        """Authorize a batch of events in order
+
+        Each user's usage context and each user and event type's policy
+        lookup are built once per batch. Decisions match authorizing the
+        events one by one: a user's counters advance in the context as
+        their earlier events in the batch are authorized.
+        """
+        contexts: Dict[str, Dict[str, Any]] = {}
+        plans: Dict[Tuple[str, str], Any] = {}
+        decisions = []
+        for event in events:
+            context = contexts.get(event.user_id)
+            if context is None:
+                context = contexts[event.user_id] = await self._build_context(event)
+            key = (event.user_id, event.type)
+            if key not in plans:
+                plans[key] = self.policy_engine.get_decision_plan(
+                    event.user_id, event.type, self.explain_decisions
+                )
+
+            authorized = await self._authorize_with_context(event, dict(context), plans[key])
+            if authorized:
+                # Mirror the usage recorded for the event
+                for counter in ("minute_events", "hourly_events", "daily_events"):
+                    context[counter] += 1
+                context["daily_cost"] += self.cost_per_event
+                context["monthly_cost"] += self.cost_per_event
+            decisions.append(authorized)
+        return decisions
+
+    async def _authorize_with_context(
+        self, event: Event, context: Dict[str, Any], plan: Optional[List[Any]] = None
+    ) -> bool:
+        """Evaluate policies for an event against a prepared context"""
         # Evaluate policies
-        evaluations = await self.policy_engine.evaluate_policies(event, context)
+        evaluations = await self.policy_engine.evaluate_policies(
+            event, context, explain=self.explain_decisions, plan=plan
+        )
 
         # Determine final authorization
         authorized = True
@@ -228,11 +457,15 @@ class SecurityManager:
 
     async def _build_context(self, event: Event) -> Dict[str, Any]:
         """Build context for policy evaluation"""
-        # This could include user info, resource usage, etc.
+        # Rolling usage windows are O(1) to read regardless of audit log size
+        usage = self.usage.snapshot(event.user_id)
         return {
             "current_time": datetime.utcnow(),
-            "daily_events": self._get_daily_events(event.user_id),
-            "monthly_cost": self._get_monthly_cost(event.user_id),
+            "minute_events": usage["minute_events"],
+            "hourly_events": usage["hour_events"],
+            "daily_events": usage["day_events"],
+            "daily_cost": usage["day_cost"],
+            "monthly_cost": usage["month_cost"],
         }
 
     async def _log_authorization(
@@ -252,13 +485,43 @@ class SecurityManager:
             "policies_evaluated": len(evaluations),
             "policies_matched": len([e for e in evaluations if e.matched]),
             "actions_taken": actions,
+            "decided_by": self._deciding_policy(evaluations),
         }
+        if self.explain_decisions:
+            log_entry["explanation"] = [
+                e.metadata["explain"] for e in evaluations if "explain" in e.metadata
+            ]
+
+        self.audit.record(log_entry)
+        if authorized:
+            # Denied events do no work; counting them would keep a user
+            # over a limit for as long as they retry
+            self.usage.record(event.user_id, cost=self.cost_per_event)
+
+    @staticmethod
+    def _deciding_policy(evaluations: List[PolicyEvaluation]) -> Optional[str]:
+        """Get the id of the policy that denied the event, if any"""
+        for evaluation in evaluations:
+            if evaluation.matched and evaluation.action == PolicyAction.DENY:
+                return evaluation.policy.id
+        return None
 
-        self.audit_log.append(log_entry)
+    async def explain(self, event: Event) -> Dict[str, Any]:
+        """Explain how the policies would decide an event
 
-        # Limit audit log size
-        if len(self.audit_log) > self.max_audit_log:
-            self.audit_log = self.audit_log[-self.max_audit_log // 2 :]
+        Nothing is logged and usage counters are not advanced.
+        """
+        context = await self._build_context(event)
+        evaluations = await self.policy_engine.evaluate_policies(
+            event, context, explain=True
+        )
+        decided_by = self._deciding_policy(evaluations)
+        return {
+            "authorized": decided_by is None,
+            "decided_by": decided_by,
+            "policies": [e.metadata["explain"] for e in evaluations],
+            "matched": [e.policy.id for e in evaluations if e.matched],
+        }
 
     def _load_default_policies(self):
         """Load default security policies"""
@@ -270,6 +533,7 @@ class SecurityManager:
             condition="monthly_cost > 100.0",
             action=PolicyAction.DENY,
             applies_to=["*"],
+            enabled=self.enforce_default_policies,
             priority=10,
         )
         self.policy_engine.add_policy(cost_policy)
@@ -282,6 +546,7 @@ class SecurityManager:
             condition="daily_events > 1000",
             action=PolicyAction.RESTRICT,
             applies_to=["*"],
+            enabled=self.enforce_default_policies,
             priority=20,
         )
         self.policy_engine.add_policy(rate_policy)
@@ -294,6 +559,7 @@ class SecurityManager:
             condition="event_type.startswith('context.') and 'Personal' in str(metadata)",
             action=PolicyAction.LOG,
             applies_to=["*"],
+            enabled=self.enforce_default_policies,
             priority=30,
         )
         self.policy_engine.add_policy(pii_policy)
@@ -312,98 +578,54 @@ class SecurityManager:
 
     def get_audit_log(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent audit log entries"""
-        return self.audit_log[-limit:]
+        return self.audit.get_recent(limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get decision cache and audit persistence statistics"""
+        return {
+            "decision_cache": self.policy_engine.get_cache_stats(),
+            "audit": self.audit.get_stats(),
+        }
+
+    def set_audit_sink(self, sink: Optional[AuditSink]):
+        """Persist audit entries in batches to a sink"""
+        self.audit.set_sink(sink)
+
+    async def query_audit_log(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Query audit entries by time range, newest first"""
+        return await self.audit.query(start, end, user_id=user_id, limit=limit)
+
+    async def flush_audit_log(self) -> int:
+        """Write buffered audit entries to the sink"""
+        return await self.audit.flush()
 
     def _get_daily_events(self, user_id: str) -> int:
-        """Get daily event count for user (placeholder implementation)"""
-        # This would integrate with actual metrics system
-        # For now, count events in audit log from today
-        today = datetime.utcnow().date()
-        count = 0
-        for entry in self.audit_log:
-            try:
-                entry_date = datetime.fromisoformat(entry["timestamp"]).date()
-                if entry_date == today and entry.get("user_id") == user_id:
-                    count += 1
-            except (ValueError, KeyError):
-                continue
-        return count
+        """Get the user's event count over the last 24 hours"""
+        return self.usage.get_events(user_id, "day")
 
     def _get_monthly_cost(self, user_id: str) -> float:
-        """Get monthly cost for user (placeholder implementation)"""
-        # This would integrate with actual cost tracking system
-        # For now, return a mock value based on event count
-        daily_events = self._get_daily_events(user_id)
-        # Assume $0.01 per event as rough estimate
-        return daily_events * 0.01
+        """Get the user's estimated cost over the last 30 days"""
+        return self.usage.get_cost(user_id, "month")
+
+    async def save_usage(self, store: DocumentStore) -> int:
+        """Persist usage counters so limits survive restarts"""
+        return await self.usage.save(store)
+
+    async def load_usage(self, store: DocumentStore) -> int:
+        """Restore usage counters persisted by ``save_usage``"""
+        return await self.usage.load(store)
 
     def _safe_evaluate_condition(self, condition: str, context: Dict[str, Any]) -> bool:
-        """
-        Safely evaluate policy conditions without using eval().
-        Supports basic comparison operations and common expressions.
-        """
-        import re
-        
-        # Basic validation of condition string
-        if not condition or not isinstance(condition, str):
-            return False
-            
-        # Remove whitespace
-        condition = condition.strip()
-        
-        # Define allowed operators and patterns
-        allowed_ops = ['>', '<', '>=', '<=', '==', '!=', 'in', 'not in', 'and', 'or', 'startswith', 'endswith']
-        
-        # Simple pattern matching for common conditions
-        try:
-            # Handle numeric comparisons like "monthly_cost > 100.0"
-            numeric_pattern = r'(\w+)\s*([><=!]+)\s*([\d.]+)'
-            match = re.match(numeric_pattern, condition)
-            if match:
-                var_name, operator, value = match.groups()
-                if var_name in context:
-                    var_value = context[var_name]
-                    num_value = float(value)
-                    
-                    if operator == '>':
-                        return var_value > num_value
-                    elif operator == '<':
-                        return var_value < num_value
-                    elif operator == '>=':
-                        return var_value >= num_value
-                    elif operator == '<=':
-                        return var_value <= num_value
-                    elif operator == '==':
-                        return var_value == num_value
-                    elif operator == '!=':
-                        return var_value != num_value
-                        
-            # Handle string operations like "event_type.startswith('context.')"
-            startswith_pattern = r'(\w+)\.startswith\([\'"](.+?)[\'"]\)'
-            match = re.match(startswith_pattern, condition)
-            if match:
-                var_name, prefix = match.groups()
-                if var_name in context:
-                    return str(context[var_name]).startswith(prefix)
-                    
-            # Handle containment checks like "'Personal' in str(metadata)"
-            contains_pattern = r'[\'"](.+?)[\'"]\s+in\s+str\((\w+)\)'
-            match = re.match(contains_pattern, condition)
-            if match:
-                search_term, var_name = match.groups()
-                if var_name in context:
-                    return search_term in str(context[var_name])
-                    
-            # If no pattern matches, default to False for security
-            logging.warning(f"Unable to safely evaluate condition: {condition}")
-            return False
-            
-        except Exception as e:
-            logging.error(f"Error evaluating condition '{condition}': {e}")
-            return False
-
-
-# Global security manager
+        """Evaluate a policy condition string without using eval()"""
+        return compile_condition(condition)(context)
+
+
 _global_security_manager: Optional[SecurityManager] = None
 
 
@@ -411,5 +633,19 @@ def get_security_manager() -> SecurityManager:
     """Get global security manager instance"""
     global _global_security_manager
     if _global_security_manager is None:
-        _global_security_manager = SecurityManager()
+        _global_security_manager = SecurityManager(
+            enforce_default_policies=os.getenv(
+                "VEXTIR_ENFORCE_DEFAULT_POLICIES", "false"
+            ).lower()
+            == "true"
+        )
+        audit_dir = os.getenv("VEXTIR_AUDIT_LOG_DIR")
+        if audit_dir:
+            _global_security_manager.set_audit_sink(FileAuditSink(audit_dir))
     return _global_security_manager
+
+
+async def close_security_manager():
+    """Flush and close the global security manager's audit log, if created"""
+    if _global_security_manager is not None:
+        await _global_security_manager.audit.close()
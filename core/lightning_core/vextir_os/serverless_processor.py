@@ -8,7 +8,7 @@ in cloud serverless environments (Azure Functions, AWS Lambda, etc.).
 
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from lightning_core.abstractions.serverless import (
     FunctionContext,
@@ -17,7 +17,11 @@ from lightning_core.abstractions.serverless import (
 )
 
 from .driver_initialization import initialize_all_drivers
-from .universal_processor import get_universal_processor, process_event_message
+from .universal_processor import (
+    get_universal_processor,
+    process_event_message,
+    process_event_messages,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +66,10 @@ async def universal_event_processor_handler(
                 error_message="Missing event data",
             )
 
+        # Batched triggers deliver a list of messages
+        if isinstance(event_data, list):
+            return await _process_batch(context, event_data)
+
         # Debug logging
         logger.debug(f"Extracted event data: {event_data}")
         
@@ -121,7 +129,68 @@ async def universal_event_processor_handler(
         )
 
 
-def _extract_event_data(context: FunctionContext) -> Optional[Dict[str, Any]]:
+async def _process_batch(
+    context: FunctionContext, messages: List[Dict[str, Any]]
+) -> FunctionResponse:
+    """
+    Process a batch of queue messages through the batched processor.
+
+    Args:
+        context: Serverless function context
+        messages: Event data for each message in the batch
+
+    Returns:
+        FunctionResponse with one result per message. The response is only
+        an error when no message succeeded; otherwise retrying the batch
+        would run drivers again for messages already processed, so callers
+        settle the messages listed in ``failed`` individually.
+    """
+    logger.info(f"Processing batch of {len(messages)} events")
+
+    results = await process_event_messages(messages)
+    failed_indices = [i for i, r in enumerate(results) if r["status"] != "success"]
+    failed = [results[i] for i in failed_indices]
+    output_count = sum(r.get("output_count", 0) for r in results)
+    all_failed = len(failed) == len(messages)
+
+    if failed:
+        logger.error(f"Failed to process {len(failed)} of {len(messages)} events")
+    else:
+        logger.info(
+            f"Successfully processed batch, generated {output_count} output events"
+        )
+
+    if all_failed:
+        status = "error"
+    elif failed:
+        status = "partial"
+    else:
+        status = "success"
+
+    return FunctionResponse(
+        status_code=500 if all_failed else 200,
+        body={
+            "status": status,
+            "results": results,
+            "event_count": len(messages),
+            "failed": failed_indices,
+            "failed_count": len(failed),
+            "output_count": output_count,
+        },
+        headers={
+            "Content-Type": "application/json",
+            "X-Function-Name": context.function_name,
+            "X-Invocation-ID": context.invocation_id,
+        },
+        is_error=all_failed,
+        error_message=failed[0].get("error") if failed else None,
+        logs=[f"Processed batch of {len(messages)} events"],
+    )
+
+
+def _extract_event_data(
+    context: FunctionContext,
+) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
     """
     Extract event data from function context based on trigger type.
 
@@ -129,7 +198,8 @@ def _extract_event_data(context: FunctionContext) -> Optional[Dict[str, Any]]:
         context: Function context
 
     Returns:
-        Event data dictionary or None if not found
+        Event data dictionary, a list of them for batched queue triggers,
+        or None if not found
     """
     trigger_data = context.trigger_data
     logger.debug(f"Trigger type: {context.trigger_type}, Trigger data: {trigger_data}")
@@ -140,6 +210,12 @@ def _extract_event_data(context: FunctionContext) -> Optional[Dict[str, Any]]:
 
     elif context.trigger_type == TriggerType.QUEUE:
         # Queue trigger (Service Bus, SQS, etc.)
+        if isinstance(trigger_data, list):
+            # Batched delivery - unwrap each message envelope
+            return [
+                message.get("body") or message.get("data") or message
+                for message in trigger_data
+            ]
         # Data might be wrapped in a message envelope
         if "body" in trigger_data:
             return trigger_data["body"]
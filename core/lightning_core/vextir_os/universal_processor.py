@@ -9,9 +9,12 @@ import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from ..events.factory import get_event_factory
 from .drivers import DriverRegistry, get_driver_registry
 from .event_bus import EventBus, get_event_bus
 from .events import Event
+from .execution_lanes import KeyedLaneScheduler, LaneConfig
+from .metrics import BoundedHistogramMap, LatencyHistogram, PrometheusWriter
 from .registries import (
     ModelRegistry,
     get_model_registry,
@@ -27,6 +30,12 @@ class EventProcessingError(Exception):
     pass
 
 
+class EventAuthorizationError(EventProcessingError):
+    """Event rejected by security policy"""
+
+    pass
+
+
 class UniversalEventProcessor:
     """Single Azure Function that processes all events according to Vextir OS spec"""
 
@@ -37,6 +46,18 @@ class UniversalEventProcessor:
         self.model_registry = get_model_registry()
         self.tool_registry = get_tool_registry()
         self.metrics = EventMetrics()
+        self.lanes: Optional[KeyedLaneScheduler] = None
+
+    def enable_lanes(self, config: Optional[LaneConfig] = None) -> KeyedLaneScheduler:
+        """Route ``submit_event`` through per-user fair execution lanes"""
+        self.lanes = KeyedLaneScheduler(self.process_event, config)
+        return self.lanes
+
+    async def submit_event(self, event: Event) -> List[Event]:
+        """Process an event through its user's lane when lanes are enabled"""
+        if self.lanes is None:
+            return await self.process_event(event)
+        return await self.lanes.run(event)
 
     async def process_event(self, event: Event) -> List[Event]:
         """Main event processing loop"""
@@ -50,10 +71,10 @@ class UniversalEventProcessor:
 
             # 2. Apply security policies
             if not await self.security_manager.authorize(event):
-                raise EventProcessingError(f"Unauthorized event: {event}")
+                raise EventAuthorizationError(f"Unauthorized event: {event}")
 
             # 3. Check if event has any consumers (drivers or direct subscribers)
-            has_drivers = bool(self.driver_registry.get_drivers_by_capability(event.type))
+            has_drivers = self.driver_registry.has_capable_drivers(event.type)
             has_subscribers = await self.event_bus.has_subscribers(event.type)
             
             if not has_drivers and not has_subscribers:
@@ -83,27 +104,159 @@ class UniversalEventProcessor:
             )
 
         except Exception as e:
-            # Create error event
-            error_event = Event(
-                timestamp=datetime.utcnow(),
-                source="UniversalEventProcessor",
-                type="error",
-                user_id=event.user_id,
-                metadata={
-                    "original_event": event.to_dict(),
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                },
+            output_events.append(
+                await self._handle_processing_error(event, e, time.time() - start_time)
             )
-            output_events.append(error_event)
 
-            # Update error metrics
-            processing_time = time.time() - start_time
-            await self.metrics.record_error(event, str(e), processing_time)
+        return output_events
 
-            logging.error(f"Error processing event {event.type}: {e}")
+    async def process_events(
+        self, events: List[Event], max_concurrency: int = 10
+    ) -> List[List[Event]]:
+        """Process a batch of events, returning output events per input event
 
-        return output_events
+        Equivalent to calling ``process_event`` for each event, but consumers
+        are resolved once per event type, drivers are invoked with bounded
+        concurrency and all output events are queued with a single bus call.
+        """
+        start_time = time.time()
+        results: List[List[Event]] = [[] for _ in events]
+
+        # 1. Validate events
+        valid = []
+        for index, event in enumerate(events):
+            if self._validate_event(event):
+                valid.append(index)
+            else:
+                results[index].append(
+                    await self._handle_processing_error(
+                        event,
+                        EventProcessingError(f"Invalid event: {event}"),
+                        time.time() - start_time,
+                    )
+                )
+
+        # 2. Apply security policies, grouped by user
+        decisions = await self.security_manager.authorize_batch(
+            [events[index] for index in valid]
+        )
+        authorized = []
+        for index, allowed in zip(valid, decisions):
+            if allowed:
+                authorized.append(index)
+            else:
+                results[index].append(
+                    await self._handle_processing_error(
+                        events[index],
+                        EventAuthorizationError(f"Unauthorized event: {events[index]}"),
+                        time.time() - start_time,
+                    )
+                )
+
+        # 3. Resolve consumers once per event type
+        consumers: Dict[str, Optional[List[str]]] = {}
+        for event_type in {events[index].type for index in authorized}:
+            driver_ids = self.driver_registry.resolve_driver_ids(event_type)
+            if self.driver_registry.has_capable_drivers(
+                event_type, driver_ids
+            ) or await self.event_bus.has_subscribers(event_type):
+                consumers[event_type] = driver_ids
+            else:
+                logging.warning(
+                    f"Event {event_type} has no consumers (no drivers or subscribers). "
+                    f"Event will be drained to prevent accumulation."
+                )
+                consumers[event_type] = None
+
+        # 4. Route to drivers with bounded concurrency
+        semaphore = asyncio.Semaphore(max_concurrency)
+        routed: List[int] = []
+        # Per-event routing time, so latency histograms are not inflated by
+        # the rest of the batch
+        durations: Dict[int, float] = {}
+
+        async def route(index: int):
+            event = events[index]
+            driver_ids = consumers[event.type]
+            if driver_ids is None:
+                await self.metrics.record_orphaned_event(event)
+                return
+            try:
+                async with semaphore:
+                    route_start = time.time()
+                    try:
+                        output_events = await self.driver_registry.route_event(
+                            event, driver_ids
+                        )
+                    finally:
+                        durations[index] = time.time() - route_start
+                for output_event in output_events:
+                    output_event.correlation_id = event.id
+                results[index] = output_events
+                routed.append(index)
+            except Exception as e:
+                results[index].append(
+                    await self._handle_processing_error(
+                        event, e, durations.get(index, 0.0)
+                    )
+                )
+
+        await asyncio.gather(*(route(index) for index in authorized))
+
+        # 5. Queue output events in one call
+        routed.sort()
+        try:
+            await self.event_bus.emit_batch(
+                [output_event for index in routed for output_event in results[index]]
+            )
+        except Exception as e:
+            # As in process_event, outputs that were not queued are errors
+            logging.error(f"Error queueing batch output events: {e}")
+            for index in routed:
+                results[index].append(
+                    await self._handle_processing_error(
+                        events[index], e, durations[index]
+                    )
+                )
+            routed = []
+
+        # 6. Update metrics
+        for index in routed:
+            await self.metrics.record_event(
+                events[index], results[index], durations[index]
+            )
+
+        logging.info(
+            f"Processed batch of {len(events)} events -> "
+            f"{sum(len(r) for r in results)} output events"
+        )
+        return results
+
+    async def _handle_processing_error(
+        self, event: Event, error: Exception, processing_time: float
+    ) -> Event:
+        """Record a processing failure and build the error event for it"""
+        error_event = Event(
+            timestamp=datetime.utcnow(),
+            source="UniversalEventProcessor",
+            type="error",
+            user_id=event.user_id,
+            metadata={
+                "original_event": event.to_dict(),
+                "error": str(error),
+                "error_type": type(error).__name__,
+            },
+        )
+
+        await self.metrics.record_error(
+            event,
+            str(error),
+            processing_time,
+            denied=isinstance(error, EventAuthorizationError),
+        )
+
+        logging.error(f"Error processing event {event.type}: {error}")
+        return error_event
 
     def _validate_event(self, event: Event) -> bool:
         """Validate event structure and required fields"""
@@ -119,42 +272,111 @@ class UniversalEventProcessor:
 
     async def get_metrics(self) -> Dict[str, Any]:
         """Get processing metrics"""
-        return await self.metrics.get_summary()
+        summary = await self.metrics.get_summary()
+        summary["latency_by_driver"] = {
+            driver_id: instance.latency.summary()
+            for driver_id, instance in self.driver_registry.instances.items()
+        }
+        if self.lanes is not None:
+            summary["lanes"] = self.lanes.get_metrics()
+        return summary
+
+    def get_prometheus_metrics(self) -> str:
+        """Get processing and driver metrics in Prometheus text format"""
+        instances = self.driver_registry.instances
+        writer = PrometheusWriter()
+        writer.summary(
+            "vextir_driver_latency_seconds",
+            "Time spent in driver event handlers",
+            [({"driver": d}, i.latency) for d, i in instances.items()],
+        )
+        writer.counter(
+            "vextir_driver_errors_total",
+            "Driver handler failures, including timeouts",
+            [({"driver": d}, i.error_count) for d, i in instances.items()],
+        )
+        writer.counter(
+            "vextir_driver_rejected_total",
+            "Events shed by an open circuit or full bulkhead",
+            [({"driver": d}, i.rejected_count) for d, i in instances.items()],
+        )
+        writer.gauge(
+            "vextir_driver_circuit_open",
+            "Whether a driver's circuit breaker is currently open",
+            [
+                ({"driver": driver_id}, int(state["state"] == "open"))
+                for driver_id, state in self.driver_registry.get_circuit_states().items()
+            ],
+        )
+        if self.lanes is not None:
+            lanes = self.lanes.lanes
+            writer.gauge(
+                "vextir_lane_queued",
+                "Events waiting in a user's execution lane",
+                [({"lane": k}, len(lane.queue)) for k, lane in lanes.items()],
+            )
+            writer.summary(
+                "vextir_lane_wait_seconds",
+                "Time events wait in their execution lane before starting",
+                [({"lane": k}, lane.wait_times) for k, lane in lanes.items()],
+            )
+            writer.counter(
+                "vextir_lane_processed_total",
+                "Events completed per execution lane",
+                [({"lane": k}, lane.processed) for k, lane in lanes.items()],
+            )
+        return self.metrics.render_prometheus(writer)
 
 
 class EventMetrics:
-    """Metrics collection for event processing"""
+    """Metrics collection for event processing
 
-    def __init__(self):
+    Latencies go into fixed-memory histograms (overall and per event type),
+    so recording is O(1) and tail latency stays visible. Per-driver
+    histograms live on the driver registry instances.
+    """
+
+    def __init__(self, max_event_types: int = 500):
         self.total_events = 0
         self.total_errors = 0
         self.total_orphaned = 0
-        self.processing_times = []
+        self.total_drained = 0
+        self.total_denied = 0
+        self.total_failed = 0
+        self.processing_times = LatencyHistogram()
+        self.latency_by_type = BoundedHistogramMap(max_event_types)
         self.event_types = {}
         self.error_types = {}
         self.orphaned_types = {}
-        self.max_metrics = 10000
 
     async def record_event(
         self, event: Event, output_events: List[Event], processing_time: float
     ):
         """Record successful event processing"""
         self.total_events += 1
-        self.processing_times.append(processing_time)
+        self.processing_times.record(processing_time)
+        self.latency_by_type.record(event.type, processing_time)
 
         # Track event types
         if event.type not in self.event_types:
             self.event_types[event.type] = 0
         self.event_types[event.type] += 1
 
-        # Limit metrics size
-        if len(self.processing_times) > self.max_metrics:
-            self.processing_times = self.processing_times[-self.max_metrics // 2 :]
-
-    async def record_error(self, event: Event, error: str, processing_time: float):
-        """Record event processing error"""
+    async def record_error(
+        self,
+        event: Event,
+        error: str,
+        processing_time: float,
+        denied: bool = False,
+    ):
+        """Record event processing error (or authorization denial)"""
         self.total_errors += 1
-        self.processing_times.append(processing_time)
+        if denied:
+            self.total_denied += 1
+        else:
+            self.total_failed += 1
+        self.processing_times.record(processing_time)
+        self.latency_by_type.record(event.type, processing_time)
 
         # Track error types
         error_type = error.split(":")[0] if ":" in error else "Unknown"
@@ -171,26 +393,71 @@ class EventMetrics:
             self.orphaned_types[event.type] = 0
         self.orphaned_types[event.type] += 1
 
+    def record_drained(self, count: int):
+        """Record orphaned events drained from the event bus"""
+        self.total_drained += count
+
     async def get_summary(self) -> Dict[str, Any]:
         """Get metrics summary"""
-        avg_processing_time = (
-            sum(self.processing_times) / len(self.processing_times)
-            if self.processing_times
-            else 0
-        )
+        overall = self.processing_times.summary()
 
         return {
             "total_events": self.total_events,
             "total_errors": self.total_errors,
             "total_orphaned": self.total_orphaned,
+            "total_drained": self.total_drained,
+            "total_denied": self.total_denied,
+            "total_failed": self.total_failed,
             "error_rate": self.total_errors / max(self.total_events, 1),
             "orphan_rate": self.total_orphaned / max(self.total_events, 1),
-            "avg_processing_time_ms": avg_processing_time * 1000,
+            "avg_processing_time_ms": overall["avg_ms"],
+            "p50_processing_time_ms": overall["p50_ms"],
+            "p95_processing_time_ms": overall["p95_ms"],
+            "p99_processing_time_ms": overall["p99_ms"],
+            "latency_by_type": {
+                event_type: histogram.summary()
+                for event_type, histogram in self.latency_by_type.items()
+            },
             "event_types": self.event_types,
             "error_types": self.error_types,
             "orphaned_types": self.orphaned_types,
         }
 
+    def render_prometheus(self, writer: Optional[PrometheusWriter] = None) -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        writer = writer or PrometheusWriter()
+        writer.counter(
+            "vextir_events_processed_total",
+            "Events processed successfully",
+            [({"event_type": t}, n) for t, n in self.event_types.items()],
+        )
+        writer.counter(
+            "vextir_events_orphaned_total",
+            "Events with no consumers, drained by the processor",
+            [({"event_type": t}, n) for t, n in self.orphaned_types.items()],
+        )
+        writer.counter(
+            "vextir_events_drained_total",
+            "Orphaned events drained from the event bus",
+            [({}, self.total_drained)],
+        )
+        writer.counter(
+            "vextir_events_denied_total",
+            "Events rejected by security policy",
+            [({}, self.total_denied)],
+        )
+        writer.counter(
+            "vextir_events_failed_total",
+            "Events that failed during processing",
+            [({}, self.total_failed)],
+        )
+        writer.summary(
+            "vextir_event_processing_seconds",
+            "End-to-end event processing latency",
+            [({"event_type": t}, h) for t, h in self.latency_by_type.items()],
+        )
+        return writer.render()
+
 
 # Global processor instance
 _global_processor: Optional[UniversalEventProcessor] = None
@@ -204,77 +471,118 @@ def get_universal_processor() -> UniversalEventProcessor:
     return _global_processor
 
 
+def event_from_message(event_data: Dict[str, Any]) -> Event:
+    """Build a typed event from a Service Bus message payload"""
+    logging.debug(f"Processing event data: {event_data}")
+
+    # Convert EventMessage format to Event format if needed
+    if 'event_type' in event_data and 'type' not in event_data:
+        # This is an EventMessage, convert to Event format
+        event_data = {
+            'type': event_data.get('event_type', 'unknown'),
+            'data': event_data.get('data', {}),
+            'id': event_data.get('id'),
+            'timestamp': event_data.get('timestamp'),
+            'source': event_data.get('metadata', {}).get('source', 'unknown'),
+            'user_id': event_data.get('metadata', {}).get('userID') or event_data.get('metadata', {}).get('user_id', 'unknown'),
+            'metadata': event_data.get('metadata', {})
+        }
+
+        # Remove None values to avoid issues
+        event_data = {k: v for k, v in event_data.items() if v is not None}
+
+    # Ensure required fields have defaults
+    if 'source' not in event_data:
+        event_data['source'] = 'unknown'
+    if 'user_id' not in event_data:
+        # Try to extract user_id from metadata if not at top level
+        event_data['user_id'] = event_data.get('metadata', {}).get('userID') or event_data.get('metadata', {}).get('user_id', 'unknown')
+
+    # Create appropriate typed event based on event type
+    event_type = event_data.get('type', 'unknown')
+    logging.debug(f"Creating event of type: {event_type}")
+
+    try:
+        return get_event_factory().from_dict(event_data)
+    except Exception as e:
+        logging.error(f"Failed to create event from data: {e}")
+        logging.error(f"Event data was: {event_data}")
+        raise
+
+
+def _message_result(
+    processor: UniversalEventProcessor, event: Event, output_events: List[Event]
+) -> Dict[str, Any]:
+    """Summarize the processing of one message"""
+    # Get driver processing results
+    driver_results = {}
+    drivers = processor.driver_registry.get_drivers_by_capability(event.type)
+    for driver in drivers:
+        driver_results[driver.manifest.id] = {
+            "handled": True,  # If we got here, driver was called
+            "capabilities": driver.get_capabilities()
+        }
+
+    return {
+        "status": "success",
+        "input_event": event.to_dict(),
+        "output_events": [e.to_dict() for e in output_events],
+        "output_count": len(output_events),
+        "driver_results": driver_results,
+    }
+
+
 async def process_event_message(event_data: Dict[str, Any]) -> Dict[str, Any]:
     """Process event from Azure Service Bus message"""
     try:
-        # Import specific event types
-        from ..events.models import LLMChatEvent, EmailEvent, CalendarEvent
-        
-        logging.debug(f"Processing event data: {event_data}")
-        
-        # Convert EventMessage format to Event format if needed
-        if 'event_type' in event_data and 'type' not in event_data:
-            # This is an EventMessage, convert to Event format
-            event_data = {
-                'type': event_data.get('event_type', 'unknown'),
-                'data': event_data.get('data', {}),
-                'id': event_data.get('id'),
-                'timestamp': event_data.get('timestamp'),
-                'source': event_data.get('metadata', {}).get('source', 'unknown'),
-                'user_id': event_data.get('metadata', {}).get('userID') or event_data.get('metadata', {}).get('user_id', 'unknown'),
-                'metadata': event_data.get('metadata', {})
-            }
-            
-            # Remove None values to avoid issues
-            event_data = {k: v for k, v in event_data.items() if v is not None}
-        
-        # Ensure required fields have defaults
-        if 'source' not in event_data:
-            event_data['source'] = 'unknown'
-        if 'user_id' not in event_data:
-            # Try to extract user_id from metadata if not at top level
-            event_data['user_id'] = event_data.get('metadata', {}).get('userID') or event_data.get('metadata', {}).get('user_id', 'unknown')
-        
-        # Create appropriate typed event based on event type
-        event_type = event_data.get('type', 'unknown')
-        logging.debug(f"Creating event of type: {event_type}")
-        
-        try:
-            if event_type == 'llm.chat':
-                event = LLMChatEvent.from_dict(event_data)
-            elif event_type == 'email':
-                event = EmailEvent.from_dict(event_data)
-            elif event_type == 'calendar':
-                event = CalendarEvent.from_dict(event_data)
-            else:
-                # Default to generic event
-                event = Event.from_dict(event_data)
-        except Exception as e:
-            logging.error(f"Failed to create event from data: {e}")
-            logging.error(f"Event data was: {event_data}")
-            raise
+        event = event_from_message(event_data)
 
         # Process through universal processor
         processor = get_universal_processor()
         output_events = await processor.process_event(event)
-        
-        # Get driver processing results
-        driver_results = {}
-        drivers = processor.driver_registry.get_drivers_by_capability(event.type)
-        for driver in drivers:
-            driver_results[driver.manifest.id] = {
-                "handled": True,  # If we got here, driver was called
-                "capabilities": driver.get_capabilities()
-            }
 
-        return {
-            "status": "success",
-            "input_event": event.to_dict(),
-            "output_events": [e.to_dict() for e in output_events],
-            "output_count": len(output_events),
-            "driver_results": driver_results,
-        }
+        return _message_result(processor, event, output_events)
 
     except Exception as e:
         logging.error(f"Failed to process event: {e}")
         return {"status": "error", "error": str(e), "input_event": event_data}
+
+
+async def process_event_messages(
+    messages: List[Dict[str, Any]], max_concurrency: int = 10
+) -> List[Dict[str, Any]]:
+    """Process a batch of Service Bus messages through ``process_events``
+
+    Results are returned in message order; a message that cannot be parsed
+    yields an error result without failing the rest of the batch.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+    events: List[Event] = []
+    positions: List[int] = []
+
+    for index, event_data in enumerate(messages):
+        try:
+            events.append(event_from_message(event_data))
+            positions.append(index)
+        except Exception as e:
+            logging.error(f"Failed to process event: {e}")
+            results[index] = {"status": "error", "error": str(e), "input_event": event_data}
+
+    if events:
+        processor = get_universal_processor()
+        try:
+            batch_outputs = await processor.process_events(events, max_concurrency)
+        except Exception as e:
+            logging.error(f"Failed to process event batch: {e}")
+            for index in positions:
+                results[index] = {
+                    "status": "error",
+                    "error": str(e),
+                    "input_event": messages[index],
+                }
+            return results
+
+        for index, event, output_events in zip(positions, events, batch_outputs):
+            results[index] = _message_result(processor, event, output_events)
+
+    return results
@@ -0,0 +1,205 @@
+"""
+Vextir OS Usage Counters - Per-user sliding-window event and cost counters
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..abstractions.storage import Document, DocumentStore
+
+# Window name -> (bucket width in seconds, number of buckets)
+DEFAULT_WINDOWS: Dict[str, Tuple[int, int]] = {
+    "minute": (1, 60),
+    "hour": (60, 60),
+    "day": (3600, 24),
+    "month": (86400, 30),
+}
+
+
+class SlidingWindowCounter:
+    """Event count and cost over a rolling window of fixed-size buckets
+
+    Recording and reading are O(1) amortized: buckets that fall out of the
+    window are cleared lazily as time advances, and running totals are kept
+    alongside the buckets.
+    """
+
+    def __init__(self, bucket_seconds: int, num_buckets: int):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self.counts: List[int] = [0] * num_buckets
+        self.costs: List[float] = [0.0] * num_buckets
+        self.total_count = 0
+        self.total_cost = 0.0
+        self.last_index: Optional[int] = None
+
+    def _advance(self, now: float) -> int:
+        index = int(now // self.bucket_seconds)
+        if self.last_index is None or index - self.last_index >= self.num_buckets:
+            self._clear()
+        elif index > self.last_index:
+            for expired in range(self.last_index + 1, index + 1):
+                slot = expired % self.num_buckets
+                self.total_count -= self.counts[slot]
+                self.total_cost -= self.costs[slot]
+                self.counts[slot] = 0
+                self.costs[slot] = 0.0
+            if not self.total_count:
+                self.total_cost = 0.0  # Drop accumulated float drift
+        if self.last_index is None or index > self.last_index:
+            self.last_index = index
+        return index
+
+    def _clear(self):
+        self.counts = [0] * self.num_buckets
+        self.costs = [0.0] * self.num_buckets
+        self.total_count = 0
+        self.total_cost = 0.0
+
+    def add(self, now: float, count: int = 1, cost: float = 0.0):
+        slot = self._advance(now) % self.num_buckets
+        self.counts[slot] += count
+        self.costs[slot] += cost
+        self.total_count += count
+        self.total_cost += cost
+
+    def get(self, now: float) -> Tuple[int, float]:
+        """Get the event count and cost within the window"""
+        self._advance(now)
+        return self.total_count, self.total_cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "last_index": self.last_index,
+            "counts": self.counts,
+            "costs": self.costs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SlidingWindowCounter":
+        counter = cls(data["bucket_seconds"], len(data["counts"]))
+        counter.last_index = data.get("last_index")
+        counter.counts = list(data["counts"])
+        counter.costs = list(data["costs"])
+        counter.total_count = sum(counter.counts)
+        counter.total_cost = sum(counter.costs)
+        return counter
+
+
+class UsageCounters:
+    """Per-user rolling event counts and estimated cost
+
+    Each user has one ``SlidingWindowCounter`` per window in ``windows``.
+    Counters can be saved to and loaded from a ``DocumentStore`` (one
+    document per user) so that limits survive restarts. Users whose
+    windows are all empty are evicted whenever the number of tracked
+    users doubles, and after each save.
+    """
+
+    min_sweep_users = 1024
+
+    def __init__(self, windows: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.windows = windows or DEFAULT_WINDOWS
+        self._users: Dict[str, Dict[str, SlidingWindowCounter]] = {}
+        self._dirty: set = set()
+        self._sweep_at = self.min_sweep_users
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def _counters_for(self, user_id: str) -> Dict[str, SlidingWindowCounter]:
+        counters = self._users.get(user_id)
+        if counters is None:
+            if len(self._users) >= self._sweep_at:
+                self.evict_idle()
+                self._sweep_at = max(self.min_sweep_users, 2 * len(self._users))
+            counters = self._users[user_id] = {
+                name: SlidingWindowCounter(bucket_seconds, num_buckets)
+                for name, (bucket_seconds, num_buckets) in self.windows.items()
+            }
+        return counters
+
+    def record(self, user_id: str, cost: float = 0.0, count: int = 1,
+               now: Optional[float] = None):
+        """Record events and their estimated cost for a user"""
+        now = time.time() if now is None else now
+        for counter in self._counters_for(user_id).values():
+            counter.add(now, count, cost)
+        self._dirty.add(user_id)
+
+    def get_events(self, user_id: str, window: str = "day", now: Optional[float] = None) -> int:
+        counters = self._users.get(user_id)
+        if counters is None:
+            return 0
+        return counters[window].get(time.time() if now is None else now)[0]
+
+    def get_cost(self, user_id: str, window: str = "day", now: Optional[float] = None) -> float:
+        counters = self._users.get(user_id)
+        if counters is None:
+            return 0.0
+        return counters[window].get(time.time() if now is None else now)[1]
+
+    def snapshot(self, user_id: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get event counts and costs for every window"""
+        now = time.time() if now is None else now
+        counters = self._users.get(user_id, {})
+        result = {}
+        for name in self.windows:
+            count, cost = counters[name].get(now) if name in counters else (0, 0.0)
+            result[f"{name}_events"] = count
+            result[f"{name}_cost"] = cost
+        return result
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Forget users with no events left in any window; returns users evicted"""
+        now = time.time() if now is None else now
+        idle = [
+            user_id
+            for user_id, counters in self._users.items()
+            if not any(counter.get(now)[0] for counter in counters.values())
+        ]
+        for user_id in idle:
+            # A saved copy only holds buckets that have expired by now
+            del self._users[user_id]
+            self._dirty.discard(user_id)
+        return len(idle)
+
+    async def save(self, store: DocumentStore, only_dirty: bool = True) -> int:
+        """Persist counters, one document per user; returns documents written"""
+        user_ids = list(self._dirty if only_dirty else self._users)
+        written = 0
+        for user_id in user_ids:
+            data = {
+                "user_id": user_id,
+                "windows": {
+                    name: counter.to_dict()
+                    for name, counter in self._users[user_id].items()
+                },
+            }
+            try:
+                existing = await store.read(user_id, user_id)
+                if existing is None:
+                    await store.create(Document(id=user_id, partition_key=user_id, data=data))
+                else:
+                    existing.data = data
+                    await store.update(existing)
+                self._dirty.discard(user_id)
+                written += 1
+            except Exception as e:
+                logging.error(f"Failed to persist usage counters for {user_id}: {e}")
+        self.evict_idle()
+        return written
+
+    async def load(self, store: DocumentStore) -> int:
+        """Load persisted counters; returns the number of users loaded"""
+        loaded = 0
+        async for document in store.iter_all():
+            windows = document.data.get("windows", {})
+            counters = self._counters_for(document.data.get("user_id", document.id))
+            for name, data in windows.items():
+                if name in counters:
+                    counters[name] = SlidingWindowCounter.from_dict(data)
+            loaded += 1
+        return loaded
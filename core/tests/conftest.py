@@ -0,0 +1,13 @@
+"""Shared fixtures for the core tests."""
+
+import pytest
+
+from lightning_core.providers.local.storage import LocalStorageProvider
+
+
+@pytest.fixture
+async def local(tmp_path):
+    """A local storage provider in a fresh directory, closed afterwards."""
+    provider = LocalStorageProvider(str(tmp_path / "db"))
+    yield provider
+    await provider.close()
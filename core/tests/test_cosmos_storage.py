@@ -0,0 +1,96 @@
+"""Tests for the async Cosmos DB store against the in-process fake."""
+
+import asyncio
+import time
+
+import pytest
+
+# Importing the Azure providers needs the optional Azure SDKs
+pytest.importorskip("lightning_core.providers.azure.storage")
+
+from lightning_core.abstractions.query import Query
+from lightning_core.abstractions.storage import Document, DocumentConflictError
+from lightning_core.providers.azure.cosmos_fake import FakeCosmosClient
+from lightning_core.providers.azure.storage import CosmosStorageProvider
+
+
+async def make_store(client=None, **kwargs):
+    provider = CosmosStorageProvider(client=client or FakeCosmosClient(), **kwargs)
+    await provider.create_container_if_not_exists("items")
+    return provider, provider.get_document_store("items", Document)
+
+
+class TestCosmosDocumentStore:
+    """Test document operations on the async SDK."""
+
+    @pytest.mark.asyncio
+    async def test_crud_query_and_pages(self):
+        provider, store = await make_store()
+
+        created = await store.create(Document(id="a", partition_key="p", data={"n": 1}))
+        assert (await store.read("a")).data == {"n": 1}
+
+        stale = await store.read("a", "p")
+        assert await store.read_if_modified("a", "p", stale.etag) == (False, None)
+        created.data["n"] = 2
+        assert (await store.update(created, if_match=created.etag)).version == 2
+        with pytest.raises(DocumentConflictError):
+            await store.update(stale, if_match=stale.etag)
+        with pytest.raises(DocumentConflictError):
+            await store.delete("a", "p", if_match=stale.etag)
+
+        await store.bulk_upsert(
+            [Document(id=f"b{i}", partition_key="q", data={"n": i % 2}) for i in range(5)]
+        )
+        assert len(await store.query({"n": 1})) == 2
+        assert len([doc async for doc in store.iter_all(page_size=2)]) == 6
+        assert [doc.id if doc else None for doc in await store.read_many(["b1", "x"], "q")] == ["b1", None]
+
+        assert await store.delete("a")
+        assert (await store.bulk_delete(["b0", "missing"], "q")).failed[0].id == "missing"
+        assert len(await store.list_all()) == 4
+
+    @pytest.mark.asyncio
+    async def test_query_expressions(self):
+        provider, store = await make_store()
+        await store.bulk_upsert(
+            [
+                Document(id="a", partition_key="u", data={"name": "daily-a", "due": 10, "meta": {"owner": "x"}}),
+                Document(id="b", partition_key="u", data={"name": "daily-b", "due": 30}),
+                Document(id="c", partition_key="u", data={"name": "weekly", "due": 20}),
+            ]
+        )
+
+        query = Query(
+            filter={"due": {"$gte": 10, "$lt": 30}, "name": {"$prefix": "daily"}},
+            fields=["name", "meta.owner"],
+        )
+        assert [doc.data for doc in await store.query(query)] == [{"name": "daily-a", "meta": {"owner": "x"}}]
+        docs = await store.query(Query(filter={"meta": {"$exists": False}}, order_by=["-due"], limit=1))
+        assert [doc.id for doc in docs] == ["b"]
+        page = await store.query_page({"due": {"$in": [10, 20]}}, page_size=1)
+        assert page.has_more and page.items[0].etag
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        provider, store = await make_store(FakeCosmosClient(latency=0.01), max_concurrency=4)
+        await asyncio.gather(
+            *(store.create(Document(id=str(i), partition_key="p")) for i in range(20))
+        )
+
+        container = provider._containers["items"]
+        assert container.max_in_flight == 4
+        assert provider.get_stats()["requests"] == 20
+
+    @pytest.mark.asyncio
+    async def test_throttled_requests_wait_for_retry_after(self):
+        provider, store = await make_store()
+        container = provider._containers["items"]
+        await store.create(Document(id="a", partition_key="p"))
+
+        container.throttle(2, retry_after_ms=50)
+        started = time.monotonic()
+        assert await store.read("a", "p") is not None
+        assert time.monotonic() - started >= 0.1
+        assert container.throttled[1] - container.throttled[0] >= 0.05
+        assert provider.get_stats()["throttled"] == 2
@@ -0,0 +1,291 @@
+"""Tests for the SQLite-backed local storage provider."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from lightning_core.abstractions.query import Query
+from lightning_core.abstractions.storage import Document, DocumentConflictError
+from lightning_core.providers.local.storage import LocalStorageProvider
+
+
+@pytest.fixture
+async def provider(tmp_path):
+    provider = LocalStorageProvider(str(tmp_path))
+    yield provider
+    await provider.close()
+
+
+class TestLocalDocumentStore:
+    """Test document operations over pooled connections."""
+
+    @pytest.mark.asyncio
+    async def test_crud_round_trip(self, provider):
+        store = provider.get_document_store("items", Document)
+
+        created = await store.create(Document(id="a", partition_key="p", data={"n": 1}))
+        assert (await store.read("a", "p")).data == {"n": 1}
+
+        created.data["n"] = 2
+        await store.update(created)
+        assert (await store.query({"n": 2}))[0].id == "a"
+        assert len(await store.list_all(partition_key="p")) == 1
+
+        assert await store.delete("a", "p")
+        assert await store.read("a") is None
+        with pytest.raises(ValueError):
+            await store.update(created)
+
+    @pytest.mark.asyncio
+    async def test_wal_and_concurrent_access(self, provider):
+        store = provider.get_document_store("items", Document)
+
+        await asyncio.gather(
+            *(store.create(Document(id=str(i), partition_key="p", data={"i": i})) for i in range(50))
+        )
+        reads = await asyncio.gather(*(store.read(str(i), "p") for i in range(50)))
+        assert [doc.data["i"] for doc in reads] == list(range(50))
+
+        mode = await store.pool.read(
+            lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0]
+        )
+        assert mode == "wal"
+
+    @pytest.mark.asyncio
+    async def test_pool_reopens_after_close(self, provider):
+        store = provider.get_document_store("items", Document)
+        await store.create(Document(id="a", partition_key="p"))
+
+        await provider.close()
+        assert await store.read("a", "p") is not None
+
+        await provider.delete_container("items")
+        assert not await provider.container_exists("items")
+
+
+class TestBulkOperations:
+    """Test bulk upsert, delete and read."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_reports_partial_failures(self, provider):
+        store = provider.get_document_store("items", Document)
+        await store.create(Document(id="taken", partition_key="other"))
+
+        documents = [Document(id=str(i), partition_key="p", data={"i": i}) for i in range(3)]
+        documents.append(Document(id="taken", partition_key="p"))
+        result = await store.bulk_upsert(documents)
+
+        assert [item.success for item in result.items] == [True, True, True, False]
+        assert "another partition" in result.failed[0].error
+
+        documents[0].data["i"] = 10
+        assert (await store.bulk_upsert(documents[:1])).all_succeeded
+        assert (await store.read("0", "p")).data == {"i": 10}
+
+    @pytest.mark.asyncio
+    async def test_read_many_and_bulk_delete(self, provider):
+        store = provider.get_document_store("items", Document)
+        await store.bulk_upsert([Document(id=str(i), partition_key="p") for i in range(5)])
+
+        found = await store.read_many(["4", "missing", "0"])
+        assert [doc.id if doc else None for doc in found] == ["4", None, "0"]
+
+        result = await store.bulk_delete(["0", "1", "missing"], partition_key="p")
+        assert [item.success for item in result.items] == [True, True, False]
+        assert len(await store.list_all()) == 3
+
+
+class TestDeclaredIndexes:
+    """Test JSON-path expression indexes and query plan diagnostics."""
+
+    @pytest.mark.asyncio
+    async def test_declared_index_is_used(self, tmp_path):
+        provider = LocalStorageProvider(str(tmp_path), indexes={"tasks": ["status"]})
+        store = provider.get_document_store("tasks", Document)
+        await store.bulk_upsert(
+            [
+                Document(
+                    id=str(i),
+                    partition_key="p",
+                    data={"status": "open" if i % 2 else "done", "owner": {"id": i}},
+                )
+                for i in range(10)
+            ]
+        )
+
+        explained = await store.explain_query({"status": "open"})
+        assert not explained["full_scan"]
+        assert explained["indexes"] == ["idx_documents_data_status"]
+        assert len(await store.query({"status": "open"})) == 5
+
+        assert (await store.explain_query({"owner.id": 3}))["full_scan"]
+        provider.declare_indexes("tasks", ["owner.id"])
+        assert not (await store.explain_query({"owner.id": 3}))["full_scan"]
+        assert [doc.id for doc in await store.query({"owner.id": 3})] == ["3"]
+        await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_field_names_are_rejected(self, provider):
+        store = provider.get_document_store("items", Document)
+        with pytest.raises(ValueError):
+            await store.query({"x') = 1 OR ('1": 1})
+
+
+class TestPagination:
+    """Test keyset pagination with continuation tokens."""
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_continuation_tokens(self, provider):
+        store = provider.get_document_store("items", Document)
+        await store.bulk_upsert(
+            [Document(id=f"d{i:02d}", partition_key="p", data={"even": i % 2 == 0}) for i in range(25)]
+        )
+
+        pages = []
+        token = None
+        while True:
+            page = await store.query_page({}, page_size=10, continuation_token=token)
+            pages.append([doc.id for doc in page.items])
+            if not page.has_more:
+                break
+            token = page.continuation_token
+        assert [len(ids) for ids in pages] == [10, 10, 5]
+        assert sum(pages, []) == sorted(f"d{i:02d}" for i in range(25))
+
+        evens = [doc.id async for doc in store.iter_query({"even": True}, page_size=4)]
+        assert len(evens) == 13
+        assert len([doc async for doc in store.iter_all(partition_key="p", page_size=7)]) == 25
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_rejected(self, provider):
+        store = provider.get_document_store("items", Document)
+        with pytest.raises(ValueError):
+            await store.query_page({}, continuation_token="not-a-token")
+
+
+class TestOptimisticConcurrency:
+    """Test conditional writes and document versions."""
+
+    @pytest.mark.asyncio
+    async def test_if_match_rejects_stale_writes(self, provider):
+        store = provider.get_document_store("items", Document)
+        created = await store.create(Document(id="a", partition_key="p", data={"n": 1}))
+        assert created.version == 1
+        with pytest.raises(DocumentConflictError):
+            await store.create(Document(id="a", partition_key="p"))
+
+        stale = await store.read("a", "p")
+        fresh = await store.update(created, if_match=created.etag)
+        assert fresh.version == 2
+        with pytest.raises(DocumentConflictError):
+            await store.update(stale, if_match=stale.etag)
+        with pytest.raises(DocumentConflictError):
+            await store.delete("a", "p", if_match=stale.etag)
+
+        await store.upsert(Document(id="a", partition_key="p"))
+        assert (await store.read("a")).version == 3
+        assert await store.delete("a", "p", if_match=(await store.read("a")).etag)
+        assert not await store.delete("a", "p", if_match="gone")
+
+    @pytest.mark.asyncio
+    async def test_read_modify_write_retries_conflicts(self, provider):
+        store = provider.get_document_store("items", Document)
+
+        def increment(document):
+            document = document or Document(id="counter", partition_key="p", data={"n": 0})
+            document.data["n"] += 1
+            return document
+
+        await asyncio.gather(
+            *(store.read_modify_write("counter", "p", increment, max_attempts=50) for _ in range(10))
+        )
+        counter = await store.read("counter", "p")
+        assert counter.data["n"] == 10
+        assert counter.version == 10
+
+    @pytest.mark.asyncio
+    async def test_version_column_is_added_to_old_tables(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "items.db"))
+        conn.execute(
+            "CREATE TABLE documents (id TEXT PRIMARY KEY, partition_key TEXT, data TEXT, "
+            "created_at TEXT, updated_at TEXT, etag TEXT, UNIQUE(id, partition_key))"
+        )
+        conn.execute(
+            "INSERT INTO documents VALUES ('a', 'p', '{}', '2024-01-01T00:00:00', "
+            "'2024-01-01T00:00:00', 'e')"
+        )
+        conn.commit()
+        conn.close()
+
+        provider = LocalStorageProvider(str(tmp_path))
+        store = provider.get_document_store("items", Document)
+        assert (await store.read("a")).version == 0
+        assert (await store.update(await store.read("a"), if_match="e")).version == 1
+        await provider.close()
+
+
+QUERY_DATA = [
+    ("a", {"name": "daily-a", "due": 10, "status": "pending", "meta": {"owner": "x"}}),
+    ("b", {"name": "daily-b", "due": 30, "status": "running", "enabled": True}),
+    ("c", {"name": "weekly", "due": 20, "status": "done", "meta": None, "enabled": False}),
+]
+
+
+class TestQueryExpressions:
+    """Test filters, ordering and projection compiled to SQLite."""
+
+    @pytest.fixture
+    async def store(self, provider):
+        store = provider.get_document_store("schedules", Document)
+        await store.bulk_upsert([Document(id=id, partition_key="u", data=data) for id, data in QUERY_DATA])
+        return store
+
+    @pytest.mark.asyncio
+    async def test_operators(self, store):
+        async def ids(filter):
+            return sorted(doc.id for doc in await store.query(filter))
+
+        assert await ids({"due": {"$lte": 20}}) == ["a", "c"]
+        assert await ids({"due": {"$gt": 10, "$lt": 30}}) == ["c"]
+        assert await ids({"status": {"$in": ["pending", "running"]}}) == ["a", "b"]
+        assert await ids({"status": {"$in": []}}) == []
+        assert await ids({"status": {"$ne": "done"}}) == ["a", "b"]
+        assert await ids({"name": {"$prefix": "daily-"}}) == ["a", "b"]
+        assert await ids({"meta": {"$exists": True}}) == ["a", "c"]
+        assert await ids({"meta": {"$exists": False}}) == ["b"]
+        assert await ids({"meta": {"owner": "x"}}) == ["a"]
+
+        with pytest.raises(ValueError):
+            await store.query({"due": {"$near": 1}})
+        with pytest.raises(ValueError):
+            await store.query(Query(order_by=["due; DROP TABLE documents"]))
+
+    @pytest.mark.asyncio
+    async def test_order_projection_and_limit(self, store):
+        docs = await store.query(
+            Query(order_by=["-due"], fields=["name", "meta.owner", "enabled"], limit=2)
+        )
+        assert [doc.id for doc in docs] == ["b", "c"]
+        assert [doc.data for doc in docs] == [
+            {"name": "daily-b", "enabled": True},
+            {"name": "weekly", "enabled": False},
+        ]
+        assert docs[0].data["enabled"] is True and docs[1].data["enabled"] is False
+        assert docs[0].etag and docs[0].version == 1
+
+        page = await store.query_page(Query(order_by=["due"]), page_size=2)
+        assert [doc.id for doc in page.items] == ["a", "c"]
+        rest = await store.query_page(
+            Query(order_by=["due"]), page_size=2, continuation_token=page.continuation_token
+        )
+        assert [doc.id for doc in rest.items] == ["b"] and not rest.has_more
+
+        with pytest.raises(ValueError):
+            await store.query_page({}, page_size=0)
+
+    @pytest.mark.asyncio
+    async def test_range_filter_uses_declared_index(self, provider, store):
+        provider.declare_indexes("schedules", ["due", "name"])
+        assert (await store.explain_query({"due": {"$lte": 20}}))["indexes"]
+        assert (await store.explain_query({"name": {"$prefix": "daily"}}))["indexes"]
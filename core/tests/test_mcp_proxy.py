@@ -0,0 +1,236 @@
+"""Tests for the MCP security proxy rate limiting."""
+
+import math
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+
+from lightning_core.mcp import MCPSecurityProxy, RateLimiter
+from lightning_core.providers.redis import RedisRateLimiter
+from lightning_core.providers.redis.rate_limiter import GCRA_RESERVE_SCRIPT
+from lightning_core.vextir_os.security import SecurityManager
+
+
+class FakeRedis:
+    """In-process stand-in for Redis running the GCRA reserve script."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.values = {}
+        self.calls = 0
+        self.available = True
+
+    def register_script(self, script):
+        async def run(keys, args):
+            if not self.available:
+                raise ConnectionError("redis down")
+            self.calls += 1
+            interval, capacity, requested = (float(a) for a in args)
+            tat = max(self.values.get(keys[0], self.now), self.now)
+            available = math.floor((self.now + capacity - tat) / interval + 1e-6)
+            if available < 1:
+                return [0, f"{tat + interval - capacity - self.now:.6f}"]
+            granted = min(available, int(requested))
+            self.values[keys[0]] = tat + granted * interval
+            return [granted, "0"]
+
+        return run
+
+
+class TestRateLimiter:
+    """Test the GCRA rate limiter."""
+
+    def test_burst_then_sustained_rate(self):
+        limiter = RateLimiter()
+
+        decisions = [limiter.acquire("k", 5, 60, now=0.0) for _ in range(6)]
+        assert [d.allowed for d in decisions] == [True] * 5 + [False]
+        assert decisions[0].remaining == 4
+        # One call is released every window / max_calls seconds
+        assert decisions[-1].retry_after == pytest.approx(12.0)
+        assert not limiter.acquire("k", 5, 60, now=11.9).allowed
+        assert limiter.acquire("k", 5, 60, now=12.0).allowed
+
+    def test_burst_allowance(self):
+        limiter = RateLimiter()
+        allowed = [limiter.acquire("k", 10, 10, burst=2, now=0.0).allowed for _ in range(3)]
+        assert allowed == [True, True, False]
+        # Separate windows for one key are limited independently
+        assert limiter.acquire("k", 100, 3600, now=0.0).allowed
+
+    def test_idle_keys_expire(self):
+        limiter = RateLimiter(idle_expiry_seconds=30)
+        limiter.acquire("a", 5, 60, now=1000.0)
+        limiter.acquire("b", 5, 60, now=1000.0)
+        assert len(limiter) == 2
+
+        # Buckets refill 12s after the call and expire 30s after that
+        limiter.acquire("c", 5, 60, now=1045.0)
+        assert len(limiter) == 1
+
+
+class TestProxyRateLimits:
+    """Test rate limit checks in the security proxy."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_has_retry_after(self):
+        proxy = MCPSecurityProxy(SecurityManager())
+        proxy.default_rate_limits["per_minute"] = 2
+
+        for _ in range(2):
+            assert (await proxy._check_rate_limits("agent", "server", "tool")).allowed
+        result = await proxy._check_rate_limits("agent", "server", "tool")
+
+        assert not result.allowed
+        assert "rate limit" in result.reason.lower()
+        assert 0 < result.retry_after <= 30
+
+
+class TestRedisRateLimiter:
+    """Test the Redis-backed distributed limiter."""
+
+    @pytest.mark.asyncio
+    async def test_replicas_share_one_limit(self):
+        redis = FakeRedis()
+        replicas = [RedisRateLimiter(redis, reservation_fraction=0) for _ in range(3)]
+
+        allowed = [
+            (await replicas[i % 3].check("agent:a", 6, 60)).allowed for i in range(9)
+        ]
+        assert allowed.count(True) == 6
+        denied = await replicas[0].check("agent:a", 6, 60)
+        assert not denied.allowed and denied.retry_after == pytest.approx(10.0)
+
+    @pytest.mark.asyncio
+    async def test_reservations_avoid_round_trips(self):
+        redis = FakeRedis()
+        limiter = RedisRateLimiter(redis, reservation_fraction=0.1, reservation_ttl=60)
+
+        results = [(await limiter.check("agent:a", 100, 60)).allowed for _ in range(25)]
+        assert all(results)
+        # Ten tokens are reserved per round trip
+        assert redis.calls == 3
+        assert limiter.get_stats()["local_hits"] == 22
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_limits(self):
+        redis = FakeRedis()
+        redis.available = False
+        limiter = RedisRateLimiter(redis, reservation_fraction=0, retry_interval=60)
+        proxy = MCPSecurityProxy(SecurityManager(), rate_limiter=limiter)
+        proxy.default_rate_limits["per_minute"] = 2
+
+        allowed = [(await proxy._check_rate_limits("a", "s", "t")).allowed for _ in range(3)]
+        assert allowed == [True, True, False]
+        assert limiter.get_stats()["fallbacks"] >= 3
+        assert redis.calls == 0
+
+
+@pytest.fixture
+async def lua_redis():
+    """A client that runs Lua scripts: fakeredis with lupa, or REDIS_URL."""
+    try:
+        import fakeredis
+        import lupa  # noqa: F401  # fakeredis needs lupa to run scripts
+
+        client = fakeredis.FakeAsyncRedis()
+    except ImportError:
+        url = os.getenv("REDIS_URL")
+        if not url:
+            pytest.skip("needs fakeredis[lua] or a Redis server at REDIS_URL")
+        import redis.asyncio as redis
+
+        client = redis.from_url(url)
+        try:
+            await client.ping()
+        except Exception:
+            pytest.skip(f"Redis at {url} is unavailable")
+    yield client
+    await client.aclose()
+
+
+class TestGcraReserveScript:
+    """Run the real reserve script, not the Python stand-in above."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_deny_with_retry_after(self, lua_redis):
+        key = f"test:{uuid.uuid4().hex}"
+        reserve = lua_redis.register_script(GCRA_RESERVE_SCRIPT)
+
+        # 5 calls per 60 seconds: a 12 second interval, a burst of 5
+        results = [await reserve(keys=[key], args=[12.0, 60.0, 1]) for _ in range(6)]
+        assert [int(granted) for granted, _ in results] == [1] * 5 + [0]
+        assert float(results[-1][1]) == pytest.approx(12.0, abs=0.5)
+        # The bucket expires once it would be full again
+        assert 0 < await lua_redis.pttl(key) <= 60000
+
+    @pytest.mark.asyncio
+    async def test_reserves_up_to_the_available_tokens(self, lua_redis):
+        key = f"test:{uuid.uuid4().hex}"
+        reserve = lua_redis.register_script(GCRA_RESERVE_SCRIPT)
+
+        granted = [int((await reserve(keys=[key], args=[0.6, 60.0, 40]))[0]) for _ in range(4)]
+        assert granted == [40, 40, 20, 0]
+
+    @pytest.mark.asyncio
+    async def test_limiter_shares_limit_through_the_script(self, lua_redis):
+        prefix = f"test:{uuid.uuid4().hex}:"
+        replicas = [
+            RedisRateLimiter(lua_redis, key_prefix=prefix, reservation_fraction=0)
+            for _ in range(2)
+        ]
+
+        allowed = [(await replicas[i % 2].check("agent:a", 4, 60)).allowed for i in range(6)]
+        assert allowed == [True] * 4 + [False] * 2
+        assert sum(r.get_stats()["remote_calls"] for r in replicas) == 6
+
+
+class TestProxyStatistics:
+    """Test call history and incremental statistics."""
+
+    @pytest.mark.asyncio
+    async def test_statistics_outlive_the_history_ring(self):
+        proxy = MCPSecurityProxy(SecurityManager(), history_size=5)
+        proxy.statistics.max_keys = 3
+
+        for i in range(20):
+            await proxy._record_call(
+                f"agent{i % 2}", "server", f"tool{i % 5}", {},
+                allowed=i % 4 != 0, reason=None, start_time=datetime.utcnow(),
+                error=i % 4 == 0,
+            )
+
+        assert len(proxy.call_history) == 5
+        stats = await proxy.get_statistics()
+        assert stats["total_calls"] == 20
+        assert stats["blocked_calls"] == 5
+        assert stats["error_rate"] == pytest.approx(0.25)
+        assert stats["agents"]["agent0"]["total"] == 10
+        assert stats["servers"]["server"]["latency"]["count"] == 20
+        # Cardinality is capped, extra tools share an overflow entry
+        assert set(stats["tools"]) == {"tool0", "tool1", "tool2", "_other"}
+        assert stats["tools"]["_other"]["total"] == 8
+
+        history = await proxy.get_call_history(agent_id="agent1", limit=2)
+        assert [r.tool_name for r in history] == ["tool2", "tool4"]
+
+
+@pytest.mark.asyncio
+async def test_runtime_shutdown_closes_rate_limiter():
+    from lightning_core.abstractions.configuration import RuntimeConfig
+    from lightning_core.runtime import LightningRuntime
+
+    class ClosableLimiter(RateLimiter):
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    runtime = LightningRuntime(RuntimeConfig(), use_resilient_providers=False)
+    runtime._mcp_security_proxy = MCPSecurityProxy(
+        SecurityManager(), rate_limiter=ClosableLimiter()
+    )
+    await runtime.shutdown()
+    assert runtime.mcp_security_proxy.rate_limiter.closed
@@ -0,0 +1,82 @@
+"""Tests for the read-through document cache."""
+
+import asyncio
+
+import pytest
+
+from lightning_core.abstractions.caching import CachePolicy, CachingStorageProvider
+from lightning_core.abstractions.storage import Document
+from lightning_core.providers.local.event_bus import LocalEventBus
+
+
+class TestCachedDocumentStore:
+    """Test hits, negative caching, revalidation and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_reads_are_cached_and_writes_invalidate(self, local):
+        cache = CachingStorageProvider(local, policies={"configs": CachePolicy(ttl_seconds=60)})
+        store = cache.get_document_store("configs", Document)
+
+        assert await store.read("a", "u1") is None
+        assert await store.read("a", "u1") is None
+        await store.create(Document(id="a", partition_key="u1", data={"v": 1}))
+
+        first = await store.read("a", "u1")
+        first.data["v"] = 99  # Callers get copies
+        assert (await store.read("a", "u1")).data == {"v": 1}
+
+        first.data["v"] = 2
+        await store.update(first)
+        assert (await store.read("a")).data == {"v": 2}
+
+        stats = cache.get_cache_stats()["configs"]
+        assert stats["negative_hits"] == 1 and stats["hits"] == 1 and stats["misses"] == 3
+        # Uncached containers go straight to the provider
+        assert cache.get_document_store("events", Document) is local.get_document_store("events", Document)
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_revalidated_by_etag(self, local):
+        cache = CachingStorageProvider(local, default_policy=CachePolicy(ttl_seconds=0.01, max_entries=2))
+        store = cache.get_document_store("plans", Document)
+        for id in ("a", "b", "c"):
+            await store.create(Document(id=id, partition_key="p", data={"id": id}))
+            await store.read(id, "p")
+
+        await asyncio.sleep(0.02)
+        assert (await store.read("c", "p")).data == {"id": "c"}
+        # Changed behind the cache's back: the ETag check notices
+        await local.get_document_store("plans", Document).upsert(
+            Document(id="c", partition_key="p", data={"id": "c2"})
+        )
+        await asyncio.sleep(0.02)
+        assert (await store.read("c", "p")).data == {"id": "c2"}
+
+        stats = cache.get_cache_stats()["plans"]
+        assert stats["stale"] == 2 and stats["revalidated"] == 1
+        assert stats["evictions"] == 1 and stats["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidations_cross_the_event_bus(self, local):
+        bus = LocalEventBus()
+        await bus.start()
+        policy = {"configs": CachePolicy(ttl_seconds=60)}
+        writer = CachingStorageProvider(local, policies=policy, invalidation_bus=bus)
+        reader = CachingStorageProvider(local, policies=policy, invalidation_bus=bus)
+        await writer.initialize()
+        await reader.initialize()
+        try:
+            await writer.get_document_store("configs", Document).create(
+                Document(id="a", partition_key="p", data={"v": 1})
+            )
+            await asyncio.sleep(0.1)
+            reader_store = reader.get_document_store("configs", Document)
+            assert (await reader_store.read("a", "p")).data == {"v": 1}
+
+            await writer.get_document_store("configs", Document).upsert(
+                Document(id="a", partition_key="p", data={"v": 2})
+            )
+            await asyncio.sleep(0.1)
+            assert (await reader_store.read("a", "p")).data == {"v": 2}
+            assert reader.get_cache_stats()["configs"]["invalidations"] == 1
+        finally:
+            await bus.stop()
@@ -0,0 +1,154 @@
+"""Tests for field compression and blob offload of stored documents."""
+
+import asyncio
+
+import pytest
+
+from lightning_core.abstractions.compression import (
+    CompressingStorageProvider,
+    CompressionPolicy,
+    OffloadedField,
+)
+from lightning_core.abstractions.storage import Document
+from lightning_core.providers.local.blob_storage import LocalBlobStore
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    return LocalBlobStore(str(tmp_path / "blobs"))
+
+
+class PausingBlobStore(LocalBlobStore):
+    """Blob store that holds the first upload until released."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.uploaded = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def put(self, key, data):
+        await super().put(key, data)
+        if not self.uploaded.is_set():
+            self.uploaded.set()
+            await self.release.wait()
+
+
+class TestCompressedDocumentStore:
+    """Test compression round trips, offload and blob cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_large_fields_are_compressed(self, local):
+        compressing = CompressingStorageProvider(
+            local, {"threads": CompressionPolicy(threshold_bytes=256)}
+        )
+        store = compressing.get_document_store("threads", Document)
+        backing = local.get_document_store("threads", Document)
+        transcript = [{"role": "user", "content": "hello " * 20}] * 50
+
+        await store.upsert(
+            Document(id="t1", partition_key="u1", data={"status": "open", "messages": transcript})
+        )
+
+        stored = await backing.read("t1", "u1")
+        assert stored.data["status"] == "open"
+        assert stored.data["messages"]["$compressed"] == "zlib"
+
+        assert (await store.read("t1", "u1")).data["messages"] == transcript
+        assert [doc.id for doc in await store.query({"status": "open"})] == ["t1"]
+
+        stats = compressing.get_compression_stats()["threads"]
+        assert stats["fields_compressed"] == 1
+        assert stats["compression_ratio"] > 10
+        assert stats["bytes_saved_written"] > 0
+
+    @pytest.mark.asyncio
+    async def test_large_fields_are_offloaded_and_fetched_lazily(self, local, blobs):
+        compressing = CompressingStorageProvider(
+            local,
+            {"runs": CompressionPolicy(threshold_bytes=64, offload_threshold_bytes=1024)},
+            blob_store=blobs,
+        )
+        store = compressing.get_document_store("runs", Document)
+        output = "x" * 5000
+
+        saved = await store.upsert(
+            Document(id="r1", partition_key="p", data={"state": "done", "output": output})
+        )
+        assert saved.version == 1
+        assert len(await blobs.list_keys("runs/")) == 1
+
+        listed = (await store.query({"state": "done"}))[0]
+        assert isinstance(listed.data["output"], OffloadedField)
+
+        # Writing an unfetched placeholder back keeps the stored blob
+        listed.data["state"] = "archived"
+        await store.upsert(listed)
+        assert len(await blobs.list_keys("runs/")) == 1
+
+        fetched = await store.fetch_offloaded((await store.list_all())[0])
+        assert fetched.data == {"state": "archived", "output": output}
+        assert (await store.read("r1", "p")).data["output"] == output
+        assert compressing.get_compression_stats()["runs"]["fields_offloaded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_replaced_and_deleted_blobs_are_removed(self, local, blobs):
+        compressing = CompressingStorageProvider(
+            local,
+            {"runs": CompressionPolicy(threshold_bytes=64, offload_threshold_bytes=1024)},
+            blob_store=blobs,
+        )
+        store = compressing.get_document_store("runs", Document)
+
+        await store.upsert(Document(id="r1", partition_key="p", data={"output": "a" * 2000}))
+        first = await blobs.list_keys("runs/")
+        await store.upsert(Document(id="r1", partition_key="p", data={"output": "b" * 2000}))
+        second = await blobs.list_keys("runs/")
+        assert len(second) == 1 and second != first
+
+        await store.upsert(Document(id="r2", partition_key="p", data={"output": "c" * 2000}))
+        assert await store.delete("r1", "p")
+        assert [key.split("/")[1] for key in await blobs.list_keys("runs/")] == ["r2"]
+
+        await compressing.delete_container("runs")
+        assert await blobs.list_keys() == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writers_keep_each_others_blobs(self, local, tmp_path):
+        blobs = PausingBlobStore(str(tmp_path / "blobs"))
+        policy = CompressionPolicy(threshold_bytes=64, offload_threshold_bytes=1024)
+        store = CompressingStorageProvider(
+            local, {"runs": policy}, blob_store=blobs
+        ).get_document_store("runs", Document)
+        backing = local.get_document_store("runs", Document)
+        await backing.upsert(Document(id="r1", partition_key="p", data={"output": "small"}))
+
+        # A uploads its blob and stalls; B writes in full before A commits
+        first = asyncio.ensure_future(
+            store.upsert(Document(id="r1", partition_key="p", data={"output": "a" * 2000}))
+        )
+        await blobs.uploaded.wait()
+        await store.upsert(Document(id="r1", partition_key="p", data={"output": "b" * 2000}))
+        blobs.release.set()
+        await first
+
+        assert (await store.read("r1", "p")).data["output"] == "a" * 2000
+        stored = await backing.read("r1", "p")
+        assert await blobs.list_keys("runs/") == [stored.data["output"]["$blob"]]
+
+    @pytest.mark.asyncio
+    async def test_small_and_unlisted_documents_are_untouched(self, local):
+        compressing = CompressingStorageProvider(local, {"threads": CompressionPolicy()})
+
+        await compressing.get_document_store("threads", Document).upsert(
+            Document(id="a", partition_key="p", data={"title": "short"})
+        )
+        await compressing.get_document_store("configs", Document).upsert(
+            Document(id="b", partition_key="p", data={"blob": "y" * 10000})
+        )
+
+        assert (await local.get_document_store("threads", Document).read("a")).data == {
+            "title": "short"
+        }
+        assert (await local.get_document_store("configs", Document).read("b")).data == {
+            "blob": "y" * 10000
+        }
@@ -0,0 +1,163 @@
+"""Tests for write-behind buffering of document writes."""
+
+import asyncio
+
+import pytest
+
+from lightning_core.abstractions.storage import Document
+from lightning_core.abstractions.write_behind import (
+    WriteBehindDocumentStore,
+    WriteBehindPolicy,
+    WriteBehindStorageProvider,
+    WriteDurability,
+)
+
+
+class TestWriteBehindDocumentStore:
+    """Test coalescing, read-your-writes, flushing and durability."""
+
+    @pytest.mark.asyncio
+    async def test_rewrites_are_coalesced(self, local):
+        buffered = WriteBehindStorageProvider(
+            local, {"threads": WriteBehindPolicy(flush_interval_seconds=60)}
+        )
+        store = buffered.get_document_store("threads", Document)
+        backing = local.get_document_store("threads", Document)
+
+        for n in range(10):
+            await store.upsert(Document(id="t1", partition_key="u1", data={"n": n}))
+        await store.upsert(Document(id="t2", partition_key="u1", data={"n": 0}))
+        await store.delete("t2", "u1")
+
+        assert (await store.read("t1", "u1")).data == {"n": 9}
+        assert await store.read("t2") is None
+        assert await backing.read("t1") is None
+
+        assert await buffered.flush() == 2
+        assert (await backing.read("t1", "u1")).data == {"n": 9}
+        assert await backing.read("t2") is None
+
+        stats = buffered.get_write_behind_stats()["threads"]
+        assert (stats["writes"], stats["coalesced"], stats["stored"]) == (12, 10, 2)
+        assert stats["writes_saved_ratio"] == pytest.approx(10 / 12)
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_queries_and_close_flush_pending_writes(self, local):
+        buffered = WriteBehindStorageProvider(
+            local, {"status": WriteBehindPolicy(flush_interval_seconds=60)}
+        )
+        store = buffered.get_document_store("status", Document)
+
+        await store.upsert(Document(id="a", partition_key="p", data={"state": "busy"}))
+        assert [doc.id for doc in await store.query({"state": "busy"})] == ["a"]
+
+        await store.upsert(Document(id="b", partition_key="p"))
+        await buffered.close()
+        assert await local.get_document_store("status", Document).read("b", "p") is not None
+
+    @pytest.mark.asyncio
+    async def test_flushed_durability_waits_for_the_batch(self, local):
+        buffered = WriteBehindStorageProvider(
+            local,
+            {
+                "progress": WriteBehindPolicy(
+                    flush_interval_seconds=0.05, durability=WriteDurability.FLUSHED
+                )
+            },
+        )
+        store = buffered.get_document_store("progress", Document)
+        backing = local.get_document_store("progress", Document)
+
+        await asyncio.gather(
+            *(
+                store.upsert(Document(id="job", partition_key="p", data={"pct": pct}))
+                for pct in range(5)
+            )
+        )
+        assert (await backing.read("job", "p")).data == {"pct": 4}
+        assert buffered.get_write_behind_stats()["progress"]["flushes"] == 1
+        await buffered.close()
+
+    @pytest.mark.asyncio
+    async def test_unlisted_containers_write_through(self, local):
+        buffered = WriteBehindStorageProvider(local, {"threads": WriteBehindPolicy()})
+        store = buffered.get_document_store("configs", Document)
+
+        await store.upsert(Document(id="a", partition_key="p"))
+        assert await local.get_document_store("configs", Document).read("a") is not None
+
+
+class FlakyStore:
+    """Wraps a document store, failing the next ``failures`` bulk upserts."""
+
+    def __init__(self, store, failures):
+        self.store = store
+        self.failures = failures
+
+    async def bulk_upsert(self, documents):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("store unavailable")
+        return await self.store.bulk_upsert(documents)
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+
+class TestWriteBehindRetries:
+    """Test that failed buffered writes are retried, not dropped."""
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_are_retried_on_the_next_flush(self, local):
+        backing = local.get_document_store("threads", Document)
+        store = WriteBehindDocumentStore(
+            FlakyStore(backing, failures=1), WriteBehindPolicy(flush_interval_seconds=60)
+        )
+
+        await store.upsert(Document(id="a", partition_key="p", data={"n": 1}))
+        assert await store.flush() == 0
+        # Still visible while waiting for the retry
+        assert (await store.read("a", "p")).data == {"n": 1}
+        assert await store.flush() == 1
+        assert (await backing.read("a", "p")).data == {"n": 1}
+        assert (store.stats.failed, store.stats.retried, store.stats.stored) == (1, 1, 1)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_newer_writes_replace_failed_ones(self, local):
+        backing = local.get_document_store("threads", Document)
+        flaky = FlakyStore(backing, failures=0)
+        store = WriteBehindDocumentStore(flaky, WriteBehindPolicy(flush_interval_seconds=60))
+
+        async def upsert_during_flush(documents):
+            await store.upsert(Document(id="a", partition_key="p", data={"n": 2}))
+            raise ConnectionError("store unavailable")
+
+        await store.upsert(Document(id="a", partition_key="p", data={"n": 1}))
+        flaky.bulk_upsert = upsert_during_flush
+        await store.flush()
+        del flaky.bulk_upsert
+
+        assert store.stats.retried == 0
+        await store.flush()
+        assert (await backing.read("a", "p")).data == {"n": 2}
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_dead_lettered_after_repeated_failures(self, local):
+        backing = local.get_document_store("threads", Document)
+        store = WriteBehindDocumentStore(
+            FlakyStore(backing, failures=10),
+            WriteBehindPolicy(flush_interval_seconds=60, max_attempts=3),
+        )
+
+        await store.upsert(Document(id="a", partition_key="p", data={"n": 1}))
+        for _ in range(3):
+            await store.flush()
+
+        assert len(store) == 0 and store.stats.dead_lettered == 1
+        assert store.dead_letters[0]["id"] == "a"
+        assert store.dead_letters[0]["attempts"] == 3
+        assert await store.read("a", "p") is None
+        await store.close()
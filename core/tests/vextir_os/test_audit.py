@@ -0,0 +1,143 @@
+"""Tests for buffered audit persistence"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from lightning_core.abstractions.storage import Document
+from lightning_core.providers.local.storage import LocalStorageProvider
+from lightning_core.vextir_os.audit import (
+    MAX_QUERY_PARTITIONS,
+    AuditLog,
+    AuditSink,
+    FileAuditSink,
+    StorageAuditSink,
+    _partitions_between,
+)
+from lightning_core.vextir_os.events import Event
+from lightning_core.vextir_os.security import SecurityManager
+
+
+class FailingSink(AuditSink):
+    async def write_batch(self, records):
+        raise IOError("sink unavailable")
+
+    async def query(self, start, end, user_id=None, limit=100):
+        return []
+
+
+def make_entry(user_id: str, timestamp: datetime):
+    return {"timestamp": timestamp.isoformat(), "user_id": user_id, "authorized": True}
+
+
+@pytest.mark.asyncio
+async def test_storage_sink_batches_by_hour_partition(tmp_path):
+    store = LocalStorageProvider(str(tmp_path)).get_document_store("audit", Document)
+    audit = AuditLog(StorageAuditSink(store), batch_size=100)
+    now = datetime.utcnow()
+    for i in range(5):
+        audit.record(make_entry("u1" if i % 2 else "u2", now - timedelta(minutes=i)))
+    audit.record(make_entry("u1", now - timedelta(hours=3)))
+
+    assert await audit.flush() == 6
+    # One document per hourly partition touched by the batch
+    assert len(await store.list_all()) in (2, 3)
+
+    recent = await audit.query(start=now - timedelta(hours=1), user_id="u1")
+    assert len(recent) == 2
+    assert recent[0]["timestamp"] > recent[1]["timestamp"]
+    older = await audit.query(start=now - timedelta(hours=4), user_id="u1")
+    assert len(older) == 3
+    await audit.close()
+
+
+@pytest.mark.asyncio
+async def test_file_sink_rotates_segments(tmp_path):
+    sink = FileAuditSink(str(tmp_path), max_bytes=200)
+    audit = AuditLog(sink, batch_size=2)
+    now = datetime.utcnow()
+    for i in range(10):
+        audit.record(make_entry(f"u{i}", now))
+    await audit.close()
+
+    assert len(list(tmp_path.glob("audit-*.jsonl"))) > 1
+    results = await sink.query(now - timedelta(minutes=1), now + timedelta(minutes=1), limit=20)
+    assert len(results) == 10
+
+
+@pytest.mark.asyncio
+async def test_overload_drops_are_counted():
+    audit = AuditLog(FailingSink(), max_recent=3, max_buffer=4, batch_size=2)
+    now = datetime.utcnow()
+    for i in range(6):
+        audit.record(make_entry("u1", now))
+
+    await audit.flush()
+    stats = audit.get_stats()
+    assert stats["dropped"] == 2
+    assert stats["buffered"] == 4
+    assert stats["failed_batches"] == 1
+    assert len(audit.get_recent(10)) == 3
+
+
+@pytest.mark.asyncio
+async def test_security_manager_persists_audit(tmp_path):
+    manager = SecurityManager()
+    manager.set_audit_sink(FileAuditSink(str(tmp_path)))
+    for user in ("u1", "u2", "u1"):
+        await manager.authorize(Event(type="test.event", source="t", user_id=user))
+
+    assert len(manager.get_audit_log(2)) == 2
+    entries = await manager.query_audit_log(user_id="u1")
+    assert [e["user_id"] for e in entries] == ["u1", "u1"]
+    assert manager.audit.get_stats()["persisted"] == 3
+    await manager.audit.close()
+    # Existing callers slice the recent entries
+    assert [e["user_id"] for e in manager.audit_log[-2:]] == ["u2", "u1"]
+
+
+@pytest.mark.asyncio
+async def test_runtime_shutdown_flushes_audit_log(tmp_path, monkeypatch):
+    from lightning_core.abstractions.configuration import RuntimeConfig
+    from lightning_core.runtime import LightningRuntime
+    from lightning_core.vextir_os import security
+
+    manager = SecurityManager()
+    manager.audit.flush_interval = 60
+    manager.set_audit_sink(FileAuditSink(str(tmp_path)))
+    monkeypatch.setattr(security, "_global_security_manager", manager)
+
+    await manager.authorize(Event(type="test.event", source="t", user_id="u1"))
+    assert manager.audit.get_stats()["persisted"] == 0
+
+    await LightningRuntime(RuntimeConfig(), use_resilient_providers=False).shutdown()
+    assert manager.audit.get_stats()["persisted"] == 1
+
+
+def test_query_partitions_are_clamped():
+    end = datetime(2024, 6, 1, 12, 30)
+    partitions = _partitions_between(datetime(2000, 1, 1), end)
+
+    assert len(partitions) == MAX_QUERY_PARTITIONS
+    assert partitions[0] == "2024-06-01T12"
+
+
+@pytest.mark.asyncio
+async def test_runtime_persists_audit_log_to_storage(tmp_path, monkeypatch):
+    from lightning_core.abstractions.configuration import RuntimeConfig
+    from lightning_core.runtime import LightningRuntime
+    from lightning_core.vextir_os import security
+
+    monkeypatch.setattr(security, "_global_security_manager", SecurityManager())
+    config = RuntimeConfig(storage_path=str(tmp_path), audit_log_container="audit")
+    runtime = LightningRuntime(config, use_resilient_providers=False)
+    await runtime.initialize()
+
+    manager = security.get_security_manager()
+    await manager.authorize(Event(type="test.event", source="t", user_id="u1"))
+    assert [e["user_id"] for e in await manager.query_audit_log()] == ["u1"]
+    await runtime.shutdown()
+
+    provider = LocalStorageProvider(str(tmp_path))
+    assert len(await provider.get_document_store("audit", Document).list_all()) == 1
+    await provider.close()
@@ -0,0 +1,206 @@
+"""Tests for batched event processing in the universal processor"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from lightning_core.vextir_os.drivers import (
+    Driver,
+    DriverManifest,
+    DriverRegistry,
+    DriverType,
+    ResourceSpec,
+)
+from lightning_core.vextir_os.event_bus import EventBus
+from lightning_core.vextir_os.events import Event
+from lightning_core.vextir_os.security import Policy, PolicyAction, SecurityManager
+from lightning_core.vextir_os.universal_processor import UniversalEventProcessor
+
+
+class EchoDriver(Driver):
+    """Driver that answers every event with one output event"""
+
+    async def handle_event(self, event: Event) -> List[Event]:
+        if event.metadata.get("fail"):
+            raise RuntimeError("driver failure")
+        if event.metadata.get("delay"):
+            await asyncio.sleep(event.metadata["delay"])
+        return [Event(type="test.output", source=self.manifest.id, user_id=event.user_id)]
+
+    def get_capabilities(self) -> List[str]:
+        return self.manifest.capabilities
+
+    def get_resource_requirements(self) -> ResourceSpec:
+        return self.manifest.resource_requirements
+
+
+async def make_processor() -> UniversalEventProcessor:
+    processor = UniversalEventProcessor()
+    processor.event_bus = EventBus()
+    processor.driver_registry = DriverRegistry(processor.event_bus)
+    processor.security_manager = SecurityManager()
+    await processor.driver_registry.register_driver(
+        DriverManifest(
+            id="echo",
+            name="echo",
+            version="1.0.0",
+            author="test",
+            description="",
+            driver_type=DriverType.TOOL,
+            capabilities=["test.event"],
+            resource_requirements=ResourceSpec(),
+        ),
+        EchoDriver,
+    )
+    return processor
+
+
+def make_event(user_id: str = "u1", event_type: str = "test.event", **metadata) -> Event:
+    return Event(type=event_type, source="test", user_id=user_id, metadata=metadata)
+
+
+@pytest.mark.asyncio
+async def test_process_events_matches_single_event_results():
+    processor = await make_processor()
+    events = [make_event("u1"), make_event("u2"), make_event("u1")]
+
+    results = await processor.process_events(events)
+
+    assert [len(outputs) for outputs in results] == [1, 1, 1]
+    for event, outputs in zip(events, results):
+        assert outputs[0].correlation_id == event.id
+        assert outputs[0].user_id == event.user_id
+    assert len(processor.event_bus.event_history) == 3
+    summary = await processor.metrics.get_summary()
+    assert summary["total_events"] == 3
+
+
+@pytest.mark.asyncio
+async def test_process_events_isolates_failures_within_batch():
+    processor = await make_processor()
+    processor.security_manager.policy_engine.add_policy(
+        Policy(
+            id="deny_blocked",
+            name="Deny blocked",
+            description="",
+            condition="always",
+            action=PolicyAction.DENY,
+            applies_to=["blocked"],
+        )
+    )
+    events = [
+        make_event("u1"),
+        make_event("blocked"),
+        make_event("u1", event_type="test.unhandled"),
+        Event(type="test.event", source="test", user_id=""),
+    ]
+
+    results = await processor.process_events(events)
+
+    assert results[0][0].type == "test.output"
+    assert results[1][0].metadata["error_type"] == "EventAuthorizationError"
+    assert results[2] == []
+    assert results[3][0].metadata["error_type"] == "EventProcessingError"
+    # Only successfully routed output reaches the bus
+    assert [e.type for e in processor.event_bus.event_history] == ["test.output"]
+    assert processor.metrics.total_denied == 1
+    assert processor.metrics.total_orphaned == 1
+
+
+@pytest.mark.asyncio
+async def test_process_events_records_per_event_latency():
+    processor = await make_processor()
+    recorded = []
+    record_event = processor.metrics.record_event
+
+    async def recording(event, outputs, processing_time):
+        recorded.append(processing_time)
+        await record_event(event, outputs, processing_time)
+
+    processor.metrics.record_event = recording
+    events = [make_event("u1", delay=0.05) for _ in range(5)]
+
+    await processor.process_events(events, max_concurrency=1)
+
+    # Each event took ~50ms even though the batch took ~250ms
+    assert len(recorded) == 5
+    assert all(0.04 <= t < 0.15 for t in recorded)
+
+
+@pytest.mark.asyncio
+async def test_process_events_reports_failed_output_queueing():
+    processor = await make_processor()
+
+    async def failing_emit_batch(events):
+        raise ConnectionError("bus unavailable")
+
+    processor.event_bus.emit_batch = failing_emit_batch
+    results = await processor.process_events([make_event("u1"), make_event("u2")])
+
+    # Same outcome as process_event: the outputs plus an error event
+    assert [[e.type for e in outputs] for outputs in results] == [
+        ["test.output", "error"],
+        ["test.output", "error"],
+    ]
+    assert processor.metrics.total_errors == 2
+    assert processor.metrics.total_events == 0
+
+
+@pytest.mark.asyncio
+async def test_authorize_batch_counts_earlier_events_in_batch():
+    manager = SecurityManager()
+    await manager.authorize(make_event("u1"))
+    seen = []
+    evaluate = manager.policy_engine.evaluate_policies
+
+    async def recording_evaluate(event, context, **kwargs):
+        seen.append((event.user_id, context["daily_events"]))
+        return await evaluate(event, context, **kwargs)
+
+    manager.policy_engine.evaluate_policies = recording_evaluate
+    snapshots = []
+    snapshot = manager.usage.snapshot
+    manager.usage.snapshot = lambda user_id: snapshots.append(user_id) or snapshot(user_id)
+    events = [make_event("u1"), make_event("u2"), make_event("u1")]
+
+    assert await manager.authorize_batch(events) == [True, True, True]
+    # Same usage context as authorizing the events one at a time
+    assert sorted(seen) == [("u1", 1), ("u1", 2), ("u2", 0)]
+    # Built once per user
+    assert snapshots == ["u1", "u2"]
+    assert manager.usage.get_events("u1") == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_handler_reports_failed_messages_without_failing(monkeypatch):
+    from lightning_core.abstractions.serverless import FunctionContext, TriggerType
+    from lightning_core.vextir_os import serverless_processor, universal_processor
+
+    monkeypatch.setattr(universal_processor, "_global_processor", await make_processor())
+    monkeypatch.setattr(serverless_processor, "_initialized", True)
+
+    def context(messages):
+        return FunctionContext(
+            function_name="test",
+            invocation_id="1",
+            trigger_type=TriggerType.QUEUE,
+            trigger_data=messages,
+            environment={},
+        )
+
+    valid = {"type": "test.event", "source": "test", "user_id": "u1"}
+    malformed = {"type": "test.event", "user_id": "u1", "timestamp": "not a time"}
+
+    response = await serverless_processor.universal_event_processor_handler(
+        context([valid, malformed, valid])
+    )
+    # Processed messages must not be redelivered with the failed one
+    assert not response.is_error
+    assert response.body["status"] == "partial"
+    assert response.body["failed"] == [1]
+
+    response = await serverless_processor.universal_event_processor_handler(
+        context([malformed])
+    )
+    assert response.is_error and response.body["status"] == "error"
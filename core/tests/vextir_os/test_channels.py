@@ -0,0 +1,133 @@
+"""Tests for coalesced agent channel telemetry"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from lightning_core.vextir_os.channels import TelemetryConfig, TelemetryLevel
+from lightning_core.vextir_os.drivers import (
+    AgentDriver,
+    DriverManifest,
+    DriverType,
+    ResourceSpec,
+)
+from lightning_core.vextir_os.event_bus import EventBus
+from lightning_core.vextir_os.events import Event
+
+
+class EchoAgent(AgentDriver):
+    async def _handle_event_impl(self, event: Event) -> List[Event]:
+        if event.metadata.get("fail"):
+            raise RuntimeError("agent failure")
+        return []
+
+    def get_capabilities(self) -> List[str]:
+        return self.manifest.capabilities
+
+    def get_resource_requirements(self):
+        return self.manifest.resource_requirements
+
+
+def make_agent(**telemetry) -> EchoAgent:
+    manifest = DriverManifest(
+        id="echo_agent",
+        name="Echo Agent",
+        version="1.0.0",
+        author="test",
+        description="",
+        driver_type=DriverType.AGENT,
+        capabilities=["test.event"],
+        resource_requirements=ResourceSpec(),
+    )
+    agent = EchoAgent(manifest, {"telemetry": telemetry})
+    bus = EventBus()
+    for channel in agent.channels.get_all_channels().values():
+        channel.event_bus = bus
+    agent.bus = bus
+    return agent
+
+
+def channel_events(agent: EchoAgent, channel: str) -> List[Event]:
+    return [e for e in agent.bus.event_history if e.type == f"agent.echo_agent.{channel}"]
+
+
+@pytest.mark.asyncio
+async def test_busy_idle_flaps_are_coalesced():
+    agent = make_agent(status_window_seconds=0.05, activity_batch_size=1000)
+
+    for _ in range(100):
+        await agent.handle_event(Event(type="test.event", source="test", user_id="u1"))
+    await asyncio.sleep(0.1)
+    await agent.telemetry.flush()
+
+    statuses = [e.data["status"] for e in channel_events(agent, "status")]
+    assert statuses == ["idle"]
+    batches = channel_events(agent, "activity")
+    assert len(batches) == 1
+    assert batches[0].data["count"] == 200
+    assert agent.telemetry.get_stats()["status_reports"] == 200
+
+
+@pytest.mark.asyncio
+async def test_full_level_publishes_every_transition():
+    agent = make_agent(level="full")
+
+    await agent.handle_event(Event(type="test.event", source="test", user_id="u1"))
+
+    assert len(channel_events(agent, "status")) == 2
+    assert len(channel_events(agent, "activity")) == 2
+
+
+@pytest.mark.asyncio
+async def test_activity_sampling_and_immediate_error_status():
+    agent = make_agent(activity_sample_rate=0.25, status_window_seconds=10)
+
+    for _ in range(10):
+        await agent.handle_event(Event(type="test.event", source="test", user_id="u1"))
+    with pytest.raises(RuntimeError):
+        await agent.handle_event(
+            Event(type="test.event", source="test", user_id="u1", metadata={"fail": True})
+        )
+
+    # Error status is not held back by the coalescing window
+    assert [e.data["status"] for e in channel_events(agent, "status")] == ["error"]
+    assert len(channel_events(agent, "error")) == 1
+
+    await agent.telemetry.flush()
+    stats = agent.telemetry.get_stats()
+    assert stats["activity_reports"] == 21
+    assert stats["activity_sampled_out"] == 16
+    assert channel_events(agent, "activity")[0].data["count"] == 5
+
+
+def test_telemetry_config_from_dict():
+    config = TelemetryConfig.from_dict({"level": "errors", "activity_sample_rate": 0.1})
+
+    assert config.level is TelemetryLevel.ERRORS
+    assert config.activity_sample_rate == 0.1
+    assert TelemetryConfig.from_dict(None).level is TelemetryLevel.COALESCED
+    # Unknown keys do not stop the driver from being constructed
+    assert TelemetryConfig.from_dict({"level": "off", "unknown": 1}).level is TelemetryLevel.OFF
+
+
+@pytest.mark.asyncio
+async def test_reports_during_a_slow_publish_are_flushed():
+    agent = make_agent(status_window_seconds=0.02)
+    telemetry = agent.telemetry
+    publish = telemetry.status_channel.report_status
+    release = asyncio.Event()
+
+    async def slow_publish(status, activity="", details=None):
+        await release.wait()
+        await publish(status, activity, details)
+
+    telemetry.status_channel.report_status = slow_publish
+    await telemetry.report_status("busy")
+    await asyncio.sleep(0.05)  # The timer is now publishing "busy"
+    await telemetry.report_status("idle")
+    release.set()
+    await asyncio.sleep(0.1)
+
+    statuses = [e.data["status"] for e in channel_events(agent, "status")]
+    assert statuses == ["busy", "idle"]
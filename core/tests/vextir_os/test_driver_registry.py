@@ -0,0 +1,256 @@
+"""Tests for vextir_os driver registry routing and resilience"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from lightning_core.abstractions.health import CircuitBreakerConfig
+from lightning_core.vextir_os.drivers import (
+    Driver,
+    DriverManifest,
+    DriverRegistry,
+    DriverType,
+    ResourceSpec,
+)
+from lightning_core.vextir_os.event_bus import EventBus
+from lightning_core.vextir_os.events import Event
+
+
+class FlakyDriver(Driver):
+    """Driver that fails while `failing` is set"""
+
+    def __init__(self, manifest, config=None):
+        super().__init__(manifest, config)
+        self.failing = False
+        self.delay = 0.0
+        self.calls = 0
+
+    async def handle_event(self, event: Event) -> List[Event]:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError("provider timeout")
+        return [Event(type="test.output", source=self.manifest.id, user_id="u1")]
+
+    def get_capabilities(self) -> List[str]:
+        return self.manifest.capabilities
+
+    def get_resource_requirements(self) -> ResourceSpec:
+        return self.manifest.resource_requirements
+
+
+def make_manifest(driver_id: str, **resources) -> DriverManifest:
+    return DriverManifest(
+        id=driver_id,
+        name=driver_id,
+        version="1.0.0",
+        author="test",
+        description="",
+        driver_type=DriverType.TOOL,
+        capabilities=["test.event"],
+        resource_requirements=ResourceSpec(**resources),
+    )
+
+
+def make_registry() -> DriverRegistry:
+    return DriverRegistry(
+        EventBus(),
+        circuit_config=CircuitBreakerConfig(
+            failure_threshold=2,
+            success_threshold=1,
+            timeout_seconds=0.1,
+            half_open_requests=1,
+        ),
+    )
+
+
+def make_event() -> Event:
+    return Event(type="test.event", source="test", user_id="u1")
+
+
+@pytest.mark.asyncio
+async def test_driver_recovers_after_transient_failure():
+    registry = make_registry()
+    await registry.register_driver(make_manifest("flaky"), FlakyDriver)
+    driver = registry.instances["flaky"].driver
+
+    driver.failing = True
+    for _ in range(2):
+        assert await registry.route_event(make_event()) == []
+
+    status = registry.get_driver_status("flaky")
+    assert status["status"] == "degraded"
+    assert status["circuit_breaker"]["state"] == "open"
+
+    # Open circuit sheds load without calling the driver
+    calls = driver.calls
+    assert await registry.route_event(make_event()) == []
+    assert driver.calls == calls
+    assert registry.get_driver_status("flaky")["bulkhead"]["rejected"] == 1
+
+    # Half-open probe succeeds and closes the circuit
+    driver.failing = False
+    await asyncio.sleep(0.15)
+    events = await registry.route_event(make_event())
+    assert len(events) == 1
+    assert registry.get_driver_status("flaky")["status"] == "running"
+    assert registry.get_circuit_states()["flaky"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_hung_driver_does_not_block_others():
+    registry = make_registry()
+    await registry.register_driver(
+        make_manifest("hung", timeout_seconds=0.05), FlakyDriver
+    )
+    await registry.register_driver(make_manifest("healthy"), FlakyDriver)
+    registry.instances["hung"].driver.delay = 1.0
+
+    events = await asyncio.wait_for(registry.route_event(make_event()), 0.5)
+
+    assert [e.source for e in events] == ["healthy"]
+    assert "timed out" in registry.get_driver_status("hung")["error_message"]
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_sheds_when_saturated():
+    registry = make_registry()
+    await registry.register_driver(
+        make_manifest("slow", max_concurrent=1), FlakyDriver
+    )
+    registry.instances["slow"].driver.delay = 0.05
+
+    results = await asyncio.gather(
+        registry.route_event(make_event()), registry.route_event(make_event())
+    )
+
+    assert sorted(len(r) for r in results) == [0, 1]
+    assert registry.get_driver_status("slow")["bulkhead"]["rejected"] == 1
+    assert registry.get_driver_status("slow")["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_admits_at_most_max_concurrent():
+    registry = make_registry()
+    await registry.register_driver(
+        make_manifest("slow", max_concurrent=2, timeout_seconds=0.2), FlakyDriver
+    )
+    registry.instances["slow"].driver.delay = 0.05
+
+    results = await asyncio.gather(*(registry.route_event(make_event()) for _ in range(5)))
+
+    assert sorted(len(r) for r in results) == [0, 0, 0, 1, 1]
+    status = registry.get_driver_status("slow")["bulkhead"]
+    assert status["rejected"] == 3 and status["in_flight"] == 0
+
+
+class SlowStartDriver(FlakyDriver):
+    """Driver that records the order in which drivers finish initializing"""
+
+    started: List[str] = []
+
+    async def initialize(self):
+        await asyncio.sleep(self.config.get("startup_delay", 0.05))
+        SlowStartDriver.started.append(self.manifest.id)
+        await super().initialize()
+
+
+@pytest.mark.asyncio
+async def test_start_all_runs_independent_drivers_in_parallel():
+    SlowStartDriver.started = []
+    registry = make_registry()
+    for driver_id in ("a", "b", "c"):
+        await registry.register_driver(
+            make_manifest(driver_id), SlowStartDriver, start=False
+        )
+    registry.manifests["c"].dependencies = ["a", "b"]
+
+    loop = asyncio.get_running_loop()
+    began = loop.time()
+    results = await registry.start_all()
+    elapsed = loop.time() - began
+
+    assert results == {"a": None, "b": None, "c": None}
+    assert SlowStartDriver.started[-1] == "c"
+    # Two dependency levels of 50ms each, not three drivers in sequence
+    assert elapsed < 0.14
+    assert all(ms is not None for ms in registry.get_startup_report().values())
+
+
+@pytest.mark.asyncio
+async def test_start_all_skips_failed_dependencies_and_cycles():
+    registry = make_registry()
+    registry.default_startup_timeout = 0.05
+    await registry.register_driver(
+        make_manifest("stuck"), SlowStartDriver, {"startup_delay": 1}, start=False
+    )
+    await registry.register_driver(make_manifest("child"), FlakyDriver, start=False)
+    await registry.register_driver(make_manifest("x"), FlakyDriver, start=False)
+    await registry.register_driver(make_manifest("y"), FlakyDriver, start=False)
+    registry.manifests["child"].dependencies = ["stuck"]
+    registry.manifests["x"].dependencies = ["y"]
+    registry.manifests["y"].dependencies = ["x"]
+
+    results = await registry.start_all()
+
+    assert "did not initialize" in results["stuck"]
+    assert results["child"] == "Dependency stuck unavailable"
+    assert results["x"] == results["y"] == "Dependency cycle detected"
+    assert "child" not in registry.instances
+
+
+@pytest.mark.asyncio
+async def test_lazy_driver_starts_on_first_event():
+    registry = make_registry()
+    manifest = make_manifest("lazy")
+    manifest.lazy = True
+    await registry.register_driver(manifest, FlakyDriver)
+
+    assert "lazy" not in registry.instances
+    assert registry.has_capable_drivers("test.event")
+    assert registry.list_drivers()[0]["status"] == "pending"
+
+    events = await registry.route_event(make_event())
+
+    assert len(events) == 1
+    assert registry.get_driver_status("lazy")["startup_time_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_events_wait_for_a_starting_lazy_driver():
+    registry = make_registry()
+    manifest = make_manifest("lazy")
+    manifest.lazy = True
+    await registry.register_driver(manifest, SlowStartDriver, {"startup_delay": 0.05})
+
+    results = await asyncio.gather(
+        *(registry.route_event(make_event()) for _ in range(3))
+    )
+
+    assert [len(events) for events in results] == [1, 1, 1]
+    assert registry.instances["lazy"].driver.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_start_all_waits_for_dependency_started_lazily():
+    registry = make_registry()
+    await registry.register_driver(
+        make_manifest("base"), SlowStartDriver, {"startup_delay": 0.05}, start=False
+    )
+    manifest = make_manifest("lazy")
+    manifest.lazy = True
+    manifest.dependencies = ["base"]
+    await registry.register_driver(manifest, FlakyDriver)
+    await registry.register_driver(make_manifest("child"), FlakyDriver, start=False)
+    registry.manifests["child"].dependencies = ["base"]
+
+    # The lazy driver starts "base" while start_all is bringing it up too
+    routed = asyncio.ensure_future(registry.route_event(make_event()))
+    await asyncio.sleep(0)
+    results = await registry.start_all()
+    await routed
+
+    assert results == {"child": None}
+    assert registry.get_driver_status("lazy")["status"] == "running"
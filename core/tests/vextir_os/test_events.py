@@ -254,3 +254,58 @@ class TestEventSerialization:
         assert hasattr(event, "user_id")
         assert hasattr(event, "category")
         assert hasattr(event, "metadata")
+
+
+class TestEventFactory:
+    """Test typed event construction through the event factory"""
+
+    def test_default_registrations(self):
+        """Test the built-in type to class mapping"""
+        from lightning_core.events.factory import get_event_factory
+        from lightning_core.events.models import LLMChatEvent
+
+        factory = get_event_factory()
+        event = factory.from_dict(
+            {
+                "type": "llm.chat",
+                "timestamp": "2024-01-01T00:00:00Z",
+                "category": "input",
+                "user_id": "user-123",
+                "unknown_field": "ignored",
+            }
+        )
+
+        assert isinstance(event, LLMChatEvent)
+        assert event.timestamp.year == 2024
+        assert event.category == EventCategory.INPUT
+        assert type(factory.from_dict({"type": "other.event"})) is Event
+
+    def test_prefix_registration_and_converters(self):
+        """Test prefix matching and custom converters for custom types"""
+        from dataclasses import dataclass
+
+        from lightning_core.events.factory import EventFactory
+
+        @dataclass
+        class SensorEvent(Event):
+            reading: float = 0.0
+
+        factory = EventFactory()
+        factory.register("sensor", SensorEvent, prefix=True, converters={"reading": float})
+        factory.register("sensor.raw", Event)
+
+        event = factory.from_dict({"type": "sensor.temp.kitchen", "reading": "21.5"})
+        assert isinstance(event, SensorEvent)
+        assert event.reading == 21.5
+        assert type(factory.from_dict({"type": "sensor.raw"})) is Event
+        # Converters are scoped to the factory they were registered with
+        plain = SensorEvent.from_dict({"type": "sensor", "reading": "1"})
+        assert isinstance(plain, SensorEvent) and plain.reading == "1"
+        other = EventFactory()
+        other.register("sensor", SensorEvent, prefix=True)
+        assert other.from_dict({"type": "sensor", "reading": "2"}).reading == "2"
+        assert factory.from_dict({"type": "sensor", "reading": "3"}).reading == 3.0
+        assert factory.get_registrations()["sensor"] == ("SensorEvent", True)
+
+        with pytest.raises(TypeError):
+            factory.register("bad", dict)
@@ -0,0 +1,105 @@
+"""Tests for per-user execution lanes"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from lightning_core.vextir_os.events import Event
+from lightning_core.vextir_os.execution_lanes import KeyedLaneScheduler, LaneConfig
+
+
+class RecordingHandler:
+    """Handler that records start order and tracks per-user concurrency"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.order: List[str] = []
+        self.running = {}
+        self.max_running = {}
+
+    async def __call__(self, event: Event) -> List[Event]:
+        user = event.user_id
+        self.order.append(user)
+        self.running[user] = self.running.get(user, 0) + 1
+        self.max_running[user] = max(self.max_running.get(user, 0), self.running[user])
+        await asyncio.sleep(self.delay)
+        self.running[user] -= 1
+        if event.metadata.get("fail"):
+            raise RuntimeError("handler failure")
+        return [Event(type="test.output", source="test", user_id=user)]
+
+
+def make_event(user_id: str, **metadata) -> Event:
+    return Event(type="email.received", source="test", user_id=user_id, metadata=metadata)
+
+
+@pytest.mark.asyncio
+async def test_bulk_user_does_not_starve_others():
+    handler = RecordingHandler()
+    lanes = KeyedLaneScheduler(
+        handler, LaneConfig(max_concurrency=2, max_in_flight_per_key=1)
+    )
+
+    bulk = [await lanes.submit(make_event("bulk")) for _ in range(50)]
+    chat = await lanes.submit(make_event("chat"))
+    await lanes.drain()
+
+    # The chat event runs right after the first bulk event, not after 50
+    assert handler.order.index("chat") <= 2
+    assert handler.max_running["bulk"] == 1
+    assert all(f.done() for f in bulk) and len(chat.result()) == 1
+    metrics = lanes.get_metrics()["lanes"]
+    assert metrics["bulk"]["processed"] == 50
+    assert metrics["bulk"]["max_queue_depth"] == 49
+    assert metrics["chat"]["wait"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_weighted_fair_share():
+    handler = RecordingHandler(delay=0)
+    lanes = KeyedLaneScheduler(
+        handler,
+        LaneConfig(mode="weighted", max_concurrency=1, weights={"premium": 3}),
+    )
+
+    for _ in range(12):
+        await lanes.submit(make_event("basic"))
+        await lanes.submit(make_event("premium"))
+    await lanes.drain()
+
+    # The first event starts immediately; after that turns follow the 3:1 weights
+    first_rounds = handler.order[1:17]
+    assert first_rounds.count("premium") == 12
+    assert first_rounds.count("basic") == 4
+
+
+@pytest.mark.asyncio
+async def test_failures_are_isolated_and_backpressure_applies():
+    handler = RecordingHandler()
+    lanes = KeyedLaneScheduler(
+        handler, LaneConfig(max_concurrency=1, max_queued_per_key=2)
+    )
+
+    failing = await lanes.submit(make_event("u1", fail=True))
+    await lanes.submit(make_event("u1"))
+    await lanes.submit(make_event("u1"))
+    # Lane is full: the next submit waits for space
+    blocked = asyncio.create_task(lanes.submit(make_event("u1")))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    await lanes.drain()
+    assert blocked.done()
+    await (await blocked)
+    with pytest.raises(RuntimeError):
+        failing.result()
+    assert lanes.get_lane_metrics("u1")["failed"] == 1
+    assert lanes.get_lane_metrics("u1")["processed"] == 3
+
+
+def test_invalid_lane_config():
+    with pytest.raises(ValueError):
+        LaneConfig(mode="fifo")
+    with pytest.raises(ValueError):
+        LaneConfig(weights={"u1": 0})
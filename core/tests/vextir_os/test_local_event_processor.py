@@ -0,0 +1,47 @@
+"""Tests for the local event processor service execution modes"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from lightning_core.abstractions import EventMessage
+from lightning_core.vextir_os.local_event_processor import LocalEventProcessorService
+
+
+class RecordingProcessor:
+    """Universal processor stand-in that answers with one output event"""
+
+    def __init__(self):
+        self.events = []
+        self.lanes = None
+
+    async def process_event(self, event):
+        from lightning_core.vextir_os.events import Event
+
+        self.events.append(event)
+        return [Event(type="test.output", source="test", user_id=event.user_id)]
+
+
+@pytest.mark.asyncio
+async def test_in_process_mode_skips_serverless_function():
+    published = []
+
+    async def publish_event(event):
+        published.append(event)
+
+    service = LocalEventProcessorService(execution_mode="in_process")
+    service.runtime = SimpleNamespace(serverless=None, publish_event=publish_event)
+    service.processor = RecordingProcessor()
+
+    await service.handle_event(
+        EventMessage(event_type="test.event", metadata={"userID": "u1", "source": "t"})
+    )
+
+    assert service.processor.events[0].user_id == "u1"
+    assert service.processor.events[0].type == "test.event"
+    assert [e.event_type for e in published] == ["test.output"]
+
+
+def test_unknown_execution_mode_is_rejected():
+    with pytest.raises(ValueError):
+        LocalEventProcessorService(execution_mode="threaded")
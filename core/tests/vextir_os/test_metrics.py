@@ -0,0 +1,79 @@
+"""Tests for vextir_os latency histograms and Prometheus exposition"""
+
+import random
+
+from lightning_core.vextir_os.metrics import (
+    BoundedHistogramMap,
+    LatencyHistogram,
+    PrometheusWriter,
+)
+from lightning_core.vextir_os.universal_processor import EventMetrics
+from lightning_core.vextir_os.events import Event
+
+
+def test_histogram_percentiles_within_bucket_error():
+    histogram = LatencyHistogram()
+    samples = [random.uniform(0.001, 0.2) for _ in range(5000)]
+    for sample in samples:
+        histogram.record(sample)
+
+    samples.sort()
+    for quantile in (0.5, 0.95, 0.99):
+        exact = samples[int(quantile * len(samples)) - 1]
+        assert abs(histogram.percentile(quantile) - exact) / exact < 0.1
+
+    assert histogram.count == 5000
+    assert histogram.percentile(1.0) == max(samples)
+
+
+def test_histogram_exposes_tail_latency():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(0.01)
+    histogram.record(2.0)
+    histogram.record(2.0)
+
+    assert histogram.percentile(0.5) < 0.011
+    assert histogram.percentile(0.99) > 1.8
+
+
+def test_histogram_memory_is_fixed():
+    histogram = LatencyHistogram()
+    buckets = len(histogram.counts)
+    for value in (0, 1e-9, 5.0, 1e6):
+        histogram.record(value)
+    assert len(histogram.counts) == buckets
+    assert histogram.count == 4
+
+
+def test_bounded_map_overflows_into_shared_key():
+    histograms = BoundedHistogramMap(max_keys=2)
+    for key in ("a", "b", "c", "d"):
+        histograms.record(key, 0.01)
+
+    assert set(dict(histograms.items())) == {"a", "b", BoundedHistogramMap.OVERFLOW_KEY}
+    assert histograms.get("z").count == 2
+
+
+async def test_event_metrics_prometheus_output():
+    metrics = EventMetrics()
+    event = Event(type='chat "quoted"', source="test", user_id="u1")
+    await metrics.record_event(event, [], 0.05)
+    await metrics.record_error(event, "Unauthorized: nope", 0.001, denied=True)
+    await metrics.record_orphaned_event(event)
+    metrics.record_drained(3)
+
+    summary = await metrics.get_summary()
+    assert summary["total_denied"] == 1
+    assert summary["total_failed"] == 0
+    assert summary["total_drained"] == 3
+    assert summary["latency_by_type"]['chat "quoted"']["count"] == 2
+
+    text = metrics.render_prometheus()
+    assert "# TYPE vextir_event_processing_seconds summary" in text
+    assert 'vextir_events_processed_total{event_type="chat \\"quoted\\""} 1' in text
+    assert "vextir_events_denied_total 1" in text
+    assert "vextir_events_drained_total 3" in text
+    assert 'quantile="0.99"' in text
+    assert text.endswith("\n")
+    assert PrometheusWriter.CONTENT_TYPE.startswith("text/plain; version=0.0.4")
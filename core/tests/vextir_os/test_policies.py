@@ -0,0 +1,158 @@
+"""Tests for compiled, indexed security policies"""
+
+import pytest
+
+from lightning_core.vextir_os.events import Event
+from lightning_core.vextir_os.policy_conditions import compile_condition
+from lightning_core.vextir_os.security import (
+    Policy,
+    PolicyAction,
+    PolicyEngine,
+    SecurityManager,
+)
+
+
+def make_policy(policy_id: str, condition: str = "always", **kwargs) -> Policy:
+    return Policy(
+        id=policy_id,
+        name=policy_id,
+        description="",
+        condition=condition,
+        action=kwargs.pop("action", PolicyAction.LOG),
+        **kwargs,
+    )
+
+
+def test_compiled_conditions():
+    pii = compile_condition(
+        "event_type.startswith('context.') and 'Personal' in str(metadata)"
+    )
+    assert pii({"event_type": "context.update", "metadata": {"tag": "Personal"}})
+    assert not pii({"event_type": "email.received", "metadata": {"tag": "Personal"}})
+    assert pii.event_type_prefixes == ["context."]
+
+    limit = compile_condition("monthly_cost > 100.0 or not (daily_events <= 5)")
+    assert limit({"monthly_cost": 150.0, "daily_events": 0})
+    assert limit({"monthly_cost": 0, "daily_events": 6})
+    assert not limit({"monthly_cost": 0, "daily_events": 5})
+    assert limit.event_type_prefixes == [] and limit.variables == {"monthly_cost", "daily_events"}
+
+    # A compared or negated startswith does not restrict the event type
+    for source in (
+        "event_type.startswith('context.') == False",
+        "False == event_type.startswith('context.')",
+        "not event_type.startswith('context.')",
+    ):
+        negated = compile_condition(source)
+        assert negated({"event_type": "email.received"})
+        assert negated.event_type_prefixes == []
+
+    # Invalid conditions and missing variables never match
+    assert not compile_condition("__import__('os')")({})
+    assert compile_condition("1 +").error
+    assert not compile_condition("missing > 1")({})
+
+
+def test_index_limits_candidates_by_user_and_type():
+    engine = PolicyEngine()
+    engine.add_policy(make_policy("global"))
+    engine.add_policy(make_policy("email", "event_type == 'email.received'"))
+    engine.add_policy(make_policy("context", event_types=["context.*"], priority=5))
+    engine.add_policy(make_policy("alice_only", applies_to=["alice"]))
+
+    def candidates(user, event_type):
+        return [c.policy.id for c in engine.get_applicable_policies(user, event_type)]
+
+    assert candidates("bob", "email.received") == ["global", "email"]
+    assert candidates("alice", "context.update") == ["context", "global", "alice_only"]
+    assert candidates("bob", "calendar.sync") == ["global"]
+
+    version = engine.version
+    engine.remove_policy("global")
+    assert engine.version > version
+    assert candidates("bob", "calendar.sync") == []
+
+    engine.add_policy(make_policy("not_context", "event_type.startswith('context.') == False"))
+    assert candidates("bob", "calendar.sync") == ["not_context"]
+
+
+@pytest.mark.asyncio
+async def test_explain_records_deciding_policy():
+    manager = SecurityManager()
+    manager.explain_decisions = True
+    manager.add_policy(
+        make_policy(
+            "block_spam",
+            "event_type == 'email.received' and 'spam' in str(metadata)",
+            action=PolicyAction.DENY,
+            priority=1,
+        )
+    )
+
+    spam = Event(type="email.received", source="t", user_id="u1", metadata={"k": "spam"})
+    assert not await manager.authorize(spam)
+    entry = manager.get_audit_log(1)[0]
+    assert entry["decided_by"] == "block_spam"
+    assert entry["explanation"][0]["matched"] is True
+    assert entry["explanation"][0]["values"]["event_type"] == "email.received"
+
+    ham = Event(type="email.received", source="t", user_id="u1", metadata={"k": "ham"})
+    explained = await manager.explain(ham)
+    assert explained["authorized"] and explained["decided_by"] is None
+    assert [p["policy_id"] for p in explained["policies"]][0] == "block_spam"
+    # Explaining does not log or count usage; denied events are not counted
+    assert len(manager.get_audit_log()) == 1
+    assert manager._get_daily_events("u1") == 0
+
+
+@pytest.mark.asyncio
+async def test_default_policies_are_inert_unless_enforced():
+    manager = SecurityManager()
+    manager.usage.record("u1", cost=150.0, count=5000)
+    personal = Event(
+        type="context.update", source="t", user_id="u1", metadata={"tag": "Personal"}
+    )
+
+    # Same decisions as before conditions were compiled: nothing matches
+    for _ in range(3):
+        assert await manager.authorize(personal)
+        entry = manager.get_audit_log(1)[0]
+        assert entry["actions_taken"] == [] and entry["decided_by"] is None
+    assert (await manager.explain(personal))["matched"] == []
+
+
+@pytest.mark.asyncio
+async def test_default_cost_policy_denies_when_enforced():
+    manager = SecurityManager(enforce_default_policies=True)
+    manager.usage.record("u1", cost=150.0)
+
+    assert not await manager.authorize(Event(type="test.event", source="t", user_id="u1"))
+    assert manager.get_audit_log(1)[0]["decided_by"] == "cost_limit"
+    assert await manager.authorize(Event(type="test.event", source="t", user_id="u2"))
+
+
+@pytest.mark.asyncio
+async def test_decision_cache_skips_stateless_policies():
+    manager = SecurityManager(enforce_default_policies=True)
+    manager.add_policy(
+        make_policy("block_tool", "event_type == 'tool.exec'", action=PolicyAction.DENY, priority=1)
+    )
+    engine = manager.policy_engine
+
+    for _ in range(5):
+        assert not await manager.authorize(Event(type="tool.exec", source="t", user_id="u1"))
+    stats = engine.get_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 4
+    # The cached deny decides before any stateful policy runs
+    assert stats["evaluations_run"] == 0
+    assert stats["hit_ratio"] == pytest.approx(0.8)
+
+    # Stateful policies still see live counters on cache hits
+    manager.usage.record("u2", cost=150.0)
+    assert not await manager.authorize(Event(type="test.event", source="t", user_id="u2"))
+    assert await manager.authorize(Event(type="test.event", source="t", user_id="u3"))
+
+    # Policy changes invalidate cached decisions
+    manager.remove_policy("block_tool")
+    assert engine.get_cache_stats()["entries"] == 0
+    assert await manager.authorize(Event(type="tool.exec", source="t", user_id="u1"))
@@ -0,0 +1,100 @@
+"""Tests for sliding-window usage counters"""
+
+import pytest
+
+from lightning_core.abstractions.storage import Document
+from lightning_core.providers.local.storage import LocalStorageProvider
+from lightning_core.vextir_os.events import Event
+from lightning_core.vextir_os.security import SecurityManager
+from lightning_core.vextir_os.usage import SlidingWindowCounter, UsageCounters
+
+
+def test_window_expires_old_buckets():
+    counter = SlidingWindowCounter(bucket_seconds=60, num_buckets=60)
+    counter.add(0, cost=0.5)
+    counter.add(1800, count=2, cost=1.0)
+
+    assert counter.get(1800) == (3, 1.5)
+    # The first bucket leaves the one-hour window, the second is still in it
+    assert counter.get(3600) == (2, 1.0)
+    assert counter.get(1800 + 3600) == (0, 0.0)
+
+
+def test_snapshot_covers_all_windows():
+    usage = UsageCounters()
+    usage.record("u1", cost=0.01, now=0)
+    usage.record("u1", cost=0.01, now=90)
+
+    snapshot = usage.snapshot("u1", now=90)
+    assert snapshot["minute_events"] == 1
+    assert snapshot["hour_events"] == 2
+    assert snapshot["day_cost"] == pytest.approx(0.02)
+    assert usage.snapshot("nobody")["day_events"] == 0
+
+
+@pytest.mark.asyncio
+async def test_security_context_uses_counters_and_persists(tmp_path):
+    manager = SecurityManager()
+    for _ in range(3):
+        await manager.authorize(Event(type="test.event", source="test", user_id="u1"))
+
+    context = await manager._build_context(Event(type="test.event", source="t", user_id="u1"))
+    assert context["daily_events"] == 3
+    assert context["monthly_cost"] == pytest.approx(0.03)
+
+    store = LocalStorageProvider(str(tmp_path)).get_document_store("usage", Document)
+    assert await manager.save_usage(store) == 1
+
+    restarted = SecurityManager()
+    assert await restarted.load_usage(store) == 1
+    assert restarted._get_daily_events("u1") == 3
+
+
+@pytest.mark.asyncio
+async def test_denied_events_do_not_add_usage():
+    manager = SecurityManager(enforce_default_policies=True)
+    manager.usage.record("u1", cost=100.5)
+
+    for _ in range(5):
+        assert not await manager.authorize(Event(type="user.action", source="t", user_id="u1"))
+    assert manager._get_monthly_cost("u1") == pytest.approx(100.5)
+    assert manager._get_daily_events("u1") == 1
+    assert len(manager.get_audit_log()) == 5
+
+
+def test_idle_users_are_evicted():
+    usage = UsageCounters()
+    usage.record("old", now=0)
+    usage.record("recent", now=40 * 86400)
+
+    assert usage.evict_idle(now=40 * 86400) == 1
+    assert len(usage) == 1 and usage.get_events("recent", now=40 * 86400) == 1
+
+    # New users trigger a sweep once the tracked count doubles
+    usage.min_sweep_users = usage._sweep_at = 4
+    for user in ("a", "b", "c"):
+        usage.record(user, now=0)
+    usage.record("d")
+    assert len(usage) == 1 and usage.get_events("d") == 1
+
+
+@pytest.mark.asyncio
+async def test_runtime_loads_and_saves_usage(tmp_path, monkeypatch):
+    from lightning_core.abstractions.configuration import RuntimeConfig
+    from lightning_core.runtime import LightningRuntime
+    from lightning_core.vextir_os import security
+
+    config = RuntimeConfig(storage_path=str(tmp_path), usage_save_interval_seconds=60)
+    monkeypatch.setattr(security, "_global_security_manager", SecurityManager())
+    runtime = LightningRuntime(config, use_resilient_providers=False)
+    await runtime.initialize()
+    await security.get_security_manager().authorize(
+        Event(type="test.event", source="t", user_id="u1")
+    )
+    await runtime.shutdown()
+
+    monkeypatch.setattr(security, "_global_security_manager", SecurityManager())
+    runtime = LightningRuntime(config, use_resilient_providers=False)
+    await runtime.initialize()
+    assert security.get_security_manager()._get_daily_events("u1") == 1
+    await runtime.shutdown()
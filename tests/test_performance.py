@@ -35,3 +35,58 @@ def test_event_to_dict_benchmark(benchmark):
 
 def test_event_matches_benchmark(benchmark):
     benchmark(utils.event_matches, "foo.bar.baz", "foo.*")
+
+
+def _make_processor_service(monkeypatch, mode):
+    """Local event processor service wired to an in-memory runtime"""
+    import asyncio
+    from types import SimpleNamespace
+
+    from lightning_core.providers.local.serverless import LocalServerlessRuntime
+    from lightning_core.vextir_os import serverless_processor
+    from lightning_core.vextir_os.local_event_processor import (
+        LocalEventProcessorService,
+    )
+
+    async def publish_event(event):
+        pass
+
+    # Measure steady-state overhead, not first-invocation driver startup
+    monkeypatch.setattr(serverless_processor, "_initialized", True)
+    loop = asyncio.new_event_loop()
+    service = LocalEventProcessorService(execution_mode=mode)
+    service.runtime = SimpleNamespace(
+        serverless=LocalServerlessRuntime(), publish_event=publish_event
+    )
+    loop.run_until_complete(service.setup_execution())
+    return loop, service
+
+
+def _bench_processor_mode(benchmark, monkeypatch, mode):
+    from lightning_core.abstractions import EventMessage
+
+    loop, service = _make_processor_service(monkeypatch, mode)
+    event = EventMessage(
+        event_type="bench.event",
+        data={"n": 1},
+        metadata={"userID": "u123", "source": "bench"},
+    )
+    benchmark.extra_info["execution_mode"] = mode
+    try:
+        benchmark(lambda: loop.run_until_complete(service.handle_event(event)))
+    finally:
+        loop.close()
+
+
+def test_local_processor_in_process_benchmark(benchmark, monkeypatch):
+    _bench_processor_mode(benchmark, monkeypatch, "in_process")
+
+
+def test_local_processor_serverless_benchmark(benchmark, monkeypatch):
+    _bench_processor_mode(benchmark, monkeypatch, "serverless")
+
+
+def test_event_factory_from_dict_benchmark(benchmark):
+    from lightning_core.events.factory import get_event_factory
+
+    benchmark(get_event_factory().from_dict, sample_event)